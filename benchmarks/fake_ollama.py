@@ -0,0 +1,335 @@
+#!/usr/bin/env python
+"""Stub Ollama server for benchmarks and load tests.
+
+Implements the parts of the Ollama API the orchestra uses, with configurable
+timings instead of a model:
+
+- ``POST /api/generate``: streaming (NDJSON) and non-streaming generations. A
+  request for a model that is not loaded first waits for the model swap delay,
+  which is reported as ``load_duration`` like Ollama does; a request without a
+  prompt only loads the model, and ``keep_alive: 0`` unloads it afterwards.
+- ``POST /api/embed``: deterministic vectors derived from the hash of each input
+- ``GET /api/tags`` and ``GET /api/ps``: available and loaded models
+- ``POST /api/pull``: adds a model after the pull delay
+
+Usage:
+    python benchmarks/fake_ollama.py [--port 11435] [--latency 0.05] [--swap-delay 1.0]
+        ...
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+
+class FakeOllamaConfig(BaseModel):
+    """Timings and models of the stub server."""
+
+    models: List[str] = ["llama3.1:8b"]
+    latency: float = 0.05
+    prompt_token_latency: float = 0.0002
+    token_latency: float = 0.002
+    tokens: int = 64
+    swap_delay: float = 1.0
+    pull_delay: float = 0.5
+    max_loaded_models: int = 1
+    parallel: int = 4
+    embed_latency: float = 0.001
+    dimensions: int = 64
+
+
+def _now() -> str:
+    """Format the current time like Ollama does."""
+    return datetime.utcnow().isoformat() + "Z"
+
+
+def create_app(config: FakeOllamaConfig) -> FastAPI:
+    """Create the stub server.
+
+    Args:
+        config: Timings and models
+
+    Returns:
+        ASGI application
+    """
+    app = FastAPI(title="Fake Ollama")
+    available = set(config.models)
+    loaded: "OrderedDict[str, float]" = OrderedDict()
+    load_lock = asyncio.Lock()
+    slots = asyncio.Semaphore(config.parallel)
+    app.state.stats = {"generations": 0, "embeddings": 0, "loads": 0}
+
+    async def ensure_loaded(model: str) -> float:
+        """Load a model unless it is loaded, evicting the least recently used one."""
+        if model not in available:
+            raise HTTPException(
+                status_code=404,
+                detail=f"model '{model}' not found, try pulling it first",
+            )
+        started = time.monotonic()
+        async with load_lock:
+            if model not in loaded:
+                await asyncio.sleep(config.swap_delay)
+                app.state.stats["loads"] += 1
+                while len(loaded) >= config.max_loaded_models:
+                    loaded.popitem(last=False)
+            loaded[model] = time.time()
+            loaded.move_to_end(model)
+        return time.monotonic() - started
+
+    @app.post("/api/generate")
+    async def generate(request: Request) -> Any:
+        body = await request.json()
+        model = body.get("model")
+        prompt = body.get("prompt") or ""
+        stream = body.get("stream", True)
+        started = time.monotonic()
+
+        async with slots:
+            load_duration = await ensure_loaded(model)
+            if not prompt:
+                if body.get("keep_alive") in (0, "0", "0s"):
+                    loaded.pop(model, None)
+                return JSONResponse(
+                    {
+                        "model": model,
+                        "created_at": _now(),
+                        "response": "",
+                        "done": True,
+                        "done_reason": "load",
+                    }
+                )
+
+            app.state.stats["generations"] += 1
+            prompt_eval_count = len(prompt.split())
+            prompt_eval_duration = prompt_eval_count * config.prompt_token_latency
+            await asyncio.sleep(config.latency + prompt_eval_duration)
+
+            def summary() -> Dict[str, Any]:
+                eval_duration = config.tokens * config.token_latency
+                return {
+                    "model": model,
+                    "created_at": _now(),
+                    "done": True,
+                    "total_duration": int((time.monotonic() - started) * 1e9),
+                    "load_duration": int(load_duration * 1e9),
+                    "prompt_eval_count": prompt_eval_count,
+                    "prompt_eval_duration": int(prompt_eval_duration * 1e9),
+                    "eval_count": config.tokens,
+                    "eval_duration": int(eval_duration * 1e9),
+                }
+
+            if not stream:
+                await asyncio.sleep(config.tokens * config.token_latency)
+                if body.get("keep_alive") in (0, "0", "0s"):
+                    loaded.pop(model, None)
+                return JSONResponse({**summary(), "response": "token " * config.tokens})
+
+        async def chunks() -> AsyncIterator[bytes]:
+            # Tokens are produced outside the slot, like the streaming tail of a real
+            # request
+            for _ in range(config.tokens):
+                await asyncio.sleep(config.token_latency)
+                chunk = {
+                    "model": model,
+                    "created_at": _now(),
+                    "response": "token ",
+                    "done": False,
+                }
+                yield (json.dumps(chunk) + "\n").encode()
+            yield (json.dumps({**summary(), "response": ""}) + "\n").encode()
+
+        return StreamingResponse(chunks(), media_type="application/x-ndjson")
+
+    @app.post("/api/embed")
+    async def embed(request: Request) -> Dict[str, Any]:
+        body = await request.json()
+        model = body.get("model")
+        inputs = body.get("input") or []
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        started = time.monotonic()
+
+        async with slots:
+            load_duration = await ensure_loaded(model)
+            app.state.stats["embeddings"] += len(inputs)
+            await asyncio.sleep(config.latency + config.embed_latency * len(inputs))
+
+        embeddings = []
+        for text in inputs:
+            digest = hashlib.sha256(text.encode()).digest()
+            values = [
+                digest[index % len(digest)] / 255 - 0.5
+                for index in range(config.dimensions)
+            ]
+            norm = sum(value * value for value in values) ** 0.5
+            embeddings.append([value / norm for value in values])
+        return {
+            "model": model,
+            "embeddings": embeddings,
+            "total_duration": int((time.monotonic() - started) * 1e9),
+            "load_duration": int(load_duration * 1e9),
+            "prompt_eval_count": sum(len(text.split()) for text in inputs),
+        }
+
+    @app.get("/api/tags")
+    async def tags() -> Dict[str, Any]:
+        return {
+            "models": [
+                {
+                    "name": name,
+                    "model": name,
+                    "modified_at": _now(),
+                    "size": 4_000_000_000,
+                    "digest": hashlib.sha256(name.encode()).hexdigest(),
+                    "details": {"format": "gguf", "family": "fake"},
+                }
+                for name in sorted(available)
+            ]
+        }
+
+    @app.get("/api/ps")
+    async def ps() -> Dict[str, Any]:
+        return {
+            "models": [
+                {"name": name, "model": name, "size": 4_000_000_000} for name in loaded
+            ]
+        }
+
+    @app.post("/api/pull")
+    async def pull(request: Request) -> Any:
+        body = await request.json()
+        name = body.get("name") or body.get("model")
+        await asyncio.sleep(config.pull_delay)
+        available.add(name)
+        if body.get("stream", True):
+            lines = [{"status": "pulling manifest"}, {"status": "success"}]
+            return StreamingResponse(
+                iter([(json.dumps(line) + "\n").encode() for line in lines]),
+                media_type="application/x-ndjson",
+            )
+        return {"status": "success"}
+
+    return app
+
+
+def serve_in_thread(app: Any, host: str = "127.0.0.1", port: int = 0) -> uvicorn.Server:
+    """Serve an ASGI application from a background thread.
+
+    Args:
+        app: ASGI application
+        host: Interface to listen on
+        port: Port to listen on (0: pick a free port)
+
+    Returns:
+        Running server (see :func:`server_port` for the bound port)
+    """
+    server = uvicorn.Server(
+        uvicorn.Config(app, host=host, port=port, log_level="warning", lifespan="on")
+    )
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Server failed to start")
+        time.sleep(0.01)
+    return server
+
+
+def server_port(server: uvicorn.Server) -> int:
+    """Get the port a server started by :func:`serve_in_thread` is bound to."""
+    return server.servers[0].sockets[0].getsockname()[1]
+
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the stub server timings to a command line parser.
+
+    Args:
+        parser: Argument parser
+    """
+    defaults = FakeOllamaConfig()
+    parser.add_argument(
+        "--models",
+        default=",".join(defaults.models),
+        help="Comma-separated model names",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=defaults.latency,
+        help="Fixed seconds per generation",
+    )
+    parser.add_argument(
+        "--token-latency",
+        type=float,
+        default=defaults.token_latency,
+        help="Seconds per generated token",
+    )
+    parser.add_argument(
+        "--tokens", type=int, default=defaults.tokens, help="Tokens per generation"
+    )
+    parser.add_argument(
+        "--swap-delay",
+        type=float,
+        default=defaults.swap_delay,
+        help="Seconds to load a model that is not loaded",
+    )
+    parser.add_argument(
+        "--max-loaded-models",
+        type=int,
+        default=defaults.max_loaded_models,
+        help="Models kept loaded at once",
+    )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=defaults.parallel,
+        help="Generations served concurrently",
+    )
+
+
+def config_from_arguments(args: argparse.Namespace) -> FakeOllamaConfig:
+    """Build the stub server configuration from parsed arguments.
+
+    Args:
+        args: Arguments added by :func:`add_config_arguments`
+
+    Returns:
+        Configuration
+    """
+    return FakeOllamaConfig(
+        models=[name.strip() for name in args.models.split(",") if name.strip()],
+        latency=args.latency,
+        token_latency=args.token_latency,
+        tokens=args.tokens,
+        swap_delay=args.swap_delay,
+        max_loaded_models=args.max_loaded_models,
+        parallel=args.parallel,
+    )
+
+
+def main() -> int:
+    """Run the stub server."""
+    parser = argparse.ArgumentParser(description="Stub Ollama server")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to listen on")
+    parser.add_argument("--port", type=int, default=11435, help="Port to listen on")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    uvicorn.run(create_app(config_from_arguments(args)), host=args.host, port=args.port)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
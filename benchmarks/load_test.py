@@ -0,0 +1,367 @@
+#!/usr/bin/env python
+"""Load test the task pipeline end to end against a stub Ollama server.
+
+Starts the stub server (``fake_ollama.py``), the API and a Celery worker in this
+process, submits ``ollama-inference`` tasks through ``POST /api/v1/tasks`` and
+measures throughput and the latency from submission to completion.
+
+The worker consumes from an in-memory broker by default, so only Redis (for the
+task state the worker reports) is needed; pass ``--broker`` to go through a real
+broker instead. Results are written as JSON; ``--compare`` prints the change
+against an earlier result file, e.g. one from the previous release.
+
+Usage:
+    python benchmarks/load_test.py [--tasks 200] [--concurrency 16 | --rate 20]
+        [--output results.json]
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import httpx
+from fake_ollama import (
+    add_config_arguments,
+    config_from_arguments,
+    create_app,
+    serve_in_thread,
+    server_port,
+)
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+# Metrics compared by --compare, and whether higher values are better
+COMPARED_METRICS = {
+    "throughput": True,
+    "latency.p50": False,
+    "latency.p99": False,
+    "submit_latency.p50": False,
+    "submit_latency.p99": False,
+}
+
+# Changes for the worse beyond this many percent are flagged as regressions
+REGRESSION_TOLERANCE = 5.0
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    """Get a nearest-rank percentile.
+
+    Args:
+        values: Values
+        q: Percentile between 0 and 100
+
+    Returns:
+        Percentile, or None if there are no values
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[index]
+
+
+def summarize(values: List[float]) -> Dict[str, Optional[float]]:
+    """Summarize a latency distribution in seconds."""
+    return {
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else None,
+        "max": max(values) if values else None,
+    }
+
+
+def _parse_timestamp(value: str) -> float:
+    """Parse a task record timestamp into a Unix timestamp."""
+    return (
+        datetime.fromisoformat(value.rstrip("Z"))
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+class LoadGenerator:
+    """Submit tasks and wait for them to finish."""
+
+    def __init__(
+        self,
+        base_url: str,
+        models: List[str],
+        prompt_words: int,
+        poll_interval: float,
+        task_timeout: float,
+    ):
+        """Initialize the load generator.
+
+        Args:
+            base_url: Base URL of the API
+            models: Models to rotate through
+            prompt_words: Words per prompt
+            poll_interval: Seconds between status checks of a task
+            task_timeout: Seconds after which a task that has not finished counts as
+                timed out
+        """
+        self.client = httpx.AsyncClient(base_url=base_url, timeout=60.0)
+        self.models = models
+        self.prompt = " ".join(["benchmark"] * prompt_words)
+        self.poll_interval = poll_interval
+        self.task_timeout = task_timeout
+        self.records: List[Dict[str, Any]] = []
+
+    async def run_task(self, index: int) -> None:
+        """Submit one task and wait until it finishes.
+
+        Args:
+            index: Sequence number of the task
+        """
+        submitted = time.time()
+        response = await self.client.post(
+            "/api/v1/tasks/",
+            json={
+                "template": "ollama-inference",
+                "parameters": {
+                    "model": self.models[index % len(self.models)],
+                    "prompt": self.prompt,
+                },
+            },
+        )
+        accepted = time.time()
+        if response.status_code >= 400:
+            self.records.append(
+                {
+                    "status": f"http_{response.status_code}",
+                    "submit_latency": accepted - submitted,
+                }
+            )
+            return
+
+        task = response.json()
+        while task["status"] not in TERMINAL_STATUSES:
+            if time.time() - submitted > self.task_timeout:
+                self.records.append(
+                    {"status": "timeout", "submit_latency": accepted - submitted}
+                )
+                return
+            await asyncio.sleep(self.poll_interval)
+            task = (await self.client.get(f"/api/v1/tasks/{task['id']}")).json()
+
+        # The worker records the completion time, so the latency does not depend
+        # on the poll interval
+        finished = (
+            _parse_timestamp(task["completed_at"])
+            if task.get("completed_at")
+            else time.time()
+        )
+        self.records.append(
+            {
+                "status": task["status"],
+                "submit_latency": accepted - submitted,
+                "latency": finished - submitted,
+            }
+        )
+
+    async def closed_loop(self, tasks: int, concurrency: int) -> None:
+        """Keep a fixed number of tasks in flight.
+
+        Args:
+            tasks: Number of tasks
+            concurrency: Tasks in flight at once
+        """
+        counter = iter(range(tasks))
+
+        async def client_loop() -> None:
+            for index in counter:
+                await self.run_task(index)
+
+        await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+
+    async def open_loop(self, tasks: int, rate: float) -> None:
+        """Submit tasks at a fixed rate regardless of how fast they finish.
+
+        Args:
+            tasks: Number of tasks
+            rate: Tasks submitted per second
+        """
+        pending = []
+        start = time.monotonic()
+        for index in range(tasks):
+            delay = start + index / rate - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            pending.append(asyncio.ensure_future(self.run_task(index)))
+        await asyncio.gather(*pending)
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print the change of the key metrics against a baseline result.
+
+    Args:
+        result: Result of this run
+        baseline: Earlier result
+    """
+    print(f"\nCompared to {baseline.get('version')} ({baseline.get('timestamp')}):")
+    for name, higher_is_better in COMPARED_METRICS.items():
+        current, previous = result, baseline
+        for part in name.split("."):
+            current = (current or {}).get(part)
+            previous = (previous or {}).get(part)
+        if not current or not previous:
+            continue
+        change = (current - previous) / previous * 100
+        regressed = (
+            -change > REGRESSION_TOLERANCE
+            if higher_is_better
+            else change > REGRESSION_TOLERANCE
+        )
+        print(
+            f"  {name:<20} {previous:>10.3f} -> {current:>10.3f} ({change:+.1f}%){'  REGRESSION' if regressed else ''}"
+        )
+
+
+def main() -> int:
+    """Run the load test."""
+    parser = argparse.ArgumentParser(
+        description="Load test the task pipeline against a stub Ollama server"
+    )
+    parser.add_argument(
+        "--tasks",
+        type=int,
+        default=200,
+        help="Number of tasks to submit (default: 200)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=16,
+        help="Tasks in flight in closed-loop mode (default: 16)",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Submit this many tasks per second (open loop)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=4, help="Worker threads (default: 4)"
+    )
+    parser.add_argument(
+        "--broker",
+        type=str,
+        default="memory://",
+        help="Broker URL (default: in-memory)",
+    )
+    parser.add_argument(
+        "--prompt-words", type=int, default=50, help="Words per prompt (default: 50)"
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.05,
+        help="Seconds between task status checks",
+    )
+    parser.add_argument(
+        "--task-timeout",
+        type=float,
+        default=300.0,
+        help="Seconds to wait for a task (default: 300)",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write results as JSON to this file"
+    )
+    parser.add_argument(
+        "--compare",
+        type=str,
+        default=None,
+        help="Compare against an earlier results file",
+    )
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    fake_config = config_from_arguments(args)
+    fake_ollama = create_app(fake_config)
+    ollama = serve_in_thread(fake_ollama)
+
+    # Settings are read at import time, so configure them before importing the app
+    os.environ["OLLAMA_API_BASE_URL"] = f"http://127.0.0.1:{server_port(ollama)}"
+    os.environ.setdefault("TEMPLATES_DIR", os.path.join(REPOSITORY, "templates"))
+    os.environ.setdefault("METRICS_WORKER_PORT", "0")
+    os.environ["BROKER_URL"] = args.broker
+
+    from celery.contrib.testing.worker import start_worker
+
+    from ai_task_orchestra import __version__
+    from ai_task_orchestra.main import app
+    from ai_task_orchestra.worker import celery_app
+
+    if args.broker.startswith("memory://"):
+        celery_app.conf.result_backend = "cache+memory://"
+
+    with start_worker(
+        celery_app, pool="threads", concurrency=args.workers, perform_ping_check=False
+    ):
+        api = serve_in_thread(app)
+        generator = LoadGenerator(
+            f"http://127.0.0.1:{server_port(api)}",
+            fake_config.models,
+            args.prompt_words,
+            args.poll_interval,
+            args.task_timeout,
+        )
+
+        started = time.monotonic()
+        if args.rate:
+            asyncio.run(generator.open_loop(args.tasks, args.rate))
+        else:
+            asyncio.run(generator.closed_loop(args.tasks, args.concurrency))
+        duration = time.monotonic() - started
+        api.should_exit = True
+
+    ollama.should_exit = True
+    records = generator.records
+    completed = [record for record in records if record["status"] == "completed"]
+    statuses: Dict[str, int] = {}
+    for record in records:
+        statuses[record["status"]] = statuses.get(record["status"], 0) + 1
+
+    result = {
+        "version": __version__,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "config": vars(args),
+        "duration": duration,
+        "tasks": len(records),
+        "statuses": statuses,
+        "throughput": len(completed) / duration if duration else None,
+        "latency": summarize([record["latency"] for record in completed]),
+        "submit_latency": summarize([record["submit_latency"] for record in records]),
+        "ollama": dict(fake_ollama.state.stats),
+    }
+
+    latency = result["latency"]
+    print(f"tasks: {result['tasks']}  statuses: {statuses}  duration: {duration:.2f}s")
+    print(f"throughput: {result['throughput']:.2f} tasks/s")
+    if completed:
+        print(
+            f"latency p50: {latency['p50']:.3f}s  p90: {latency['p90']:.3f}s  p99: {latency['p99']:.3f}s"
+        )
+    print(
+        f"model loads: {result['ollama']['loads']}  generations: {result['ollama']['generations']}"
+    )
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(result, json.load(f))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return 0 if len(completed) == len(records) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
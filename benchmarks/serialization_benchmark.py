@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Benchmark encode/decode cost of the Celery message serializers.
+
+Measures the serializers through kombu's registry, exactly as Celery calls them,
+using message bodies shaped like ``execute_task`` messages.
+
+Usage:
+    python benchmarks/serialization_benchmark.py [--iterations N]
+        [--output results.json]
+"""
+
+import argparse
+import json
+import sys
+import time
+import uuid
+from typing import Any, Dict, List
+
+from kombu.serialization import dumps, loads, prepare_accept_content
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.serialization import register_serializers
+
+
+def build_payloads() -> Dict[str, Any]:
+    """Build representative Celery message bodies.
+
+    Returns:
+        Message bodies by name
+    """
+    embed = {"callbacks": None, "errbacks": None, "chain": None, "chord": None}
+
+    def message(parameters: Dict[str, Any]) -> Any:
+        return ([str(uuid.uuid4()), "ollama-inference", parameters], {}, embed)
+
+    words = "The quick brown fox jumps over the lazy dog while the model thinks. "
+    return {
+        "small": message({"model": "llama3", "prompt": "Summarize this sentence."}),
+        "prompt_16k": message({"model": "llama3", "prompt": words * 240}),
+        "prompt_1m": message({"model": "llama3", "prompt": words * 15000}),
+        "files_10k": message(
+            {
+                "input_files": [
+                    f"/data/corpus/batch-{i // 100:03d}/document-{i:05d}.txt"
+                    for i in range(10000)
+                ],
+                "analysis_model": "llama3",
+                "output_format": "json",
+            }
+        ),
+    }
+
+
+def measure(
+    body: Any, serializer: str, accept: Any, iterations: int
+) -> Dict[str, float]:
+    """Measure one serializer on one message body.
+
+    Args:
+        body: Message body
+        serializer: Serializer name
+        accept: Accepted content types
+        iterations: Number of encode/decode round trips
+
+    Returns:
+        Encoded size and mean encode/decode time in microseconds
+    """
+    content_type, content_encoding, data = dumps(body, serializer=serializer)
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        dumps(body, serializer=serializer)
+    encode = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        loads(data, content_type, content_encoding, accept=accept)
+    decode = (time.perf_counter() - start) / iterations
+
+    return {
+        "bytes": len(data),
+        "encode_us": encode * 1e6,
+        "decode_us": decode * 1e6,
+    }
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark Celery message serializers")
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=200,
+        help="Round trips per measurement (default: 200)",
+    )
+    parser.add_argument(
+        "--output", type=str, default=None, help="Write results as JSON to this file"
+    )
+    args = parser.parse_args()
+
+    serializers = ["json"] + register_serializers()
+    accept = prepare_accept_content(settings.celery_accept_content)
+    payloads = build_payloads()
+
+    results: List[Dict[str, Any]] = []
+    print(
+        f"{'payload':<12} {'serializer':<12} {'bytes':>10} {'encode us':>11} {'decode us':>11}"
+    )
+    for payload_name, body in payloads.items():
+        for serializer in serializers:
+            # Fewer round trips for the megabyte payloads keeps the run short
+            iterations = (
+                max(args.iterations // 20, 5)
+                if payload_name == "prompt_1m"
+                else args.iterations
+            )
+            row = {
+                "payload": payload_name,
+                "serializer": serializer,
+                **measure(body, serializer, accept, iterations),
+            }
+            results.append(row)
+            print(
+                f"{payload_name:<12} {serializer:<12} {row['bytes']:>10} "
+                f"{row['encode_us']:>11.1f} {row['decode_us']:>11.1f}"
+            )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(
+                {
+                    "compression_threshold": settings.celery_compression_threshold,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
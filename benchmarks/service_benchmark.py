@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+"""Microbenchmarks for the per-request hot paths of the task and template services.
+
+Each case is timed like pytest-benchmark does: the call is repeated for at least
+``--min-time`` seconds (and ``--min-rounds`` rounds), and the min/median/mean of
+one call are reported. Cases that depend on data size run at several sizes so
+the scaling is visible:
+
+- ``load_templates`` with 10 and 1,000 template files
+- ``validate_parameters`` on a template with 200 parameters
+- ``create_task``, ``list_tasks`` and ``get_tasks_status`` with 10k, 100k and 1M
+  stored tasks
+
+Tasks are created with a dependency so they are not published, and their
+lifecycle events are not written, so no case reaches Redis; broker and Redis
+round trips are covered by ``load_test.py``. Logging is raised to WARNING, but
+arguments of log calls are still formatted and so are part of the measurement.
+
+Results can be saved and used as the baseline of a later run; the run fails if a
+case got slower than the baseline by more than the tolerance.
+
+Usage:
+    python benchmarks/service_benchmark.py [--sizes 10000,100000,1000000]
+        [--save results.json]
+    python benchmarks/service_benchmark.py --baseline results.json [--tolerance 20]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+import yaml
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("TEMPLATES_DIR", os.path.join(REPOSITORY, "templates"))
+os.environ.setdefault("TEMPLATES_RELOAD_INTERVAL", "3600")
+
+from ai_task_orchestra.api.v1.endpoints.tasks import get_tasks_status  # noqa: E402
+from ai_task_orchestra.services import task_service as task_service_module  # noqa: E402
+from ai_task_orchestra.services.task_service import TaskService  # noqa: E402
+from ai_task_orchestra.services.template_service import TemplateService  # noqa: E402
+
+STATUSES = ("queued", "completed", "completed", "completed", "failed", "cancelled")
+WIDE_PARAMETERS = 200
+
+
+def measure(
+    func: Callable[[], Any], min_time: float, min_rounds: int
+) -> Dict[str, float]:
+    """Time repeated calls of a function.
+
+    Args:
+        func: Function to call
+        min_time: Minimum total time in seconds
+        min_rounds: Minimum number of calls
+
+    Returns:
+        Statistics of the duration of one call in seconds
+    """
+    func()  # warm up
+    timings: List[float] = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < min_rounds or time.perf_counter() < deadline:
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "min": min(timings),
+        "median": statistics.median(timings),
+        "mean": statistics.fmean(timings),
+        "stddev": statistics.pstdev(timings),
+        "rounds": len(timings),
+    }
+
+
+def write_templates(directory: str, count: int, parameters: int = 5) -> None:
+    """Write inference-style template files.
+
+    Args:
+        directory: Directory to write to
+        count: Number of templates
+        parameters: Parameters per template
+    """
+    for index in range(count):
+        template = {
+            "name": f"benchmark-{index:05d}",
+            "description": "Benchmark template",
+            "parameters": [
+                {
+                    "name": f"param_{number}",
+                    "type": "string",
+                    "required": number % 2 == 0,
+                }
+                for number in range(parameters)
+            ],
+            "steps": [
+                {
+                    "type": "ollama_generate",
+                    "model": "{{param_0}}",
+                    "prompt": "{{param_1}}",
+                },
+                {"type": "store_result", "path": "results/{{param_0}}.txt"},
+            ],
+        }
+        with open(os.path.join(directory, f"benchmark-{index:05d}.yaml"), "w") as f:
+            yaml.safe_dump(template, f)
+
+
+def seed_tasks(service: TaskService, count: int) -> None:
+    """Grow the task store of a service to a number of tasks.
+
+    Args:
+        service: Task service
+        count: Number of stored tasks afterwards
+    """
+    parameters = {"model": "llama3.1:8b", "prompt": "Summarize the attached report."}
+    created = datetime(2025, 1, 1)
+    for index in range(len(service.tasks), count):
+        task_id = str(uuid.UUID(int=index))
+        service.tasks[task_id] = {
+            "id": task_id,
+            "status": STATUSES[index % len(STATUSES)],
+            "priority": index % 10 + 1,
+            "created_at": (created + timedelta(seconds=index)).isoformat() + "Z",
+            "template": "ollama-inference",
+            "parameters": parameters,
+            "depends_on": [],
+        }
+
+
+def run_benchmarks(
+    sizes: List[int], min_time: float, min_rounds: int
+) -> Dict[str, Dict[str, float]]:
+    """Run all cases.
+
+    Args:
+        sizes: Numbers of stored tasks to run the task cases at
+        min_time: Minimum time per case in seconds
+        min_rounds: Minimum rounds per case
+
+    Returns:
+        Statistics by case name
+    """
+    results: Dict[str, Dict[str, float]] = {}
+    loop = asyncio.new_event_loop()
+
+    def record(name: str, func: Callable[[], Any], rounds: int = min_rounds) -> None:
+        results[name] = measure(func, min_time, rounds)
+        print(
+            f"{name:<32} {results[name]['median'] * 1e3:>12.3f} {results[name]['min'] * 1e3:>12.3f} "
+            f"{results[name]['rounds']:>8}"
+        )
+
+    print(f"{'case':<32} {'median ms':>12} {'min ms':>12} {'rounds':>8}")
+    for count in (10, 1000):
+        with tempfile.TemporaryDirectory() as directory:
+            write_templates(directory, count)
+            service = TemplateService(templates_dir=directory)
+            record(f"load_templates[{count}]", service.load_templates, rounds=3)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_templates(directory, 1, parameters=WIDE_PARAMETERS)
+        service = TemplateService(templates_dir=directory)
+        parameters = {
+            f"param_{number}": f"value {number}" for number in range(WIDE_PARAMETERS)
+        }
+        record(
+            f"validate_parameters[{WIDE_PARAMETERS}]",
+            lambda: service.validate_parameters("benchmark-00000", parameters),
+        )
+
+    # The event stream write is the only Redis call left in create_task
+    task_service_module.publish_task_event = lambda *args, **kwargs: None
+    task_service = TaskService(template_service=TemplateService())
+    for size in sorted(sizes):
+        seed_tasks(task_service, size)
+        label = f"{size // 1000}k" if size < 1_000_000 else f"{size // 1_000_000}m"
+        dependency = next(iter(task_service.tasks))
+        parameters = {
+            "model": "llama3.1:8b",
+            "prompt": "Summarize the attached report.",
+        }
+        record(
+            f"create_task[{label}]",
+            lambda: loop.run_until_complete(
+                task_service.create_task(
+                    "ollama-inference", parameters, depends_on=[dependency]
+                )
+            ),
+        )
+        record(
+            f"list_tasks[{label}]",
+            lambda: loop.run_until_complete(task_service.list_tasks(limit=100)),
+        )
+        record(
+            f"get_tasks_status[{label}]",
+            lambda: loop.run_until_complete(
+                get_tasks_status(task_service=task_service)
+            ),
+        )
+
+    loop.close()
+    return results
+
+
+def check_regressions(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    """Find cases that got slower than the baseline.
+
+    Args:
+        results: Results of this run
+        baseline: Results of an earlier run
+        tolerance: Allowed slowdown of the median in percent
+
+    Returns:
+        Descriptions of the regressions
+    """
+    regressions = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        change = (stats["median"] - previous["median"]) / previous["median"] * 100
+        if change > tolerance:
+            regressions.append(
+                f"{name}: {previous['median'] * 1e3:.3f} ms -> {stats['median'] * 1e3:.3f} ms ({change:+.1f}%)"
+            )
+    return regressions
+
+
+def main() -> int:
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(
+        description="Benchmark task and template service hot paths"
+    )
+    parser.add_argument(
+        "--sizes",
+        type=str,
+        default="10000,100000,1000000",
+        help="Stored task counts (default: 10k, 100k, 1M)",
+    )
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.5,
+        help="Minimum seconds per case (default: 0.5)",
+    )
+    parser.add_argument(
+        "--min-rounds", type=int, default=5, help="Minimum rounds per case (default: 5)"
+    )
+    parser.add_argument(
+        "--save", type=str, default=None, help="Write results as JSON to this file"
+    )
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=None,
+        help="Fail on regressions against this results file",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=20.0,
+        help="Allowed slowdown against the baseline in percent (default: 20)",
+    )
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    results = run_benchmarks(sizes, args.min_time, args.min_rounds)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(
+                {"timestamp": datetime.utcnow().isoformat() + "Z", "results": results},
+                f,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = check_regressions(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0f}%:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions beyond {args.tolerance:.0f}% against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -18,6 +18,12 @@ def parse_args():
         default=1,
         help="Number of worker processes (default: 1)",
     )
+    parser.add_argument(
+        "--autoscale",
+        type=str,
+        default=None,
+        help="Scale worker processes with the queue between MAX,MIN (e.g. 8,1) instead of --concurrency",
+    )
     parser.add_argument(
         "--loglevel",
         type=str,
@@ -51,7 +57,9 @@ def main():
         f"--loglevel={args.loglevel}",
         f"--queues={args.queues}",
     ]
-    
+    if args.autoscale:
+        worker_args.append(f"--autoscale={args.autoscale}")
+
     celery_app.worker_main(argv=worker_args)
 
 
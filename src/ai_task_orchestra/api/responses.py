@@ -0,0 +1,88 @@
+"""Response helpers for AI Task Orchestra API endpoints."""
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response, status
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content to JSON bytes with the fastest available encoder.
+
+    Args:
+        content: JSON-compatible content
+
+    Returns:
+        Encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with orjson when available.
+
+    Returning it directly from an endpoint also skips FastAPI's
+    ``jsonable_encoder`` pass, so only use it for content that is already plain
+    JSON-compatible data.
+    """
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        """Render the content.
+
+        Args:
+            content: Content to render
+
+        Returns:
+            Encoded JSON
+        """
+        return dumps(content)
+
+
+def make_etag(body: bytes) -> str:
+    """Compute a strong ETag for a response body.
+
+    Args:
+        body: Response body
+
+    Returns:
+        Quoted ETag
+    """
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_response(request: Request, body: bytes, etag: str) -> Response:
+    """Build a JSON response for a pre-serialized body, honouring ``If-None-Match``.
+
+    Args:
+        request: Incoming request
+        body: Serialized JSON body
+        etag: ETag of the body
+
+    Returns:
+        304 response if the client already has this version, the body otherwise
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match uses weak comparison, so W/ prefixes are ignored
+        candidates = {_strip_weak(tag.strip()) for tag in if_none_match.split(",")}
+        if "*" in candidates or etag in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _strip_weak(tag: str) -> str:
+    """Remove the weak indicator from an entity tag."""
+    return tag[2:] if tag.startswith("W/") else tag
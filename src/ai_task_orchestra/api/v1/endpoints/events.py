@@ -0,0 +1,159 @@
+"""Task lifecycle events API endpoints."""
+
+import asyncio
+import json
+from typing import AsyncIterator, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from ai_task_orchestra.services.event_stream import (
+    EVENT_ID_PATTERN,
+    EVENT_TYPES,
+    EventFilter,
+    EventHub,
+    get_event_hub,
+)
+
+# Create router
+router = APIRouter()
+
+
+def _event_filter(
+    ids: Optional[str] = Query(None, description="Comma-separated task IDs to follow"),
+    template: Optional[str] = Query(
+        None, description="Only events of tasks of this template"
+    ),
+    tag: Optional[str] = Query(None, description="Only events of tasks with this tag"),
+    types: Optional[str] = Query(
+        None, description="Comma-separated event types, e.g. 'completed,failed'"
+    ),
+) -> EventFilter:
+    """Build the event filter from the query parameters."""
+    event_types = frozenset(value for value in (types or "").split(",") if value)
+    unknown = event_types.difference(EVENT_TYPES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown event types: {', '.join(sorted(unknown))}",
+        )
+    return EventFilter(
+        task_ids=frozenset(value for value in (ids or "").split(",") if value),
+        template=template,
+        tag=tag,
+        types=event_types,
+    )
+
+
+def _offset(after: Optional[str]) -> Optional[str]:
+    """Validate the event ID to resume after."""
+    if after is not None and not EVENT_ID_PATTERN.match(after):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid event ID '{after}'",
+        )
+    return after
+
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    event_filter: EventFilter = Depends(_event_filter),
+    after: Optional[str] = Query(
+        None, description="Event ID to resume after ('0' for all stored events)"
+    ),
+    last_event_id: Optional[str] = Header(None),
+    hub: EventHub = Depends(get_event_hub),
+) -> StreamingResponse:
+    """
+    Follow task lifecycle events as Server-Sent Events.
+
+    - **ids**: Comma-separated task IDs to follow
+    - **template**: Only events of tasks of this template
+    - **tag**: Only events of tasks with this tag
+    - **types**: Comma-separated event types (queued, running, step, completed, failed,
+      cancelled)
+    - **after**: Event ID to resume after; by default only new events are sent
+
+    Each event carries its ID, so a reconnecting client resumes where it left off
+    (browsers send it as ``Last-Event-ID``, which takes precedence over ``after``).
+    """
+    offset = _offset(last_event_id or after)
+
+    async def body() -> AsyncIterator[str]:
+        async for item in hub.events(event_filter, offset):
+            if await request.is_disconnected():
+                return
+            if item is None:
+                yield ": keepalive\n\n"
+                continue
+            event_id, event = item
+            yield f"id: {event_id}\nevent: {event['type']}\ndata: {json.dumps(event, separators=(',', ':'))}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        # Keep proxies from buffering the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _receive_until_disconnect(websocket: WebSocket) -> None:
+    """Read a WebSocket until the client disconnects."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
+
+@router.websocket("/")
+async def websocket_events(
+    websocket: WebSocket,
+    ids: Optional[str] = Query(None),
+    template: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    types: Optional[str] = Query(None),
+    after: Optional[str] = Query(None),
+) -> None:
+    """
+    Follow task lifecycle events over a WebSocket.
+
+    Takes the same query parameters as the Server-Sent Events feed and sends each
+    event as a JSON message with its ``id``. A client that disconnects is
+    unsubscribed within ``EVENT_STREAM_KEEPALIVE`` seconds.
+    """
+    try:
+        event_filter = _event_filter(ids, template, tag, types)
+        offset = _offset(after)
+    except HTTPException as e:
+        await websocket.close(code=1008, reason=str(e.detail))
+        return
+
+    await websocket.accept()
+    # Clients send nothing; reading the socket is how a disconnect is noticed
+    disconnected = asyncio.create_task(_receive_until_disconnect(websocket))
+    events = get_event_hub().events(event_filter, offset)
+    try:
+        async for item in events:
+            if disconnected.done():
+                return
+            if item is not None:
+                event_id, event = item
+                await websocket.send_json({"id": event_id, **event})
+    except WebSocketDisconnect:
+        return
+    finally:
+        disconnected.cancel()
+        await events.aclose()
+    # The client fell behind; it resumes from the last ID it received
+    await websocket.close(
+        code=1013, reason="Subscriber fell behind, resume from the last event ID"
+    )
@@ -0,0 +1,99 @@
+"""Results API endpoints."""
+
+import re
+from typing import Optional, Tuple
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from ai_task_orchestra.services.blob_store import (
+    BlobNotFoundError,
+    BlobStore,
+    get_blob_store,
+)
+
+# Create router
+router = APIRouter()
+
+_RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+# Spelled out because the constant was renamed between Starlette releases
+HTTP_416_RANGE_NOT_SATISFIABLE = 416
+
+
+def _parse_range(header: str, size: int) -> Tuple[int, int]:
+    """Parse a single-range ``Range`` header into a half-open interval.
+
+    Args:
+        header: Range header value
+        size: Size of the blob
+
+    Returns:
+        Start and stop offsets
+
+    Raises:
+        HTTPException: If the range is malformed or not satisfiable
+    """
+    match = _RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        raise HTTPException(
+            status_code=HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail=f"Unsupported range: {header}",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+
+    first, last = match.groups()
+    if first == "":
+        # Suffix range: the last N bytes
+        start, stop = max(size - int(last), 0), size
+    else:
+        start = int(first)
+        stop = size if last == "" else min(int(last) + 1, size)
+
+    if start >= stop:
+        raise HTTPException(
+            status_code=HTTP_416_RANGE_NOT_SATISFIABLE,
+            detail=f"Range not satisfiable: {header}",
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, stop
+
+
+@router.get("/{key}")
+async def get_result(
+    key: str,
+    range: Optional[str] = Header(None),
+    blob_store: BlobStore = Depends(get_blob_store),
+) -> StreamingResponse:
+    """
+    Download a stored result.
+
+    - **key**: Blob key from a result reference (e.g. `sha256:...`)
+
+    Supports single `Range: bytes=start-end` requests for fetching parts of large
+    outputs.
+    """
+    try:
+        size = blob_store.size(key)
+    except BlobNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Result '{key}' not found",
+        )
+
+    headers = {"Accept-Ranges": "bytes", "ETag": f'"{key}"'}
+    if range:
+        start, stop = _parse_range(range, size)
+        headers["Content-Range"] = f"bytes {start}-{stop - 1}/{size}"
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+    else:
+        start, stop = 0, size
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(stop - start)
+
+    return StreamingResponse(
+        blob_store.read_range(key, start, stop),
+        status_code=status_code,
+        media_type="application/octet-stream",
+        headers=headers,
+    )
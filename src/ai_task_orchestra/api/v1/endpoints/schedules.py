@@ -0,0 +1,148 @@
+"""Schedules API endpoints."""
+
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Query, status
+from pydantic import BaseModel, Field
+
+from ai_task_orchestra.services.schedule_service import (
+    ScheduleService,
+    get_schedule_service,
+)
+
+# Create router
+router = APIRouter()
+
+
+class ScheduleCreate(BaseModel):
+    """Schedule creation model."""
+
+    template: str = Field(..., description="Name of the task template to submit")
+    parameters: Dict = Field(..., description="Parameters for the task template")
+    priority: int = Field(
+        5, ge=1, le=10, description="Priority of the submitted tasks (1-10, default: 5)"
+    )
+    cron: Optional[str] = Field(
+        None, description="Cron expression in UTC, e.g. '0 3 * * *'"
+    )
+    interval: Optional[float] = Field(None, gt=0, description="Seconds between runs")
+    enabled: bool = Field(True, description="Whether the schedule submits tasks")
+    allow_overlap: bool = Field(
+        False,
+        description="Submit a task even if the previous one is still queued or running",
+    )
+
+
+class ScheduleUpdate(BaseModel):
+    """Schedule update model; unset fields are left unchanged."""
+
+    parameters: Optional[Dict] = Field(
+        None, description="Parameters for the task template"
+    )
+    priority: Optional[int] = Field(
+        None, ge=1, le=10, description="Priority of the submitted tasks (1-10)"
+    )
+    cron: Optional[str] = Field(
+        None, description="Cron expression in UTC; replaces the interval"
+    )
+    interval: Optional[float] = Field(
+        None, gt=0, description="Seconds between runs; replaces the cron expression"
+    )
+    enabled: Optional[bool] = Field(
+        None, description="Whether the schedule submits tasks"
+    )
+    allow_overlap: Optional[bool] = Field(
+        None,
+        description="Submit a task even if the previous one is still queued or running",
+    )
+
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_schedule(
+    schedule: ScheduleCreate,
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+) -> Dict:
+    """
+    Create a recurring submission of a template.
+
+    - **template**: Name of the task template to submit
+    - **parameters**: Parameters for the task template
+    - **priority**: Priority of the submitted tasks (1-10, default: 5)
+    - **cron**: Cron expression in UTC (either this or interval)
+    - **interval**: Seconds between runs (either this or cron)
+    - **enabled**: Whether the schedule submits tasks
+    - **allow_overlap**: Submit a task even if the previous one is still queued or
+      running
+    """
+    return await schedule_service.create_schedule(
+        template_name=schedule.template,
+        parameters=schedule.parameters,
+        priority=schedule.priority,
+        cron=schedule.cron,
+        interval=schedule.interval,
+        enabled=schedule.enabled,
+        allow_overlap=schedule.allow_overlap,
+    )
+
+
+@router.get("/")
+async def list_schedules(
+    template: Optional[str] = Query(None, description="Filter by template name"),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of schedules to return"
+    ),
+    offset: int = Query(0, ge=0, description="Pagination offset"),
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+) -> List[Dict]:
+    """
+    List schedules, oldest first.
+
+    - **template**: Filter by template name
+    - **limit**: Maximum number of schedules to return
+    - **offset**: Pagination offset
+    """
+    return await schedule_service.list_schedules(
+        template=template, limit=limit, offset=offset
+    )
+
+
+@router.get("/{schedule_id}")
+async def get_schedule(
+    schedule_id: str,
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+) -> Dict:
+    """
+    Get schedule details by ID.
+
+    - **schedule_id**: ID of the schedule to retrieve
+    """
+    return await schedule_service.get_schedule(schedule_id)
+
+
+@router.patch("/{schedule_id}")
+async def update_schedule(
+    schedule_id: str,
+    changes: ScheduleUpdate,
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+) -> Dict:
+    """
+    Change a schedule. A new cron expression or interval restarts its timing.
+
+    - **schedule_id**: ID of the schedule to update
+    """
+    return await schedule_service.update_schedule(
+        schedule_id, changes.model_dump(exclude_unset=True)
+    )
+
+
+@router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule(
+    schedule_id: str,
+    schedule_service: ScheduleService = Depends(get_schedule_service),
+) -> None:
+    """
+    Delete a schedule.
+
+    - **schedule_id**: ID of the schedule to delete
+    """
+    await schedule_service.delete_schedule(schedule_id)
@@ -0,0 +1,39 @@
+"""Statistics API endpoints."""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+
+from ai_task_orchestra.api.responses import FastJSONResponse
+from ai_task_orchestra.services.stats_service import StatsService, get_stats_service
+
+# Create router
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+@router.get("/models")
+def get_model_stats(
+    window: Optional[int] = Query(
+        None, ge=1, description="Window in seconds (default: all kept statistics)"
+    ),
+    stats_service: StatsService = Depends(get_stats_service),
+) -> Response:
+    """
+    Get rolling latency and throughput statistics per model and template.
+
+    The statistics are read from Redis, so the endpoint runs in the thread pool.
+
+    - **window**: Window in seconds (default: all kept statistics)
+    """
+    try:
+        stats = stats_service.get_model_stats(window)
+    except Exception as e:
+        logger.error(f"Error reading statistics: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Statistics are temporarily unavailable",
+        )
+    return FastJSONResponse({"stats": stats})
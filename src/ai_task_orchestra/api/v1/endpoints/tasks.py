@@ -1,12 +1,34 @@
 """Tasks API endpoints."""
 
 import logging
-from typing import Dict, List, Optional
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
+from ai_task_orchestra.api.responses import FastJSONResponse
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.metrics import ADMISSION_DECISIONS
+from ai_task_orchestra.services.admission import (
+    ACCEPTED,
+    DEFERRED,
+    OVERLOADED,
+    AdmissionController,
+    get_admission_controller,
+)
+from ai_task_orchestra.services.eta import EtaEstimator, get_eta_estimator
 from ai_task_orchestra.services.task_service import TaskService, get_task_service
 
 # Create router
@@ -18,14 +40,72 @@ class TaskCreate(BaseModel):
 
     template: str = Field(..., description="Name of the task template to use")
     parameters: Dict = Field(..., description="Parameters for the task template")
-    priority: int = Field(5, ge=1, le=10, description="Task priority (1-10, default: 5)")
-    depends_on: Optional[List[str]] = Field(None, description="List of task IDs this task depends on")
+    priority: int = Field(
+        5, ge=1, le=10, description="Task priority (1-10, default: 5)"
+    )
+    depends_on: Optional[List[str]] = Field(
+        None, description="List of task IDs this task depends on"
+    )
+    session_id: Optional[str] = Field(
+        None,
+        max_length=128,
+        description="Session whose generation context the task continues and updates",
+    )
+    reuse_context: bool = Field(
+        False,
+        description="Continue from the generation context of the dependencies (implied by session_id)",
+    )
+    allow_defer: bool = Field(
+        False,
+        description="Accept the task into the defer lane instead of refusing it while the queue is full",
+    )
+    deadline: Optional[datetime] = Field(
+        None,
+        description="Time the task must be finished by (ISO 8601; without a time zone, UTC)",
+    )
+    max_queue_wait: Optional[float] = Field(
+        None, gt=0, description="Seconds the task may wait to start before it is failed"
+    )
+    deduplicate: Optional[bool] = Field(
+        None,
+        description="Attach to a queued or running task with the same template and parameters "
+        "(default: TASK_DEDUPLICATE)",
+    )
+    tags: Optional[List[str]] = Field(
+        None, max_length=16, description="Labels to follow the task's events by"
+    )
+
+
+class TaskWait(BaseModel):
+    """Task wait model."""
+
+    ids: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=settings.task_wait_max_ids,
+        description="IDs of the tasks",
+    )
+    timeout: float = Field(
+        30.0,
+        ge=0,
+        le=settings.task_wait_max_timeout,
+        description="Seconds to wait at most (default: 30)",
+    )
+    return_when: Literal["all", "any"] = Field(
+        "all", description="Return once all tasks have finished, or once any has"
+    )
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
 async def create_task(
     task: TaskCreate,
+    request: Request,
+    response: Response,
+    x_api_key: Optional[str] = Header(None),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     task_service: TaskService = Depends(get_task_service),
+    admission: AdmissionController = Depends(get_admission_controller),
+    eta_estimator: EtaEstimator = Depends(get_eta_estimator),
 ) -> Dict:
     """
     Create a new task.
@@ -34,57 +114,177 @@ async def create_task(
     - **parameters**: Parameters for the task template
     - **priority**: Task priority (1-10, default: 5)
     - **depends_on**: List of task IDs this task depends on
+    - **session_id**: Session whose generation context the task continues and updates
+    - **reuse_context**: Continue from the generation context of the dependencies
+    - **allow_defer**: Accept the task into the defer lane while the queue is full (202)
+    - **deadline**: Time the task must be finished by; refused with 422 if it cannot be
+      met
+    - **max_queue_wait**: Seconds the task may wait to start
+    - **deduplicate**: Attach to a queued or running task with the same template and
+      parameters
+    - **tags**: Labels to follow the task's events by (see ``GET /events``)
+
+    A submission with an ``Idempotency-Key`` header already used by the same API key,
+    or a deduplicated one, returns the existing task with 200 instead of creating one.
+
+    Submissions are refused with 429 above the API key's rate limit and with 503
+    while the queue is full, both with a ``Retry-After`` header.
+
+    New tasks carry an ``eta`` estimate, as returned by ``GET /tasks/{task_id}/eta``.
     """
     # Add diagnostic logging
     logger = logging.getLogger(__name__)
     logger.info(f"Creating task with template: {task.template}")
-    logger.info(f"Task parameters: {task.parameters}")
+    logger.info(f"Task parameters: {list(task.parameters)}")
     logger.info(f"Task priority: {task.priority}")
     logger.info(f"Task dependencies: {task.depends_on}")
-    
+
+    # Idempotency keys are scoped to the API key
+    scoped_key = f"{x_api_key or ''}:{idempotency_key}" if idempotency_key else None
+    deduplicate = (
+        settings.task_deduplicate if task.deduplicate is None else task.deduplicate
+    )
+    # Results of tasks with dependencies or a session depend on other tasks
+    deduplicate = deduplicate and not task.depends_on and not task.session_id
+    existing = await task_service.find_duplicate(
+        task.template, task.parameters, scoped_key, deduplicate
+    )
+    if existing:
+        logger.info(f"Returning existing task {existing['id']}")
+        response.status_code = status.HTTP_200_OK
+        return existing
+
+    # The check reads the queue length and the rate limit from Redis
+    admitted = await run_in_threadpool(
+        admission.check,
+        api_key=x_api_key,
+        client=request.client.host if request.client else None,
+        allow_defer=task.allow_defer,
+    )
+    decision = admitted["decision"]
+    deferred = False
+    if (
+        decision == OVERLOADED
+        and task.allow_defer
+        and len(task_service.deferred) < settings.admission_defer_limit
+    ):
+        decision = DEFERRED
+        deferred = True
+    ADMISSION_DECISIONS.labels(decision=decision).inc()
+    if decision not in (ACCEPTED, DEFERRED):
+        logger.warning(f"Task submission refused: {decision}")
+        if decision == OVERLOADED:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Task queue is full",
+                headers={"Retry-After": str(admitted["retry_after"])},
+            )
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers={"Retry-After": str(admitted["retry_after"])},
+        )
+
     try:
         result = await task_service.create_task(
             template_name=task.template,
             parameters=task.parameters,
             priority=task.priority,
             depends_on=task.depends_on,
+            session_id=task.session_id,
+            reuse_context=task.reuse_context,
+            deferred=deferred,
+            idempotency_key=scoped_key,
+            deduplicate=deduplicate,
+            deadline=task.deadline,
+            max_queue_wait=task.max_queue_wait,
+            tags=task.tags,
         )
+        if result.get("deferred"):
+            response.status_code = status.HTTP_202_ACCEPTED
         logger.info(f"Task created successfully: {result}")
-        return result
+        try:
+            eta = eta_estimator.estimate(result, task_service)
+        except Exception as e:
+            logger.warning(
+                f"Could not estimate the completion of task {result['id']}: {e}"
+            )
+            eta = None
+        return dict(result, eta=eta)
     except Exception as e:
         logger.error(f"Error creating task: {str(e)}")
         logger.exception("Task creation failed")
         raise
 
 
+@router.post("/wait")
+async def wait_for_tasks(
+    wait: TaskWait,
+    task_service: TaskService = Depends(get_task_service),
+) -> Response:
+    """
+    Wait until tasks have finished (completed, failed or cancelled).
+
+    - **ids**: IDs of the tasks
+    - **timeout**: Seconds to wait at most
+    - **return_when**: Return once ``all`` tasks have finished, or once ``any`` has
+
+    Returns when the condition is met or the timeout expires, with ``done`` telling
+    which, the ``finished`` and ``pending`` task IDs, and the tasks.
+    """
+    result = await task_service.wait_for_tasks(
+        wait.ids, wait.timeout, wait_for_all=wait.return_when == "all"
+    )
+    return FastJSONResponse(result)
+
+
 @router.get("/")
 async def list_tasks(
     status: Optional[str] = Query(None, description="Filter by task status"),
     template: Optional[str] = Query(None, description="Filter by template name"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of tasks to return"),
+    ids: Optional[str] = Query(
+        None, description="Comma-separated IDs of the tasks to get"
+    ),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Maximum number of tasks to return"
+    ),
     offset: int = Query(0, ge=0, description="Pagination offset"),
     task_service: TaskService = Depends(get_task_service),
-) -> List[Dict]:
+) -> Response:
     """
     List tasks with optional filtering.
 
     - **status**: Filter by task status (queued, running, completed, failed, cancelled)
     - **template**: Filter by template name
+    - **ids**: Get these tasks, including archived ones, in the given order; unknown IDs
+      are left out
     - **limit**: Maximum number of tasks to return
     - **offset**: Pagination offset
     """
-    return await task_service.list_tasks(
+    if ids is not None:
+        tasks = await task_service.get_tasks(
+            [task_id for task_id in ids.split(",") if task_id]
+        )
+        if status:
+            tasks = [task for task in tasks if task["status"] == status]
+        if template:
+            tasks = [task for task in tasks if task["template"] == template]
+        return FastJSONResponse(tasks[offset : offset + limit])
+
+    tasks = await task_service.list_tasks(
         status=status,
         template=template,
         limit=limit,
         offset=offset,
     )
+    # Task records are plain JSON data, so they can skip jsonable_encoder
+    return FastJSONResponse(tasks)
 
 
 @router.get("/status", summary="Get current tasks with execution status")
 async def get_tasks_status(
     task_service: TaskService = Depends(get_task_service),
-) -> Dict[str, List[Dict]]:
+) -> Response:
     """
     Get current tasks grouped by execution status.
 
@@ -94,40 +294,68 @@ async def get_tasks_status(
     - completed: Tasks that have been successfully completed
     - failed: Tasks that have failed
     - cancelled: Tasks that have been cancelled
-    
+
     Each task includes its ID, template name, creation time, and other relevant details.
     """
     # Get all tasks
     all_tasks = await task_service.list_tasks(limit=1000)
-    
+
     # Group tasks by status
     tasks_by_status = {
         "queued": [],
         "running": [],
         "completed": [],
         "failed": [],
-        "cancelled": []
+        "cancelled": [],
     }
-    
+
     for task in all_tasks:
         status = task.get("status", "unknown")
         if status in tasks_by_status:
             tasks_by_status[status].append(task)
-    
-    return tasks_by_status
+
+    return FastJSONResponse(tasks_by_status)
 
 
 @router.get("/{task_id}")
 async def get_task(
     task_id: str,
     task_service: TaskService = Depends(get_task_service),
-) -> Dict:
+) -> Response:
     """
     Get task details by ID.
 
     - **task_id**: ID of the task to retrieve
     """
-    return await task_service.get_task(task_id)
+    return FastJSONResponse(await task_service.get_task(task_id))
+
+
+@router.get("/{task_id}/eta")
+async def get_task_eta(
+    task_id: str,
+    task_service: TaskService = Depends(get_task_service),
+    eta_estimator: EtaEstimator = Depends(get_eta_estimator),
+) -> Dict:
+    """
+    Estimate when a task will start and finish.
+
+    - **task_id**: ID of the task to estimate
+
+    The estimate is made from the task's position in the queue, the concurrency
+    of the workers that are up and the execution times of its template and model.
+    Clients should wait ``poll_after`` seconds before checking on the task again.
+    """
+    task = await task_service.get_task(task_id)
+    try:
+        eta = eta_estimator.estimate(task, task_service)
+    except Exception as e:
+        logger = logging.getLogger(__name__)
+        logger.error(f"Could not estimate the completion of task {task_id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Completion estimate is not available",
+        )
+    return {"task_id": task_id, "status": task["status"], **eta}
 
 
 @router.patch("/{task_id}/priority")
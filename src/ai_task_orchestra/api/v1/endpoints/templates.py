@@ -1,39 +1,88 @@
 """Templates API endpoints."""
 
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from ai_task_orchestra.services.template_service import Template, TemplateService, get_template_service
+from ai_task_orchestra.api.responses import dumps, etag_response, make_etag
+from ai_task_orchestra.services.template_service import (
+    Template,
+    TemplateService,
+    get_template_service,
+)
 
 # Create router
 router = APIRouter()
 
+# Serialized responses of the current registry version, keyed by template name
+# ("" for the list). Dashboards poll these endpoints, so each body is encoded
+# once per version instead of once per request.
+_response_cache: Dict[str, Tuple[bytes, str]] = {}
+_response_cache_version = ""
+
+
+def _cached_body(
+    template_service: TemplateService, key: str, build: Callable[[], Any]
+) -> Tuple[bytes, str]:
+    """Get a serialized response body and its ETag for the current registry version.
+
+    Args:
+        template_service: Template service
+        key: Cache key
+        build: Function building the response content
+
+    Returns:
+        Serialized body and ETag
+    """
+    global _response_cache_version
+    if _response_cache_version != template_service.version:
+        _response_cache.clear()
+        _response_cache_version = template_service.version
+
+    cached = _response_cache.get(key)
+    if cached is None:
+        body = dumps(build())
+        cached = (body, make_etag(body))
+        _response_cache[key] = cached
+    return cached
+
 
 @router.get("/")
 async def list_templates(
+    request: Request,
     template_service: TemplateService = Depends(get_template_service),
-) -> List[Dict]:
+) -> Response:
     """
     List all available task templates.
+
+    Responses carry an `ETag`; send it back in `If-None-Match` to get `304 Not Modified`
+    while the templates are unchanged.
     """
-    templates = template_service.get_templates()
-    return [template.model_dump() for template in templates]
+    body, etag = _cached_body(
+        template_service,
+        "",
+        lambda: [
+            template.model_dump() for template in template_service.get_templates()
+        ],
+    )
+    return etag_response(request, body, etag)
 
 
 @router.get("/{template_name}")
 async def get_template(
     template_name: str,
+    request: Request,
     template_service: TemplateService = Depends(get_template_service),
-) -> Dict:
+) -> Response:
     """
     Get template details by name.
 
     - **template_name**: Name of the template to retrieve
     """
     template = template_service.get_template(template_name)
-    return template.model_dump()
+    body, etag = _cached_body(template_service, template_name, template.model_dump)
+    return etag_response(request, body, etag)
 
 
 @router.post("/validate")
@@ -0,0 +1,83 @@
+"""Vector search API endpoints."""
+
+import logging
+from typing import TYPE_CHECKING, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, Field
+
+from ai_task_orchestra.api.responses import FastJSONResponse
+
+if TYPE_CHECKING:
+    from ai_task_orchestra.services.embedding_service import EmbeddingService
+
+# Create router
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+class SimilaritySearch(BaseModel):
+    """Similarity search request model."""
+
+    query: str = Field(..., description="Text to find similar texts for")
+    model: Optional[str] = Field(
+        None, description="Embedding model (default: OLLAMA_EMBED_MODEL)"
+    )
+    k: int = Field(5, ge=1, le=1000, description="Number of matches (default: 5)")
+    candidates: Optional[List[str]] = Field(
+        None,
+        description="Texts to choose from (default: every text embedded with the model)",
+    )
+    min_score: Optional[float] = Field(
+        None, ge=-1, le=1, description="Minimum cosine similarity of a match"
+    )
+
+
+def _embedding_service() -> "EmbeddingService":
+    """Get the embedding service, or fail if the vector store is unavailable."""
+    # Import here so the API does not load the Ollama client (and httpx) at startup
+    from ai_task_orchestra.services.embedding_service import get_embedding_service
+
+    try:
+        return get_embedding_service()
+    except RuntimeError as e:
+        logger.error(f"Vector store unavailable: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e)
+        )
+
+
+@router.post("/search")
+def search(
+    request: SimilaritySearch,
+    embedding_service: "EmbeddingService" = Depends(_embedding_service),
+) -> Response:
+    """
+    Find the texts most similar to a query.
+
+    Texts are embedded with Ollama unless their vector is already cached.
+
+    - **query**: Text to find similar texts for
+    - **model**: Embedding model
+    - **k**: Number of matches
+    - **candidates**: Texts to choose from; matches then include the index of the text
+    - **min_score**: Minimum cosine similarity of a match
+    """
+    import httpx
+
+    try:
+        result = embedding_service.search(
+            request.query,
+            model=request.model,
+            k=request.k,
+            candidates=request.candidates,
+            min_score=request.min_score,
+        )
+    except httpx.HTTPError as e:
+        logger.error(f"Error embedding search texts: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Embedding request to Ollama failed: {e}",
+        )
+    return FastJSONResponse(result)
@@ -2,7 +2,15 @@
 
 from fastapi import APIRouter
 
-from ai_task_orchestra.api.v1.endpoints import tasks, templates
+from ai_task_orchestra.api.v1.endpoints import (
+    events,
+    results,
+    schedules,
+    stats,
+    tasks,
+    templates,
+    vectors,
+)
 
 # Create API router
 api_router = APIRouter()
@@ -10,3 +18,8 @@ api_router = APIRouter()
 # Include endpoint routers
 api_router.include_router(tasks.router, prefix="/tasks", tags=["tasks"])
 api_router.include_router(templates.router, prefix="/templates", tags=["templates"])
+api_router.include_router(results.router, prefix="/results", tags=["results"])
+api_router.include_router(stats.router, prefix="/stats", tags=["stats"])
+api_router.include_router(vectors.router, prefix="/vectors", tags=["vectors"])
+api_router.include_router(schedules.router, prefix="/schedules", tags=["schedules"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
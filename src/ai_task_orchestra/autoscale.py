@@ -0,0 +1,208 @@
+"""Queue-driven autoscaling of worker pools for AI Task Orchestra.
+
+Workers started with ``--autoscale=MAX,MIN`` grow and shrink their pool between
+the two bounds. Celery's default autoscaler sizes the pool by the messages the
+worker has prefetched; :class:`QueueAutoscaler` sizes it by the whole queue:
+
+- The pool grows while the oldest queued task (of any priority step) has waited
+  longer than ``AUTOSCALE_TARGET_WAIT``, by the number of queued tasks that could
+  start now. Tasks of a model at its ``AUTOSCALE_MODEL_LIMITS`` limit, and model
+  tasks beyond ``AUTOSCALE_GPU_SLOTS``, could not start, so they do not count.
+- The pool shrinks to the tasks it is running once nothing runnable is queued.
+- Growing waits ``AUTOSCALE_SCALE_UP_COOLDOWN`` after the last growth, and
+  shrinking ``AUTOSCALE_SCALE_DOWN_COOLDOWN``, so the pool does not flap.
+
+Queue depth and running tasks are read from Redis and are shared by all workers,
+so run one autoscaled worker per host.
+"""
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from celery.worker import state
+from celery.worker.autoscale import Autoscaler
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.metrics import (
+    PRIORITY_STEPS,
+    get_queued_models,
+    get_running_models,
+    heartbeat_worker,
+    priority_list,
+)
+from ai_task_orchestra.redis_client import get_broker_redis
+
+logger = logging.getLogger(__name__)
+
+# Model recorded for tasks that do not use one
+NO_MODEL = "none"
+
+# Seconds the target pool size is reused; the autoscaler is also consulted on
+# every task message
+TARGET_CACHE_SECONDS = 1.0
+
+
+class QueueAutoscaler(Autoscaler):
+    """Autoscaler sizing the pool by queue wait and depth, within GPU limits."""
+
+    def __init__(
+        self,
+        pool: Any,
+        max_concurrency: int,
+        min_concurrency: int = 0,
+        worker: Any = None,
+        keepalive: Optional[float] = None,
+        mutex: Any = None,
+        interval: Optional[float] = None,
+    ):
+        """Initialize the autoscaler.
+
+        Args:
+            pool: Worker pool
+            max_concurrency: Largest pool size
+            min_concurrency: Smallest pool size
+            worker: Worker controller
+            keepalive: Unused; the cooldowns take its place
+            mutex: Lock around scaling
+            interval: Seconds between checks (default: ``AUTOSCALE_INTERVAL``)
+        """
+        super().__init__(
+            pool, max_concurrency, min_concurrency, worker=worker, mutex=mutex
+        )
+        self.interval = interval or settings.autoscale_interval
+        self._stopping = threading.Event()
+        self.target_wait = settings.autoscale_target_wait
+        self.scale_up_cooldown = settings.autoscale_scale_up_cooldown
+        self.scale_down_cooldown = settings.autoscale_scale_down_cooldown
+        self.model_limits = settings.autoscale_model_limits
+        self.gpu_slots = settings.autoscale_gpu_slots
+        self._target: Optional[int] = None
+        self._target_at = 0.0
+
+    def body(self) -> None:
+        """Check the pool size, then wait ``interval`` seconds (Celery waits 1s)."""
+        with self.mutex:
+            self.maybe_scale()
+        self._stopping.wait(self.interval)
+
+    def stop(self) -> None:
+        """Stop checking the pool size without waiting out the interval."""
+        self._stopping.set()
+        super().stop()
+
+    def runnable_tasks(self, queued: Dict[str, int], running: Dict[str, int]) -> int:
+        """Count the queued tasks that could start now.
+
+        Args:
+            queued: Queued tasks by model
+            running: Running tasks by model
+
+        Returns:
+            Queued tasks within the per-model limits, with model tasks also
+            within the free GPU slots
+        """
+        model_tasks = 0
+        other_tasks = 0
+        for model, count in queued.items():
+            if model in self.model_limits:
+                count = min(
+                    count, max(self.model_limits[model] - running.get(model, 0), 0)
+                )
+            if model == NO_MODEL:
+                other_tasks += count
+            else:
+                model_tasks += count
+        if self.gpu_slots:
+            in_use = sum(count for model, count in running.items() if model != NO_MODEL)
+            model_tasks = min(model_tasks, max(self.gpu_slots - in_use, 0))
+        return model_tasks + other_tasks
+
+    def oldest_wait(self) -> float:
+        """Get how long the oldest queued task has waited.
+
+        Returns:
+            Seconds since the oldest task in the broker lists, or prefetched by
+            this worker, was published
+        """
+        pipe = get_broker_redis().pipeline(transaction=False)
+        for step in PRIORITY_STEPS:
+            # Workers take messages from the tail of each list
+            pipe.lindex(priority_list(step), -1)
+
+        enqueued = []
+        for message in pipe.execute():
+            if message:
+                try:
+                    enqueued.append(
+                        json.loads(message).get("headers", {}).get("ato_enqueued_at")
+                    )
+                except (ValueError, AttributeError):
+                    continue
+        for request in list(state.reserved_requests):
+            if request not in state.active_requests:
+                enqueued.append(request.request_dict.get("ato_enqueued_at"))
+
+        enqueued = [float(value) for value in enqueued if value is not None]
+        return max(time.time() - min(enqueued), 0.0) if enqueued else 0.0
+
+    def target_concurrency(self) -> int:
+        """Get the pool size the queue calls for, before the configured bounds.
+
+        Returns:
+            Number of pool processes
+        """
+        busy = len(state.active_requests)
+        runnable = self.runnable_tasks(get_queued_models(), get_running_models())
+        if not runnable:
+            return busy
+        if self.oldest_wait() < self.target_wait:
+            # The queue is worked off in time: keep the pool as it is
+            return max(self.processes, busy)
+        return busy + runnable
+
+    @property
+    def qty(self) -> int:
+        """Pool size the autoscaler scales towards."""
+        now = time.monotonic()
+        if self._target is None or now - self._target_at >= TARGET_CACHE_SECONDS:
+            try:
+                self._target = self.target_concurrency()
+            except Exception as e:
+                logger.warning(
+                    f"Could not read the queue, sizing the pool by prefetched tasks: {e}"
+                )
+                self._target = len(state.reserved_requests)
+            self._target_at = now
+        return self._target
+
+    def scale_up(self, n: int) -> None:
+        """Grow the pool, unless it grew within the scale-up cooldown."""
+        if (
+            self._last_scale_up
+            and time.monotonic() - self._last_scale_up < self.scale_up_cooldown
+        ):
+            return
+        super().scale_up(n)
+        self._announce()
+
+    def scale_down(self, n: int) -> None:
+        """Shrink the pool, unless it grew within the scale-down cooldown."""
+        if (
+            self._last_scale_up
+            and time.monotonic() - self._last_scale_up < self.scale_down_cooldown
+        ):
+            return
+        self._shrink(n)
+        self._announce()
+
+    def _announce(self) -> None:
+        """Report the new pool size right away, for queue wait estimates."""
+        if self.worker is None:
+            return
+        try:
+            heartbeat_worker(self.worker.hostname, self.processes)
+        except Exception as e:
+            logger.warning(f"Could not report the pool size: {e}")
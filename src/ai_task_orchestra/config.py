@@ -21,12 +21,18 @@ class Settings(BaseSettings):
 
     # Redis Configuration
     redis_url: str = Field("redis://localhost:6379/0", env="REDIS_URL")
+    broker_url: Optional[str] = Field(None, env="BROKER_URL")
+    broker_pool_limit: int = Field(10, env="BROKER_POOL_LIMIT")
 
     # Ollama Configuration
-    ollama_api_base_url: str = Field("http://localhost:11434", env="OLLAMA_API_BASE_URL")
+    ollama_api_base_url: str = Field(
+        "http://localhost:11434", env="OLLAMA_API_BASE_URL"
+    )
     ollama_api_key: Optional[str] = Field(None, env="OLLAMA_API_KEY")
     ollama_timeout: int = Field(30, env="OLLAMA_TIMEOUT")
+    ollama_generate_timeout: float = Field(300.0, env="OLLAMA_GENERATE_TIMEOUT")
     ollama_default_model: str = Field("llama3", env="OLLAMA_DEFAULT_MODEL")
+    ollama_embed_model: str = Field("nomic-embed-text", env="OLLAMA_EMBED_MODEL")
 
     # Logging Configuration
     log_level: str = Field("INFO", env="LOG_LEVEL")
@@ -36,6 +42,128 @@ class Settings(BaseSettings):
 
     # Templates Configuration
     templates_dir: str = Field("templates", env="TEMPLATES_DIR")
+    templates_reload_interval: float = Field(5.0, env="TEMPLATES_RELOAD_INTERVAL")
+
+    # Script Execution Configuration
+    script_workdir: str = Field(".", env="SCRIPT_WORKDIR")
+    script_spool_dir: Optional[str] = Field(None, env="SCRIPT_SPOOL_DIR")
+    script_timeout: int = Field(600, env="SCRIPT_TIMEOUT")
+    script_cpu_limit: int = Field(300, env="SCRIPT_CPU_LIMIT")
+    script_memory_limit_mb: int = Field(1024, env="SCRIPT_MEMORY_LIMIT_MB")
+    script_output_limit_mb: int = Field(64, env="SCRIPT_OUTPUT_LIMIT_MB")
+    script_max_processes: int = Field(64, env="SCRIPT_MAX_PROCESSES")
+    script_cgroup_root: Optional[str] = Field(None, env="SCRIPT_CGROUP_ROOT")
+
+    # Result Store Configuration
+    result_store_dir: str = Field("results", env="RESULT_STORE_DIR")
+    result_inline_limit: int = Field(65536, env="RESULT_INLINE_LIMIT")
+    result_compression: str = Field("zstd", env="RESULT_COMPRESSION")
+    result_compression_level: int = Field(3, env="RESULT_COMPRESSION_LEVEL")
+    result_chunk_size: int = Field(1048576, env="RESULT_CHUNK_SIZE")
+    parameter_inline_limit: int = Field(16384, env="PARAMETER_INLINE_LIMIT")
+
+    # Celery Serialization Configuration
+    celery_serializer: str = Field("json", env="CELERY_SERIALIZER")
+    celery_accept_content: List[str] = Field(
+        ["json", "application/x-ato-orjson", "application/x-ato-msgpack"],
+        env="CELERY_ACCEPT_CONTENT",
+    )
+    celery_compression_threshold: int = Field(16384, env="CELERY_COMPRESSION_THRESHOLD")
+
+    # Worker Configuration
+    worker_preload: bool = Field(True, env="WORKER_PRELOAD")
+    worker_max_tasks_per_child: int = Field(100, env="WORKER_MAX_TASKS_PER_CHILD")
+    worker_max_memory_per_child: int = Field(0, env="WORKER_MAX_MEMORY_PER_CHILD")
+
+    # Autoscaling Configuration
+    autoscale_interval: float = Field(5.0, env="AUTOSCALE_INTERVAL")
+    autoscale_target_wait: float = Field(10.0, env="AUTOSCALE_TARGET_WAIT")
+    autoscale_scale_up_cooldown: float = Field(10.0, env="AUTOSCALE_SCALE_UP_COOLDOWN")
+    autoscale_scale_down_cooldown: float = Field(
+        120.0, env="AUTOSCALE_SCALE_DOWN_COOLDOWN"
+    )
+    autoscale_model_limits: Dict[str, int] = Field({}, env="AUTOSCALE_MODEL_LIMITS")
+    autoscale_gpu_slots: int = Field(0, env="AUTOSCALE_GPU_SLOTS")
+
+    # Metrics Configuration
+    metrics_worker_port: int = Field(9808, env="METRICS_WORKER_PORT")
+
+    # Telemetry and Statistics Configuration
+    task_state_ttl: int = Field(604800, env="TASK_STATE_TTL")
+    stats_window_seconds: int = Field(300, env="STATS_WINDOW_SECONDS")
+    stats_windows: int = Field(12, env="STATS_WINDOWS")
+    stats_relative_accuracy: float = Field(0.02, env="STATS_RELATIVE_ACCURACY")
+
+    # Tracing Configuration
+    tracing_exporter: str = Field("none", env="TRACING_EXPORTER")
+    tracing_otlp_endpoint: str = Field(
+        "http://localhost:4318/v1/traces", env="TRACING_OTLP_ENDPOINT"
+    )
+    tracing_file_path: str = Field("traces.jsonl", env="TRACING_FILE_PATH")
+    tracing_sample_ratio: float = Field(1.0, env="TRACING_SAMPLE_RATIO")
+
+    # Vector Store Configuration
+    vector_store_dir: str = Field("vectors", env="VECTOR_STORE_DIR")
+    embed_batch_size: int = Field(32, env="EMBED_BATCH_SIZE")
+
+    # Semantic Cache Configuration
+    semantic_cache_threshold: float = Field(0.95, env="SEMANTIC_CACHE_THRESHOLD")
+    semantic_cache_ttl: int = Field(86400, env="SEMANTIC_CACHE_TTL")
+    semantic_cache_max_entries: int = Field(10000, env="SEMANTIC_CACHE_MAX_ENTRIES")
+
+    # Context Reuse Configuration
+    context_ttl: int = Field(3600, env="CONTEXT_TTL")
+    context_max_entries: int = Field(10000, env="CONTEXT_MAX_ENTRIES")
+    context_max_tokens: int = Field(32768, env="CONTEXT_MAX_TOKENS")
+
+    # Prewarm Configuration
+    prewarm_interval: float = Field(2.0, env="PREWARM_INTERVAL")
+    prewarm_lookahead: int = Field(20, env="PREWARM_LOOKAHEAD")
+    prewarm_max_models: int = Field(2, env="PREWARM_MAX_MODELS")
+    prewarm_min_keep_alive: int = Field(300, env="PREWARM_MIN_KEEP_ALIVE")
+    prewarm_max_keep_alive: int = Field(3600, env="PREWARM_MAX_KEEP_ALIVE")
+    prewarm_default_task_seconds: float = Field(
+        60.0, env="PREWARM_DEFAULT_TASK_SECONDS"
+    )
+
+    # Admission Control Configuration
+    rate_limit_per_second: float = Field(10.0, env="RATE_LIMIT_PER_SECOND")
+    rate_limit_burst: int = Field(100, env="RATE_LIMIT_BURST")
+    admission_queue_high_water: int = Field(10000, env="ADMISSION_QUEUE_HIGH_WATER")
+    admission_queue_low_water: int = Field(8000, env="ADMISSION_QUEUE_LOW_WATER")
+    admission_retry_after: int = Field(30, env="ADMISSION_RETRY_AFTER")
+    admission_defer_limit: int = Field(10000, env="ADMISSION_DEFER_LIMIT")
+    admission_release_interval: float = Field(1.0, env="ADMISSION_RELEASE_INTERVAL")
+
+    # Deadline Scheduling Configuration
+    dispatch_window: int = Field(0, env="DISPATCH_WINDOW")
+    dispatch_interval: float = Field(0.5, env="DISPATCH_INTERVAL")
+    deadline_default_task_seconds: float = Field(
+        0.0, env="DEADLINE_DEFAULT_TASK_SECONDS"
+    )
+
+    # Deduplication Configuration
+    task_deduplicate: bool = Field(False, env="TASK_DEDUPLICATE")
+
+    # Task Retention Configuration
+    task_retention_age: int = Field(86400, env="TASK_RETENTION_AGE")
+    task_retention_interval: float = Field(300.0, env="TASK_RETENTION_INTERVAL")
+    task_archive_dir: str = Field("archive", env="TASK_ARCHIVE_DIR")
+    task_archive_compression_level: int = Field(9, env="TASK_ARCHIVE_COMPRESSION_LEVEL")
+
+    # Schedule Configuration
+    schedule_tick_interval: float = Field(1.0, env="SCHEDULE_TICK_INTERVAL")
+    schedule_batch_size: int = Field(100, env="SCHEDULE_BATCH_SIZE")
+    schedule_min_interval: float = Field(1.0, env="SCHEDULE_MIN_INTERVAL")
+
+    # Task Wait Configuration
+    task_wait_max_timeout: float = Field(300.0, env="TASK_WAIT_MAX_TIMEOUT")
+    task_wait_max_ids: int = Field(1000, env="TASK_WAIT_MAX_IDS")
+
+    # Event Stream Configuration
+    event_stream_max_length: int = Field(100000, env="EVENT_STREAM_MAX_LENGTH")
+    event_stream_keepalive: float = Field(15.0, env="EVENT_STREAM_KEEPALIVE")
+    event_subscriber_queue_size: int = Field(1000, env="EVENT_SUBSCRIBER_QUEUE_SIZE")
 
     # CORS Configuration
     cors_origins: List[str] = Field(["*"], env="CORS_ORIGINS")
@@ -54,17 +182,23 @@ class Settings(BaseSettings):
             Celery configuration dictionary
         """
         return {
-            "broker_url": self.redis_url,
+            "broker_url": self.broker_url or self.redis_url,
+            "broker_pool_limit": self.broker_pool_limit,
             "result_backend": self.redis_url,
-            "task_serializer": "json",
-            "accept_content": ["json"],
-            "result_serializer": "json",
+            "task_serializer": self.celery_serializer,
+            "accept_content": self.celery_accept_content,
+            "result_serializer": self.celery_serializer,
+            "result_accept_content": self.celery_accept_content,
             "timezone": "UTC",
             "enable_utc": True,
             "task_track_started": True,
             "task_time_limit": 3600,  # 1 hour
             "worker_prefetch_multiplier": 1,
-            "worker_max_tasks_per_child": 100,
+            # 0 disables either limit
+            "worker_max_tasks_per_child": self.worker_max_tasks_per_child or None,
+            "worker_max_memory_per_child": self.worker_max_memory_per_child or None,
+            # Only used by workers started with --autoscale
+            "worker_autoscaler": "ai_task_orchestra.autoscale:QueueAutoscaler",
         }
 
 
@@ -0,0 +1,198 @@
+"""Task dispatch for AI Task Orchestra.
+
+The API only publishes task messages and broadcasts revokes. It does both
+through kombu directly instead of through the worker's Celery app, so API
+processes do not import Celery, the worker module or the step engine. kombu is
+imported on first use, and messages are published from a pool of producers
+sharing a bounded pool of broker connections.
+
+Messages follow Celery's task message protocol (version 2), so workers cannot
+tell them apart from messages sent with ``send_task``.
+"""
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from functools import lru_cache
+from typing import Any, Dict, Optional, Sequence
+
+from ai_task_orchestra.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXECUTE_TASK = "ai_task_orchestra.execute_task"
+
+# Celery's default queue (and its direct exchange and routing key), and the
+# exchange its remote control commands are broadcast on
+DEFAULT_QUEUE = "celery"
+CONTROL_EXCHANGE = "celery"
+
+# Longest argsrepr/kwargsrepr header, as in Celery
+REPR_MAX_SIZE = 1024
+
+# Celery's default publish retry policy
+RETRY_POLICY = {
+    "max_retries": 3,
+    "interval_start": 0,
+    "interval_step": 0.2,
+    "interval_max": 0.2,
+}
+
+PERSISTENT_DELIVERY_MODE = 2
+
+
+def _short_repr(value: Any) -> str:
+    """Represent task arguments for monitoring tools, truncated like Celery does."""
+    text = repr(value)
+    return text if len(text) <= REPR_MAX_SIZE else text[: REPR_MAX_SIZE - 3] + "..."
+
+
+class TaskDispatcher:
+    """Publish task messages and control commands to the broker."""
+
+    def __init__(self, broker_url: str = None, pool_limit: int = None):
+        """Initialize the dispatcher. Nothing connects until the first message.
+
+        Args:
+            broker_url: Broker URL
+            pool_limit: Maximum number of broker connections
+        """
+        self.broker_url = broker_url or settings.broker_url or settings.redis_url
+        self.pool_limit = pool_limit or settings.broker_pool_limit
+        self.origin = f"{os.getpid()}@{socket.gethostname()}"
+        self._producers: Optional[Any] = None
+        self._queue: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    def _producer_pool(self) -> Any:
+        """Get the producer pool, creating it on first use."""
+        if self._producers is None:
+            with self._lock:
+                if self._producers is None:
+                    from kombu import Connection, Exchange, Queue
+                    from kombu.pools import ProducerPool
+
+                    from ai_task_orchestra.serialization import register_serializers
+
+                    register_serializers()
+                    connection = Connection(self.broker_url)
+                    self._queue = Queue(
+                        DEFAULT_QUEUE,
+                        Exchange(DEFAULT_QUEUE, type="direct"),
+                        DEFAULT_QUEUE,
+                    )
+                    self._producers = ProducerPool(
+                        connection.Pool(limit=self.pool_limit), limit=self.pool_limit
+                    )
+        return self._producers
+
+    def send_task(
+        self,
+        name: str,
+        args: Sequence[Any] = (),
+        kwargs: Dict[str, Any] = None,
+        task_id: str = None,
+        priority: int = None,
+        headers: Dict[str, Any] = None,
+    ) -> str:
+        """Publish a task message.
+
+        Args:
+            name: Registered name of the task
+            args: Positional arguments
+            kwargs: Keyword arguments
+            task_id: Task ID (default: a new UUID)
+            priority: Message priority
+            headers: Custom message headers
+
+        Returns:
+            Task ID
+        """
+        task_id = task_id or str(uuid.uuid4())
+        args = list(args)
+        kwargs = kwargs or {}
+        message_headers = {
+            "lang": "py",
+            "task": name,
+            "id": task_id,
+            "shadow": None,
+            "eta": None,
+            "expires": None,
+            "group": None,
+            "group_index": None,
+            "retries": 0,
+            "timelimit": [None, None],
+            "root_id": task_id,
+            "parent_id": None,
+            "argsrepr": _short_repr(args),
+            "kwargsrepr": _short_repr(kwargs),
+            "origin": self.origin,
+            "ignore_result": False,
+            "replaced_task_nesting": 0,
+            "stamped_headers": None,
+            "stamps": {},
+            **(headers or {}),
+        }
+        body = (
+            args,
+            kwargs,
+            {"callbacks": None, "errbacks": None, "chain": None, "chord": None},
+        )
+
+        producers = self._producer_pool()
+        with producers.acquire(block=True) as producer:
+            producer.publish(
+                body,
+                exchange="",
+                routing_key=DEFAULT_QUEUE,
+                serializer=settings.celery_serializer,
+                headers=message_headers,
+                declare=[self._queue],
+                delivery_mode=PERSISTENT_DELIVERY_MODE,
+                correlation_id=task_id,
+                reply_to="",
+                priority=priority,
+                retry=True,
+                retry_policy=RETRY_POLICY,
+            )
+        return task_id
+
+    def revoke(
+        self, task_id: str, terminate: bool = False, signal: str = "SIGTERM"
+    ) -> None:
+        """Broadcast a revoke command to all workers.
+
+        Args:
+            task_id: ID of the task
+            terminate: Also stop the task if it is running
+            signal: Signal sent to the process running the task when terminating
+        """
+        from kombu.pidbox import Mailbox
+
+        mailbox = Mailbox(
+            CONTROL_EXCHANGE, type="fanout", accept=["json"], serializer="json"
+        )
+        with self._producer_pool().connections.acquire(block=True) as connection:
+            mailbox(connection)._broadcast(
+                "revoke", {"task_id": task_id, "terminate": terminate, "signal": signal}
+            )
+
+    def close(self) -> None:
+        """Release the pooled broker connections."""
+        with self._lock:
+            if self._producers is not None:
+                self._producers.connections.force_close_all()
+                self._producers.force_close_all()
+                self._producers = None
+
+
+@lru_cache()
+def get_dispatcher() -> TaskDispatcher:
+    """Get the shared task dispatcher.
+
+    Returns:
+        Task dispatcher
+    """
+    return TaskDispatcher()
@@ -2,12 +2,15 @@
 
 import json
 import logging
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 
 import httpx
 from pydantic import BaseModel, Field
 
 from ai_task_orchestra.config import settings
+from ai_task_orchestra.metrics import observe_generation
+from ai_task_orchestra.tracing import SpanKind, record_phases, tracer
 
 logger = logging.getLogger(__name__)
 
@@ -35,10 +38,47 @@ class OllamaGenerateResponse(BaseModel):
     done: bool
     total_duration: Optional[int] = Field(None, alias="total_duration")
     load_duration: Optional[int] = Field(None, alias="load_duration")
+    prompt_eval_count: Optional[int] = Field(None, alias="prompt_eval_count")
     prompt_eval_duration: Optional[int] = Field(None, alias="prompt_eval_duration")
     eval_duration: Optional[int] = Field(None, alias="eval_duration")
     eval_count: Optional[int] = Field(None, alias="eval_count")
 
+    def telemetry(self) -> Dict[str, Any]:
+        """Get the timings of the generation.
+
+        Returns:
+            Durations in seconds, token counts and generation throughput
+        """
+        telemetry: Dict[str, Any] = {
+            "model": self.model,
+            "prompt_eval_count": self.prompt_eval_count,
+            "eval_count": self.eval_count,
+        }
+        for name in (
+            "total_duration",
+            "load_duration",
+            "prompt_eval_duration",
+            "eval_duration",
+        ):
+            value = getattr(self, name)
+            telemetry[name] = value / 1e9 if value is not None else None
+        telemetry["tokens_per_second"] = (
+            self.eval_count / (self.eval_duration / 1e9)
+            if self.eval_count and self.eval_duration
+            else None
+        )
+        return telemetry
+
+
+class OllamaEmbedResponse(BaseModel):
+    """Response model for Ollama embed API."""
+
+    model: str
+    embeddings: List[List[float]]
+    total_duration: Optional[int] = None
+    load_duration: Optional[int] = None
+    prompt_eval_count: Optional[int] = None
+
 
 class OllamaModelInfo(BaseModel):
     """Model information from Ollama API."""
@@ -53,32 +93,71 @@ class OllamaModelInfo(BaseModel):
 class OllamaClient:
     """Client for interacting with the Ollama API."""
 
-    def __init__(self, base_url: str = None, api_key: str = None, timeout: int = None):
+    def __init__(
+        self,
+        base_url: str = None,
+        api_key: str = None,
+        timeout: int = None,
+        generate_timeout: float = None,
+    ):
         """Initialize the Ollama client.
 
         Args:
             base_url: Base URL for the Ollama API
             api_key: API key for authentication
             timeout: Timeout for API requests in seconds
+            generate_timeout: Read timeout of generation and model load requests
+                in seconds, which include loading the model
         """
         self.base_url = base_url or settings.ollama_api_base_url
         self.api_key = api_key or settings.ollama_api_key
         self.timeout = timeout or settings.ollama_timeout
-        
+        self.generate_timeout = httpx.Timeout(
+            float(self.timeout),
+            read=float(generate_timeout or settings.ollama_generate_timeout),
+        )
+
         # Create HTTP client with headers if API key is provided
         headers = {}
         if self.api_key:
             headers["Authorization"] = f"Bearer {self.api_key}"
-            
+
         self.client = httpx.AsyncClient(
-            base_url=self.base_url,
-            timeout=float(self.timeout),
-            headers=headers
+            base_url=self.base_url, timeout=float(self.timeout), headers=headers
+        )
+        # Workers run steps synchronously; this client keeps its own connection pool
+        self.sync_client = httpx.Client(
+            base_url=self.base_url, timeout=float(self.timeout), headers=headers
         )
 
     async def close(self) -> None:
-        """Close the HTTP client."""
+        """Close the HTTP clients."""
         await self.client.aclose()
+        self.sync_client.close()
+
+    def _span(self, operation: str, model: Optional[str] = None) -> Any:
+        """Start a client span around a call to the Ollama API."""
+        attributes = {"server.address": self.base_url}
+        if model:
+            attributes["ato.model"] = model
+        return tracer.start_as_current_span(
+            f"ollama {operation}", kind=SpanKind.CLIENT, attributes=attributes
+        )
+
+    def _prepare_generate(
+        self, request: Union[OllamaGenerateRequest, Dict[str, Any]]
+    ) -> OllamaGenerateRequest:
+        """Validate a generate request and fill in the default model."""
+        if isinstance(request, dict):
+            request = OllamaGenerateRequest(**request)
+
+        # Use default model if not specified
+        if not request.model:
+            request.model = settings.ollama_default_model
+            logger.info(f"No model specified, using default model: {request.model}")
+
+        logger.info(f"Generating response with model: {request.model}")
+        return request
 
     async def generate(
         self, request: Union[OllamaGenerateRequest, Dict[str, Any]]
@@ -91,18 +170,84 @@ class OllamaClient:
         Returns:
             Generate response
         """
-        if isinstance(request, dict):
-            request = OllamaGenerateRequest(**request)
-            
-        # Use default model if not specified
-        if not request.model:
-            request.model = settings.ollama_default_model
-            logger.info(f"No model specified, using default model: {request.model}")
+        request = self._prepare_generate(request)
+        with self._span("generate", request.model) as span:
+            response = await self.client.post(
+                "/api/generate",
+                json=request.model_dump(exclude_none=True),
+                timeout=self.generate_timeout,
+            )
+            response.raise_for_status()
+            result = OllamaGenerateResponse(**response.json())
+            _record_generation(span, result)
+        observe_generation(result)
+        return result
+
+    def generate_sync(
+        self, request: Union[OllamaGenerateRequest, Dict[str, Any]]
+    ) -> OllamaGenerateResponse:
+        """Generate a response from Ollama, blocking until it is complete.
 
-        logger.info(f"Generating response with model: {request.model}")
-        response = await self.client.post("/api/generate", json=request.model_dump(exclude_none=True))
-        response.raise_for_status()
-        return OllamaGenerateResponse(**response.json())
+        Args:
+            request: Generate request parameters
+
+        Returns:
+            Generate response
+        """
+        request = self._prepare_generate(request)
+        with self._span("generate", request.model) as span:
+            response = self.sync_client.post(
+                "/api/generate",
+                json=request.model_dump(exclude_none=True),
+                timeout=self.generate_timeout,
+            )
+            response.raise_for_status()
+            result = OllamaGenerateResponse(**response.json())
+            _record_generation(span, result)
+        observe_generation(result)
+        return result
+
+    async def embed(
+        self, inputs: List[str], model_name: Optional[str] = None
+    ) -> OllamaEmbedResponse:
+        """Embed a batch of texts.
+
+        Args:
+            inputs: Texts to embed
+            model_name: Embedding model. If None, uses the default embedding model.
+
+        Returns:
+            Embed response with one vector per input, in order
+        """
+        model_name = model_name or settings.ollama_embed_model
+        with self._span("embed", model_name) as span:
+            span.set_attribute("ollama.input_count", len(inputs))
+            response = await self.client.post(
+                "/api/embed", json={"model": model_name, "input": inputs}
+            )
+            response.raise_for_status()
+        return OllamaEmbedResponse(**response.json())
+
+    def embed_sync(
+        self, inputs: List[str], model_name: Optional[str] = None
+    ) -> OllamaEmbedResponse:
+        """Embed a batch of texts, blocking until the vectors are returned.
+
+        Args:
+            inputs: Texts to embed
+            model_name: Embedding model. If None, uses the default embedding model.
+
+        Returns:
+            Embed response with one vector per input, in order
+        """
+        model_name = model_name or settings.ollama_embed_model
+        with self._span("embed", model_name) as span:
+            span.set_attribute("ollama.input_count", len(inputs))
+            response = self.sync_client.post(
+                "/api/embed", json={"model": model_name, "input": inputs}
+            )
+            response.raise_for_status()
+        return OllamaEmbedResponse(**response.json())
 
     async def list_models(self) -> List[OllamaModelInfo]:
         """List available models.
@@ -111,12 +256,15 @@ class OllamaClient:
             List of available models
         """
         logger.info("Listing available models")
-        response = await self.client.get("/api/tags")
-        response.raise_for_status()
+        with self._span("list_models"):
+            response = await self.client.get("/api/tags")
+            response.raise_for_status()
         data = response.json()
         return [OllamaModelInfo(**model) for model in data.get("models", [])]
 
-    async def get_model(self, model_name: Optional[str] = None) -> Optional[OllamaModelInfo]:
+    async def get_model(
+        self, model_name: Optional[str] = None
+    ) -> Optional[OllamaModelInfo]:
         """Get information about a specific model.
 
         Args:
@@ -129,7 +277,7 @@ class OllamaClient:
         if not model_name:
             model_name = settings.ollama_default_model
             logger.info(f"No model specified, using default model: {model_name}")
-            
+
         logger.info(f"Getting information for model: {model_name}")
         models = await self.list_models()
         for model in models:
@@ -150,12 +298,56 @@ class OllamaClient:
         if not model_name:
             model_name = settings.ollama_default_model
             logger.info(f"No model specified, using default model: {model_name}")
-            
+
         logger.info(f"Pulling model: {model_name}")
-        response = await self.client.post("/api/pull", json={"name": model_name})
-        response.raise_for_status()
+        with self._span("pull_model", model_name):
+            # Without stream=False Ollama reports progress as a stream of JSON lines
+            response = await self.client.post(
+                "/api/pull", json={"name": model_name, "stream": False}
+            )
+            response.raise_for_status()
         return response.json()
 
+    async def list_running_models(self) -> List[str]:
+        """List the models currently loaded into memory.
+
+        Returns:
+            Names of the loaded models
+        """
+        with self._span("list_running_models"):
+            response = await self.client.get("/api/ps")
+            response.raise_for_status()
+        return [model["name"] for model in response.json().get("models", [])]
+
+    async def load_model(
+        self, model_name: str, keep_alive: Union[int, str, None] = None
+    ) -> None:
+        """Load a model into memory without generating anything.
+
+        Loading a model that is already loaded only updates how long it stays loaded.
+
+        Args:
+            model_name: Name of the model
+            keep_alive: Seconds (or an Ollama duration such as "10m") to keep the
+                model loaded after its last request; 0 unloads it
+        """
+        request: Dict[str, Any] = {"model": model_name}
+        if keep_alive is not None:
+            request["keep_alive"] = keep_alive
+        with self._span("load_model", model_name):
+            response = await self.client.post(
+                "/api/generate", json=request, timeout=self.generate_timeout
+            )
+            response.raise_for_status()
+
+    async def unload_model(self, model_name: str) -> None:
+        """Unload a model from memory once its running requests finish.
+
+        Args:
+            model_name: Name of the model
+        """
+        await self.load_model(model_name, keep_alive=0)
+
     async def check_model_loaded(self, model_name: Optional[str] = None) -> bool:
         """Check if a model is loaded.
 
@@ -169,15 +361,20 @@ class OllamaClient:
         if not model_name:
             model_name = settings.ollama_default_model
             logger.info(f"No model specified, using default model: {model_name}")
-            
+
         model = await self.get_model(model_name)
         return model is not None
 
-    async def ensure_model_loaded(self, model_name: Optional[str] = None) -> bool:
+    async def ensure_model_loaded(
+        self, model_name: Optional[str] = None, keep_alive: Union[int, str, None] = None
+    ) -> bool:
         """Ensure a model is loaded, pulling it if necessary.
 
         Args:
-            model_name: Name of the model to ensure is loaded. If None, uses default model.
+            model_name: Name of the model to ensure is loaded. If None, uses default
+                model.
+            keep_alive: If set, also load the model into memory and keep it there
+                for this long (see :meth:`load_model`)
 
         Returns:
             True if the model is loaded, False otherwise
@@ -186,15 +383,53 @@ class OllamaClient:
         if not model_name:
             model_name = settings.ollama_default_model
             logger.info(f"No model specified, using default model: {model_name}")
-            
+
         if await self.check_model_loaded(model_name):
             logger.info(f"Model {model_name} is already loaded")
-            return True
-
-        logger.info(f"Model {model_name} is not loaded, pulling...")
-        try:
-            await self.pull_model(model_name)
-            return await self.check_model_loaded(model_name)
-        except Exception as e:
-            logger.error(f"Error pulling model {model_name}: {e}")
-            return False
+        else:
+            logger.info(f"Model {model_name} is not loaded, pulling...")
+            try:
+                await self.pull_model(model_name)
+                if not await self.check_model_loaded(model_name):
+                    return False
+            except Exception as e:
+                logger.error(f"Error pulling model {model_name}: {e}")
+                return False
+
+        if keep_alive is not None:
+            try:
+                await self.load_model(model_name, keep_alive=keep_alive)
+            except Exception as e:
+                logger.error(f"Error loading model {model_name} into memory: {e}")
+                return False
+        return True
+
+
+def _record_generation(span: Any, response: OllamaGenerateResponse) -> None:
+    """Add the timings Ollama reported for a generation to its span.
+
+    The model load, prompt evaluation and generation become child spans, so a
+    trace shows whether a slow call waited for the model or generated slowly.
+    """
+    telemetry = response.telemetry()
+    for name, value in telemetry.items():
+        if value is not None and name != "model":
+            span.set_attribute(f"ollama.{name}", value)
+    record_phases(
+        span,
+        [
+            ("ollama load", telemetry["load_duration"]),
+            ("ollama prompt_eval", telemetry["prompt_eval_duration"]),
+            ("ollama eval", telemetry["eval_duration"]),
+        ],
+    )
+
+
+@lru_cache()
+def get_ollama_client() -> OllamaClient:
+    """Get the Ollama client shared by this process.
+
+    Returns:
+        Ollama client
+    """
+    return OllamaClient()
@@ -1,14 +1,22 @@
 """Main application module for AI Task Orchestra."""
 
+import asyncio
 import logging
-from typing import Dict
+from typing import Dict, List
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
 
 from ai_task_orchestra import __version__
 from ai_task_orchestra.config import settings
+from ai_task_orchestra.metrics import render_metrics
+from ai_task_orchestra.tracing import (
+    FASTAPI_TRACES_REQUESTS,
+    setup_tracing,
+    shutdown_tracing,
+    tracing_middleware,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -33,6 +41,51 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Trace requests only when an exporter is configured
+if setup_tracing("ai-task-orchestra-api"):
+    if not FASTAPI_TRACES_REQUESTS:
+        app.middleware("http")(tracing_middleware)
+    app.router.on_shutdown.append(shutdown_tracing)
+
+# Loops that maintain the API's task records
+_background_tasks: List[asyncio.Task] = []
+
+
+async def start_background_tasks() -> None:
+    """Start the loops that maintain the task records.
+
+    They publish deferred, held and dependent tasks, fire schedules and archive
+    finished tasks.
+    """
+    from ai_task_orchestra.services.admission import get_admission_controller
+    from ai_task_orchestra.services.schedule_service import get_schedule_service
+    from ai_task_orchestra.services.task_archive import run_retention
+    from ai_task_orchestra.services.task_service import get_task_service
+    from ai_task_orchestra.services.template_service import get_template_service
+
+    task_service = get_task_service(get_template_service())
+    _background_tasks.append(
+        asyncio.create_task(get_admission_controller().release_deferred(task_service))
+    )
+    _background_tasks.append(
+        asyncio.create_task(get_schedule_service().run(task_service))
+    )
+    _background_tasks.append(asyncio.create_task(task_service.run_dependency_release()))
+    if settings.dispatch_window > 0:
+        _background_tasks.append(asyncio.create_task(task_service.run_dispatcher()))
+    if settings.task_retention_age > 0:
+        _background_tasks.append(asyncio.create_task(run_retention(task_service)))
+
+
+async def stop_background_tasks() -> None:
+    """Stop the background loops."""
+    while _background_tasks:
+        _background_tasks.pop().cancel()
+
+
+app.router.on_startup.append(start_background_tasks)
+app.router.on_shutdown.append(stop_background_tasks)
+
 
 # Custom OpenAPI schema
 def custom_openapi() -> Dict:
@@ -73,9 +126,17 @@ async def health_check() -> Dict:
     return {"status": "healthy"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Prometheus metrics endpoint."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
 # Import and include API routers
 # This is placed here to avoid circular imports
 from ai_task_orchestra.api.v1.router import api_router
+
 app.include_router(api_router, prefix="/api/v1")
 
 
@@ -0,0 +1,500 @@
+"""Prometheus metrics for AI Task Orchestra.
+
+The API exposes these at ``/metrics``; workers serve them from a small HTTP
+exporter started in the worker's main process. With more than one process per
+host (prefork workers, several uvicorn workers) set ``PROMETHEUS_MULTIPROC_DIR``
+so the per-process values are aggregated.
+"""
+
+import bisect
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_broker_redis, get_redis, redis_key
+
+logger = logging.getLogger(__name__)
+
+# Generations whose model load took longer than this count as a model load;
+# a high rate of loads means models are being swapped in and out.
+MODEL_LOAD_THRESHOLD = 0.5
+
+# Queue consumed by the workers, and kombu's naming of its Redis priority lists
+CELERY_QUEUE = "celery"
+PRIORITY_SEPARATOR = "\x06\x16"
+PRIORITY_STEPS = (0, 3, 6, 9)
+
+# Seconds between worker heartbeats; workers missing three are considered gone
+WORKER_HEARTBEAT_SECONDS = 30
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+WAIT_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600, 7200)
+DURATION_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+TOKENS_PER_SECOND_BUCKETS = (1, 2, 5, 10, 15, 20, 30, 40, 50, 75, 100, 150, 200, 300)
+
+TASKS_SUBMITTED = Counter(
+    "ato_tasks_submitted_total",
+    "Tasks submitted through the API",
+    ["template"],
+)
+DISPATCH_LATENCY = Histogram(
+    "ato_dispatch_seconds",
+    "Time to publish a task to the broker",
+    ["template"],
+    buckets=LATENCY_BUCKETS,
+)
+QUEUE_WAIT = Histogram(
+    "ato_queue_wait_seconds",
+    "Time between publishing a task and a worker starting it",
+    ["template", "model"],
+    buckets=WAIT_BUCKETS,
+)
+TASK_DURATION = Histogram(
+    "ato_task_duration_seconds",
+    "Task execution time on the worker",
+    ["template", "status"],
+    buckets=DURATION_BUCKETS,
+)
+STEP_DURATION = Histogram(
+    "ato_step_duration_seconds",
+    "Step execution time on the worker",
+    ["template", "step_type"],
+    buckets=DURATION_BUCKETS,
+)
+OLLAMA_TOKENS_PER_SECOND = Histogram(
+    "ato_ollama_tokens_per_second",
+    "Generation throughput reported by Ollama (eval_count / eval_duration)",
+    ["model"],
+    buckets=TOKENS_PER_SECOND_BUCKETS,
+)
+OLLAMA_LOAD_SECONDS = Histogram(
+    "ato_ollama_load_seconds",
+    "Model load time reported by Ollama (load_duration)",
+    ["model"],
+    buckets=LATENCY_BUCKETS + (30, 60, 120),
+)
+OLLAMA_GENERATED_TOKENS = Counter(
+    "ato_ollama_generated_tokens_total",
+    "Tokens generated by Ollama",
+    ["model"],
+)
+OLLAMA_MODEL_LOADS = Counter(
+    "ato_ollama_model_loads_total",
+    f"Generations that had to load the model first (load_duration > {MODEL_LOAD_THRESHOLD}s)",
+    ["model"],
+)
+ADMISSION_DECISIONS = Counter(
+    "ato_admission_decisions_total",
+    "Task submissions by admission decision (accepted, deferred, rate_limited, overloaded)",
+    ["decision"],
+)
+TASKS_SHED = Counter(
+    "ato_tasks_shed_total",
+    "Tasks failed without running because they could not meet their deadline or max_queue_wait",
+    ["template", "reason"],
+)
+SEMANTIC_CACHE_REQUESTS = Counter(
+    "ato_semantic_cache_requests_total",
+    "Semantic cache lookups by result (hit, miss or error)",
+    ["template", "model", "result"],
+)
+
+
+def observe_generation(response: Any) -> None:
+    """Record the timings of an Ollama generation.
+
+    Args:
+        response: Ollama generate response (``OllamaGenerateResponse``)
+    """
+    telemetry = response.telemetry()
+    model = telemetry["model"]
+    if telemetry["eval_count"]:
+        OLLAMA_GENERATED_TOKENS.labels(model=model).inc(telemetry["eval_count"])
+    if telemetry["tokens_per_second"] is not None:
+        OLLAMA_TOKENS_PER_SECOND.labels(model=model).observe(
+            telemetry["tokens_per_second"]
+        )
+    if telemetry["load_duration"] is not None:
+        OLLAMA_LOAD_SECONDS.labels(model=model).observe(telemetry["load_duration"])
+        if telemetry["load_duration"] > MODEL_LOAD_THRESHOLD:
+            OLLAMA_MODEL_LOADS.labels(model=model).inc()
+
+
+def _queue_depth_key() -> str:
+    """Redis hash holding queued task counts by priority and model."""
+    return redis_key("metrics", "queue_depth")
+
+
+def _published_key(step: int) -> str:
+    """Redis counter of the messages published to a priority step."""
+    return redis_key("dispatch", "published", step)
+
+
+def _dequeued_key(step: int) -> str:
+    """Redis value holding the sequence number of the last message taken from a step."""
+    return redis_key("dispatch", "dequeued", step)
+
+
+def next_dispatch_sequence(priority: int) -> Optional[int]:
+    """Number a message about to be published, in order within its priority step.
+
+    Args:
+        priority: Task priority
+
+    Returns:
+        Sequence number, or None if Redis could not be reached
+    """
+    try:
+        return get_redis().incr(_published_key(priority_step(priority)))
+    except Exception as e:
+        logger.warning(f"Could not number the message: {e}")
+        return None
+
+
+def track_enqueued(priority: int, model: str) -> None:
+    """Count a task published to the queue.
+
+    Args:
+        priority: Task priority
+        model: Model the task uses
+    """
+    try:
+        get_redis().hincrby(_queue_depth_key(), f"{priority}|{model}", 1)
+    except Exception as e:
+        logger.warning(f"Could not update queue depth metric: {e}")
+
+
+def track_dequeued(
+    priority: Optional[int], model: Optional[str], sequence: Optional[int] = None
+) -> None:
+    """Count a task leaving the queue (started or discarded by a worker).
+
+    Args:
+        priority: Task priority
+        model: Model the task uses
+        sequence: Sequence number from :func:`next_dispatch_sequence`
+    """
+    if priority is None or model is None:
+        return
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hincrby(_queue_depth_key(), f"{priority}|{model}", -1)
+        if sequence is not None:
+            pipe.set(_dequeued_key(priority_step(priority)), sequence)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not update queue depth metric: {e}")
+
+
+def get_dispatch_progress() -> Dict[int, Tuple[int, int]]:
+    """Get the queue length and dequeue progress of each priority step.
+
+    A message with sequence number ``n`` has about ``n - dequeued - 1``
+    messages of its step ahead of it.
+
+    Returns:
+        Messages waiting and sequence number of the last message taken, by priority step
+    """
+    pipe = get_broker_redis().pipeline(transaction=False)
+    for step in PRIORITY_STEPS:
+        pipe.llen(priority_list(step))
+    lengths = pipe.execute()
+    dequeued = get_redis().mget([_dequeued_key(step) for step in PRIORITY_STEPS])
+    return {
+        step: (int(length), int(sequence or 0))
+        for step, length, sequence in zip(PRIORITY_STEPS, lengths, dequeued)
+    }
+
+
+def _workers_key() -> str:
+    """Redis sorted set of worker hostnames by last heartbeat."""
+    return redis_key("workers")
+
+
+def _worker_concurrency_key() -> str:
+    """Redis hash of the pool size of each worker."""
+    return redis_key("workers", "concurrency")
+
+
+def heartbeat_worker(hostname: str, concurrency: int) -> None:
+    """Record that a worker is up, with its pool size.
+
+    Args:
+        hostname: Worker hostname
+        concurrency: Number of pool processes
+    """
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.zadd(_workers_key(), {hostname: time.time()})
+    pipe.hset(_worker_concurrency_key(), hostname, concurrency)
+    pipe.execute()
+
+
+def remove_worker(hostname: str) -> None:
+    """Forget a worker that is shutting down.
+
+    Args:
+        hostname: Worker hostname
+    """
+    pipe = get_redis().pipeline(transaction=False)
+    pipe.zrem(_workers_key(), hostname)
+    pipe.hdel(_worker_concurrency_key(), hostname)
+    pipe.execute()
+
+
+def get_worker_concurrency() -> int:
+    """Get the total pool size of the workers that are up.
+
+    Returns:
+        Number of tasks the workers can run at once
+    """
+    client = get_redis()
+    live = client.zrangebyscore(
+        _workers_key(), time.time() - 3 * WORKER_HEARTBEAT_SECONDS, "+inf"
+    )
+    if not live:
+        return 0
+    return sum(
+        int(value or 0) for value in client.hmget(_worker_concurrency_key(), live)
+    )
+
+
+def start_worker_heartbeat(hostname: str, concurrency: Callable[[], int]) -> None:
+    """Send worker heartbeats from a background thread.
+
+    Call this from the worker's main process.
+
+    Args:
+        hostname: Worker hostname
+        concurrency: Function returning the current number of pool processes
+    """
+
+    def beat() -> None:
+        while True:
+            try:
+                heartbeat_worker(hostname, concurrency())
+            except Exception as e:
+                logger.warning(f"Could not send worker heartbeat: {e}")
+            time.sleep(WORKER_HEARTBEAT_SECONDS)
+
+    threading.Thread(target=beat, name="ato-worker-heartbeat", daemon=True).start()
+
+
+def _running_key() -> str:
+    """Redis hash holding running task counts by model."""
+    return redis_key("metrics", "running")
+
+
+def _running_tasks_key() -> str:
+    """Redis hash holding the model of each running task."""
+    return redis_key("metrics", "running_tasks")
+
+
+def track_started(model: str, task_id: str) -> None:
+    """Count a task a worker started.
+
+    Args:
+        model: Model the task uses
+        task_id: ID of the task
+    """
+    try:
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.hset(_running_tasks_key(), task_id, model)
+        pipe.hincrby(_running_key(), model, 1)
+        pipe.execute()
+    except Exception as e:
+        logger.warning(f"Could not update running tasks metric: {e}")
+
+
+def track_finished(model: str, task_id: str) -> None:
+    """Count a task a worker finished.
+
+    A task is only counted once, however many times it is reported finished
+    (a terminated task can both return and be reported revoked).
+
+    Args:
+        model: Model the task uses
+        task_id: ID of the task
+    """
+    try:
+        client = get_redis()
+        if client.hdel(_running_tasks_key(), task_id):
+            client.hincrby(_running_key(), model, -1)
+    except Exception as e:
+        logger.warning(f"Could not update running tasks metric: {e}")
+
+
+def get_running_models() -> Dict[str, int]:
+    """Get the number of running tasks by model.
+
+    Returns:
+        Running task counts of the models that have running tasks
+    """
+    counts = get_redis().hgetall(_running_key())
+    return {model: int(count) for model, count in counts.items() if int(count) > 0}
+
+
+def get_queued_models() -> Dict[str, int]:
+    """Get the number of queued tasks by model.
+
+    Returns:
+        Queued task counts of the models that have queued tasks
+    """
+    counts: Dict[str, int] = {}
+    for field, count in get_redis().hgetall(_queue_depth_key()).items():
+        _, _, model = field.partition("|")
+        counts[model] = counts.get(model, 0) + int(count)
+    return {model: count for model, count in counts.items() if count > 0}
+
+
+def priority_step(priority: int) -> int:
+    """Get the broker priority step a task priority is published to.
+
+    Args:
+        priority: Task priority
+
+    Returns:
+        Priority step (one of ``PRIORITY_STEPS``); lower steps are consumed first
+    """
+    return PRIORITY_STEPS[max(bisect.bisect(PRIORITY_STEPS, priority) - 1, 0)]
+
+
+def priority_list(step: int) -> str:
+    """Name of the broker list holding the messages of one priority step.
+
+    Args:
+        step: Priority step (one of ``PRIORITY_STEPS``)
+
+    Returns:
+        Redis key of the list
+    """
+    return f"{CELERY_QUEUE}{PRIORITY_SEPARATOR}{step}" if step else CELERY_QUEUE
+
+
+def get_queue_length() -> int:
+    """Get the number of messages waiting in the broker queue.
+
+    Returns:
+        Total length of the priority lists
+    """
+    pipe = get_broker_redis().pipeline(transaction=False)
+    for step in PRIORITY_STEPS:
+        pipe.llen(priority_list(step))
+    return sum(pipe.execute())
+
+
+class QueueDepthCollector:
+    """Collect queue depth from Redis at scrape time.
+
+    ``ato_queue_length`` is the exact length of each broker priority list;
+    ``ato_queued_tasks`` breaks the queue down by task priority and model, and
+    ``ato_running_tasks`` counts running tasks by model, using counters
+    maintained at publish, pickup and completion time.
+    """
+
+    def describe(self) -> Iterator[GaugeMetricFamily]:
+        """Describe the metrics without querying Redis at registration time."""
+        return iter(())
+
+    def collect(self) -> Iterator[GaugeMetricFamily]:
+        """Collect the queue depth metrics."""
+        length = GaugeMetricFamily(
+            "ato_queue_length",
+            "Messages in the broker queue",
+            labels=["queue", "priority_band"],
+        )
+        queued = GaugeMetricFamily(
+            "ato_queued_tasks",
+            "Queued tasks by priority and model",
+            labels=["priority", "model"],
+        )
+        running = GaugeMetricFamily(
+            "ato_running_tasks", "Running tasks by model", labels=["model"]
+        )
+        try:
+            pipe = get_broker_redis().pipeline()
+            for step in PRIORITY_STEPS:
+                pipe.llen(priority_list(step))
+            lengths = pipe.execute()
+            pipe = get_redis().pipeline()
+            pipe.hgetall(_queue_depth_key())
+            pipe.hgetall(_running_key())
+            depths, running_counts = pipe.execute()
+        except Exception as e:
+            logger.warning(f"Could not collect queue depth: {e}")
+            return
+
+        for step, size in zip(PRIORITY_STEPS, lengths):
+            length.add_metric([CELERY_QUEUE, str(step)], size)
+        for field, count in depths.items():
+            priority, _, model = field.partition("|")
+            queued.add_metric([priority, model], max(int(count), 0))
+        for model, count in running_counts.items():
+            running.add_metric([model], max(int(count), 0))
+        yield length
+        yield queued
+        yield running
+
+
+def _multiprocess_registry() -> Optional[CollectorRegistry]:
+    """Build a registry aggregating all processes, if multiprocess mode is on."""
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return None
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+_api_registry: Optional[CollectorRegistry] = None
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Render the metrics of the API process.
+
+    Returns:
+        Exposition body and its content type
+    """
+    global _api_registry
+    if _api_registry is None:
+        _api_registry = _multiprocess_registry() or REGISTRY
+        _api_registry.register(QueueDepthCollector())
+    return generate_latest(_api_registry), CONTENT_TYPE_LATEST
+
+
+def start_worker_exporter(port: int = None) -> None:
+    """Serve the worker metrics over HTTP.
+
+    Call this from the worker's main process before the pool forks.
+
+    Args:
+        port: Port to listen on (default: METRICS_WORKER_PORT; 0 disables)
+    """
+    port = settings.metrics_worker_port if port is None else port
+    if not port:
+        return
+    start_http_server(port, registry=_multiprocess_registry() or REGISTRY)
+    logger.info(f"Serving worker metrics on port {port}")
+
+
+def mark_process_dead(pid: int) -> None:
+    """Drop the live gauges of an exited worker process in multiprocess mode.
+
+    Args:
+        pid: Process ID
+    """
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.mark_process_dead(pid)
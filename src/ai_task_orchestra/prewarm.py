@@ -0,0 +1,254 @@
+"""Model prewarmer for AI Task Orchestra.
+
+A task for a model that Ollama has not loaded waits for the model to load
+before it generates anything. The prewarmer watches the head of the task queue
+and loads the models the next tasks need while the current tasks are still
+running, so the load overlaps with them instead of delaying the next task.
+
+It also manages how long Ollama keeps each model loaded (``keep_alive``): models
+with more queued work are kept longer, and models that neither a running nor a
+queued task needs are unloaded when another model is waiting for memory.
+
+Run it as one process next to the workers::
+
+    python -m ai_task_orchestra.prewarm
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.integrations.ollama import OllamaClient, get_ollama_client
+from ai_task_orchestra.metrics import (
+    PRIORITY_STEPS,
+    get_queued_models,
+    get_running_models,
+    priority_list,
+)
+from ai_task_orchestra.redis_client import get_broker_redis
+from ai_task_orchestra.services.stats_service import get_stats_service
+
+logger = logging.getLogger(__name__)
+
+# Model recorded for tasks that do not use one
+NO_MODEL = "none"
+
+
+class ModelPrewarmer:
+    """Load the models of upcoming tasks ahead of time."""
+
+    def __init__(
+        self,
+        client: OllamaClient = None,
+        lookahead: int = None,
+        max_models: int = None,
+        min_keep_alive: int = None,
+        max_keep_alive: int = None,
+    ):
+        """Initialize the prewarmer.
+
+        Args:
+            client: Ollama client
+            lookahead: Queued messages inspected per tick
+            max_models: Models kept loaded at once
+            min_keep_alive: Shortest keep_alive in seconds set for a needed model
+            max_keep_alive: Longest keep_alive in seconds set for a needed model
+        """
+        self.client = client or get_ollama_client()
+        self.lookahead = lookahead or settings.prewarm_lookahead
+        self.max_models = max_models or settings.prewarm_max_models
+        self.min_keep_alive = min_keep_alive or settings.prewarm_min_keep_alive
+        self.max_keep_alive = max_keep_alive or settings.prewarm_max_keep_alive
+        # When keep_alive was last set per model; a model's own tasks reset it to
+        # Ollama's default, so it is set again after half the minimum
+        self._kept_alive: Dict[str, float] = {}
+
+    def upcoming_models(self) -> List[str]:
+        """Get the models of the next queued tasks, in the order workers will take them.
+
+        Workers take messages from the lowest priority step first, and from the
+        tail of each list.
+
+        Returns:
+            Distinct model names, next needed first
+        """
+        pipe = get_broker_redis().pipeline(transaction=False)
+        for step in PRIORITY_STEPS:
+            pipe.lrange(priority_list(step), -self.lookahead, -1)
+
+        models: List[str] = []
+        inspected = 0
+        for messages in pipe.execute():
+            for message in reversed(messages):
+                if inspected >= self.lookahead:
+                    return models
+                inspected += 1
+                model = self._message_model(message)
+                if model and model != NO_MODEL and model not in models:
+                    models.append(model)
+        return models
+
+    @staticmethod
+    def _message_model(message: str) -> Optional[str]:
+        """Read the model header of a queued message."""
+        try:
+            return json.loads(message).get("headers", {}).get("ato_model")
+        except (ValueError, AttributeError):
+            return None
+
+    def task_estimates(self) -> Dict[str, float]:
+        """Estimate the execution time of one task per model from the rolling stats.
+
+        Returns:
+            Median execution time in seconds by model (models without stats are missing)
+        """
+        totals: Dict[str, List[float]] = {}
+        for entry in get_stats_service().get_model_stats():
+            execution_time = entry.get("execution_time")
+            if not execution_time:
+                continue
+            total = totals.setdefault(entry["model"], [0.0, 0])
+            total[0] += execution_time["p50"] * execution_time["count"]
+            total[1] += execution_time["count"]
+        return {
+            model: seconds / count
+            for model, (seconds, count) in totals.items()
+            if count
+        }
+
+    def keep_alive(self, demand: int, task_seconds: float) -> int:
+        """Get the keep_alive of a model.
+
+        Args:
+            demand: Running and queued tasks of the model
+            task_seconds: Estimated execution time of one task
+
+        Returns:
+            keep_alive in seconds: the time the known work takes, within the
+            configured bounds
+        """
+        return int(
+            min(max(demand * task_seconds, self.min_keep_alive), self.max_keep_alive)
+        )
+
+    async def tick(self) -> Dict[str, Any]:
+        """Load the models upcoming tasks need and unload the ones nothing needs.
+
+        Returns:
+            Summary of the tick: target models, and the models loaded and unloaded
+        """
+        running = get_running_models()
+        running.pop(NO_MODEL, None)
+        queued = get_queued_models()
+        queued.pop(NO_MODEL, None)
+
+        # Models of running tasks stay loaded; the remaining room goes to the
+        # models the next tasks need
+        targets = list(running)
+        for model in self.upcoming_models():
+            if len(targets) >= self.max_models:
+                break
+            if model not in targets:
+                targets.append(model)
+
+        resident = await self.client.list_running_models()
+        summary: Dict[str, Any] = {"targets": targets, "loaded": [], "unloaded": []}
+
+        if targets:
+            # Free memory for the models that are needed before loading them
+            for model in resident:
+                if (
+                    model not in targets
+                    and model not in queued
+                    and model not in running
+                ):
+                    logger.info(
+                        f"Unloading model {model}: no running or queued task needs it"
+                    )
+                    try:
+                        await self.client.unload_model(model)
+                        self._kept_alive.pop(model, None)
+                        summary["unloaded"].append(model)
+                    except Exception as e:
+                        logger.warning(f"Could not unload model {model}: {e}")
+
+        now = time.monotonic()
+        estimates: Optional[Dict[str, float]] = None
+        for model in targets:
+            kept_alive = self._kept_alive.get(model)
+            if (
+                model in resident
+                and kept_alive is not None
+                and now - kept_alive < self.min_keep_alive / 2
+            ):
+                continue
+            if estimates is None:
+                try:
+                    estimates = self.task_estimates()
+                except Exception as e:
+                    logger.warning(f"Could not read task statistics: {e}")
+                    estimates = {}
+            keep_alive = self.keep_alive(
+                running.get(model, 0) + queued.get(model, 0),
+                estimates.get(model, settings.prewarm_default_task_seconds),
+            )
+            if model not in resident:
+                logger.info(f"Prewarming model {model} (keep_alive {keep_alive}s)")
+            if await self.client.ensure_model_loaded(model, keep_alive=keep_alive):
+                self._kept_alive[model] = now
+                if model not in resident:
+                    summary["loaded"].append(model)
+        return summary
+
+    async def run(self, interval: float = None) -> None:
+        """Run ticks until cancelled.
+
+        Args:
+            interval: Seconds between ticks
+        """
+        interval = interval or settings.prewarm_interval
+        logger.info(
+            f"Prewarming up to {self.max_models} model(s), looking {self.lookahead} tasks ahead every {interval}s"
+        )
+        while True:
+            started = time.monotonic()
+            try:
+                await self.tick()
+            except Exception as e:
+                logger.error(f"Prewarm tick failed: {e}")
+            await asyncio.sleep(max(interval - (time.monotonic() - started), 0.0))
+
+
+def main() -> None:
+    """Run the prewarmer."""
+    parser = argparse.ArgumentParser(
+        description="Load the models of upcoming tasks ahead of time"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=None, help="Seconds between ticks"
+    )
+    parser.add_argument(
+        "--loglevel",
+        type=str,
+        default=settings.log_level.lower(),
+        choices=["debug", "info", "warning", "error", "critical"],
+        help=f"Log level (default: {settings.log_level.lower()})",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=getattr(logging, args.loglevel.upper()),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    try:
+        asyncio.run(ModelPrewarmer().run(args.interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
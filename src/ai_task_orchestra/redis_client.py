@@ -0,0 +1,50 @@
+"""Shared Redis client for AI Task Orchestra."""
+
+from functools import lru_cache
+
+import redis
+
+from ai_task_orchestra.config import settings
+
+# Prefix of all keys owned by AI Task Orchestra (Celery uses its own keys)
+KEY_PREFIX = "ato"
+
+
+def redis_key(*parts: str) -> str:
+    """Build a namespaced Redis key.
+
+    Args:
+        parts: Key components
+
+    Returns:
+        Redis key
+    """
+    return ":".join((KEY_PREFIX,) + tuple(str(part) for part in parts))
+
+
+@lru_cache()
+def get_redis() -> redis.Redis:
+    """Get the Redis client shared by this process.
+
+    The client keeps a connection pool, so it should be reused rather than
+    created per call.
+
+    Returns:
+        Redis client
+    """
+    return redis.Redis.from_url(settings.redis_url, decode_responses=True)
+
+
+@lru_cache()
+def get_broker_redis() -> redis.Redis:
+    """Get the Redis client of the Celery broker.
+
+    The broker lists are read directly for queue depth and lookahead. Without a
+    separate ``BROKER_URL`` this is the shared client.
+
+    Returns:
+        Redis client
+    """
+    if not settings.broker_url or settings.broker_url == settings.redis_url:
+        return get_redis()
+    return redis.Redis.from_url(settings.broker_url, decode_responses=True)
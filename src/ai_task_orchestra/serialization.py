@@ -0,0 +1,190 @@
+"""Message serializers for AI Task Orchestra.
+
+Registers compact serializers with kombu so Celery messages and results can use
+orjson or msgpack instead of the standard library JSON encoder. Payloads above a
+size threshold are compressed; a one-byte frame marker records how each payload
+was encoded, so the threshold can change without breaking messages in flight.
+
+Rolling upgrades: deploy workers that accept the new content types first (the
+default ``CELERY_ACCEPT_CONTENT`` already does), then switch ``CELERY_SERIALIZER``.
+"""
+
+import base64
+import logging
+import zlib
+from typing import Any, Callable, List
+
+from kombu.serialization import registry
+
+from ai_task_orchestra.config import settings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zlib is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SERIALIZER_ORJSON = "ato-orjson"
+SERIALIZER_MSGPACK = "ato-msgpack"
+
+# Frame markers
+_FRAME_RAW = b"\x00"
+_FRAME_ZSTD = b"\x01"
+_FRAME_ZLIB = b"\x02"
+
+# Marks bytes values in orjson payloads
+_BYTES_TAG = b'"__type__":"bytes"'
+
+_registered: List[str] = []
+
+
+def compress_frame(data: bytes, threshold: int = None) -> bytes:
+    """Frame a payload, compressing it if it is larger than the threshold.
+
+    Args:
+        data: Encoded payload
+        threshold: Size in bytes above which the payload is compressed
+
+    Returns:
+        Framed payload
+    """
+    threshold = (
+        settings.celery_compression_threshold if threshold is None else threshold
+    )
+    if threshold <= 0 or len(data) <= threshold:
+        return _FRAME_RAW + data
+    if zstandard is not None:
+        return _FRAME_ZSTD + zstandard.ZstdCompressor(level=3).compress(data)
+    return _FRAME_ZLIB + zlib.compress(data, 6)
+
+
+def decompress_frame(data: bytes) -> bytes:
+    """Unwrap a payload framed by :func:`compress_frame`.
+
+    Args:
+        data: Framed payload
+
+    Returns:
+        Encoded payload
+
+    Raises:
+        ValueError: If the frame marker is unknown
+    """
+    data = bytes(data)
+    marker, payload = data[:1], data[1:]
+    if marker == _FRAME_RAW:
+        return payload
+    if marker == _FRAME_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is required to decode this message")
+        return zstandard.ZstdDecompressor().decompress(payload)
+    if marker == _FRAME_ZLIB:
+        return zlib.decompress(payload)
+    raise ValueError(f"Unknown message frame marker: {marker!r}")
+
+
+def _framed(encode: Callable[[Any], bytes], decode: Callable[[bytes], Any]) -> Any:
+    """Wrap an encoder/decoder pair with compression framing."""
+    return (
+        lambda obj: compress_frame(encode(obj)),
+        lambda data: decode(decompress_frame(data)),
+    )
+
+
+def _encode_default(obj: Any) -> Any:
+    """Encode types the fast encoders do not support natively."""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        # JSON has no binary type: tag base64 like kombu's JSON serializer does
+        return {"__type__": "bytes", "__value__": base64.b64encode(obj).decode("ascii")}
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _decode_bytes(obj: Any) -> Any:
+    """Restore the bytes values tagged by :func:`_encode_default`."""
+    if isinstance(obj, dict):
+        if obj.get("__type__") == "bytes" and len(obj) == 2 and "__value__" in obj:
+            return base64.b64decode(obj["__value__"])
+        return {key: _decode_bytes(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_decode_bytes(item) for item in obj]
+    return obj
+
+
+def _orjson_dumps(obj: Any) -> bytes:
+    """Encode with orjson."""
+    return orjson.dumps(obj, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _orjson_loads(data: bytes) -> Any:
+    """Decode with orjson."""
+    obj = orjson.loads(data)
+    # Only payloads that carry bytes need the second pass
+    if _BYTES_TAG in data:
+        obj = _decode_bytes(obj)
+    return obj
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    """Encode with msgpack."""
+    return msgpack.packb(obj, use_bin_type=True, default=_encode_default)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    """Decode with msgpack."""
+    return msgpack.unpackb(data, raw=False)
+
+
+def register_serializers() -> List[str]:
+    """Register the serializers whose libraries are installed with kombu.
+
+    Safe to call more than once.
+
+    Returns:
+        Names of the registered serializers
+    """
+    if _registered:
+        return list(_registered)
+
+    if orjson is not None:
+        encoder, decoder = _framed(_orjson_dumps, _orjson_loads)
+        registry.register(
+            SERIALIZER_ORJSON,
+            encoder,
+            decoder,
+            content_type="application/x-ato-orjson",
+            content_encoding="binary",
+        )
+        _registered.append(SERIALIZER_ORJSON)
+
+    if msgpack is not None:
+        encoder, decoder = _framed(_msgpack_dumps, _msgpack_loads)
+        registry.register(
+            SERIALIZER_MSGPACK,
+            encoder,
+            decoder,
+            content_type="application/x-ato-msgpack",
+            content_encoding="binary",
+        )
+        _registered.append(SERIALIZER_MSGPACK)
+
+    if settings.celery_serializer not in _registered + ["json"]:
+        raise RuntimeError(
+            f"Celery serializer '{settings.celery_serializer}' is not available; "
+            f"install orjson or msgpack, or use one of: {', '.join(['json'] + _registered)}"
+        )
+
+    logger.debug(f"Registered serializers: {_registered}")
+    return list(_registered)
@@ -0,0 +1,211 @@
+"""Admission control for AI Task Orchestra.
+
+Task submissions pass two checks before a task is created:
+
+- Queue depth: while the broker queue holds ``ADMISSION_QUEUE_HIGH_WATER`` or
+  more messages, new tasks are refused with 503, or accepted into the defer
+  lane if the client allows it. Deferred tasks are published once the queue
+  drains below ``ADMISSION_QUEUE_LOW_WATER``.
+- Rate: each API key (or client address without a valid key) has a token
+  bucket in Redis that refills at ``RATE_LIMIT_PER_SECOND`` up to ``RATE_LIMIT_BURST``
+  tokens; a submission without a token is refused with 429. Submissions to
+  the defer lane are rate limited too.
+
+Refusals carry ``Retry-After``. If Redis cannot be reached, submissions are
+admitted rather than refused.
+"""
+
+import asyncio
+import hashlib
+import hmac
+import logging
+import math
+import time
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.metrics import get_queue_length
+from ai_task_orchestra.redis_client import get_redis, redis_key
+
+logger = logging.getLogger(__name__)
+
+ACCEPTED = "accepted"
+DEFERRED = "deferred"
+RATE_LIMITED = "rate_limited"
+OVERLOADED = "overloaded"
+
+# Refill the bucket for the time since the last request, then take a token if
+# there is one. Returns whether a token was taken and, if not, the seconds until
+# the next one (as a string, since Lua numbers are truncated to integers).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(wait)}
+"""
+
+
+class AdmissionController:
+    """Decide whether a task submission is admitted."""
+
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = None,
+        high_water: int = None,
+        low_water: int = None,
+        retry_after: int = None,
+        api_key: Optional[str] = None,
+    ):
+        """Initialize the admission controller.
+
+        Args:
+            rate: Submissions per second per API key (0 disables rate limiting)
+            burst: Submissions an idle API key can make at once
+            high_water: Queue length at which submissions are refused (0 disables)
+            low_water: Queue length below which deferred tasks are published
+            retry_after: Seconds clients are asked to wait when the queue is full
+            api_key: API key whose submissions have their own bucket
+        """
+        self.rate = settings.rate_limit_per_second if rate is None else rate
+        self.burst = burst or settings.rate_limit_burst
+        self.high_water = (
+            settings.admission_queue_high_water if high_water is None else high_water
+        )
+        self.low_water = (
+            settings.admission_queue_low_water if low_water is None else low_water
+        )
+        self.retry_after = retry_after or settings.admission_retry_after
+        self.api_key = api_key or settings.api_key
+        self._token_bucket: Optional[Any] = None
+
+    def _identity(self, api_key: Optional[str], client: Optional[str]) -> str:
+        """Get the identity a submission is rate limited by.
+
+        Only a configured API key identifies a client: any other key is chosen by
+        the client, so it is ignored and the client address is used instead.
+        """
+        if (
+            api_key
+            and self.api_key
+            and hmac.compare_digest(
+                api_key.encode("utf-8"), self.api_key.encode("utf-8")
+            )
+        ):
+            return f"key:{api_key}"
+        return f"client:{client or 'unknown'}"
+
+    def _take_token(self, identity: str) -> float:
+        """Take a token from the bucket of a client.
+
+        Returns:
+            0 if a token was taken, otherwise the seconds until one is available
+        """
+        if self._token_bucket is None:
+            self._token_bucket = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+        digest = hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+        allowed, wait = self._token_bucket(
+            keys=[redis_key("ratelimit", digest)],
+            args=[self.rate, self.burst, time.time()],
+        )
+        return 0.0 if int(allowed) else float(wait)
+
+    def check(
+        self,
+        api_key: Optional[str] = None,
+        client: Optional[str] = None,
+        allow_defer: bool = False,
+    ) -> Dict[str, Any]:
+        """Check a submission against the queue depth and the client's rate limit.
+
+        A submission refused for the queue depth does not use up a token, unless
+        it may be deferred: the defer lane is rate limited like the queue.
+
+        Args:
+            api_key: API key of the request
+            client: Address of the client, identifying requests without an API key
+            allow_defer: Whether the submission may be deferred while the queue is full
+
+        Returns:
+            ``decision`` (accepted, rate_limited or overloaded) and, if refused,
+            ``retry_after`` in seconds
+        """
+        try:
+            overloaded = None
+            if self.high_water:
+                depth = get_queue_length()
+                if depth >= self.high_water:
+                    logger.warning(
+                        f"Queue length {depth} is at the high-water mark ({self.high_water})"
+                    )
+                    overloaded = {
+                        "decision": OVERLOADED,
+                        "retry_after": self.retry_after,
+                        "queue_length": depth,
+                    }
+                    if not allow_defer:
+                        return overloaded
+
+            if self.rate > 0:
+                wait = self._take_token(self._identity(api_key, client))
+                if wait:
+                    return {
+                        "decision": RATE_LIMITED,
+                        "retry_after": max(math.ceil(wait), 1),
+                    }
+            if overloaded:
+                return overloaded
+        except Exception as e:
+            logger.warning(f"Admission check failed, admitting the submission: {e}")
+        return {"decision": ACCEPTED}
+
+    async def release_deferred(self, task_service: Any, interval: float = None) -> None:
+        """Publish deferred tasks whenever the queue has drained, until cancelled.
+
+        Args:
+            task_service: Task service holding the deferred tasks
+            interval: Seconds between queue checks
+        """
+        interval = interval or settings.admission_release_interval
+        while True:
+            await asyncio.sleep(interval)
+            if not task_service.deferred:
+                continue
+            try:
+                room = (
+                    self.low_water - get_queue_length()
+                    if self.high_water
+                    else len(task_service.deferred)
+                )
+            except Exception as e:
+                logger.warning(f"Could not read the queue length: {e}")
+                continue
+            if room > 0:
+                released = await task_service.release_deferred(room)
+                if released:
+                    logger.info(f"Released {released} deferred tasks")
+
+
+@lru_cache()
+def get_admission_controller() -> AdmissionController:
+    """Get admission controller dependency.
+
+    Returns:
+        Admission controller
+    """
+    return AdmissionController()
@@ -0,0 +1,389 @@
+"""Content-addressed blob store for AI Task Orchestra."""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import struct
+import tempfile
+import zlib
+from functools import lru_cache
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ai_task_orchestra.config import settings
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - zlib is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Key marking a dict as a reference to a stored blob
+BLOB_REF_KEY = "$blob"
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+CODEC_ZSTD = 2
+CODECS = {"none": CODEC_NONE, "zlib": CODEC_ZLIB, "zstd": CODEC_ZSTD}
+
+# Blob file layout:
+#   header | chunk 0 | ... | chunk n-1 | n x u32 compressed chunk lengths | footer
+# Chunks are compressed independently so a range read only decompresses the
+# chunks it touches. The chunk table lives at the end so blobs can be written
+# in a single streaming pass.
+MAGIC = b"ATOB"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBBI")  # magic, version, codec, chunk size
+_FOOTER = struct.Struct("<QI4s")  # uncompressed size, chunk count, magic
+_CHUNK_LENGTH = struct.Struct("<I")
+
+
+class BlobNotFoundError(KeyError):
+    """Raised when a blob does not exist in the store."""
+
+
+def is_blob_ref(value: Any) -> bool:
+    """Check whether a value is a blob reference.
+
+    Args:
+        value: Value to check
+
+    Returns:
+        True if the value is a blob reference
+    """
+    return isinstance(value, dict) and BLOB_REF_KEY in value
+
+
+class BlobStore:
+    """Content-addressed, compressed blob store on the local filesystem.
+
+    Blobs are keyed by the SHA-256 of their uncompressed content, so storing the
+    same output twice only keeps one copy.
+    """
+
+    def __init__(
+        self,
+        root: str = None,
+        compression: str = None,
+        compression_level: int = None,
+        chunk_size: int = None,
+    ):
+        """Initialize the blob store.
+
+        Args:
+            root: Directory to store blobs in
+            compression: Compression codec (zstd, zlib or none)
+            compression_level: Compression level
+            chunk_size: Uncompressed size of independently compressed chunks
+        """
+        self.root = root or settings.result_store_dir
+        self.chunk_size = chunk_size or settings.result_chunk_size
+        self.compression_level = (
+            compression_level
+            if compression_level is not None
+            else settings.result_compression_level
+        )
+
+        compression = (compression or settings.result_compression).lower()
+        if compression not in CODECS:
+            raise ValueError(f"Unknown compression codec: {compression}")
+        if compression == "zstd" and zstandard is None:
+            logger.warning(
+                "zstandard is not installed, falling back to zlib compression"
+            )
+            compression = "zlib"
+        self.codec = CODECS[compression]
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def put(
+        self, data: bytes, content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store bytes.
+
+        Args:
+            data: Content to store
+            content_type: Content type recorded on the reference
+
+        Returns:
+            Blob reference
+        """
+        return self.put_stream(io.BytesIO(data), content_type)
+
+    def put_file(
+        self, path: str, content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store the content of a file without reading it into memory.
+
+        Args:
+            path: Path of the file
+            content_type: Content type recorded on the reference
+
+        Returns:
+            Blob reference
+        """
+        with open(path, "rb") as f:
+            return self.put_stream(f, content_type)
+
+    def put_stream(
+        self, stream: BinaryIO, content_type: str = "application/octet-stream"
+    ) -> Dict[str, Any]:
+        """Store the content of a binary stream.
+
+        Args:
+            stream: Stream to read the content from
+            content_type: Content type recorded on the reference
+
+        Returns:
+            Blob reference
+        """
+        digest = hashlib.sha256()
+        lengths: List[int] = []
+        size = 0
+        compressor = self._compressor()
+
+        fd, temp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(
+                    _HEADER.pack(MAGIC, FORMAT_VERSION, self.codec, self.chunk_size)
+                )
+                while True:
+                    chunk = stream.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    size += len(chunk)
+                    compressed = compressor(chunk)
+                    lengths.append(len(compressed))
+                    out.write(compressed)
+                for length in lengths:
+                    out.write(_CHUNK_LENGTH.pack(length))
+                out.write(_FOOTER.pack(size, len(lengths), MAGIC))
+
+            key = f"sha256:{digest.hexdigest()}"
+            path = self._path(key)
+            if os.path.exists(path):
+                logger.debug(f"Blob {key} already stored")
+                os.unlink(temp_path)
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+        return {BLOB_REF_KEY: key, "size": size, "content_type": content_type}
+
+    def exists(self, key: str) -> bool:
+        """Check whether a blob exists.
+
+        Args:
+            key: Blob key
+
+        Returns:
+            True if the blob exists
+        """
+        return os.path.exists(self._path(key))
+
+    def size(self, key: str) -> int:
+        """Get the uncompressed size of a blob.
+
+        Args:
+            key: Blob key
+
+        Returns:
+            Size in bytes
+
+        Raises:
+            BlobNotFoundError: If the blob does not exist
+        """
+        with self._open(key) as f:
+            size, _ = self._read_footer(f)
+        return size
+
+    def get(self, key: str) -> bytes:
+        """Read a whole blob.
+
+        Args:
+            key: Blob key
+
+        Returns:
+            Blob content
+
+        Raises:
+            BlobNotFoundError: If the blob does not exist
+        """
+        return b"".join(self.read_range(key))
+
+    def read_range(
+        self, key: str, start: int = 0, stop: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """Read part of a blob, decompressing only the chunks that overlap it.
+
+        Args:
+            key: Blob key
+            start: Offset of the first byte
+            stop: Offset after the last byte (default: end of blob)
+
+        Yields:
+            Consecutive pieces of the requested range
+
+        Raises:
+            BlobNotFoundError: If the blob does not exist
+        """
+        f = self._open(key)
+        try:
+            size, lengths = self._read_footer(f)
+            _, _, codec, chunk_size = _HEADER.unpack(self._read_at(f, 0, _HEADER.size))
+            stop = size if stop is None else min(stop, size)
+            if start >= stop:
+                return
+
+            decompressor = _decompressor(codec)
+            first = start // chunk_size
+            last = (stop - 1) // chunk_size
+            offset = _HEADER.size + sum(lengths[:first])
+            f.seek(offset)
+            for index in range(first, last + 1):
+                chunk = decompressor(f.read(lengths[index]))
+                chunk_start = index * chunk_size
+                yield chunk[max(start - chunk_start, 0) : stop - chunk_start]
+        finally:
+            f.close()
+
+    def delete(self, key: str) -> None:
+        """Delete a blob if it exists.
+
+        Args:
+            key: Blob key
+        """
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _path(self, key: str) -> str:
+        """Get the file path of a blob."""
+        algorithm, _, hexdigest = key.partition(":")
+        if (
+            algorithm != "sha256"
+            or len(hexdigest) != 64
+            or not all(c in "0123456789abcdef" for c in hexdigest)
+        ):
+            raise BlobNotFoundError(key)
+        return os.path.join(self.root, hexdigest[:2], hexdigest[2:4], hexdigest)
+
+    def _open(self, key: str) -> BinaryIO:
+        """Open a blob file for reading."""
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def _read_footer(self, f: BinaryIO) -> Tuple[int, List[int]]:
+        """Read the uncompressed size and chunk lengths of an open blob."""
+        f.seek(-_FOOTER.size, os.SEEK_END)
+        size, count, magic = _FOOTER.unpack(f.read(_FOOTER.size))
+        if magic != MAGIC:
+            raise ValueError("Corrupt blob: bad footer")
+        f.seek(-_FOOTER.size - count * _CHUNK_LENGTH.size, os.SEEK_END)
+        table = f.read(count * _CHUNK_LENGTH.size)
+        lengths = [length for (length,) in _CHUNK_LENGTH.iter_unpack(table)]
+        return size, lengths
+
+    @staticmethod
+    def _read_at(f: BinaryIO, offset: int, length: int) -> bytes:
+        """Read bytes at an absolute offset."""
+        f.seek(offset)
+        return f.read(length)
+
+    def _compressor(self) -> Any:
+        """Get a function compressing one chunk with the configured codec."""
+        if self.codec == CODEC_ZSTD:
+            return zstandard.ZstdCompressor(level=self.compression_level).compress
+        if self.codec == CODEC_ZLIB:
+            level = min(max(self.compression_level, 0), 9)
+            return lambda chunk: zlib.compress(chunk, level)
+        return bytes
+
+
+def _decompressor(codec: int) -> Any:
+    """Get a function decompressing one chunk of the given codec."""
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read this blob")
+        return zstandard.ZstdDecompressor().decompress
+    if codec == CODEC_ZLIB:
+        return zlib.decompress
+    return bytes
+
+
+def offload_large_values(
+    result: Dict[str, Any], store: "BlobStore" = None, limit: int = None
+) -> Dict[str, Any]:
+    """Replace large values of a result with blob references.
+
+    Strings and bytes longer than the limit are stored as-is; lists and dicts
+    whose JSON encoding exceeds it are stored as JSON documents.
+
+    Args:
+        result: Result to process
+        store: Blob store (default: the shared store)
+        limit: Inline size limit in bytes (default: RESULT_INLINE_LIMIT)
+
+    Returns:
+        Result with large values replaced by references
+    """
+    limit = settings.result_inline_limit if limit is None else limit
+    offloaded = {}
+    for key, value in result.items():
+        # A string of at most limit / 4 characters cannot exceed the limit in UTF-8
+        if isinstance(value, str) and len(value) > limit // 4:
+            data = value.encode("utf-8")
+            if len(data) > limit:
+                value = (store or get_blob_store()).put(
+                    data, "text/plain; charset=utf-8"
+                )
+        elif isinstance(value, bytes) and len(value) > limit:
+            value = (store or get_blob_store()).put(value)
+        elif isinstance(value, (list, dict)) and not is_blob_ref(value):
+            data = json.dumps(value).encode("utf-8")
+            if len(data) > limit:
+                value = (store or get_blob_store()).put(data, "application/json")
+        offloaded[key] = value
+    return offloaded
+
+
+def load_blob_value(value: Any, store: "BlobStore" = None) -> Any:
+    """Load the value behind a reference created by :func:`offload_large_values`.
+
+    Args:
+        value: Blob reference or plain value
+        store: Blob store (default: the shared store)
+
+    Returns:
+        The original value; values that are not references are returned unchanged
+    """
+    if not is_blob_ref(value):
+        return value
+    data = (store or get_blob_store()).get(value[BLOB_REF_KEY])
+    content_type = value.get("content_type", "")
+    if content_type == "application/json":
+        return json.loads(data)
+    if content_type.startswith("text/"):
+        return data.decode("utf-8")
+    return data
+
+
+@lru_cache()
+def get_blob_store() -> BlobStore:
+    """Get the shared blob store.
+
+    Returns:
+        Blob store
+    """
+    return BlobStore()
@@ -0,0 +1,151 @@
+"""Generation context store for AI Task Orchestra.
+
+Ollama returns the tokens of a generation (prompt and response) as ``context``;
+sending them with the next request continues the conversation without
+evaluating the history again. Tasks that opt in store the context they end
+with, keyed by task ID and by session ID, so that a dependent task or the next
+task of the session can start from it.
+
+Contexts are kept in Redis and bounded: entries expire after ``CONTEXT_TTL``
+seconds without use, contexts longer than ``CONTEXT_MAX_TOKENS`` are not kept,
+and beyond ``CONTEXT_MAX_ENTRIES`` entries the least recently used ones are
+evicted.
+"""
+
+import json
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+
+logger = logging.getLogger(__name__)
+
+
+def task_context_key(task_id: str) -> str:
+    """Name the context a task ended with."""
+    return f"task:{task_id}"
+
+
+def session_context_key(session_id: str) -> str:
+    """Name the latest context of a session."""
+    return f"session:{session_id}"
+
+
+class ContextStore:
+    """Bounded store of generation contexts backed by Redis."""
+
+    def __init__(
+        self, ttl: int = None, max_entries: int = None, max_tokens: int = None
+    ):
+        """Initialize the context store.
+
+        Args:
+            ttl: Seconds an entry is kept after it was last stored or read
+            max_entries: Maximum number of entries
+            max_tokens: Longest context kept, in tokens
+        """
+        self.ttl = ttl or settings.context_ttl
+        self.max_entries = max_entries or settings.context_max_entries
+        self.max_tokens = max_tokens or settings.context_max_tokens
+        self.index_key = redis_key("context", "index")
+
+    def _key(self, name: str) -> str:
+        """Redis key of an entry."""
+        return redis_key("context", name)
+
+    def get(self, names: Sequence[str], model: str) -> Optional[Dict[str, Any]]:
+        """Get the first stored context of a model among several entries.
+
+        Args:
+            names: Entry names, in order of preference
+            model: Model the context must belong to; contexts are model specific
+
+        Returns:
+            Entry name and context tokens, or None if no entry matches
+        """
+        if not names:
+            return None
+        client = get_redis()
+        for name, value in zip(names, client.mget([self._key(name) for name in names])):
+            if value is None:
+                continue
+            entry = json.loads(value)
+            if entry["model"] != model:
+                logger.debug(
+                    f"Stored context {name} belongs to model {entry['model']}, not {model}"
+                )
+                continue
+            # Reading an entry counts as a use for expiry and eviction
+            pipe = client.pipeline(transaction=False)
+            pipe.expire(self._key(name), self.ttl)
+            pipe.zadd(self.index_key, {name: time.time()})
+            pipe.execute()
+            return {"name": name, "context": entry["context"]}
+        return None
+
+    def put(self, names: Sequence[str], model: str, context: List[int]) -> None:
+        """Store a context under one or more entry names.
+
+        A context longer than the limit is not stored, and removes the entries'
+        previous contexts, which no longer continue the conversation.
+
+        Args:
+            names: Entry names
+            model: Model that produced the context
+            context: Context tokens returned by Ollama
+        """
+        if not names:
+            return
+        client = get_redis()
+        if len(context) > self.max_tokens:
+            logger.info(
+                f"Not storing context of {len(context)} tokens (limit: {self.max_tokens})"
+            )
+            self.delete(names)
+            return
+
+        now = time.time()
+        value = json.dumps({"model": model, "context": context}, separators=(",", ":"))
+        pipe = client.pipeline(transaction=False)
+        for name in names:
+            pipe.set(self._key(name), value, ex=self.ttl)
+        pipe.zadd(self.index_key, {name: now for name in names})
+        # Entries that expired on their own leave the index here
+        pipe.zremrangebyscore(self.index_key, "-inf", now - self.ttl)
+        pipe.zcard(self.index_key)
+        size = pipe.execute()[-1]
+
+        if size > self.max_entries:
+            evicted = [
+                name
+                for name, _ in client.zpopmin(self.index_key, size - self.max_entries)
+            ]
+            if evicted:
+                client.delete(*(self._key(name) for name in evicted))
+                logger.info(f"Evicted {len(evicted)} least recently used contexts")
+
+    def delete(self, names: Sequence[str]) -> None:
+        """Remove entries.
+
+        Args:
+            names: Entry names
+        """
+        if not names:
+            return
+        pipe = get_redis().pipeline(transaction=False)
+        pipe.delete(*(self._key(name) for name in names))
+        pipe.zrem(self.index_key, *names)
+        pipe.execute()
+
+
+@lru_cache()
+def get_context_store() -> ContextStore:
+    """Get the shared context store.
+
+    Returns:
+        Context store
+    """
+    return ContextStore()
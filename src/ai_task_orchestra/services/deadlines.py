@@ -0,0 +1,77 @@
+"""Deadline checks for AI Task Orchestra.
+
+Tasks can carry a ``deadline`` (when they must be finished) and a
+``max_queue_wait`` (how long they may wait to start). Whether a deadline can
+still be met is predicted from the rolling execution time stats of the task's
+template and model. The API checks this on submission and again before it
+dispatches a held task, and workers check it before they start a task, so work
+that would finish too late is shed instead of taking a worker from work that
+can still make it.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.services.stats_service import get_stats_service
+
+logger = logging.getLogger(__name__)
+
+DEADLINE_MISSED = "deadline"
+QUEUE_WAIT_EXCEEDED = "max_queue_wait"
+
+
+def predicted_duration(template: str, model: Optional[str] = None) -> float:
+    """Predict how long a task will run.
+
+    Args:
+        template: Template of the task
+        model: Model of the task
+
+    Returns:
+        p95 execution time of the template and model, or
+        ``DEADLINE_DEFAULT_TASK_SECONDS`` without stats
+    """
+    try:
+        estimate = get_stats_service().execution_estimate(template, model)
+    except Exception as e:
+        logger.warning(f"Could not read execution time stats: {e}")
+        estimate = None
+    return estimate if estimate is not None else settings.deadline_default_task_seconds
+
+
+def shed_reason(
+    template: str,
+    model: Optional[str],
+    deadline: Optional[float],
+    queued_at: float,
+    max_queue_wait: Optional[float],
+    now: float = None,
+) -> Optional[str]:
+    """Check whether a task that has not started yet should be shed.
+
+    Args:
+        template: Template of the task
+        model: Model of the task
+        deadline: Unix timestamp the task must be finished by
+        queued_at: Unix timestamp the task started waiting
+        max_queue_wait: Seconds the task may wait to start
+        now: Current Unix timestamp (default: now)
+
+    Returns:
+        ``max_queue_wait`` or ``deadline`` if the task should be shed, otherwise None
+    """
+    now = now or time.time()
+    if max_queue_wait is not None and now - queued_at > max_queue_wait:
+        return QUEUE_WAIT_EXCEEDED
+    if deadline is not None and now + predicted_duration(template, model) > deadline:
+        return DEADLINE_MISSED
+    return None
+
+
+def shed_message(reason: str) -> str:
+    """Describe why a task was shed, for its error field."""
+    if reason == QUEUE_WAIT_EXCEEDED:
+        return "Task was not started within its max_queue_wait"
+    return "Task could no longer finish before its deadline"
@@ -0,0 +1,184 @@
+"""Embedding service for AI Task Orchestra.
+
+Embeds texts with Ollama in batches, skipping texts whose vector is already in
+the vector store, and answers similarity queries against the stored vectors.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.integrations.ollama import OllamaClient, get_ollama_client
+from ai_task_orchestra.services.vector_store import (
+    VectorStore,
+    content_hash,
+    get_vector_store,
+    normalize,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingService:
+    """Cached, batched embeddings and similarity search."""
+
+    def __init__(
+        self,
+        store: VectorStore = None,
+        client: OllamaClient = None,
+        batch_size: int = None,
+    ):
+        """Initialize the embedding service.
+
+        Args:
+            store: Vector store used as the cache
+            client: Ollama client
+            batch_size: Texts sent per embed request
+        """
+        self.store = store or get_vector_store()
+        self.client = client or get_ollama_client()
+        self.batch_size = batch_size or settings.embed_batch_size
+
+    def embed(
+        self, texts: Sequence[str], model: Optional[str] = None, batch_size: int = None
+    ) -> Dict[str, Any]:
+        """Make sure every text has a stored vector.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model (default: ``OLLAMA_EMBED_MODEL``)
+            batch_size: Texts sent per embed request (default: ``EMBED_BATCH_SIZE``)
+
+        Returns:
+            Model, content hash of each text (in order) and how many texts were
+            embedded, found in the cache, and sent in how many requests
+        """
+        model = model or settings.ollama_embed_model
+        batch_size = batch_size or self.batch_size
+        hashes = [content_hash(text) for text in texts]
+        missing = set(self.store.missing(model, hashes))
+
+        # Each distinct missing text is embedded once
+        pending: Dict[str, str] = {}
+        for key, text in zip(hashes, texts):
+            if key in missing:
+                pending.setdefault(key, text)
+        keys = list(pending)
+
+        batches = 0
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start : start + batch_size]
+            response = self.client.embed_sync([pending[key] for key in batch], model)
+            self.store.add(model, batch, response.embeddings)
+            batches += 1
+        if keys:
+            logger.info(
+                f"Embedded {len(keys)} texts with {model} in {batches} requests"
+            )
+
+        return {
+            "model": model,
+            "hashes": hashes,
+            "embedded": len(keys),
+            "cached": len(hashes) - sum(1 for key in hashes if key in missing),
+            "batches": batches,
+        }
+
+    def embed_unstored(self, texts: Sequence[str], model: Optional[str] = None) -> Any:
+        """Embed texts without adding them to the vector store.
+
+        For texts that are not worth keeping, such as prompts; stored vectors
+        are still reused.
+
+        Args:
+            texts: Texts to embed
+            model: Embedding model (default: ``OLLAMA_EMBED_MODEL``)
+
+        Returns:
+            Array with one unit-length row per text
+        """
+        model = model or settings.ollama_embed_model
+        hashes = [content_hash(text) for text in texts]
+        missing = set(self.store.missing(model, hashes))
+        vectors: Dict[str, Any] = {}
+        if len(missing) < len(set(hashes)):
+            known = [key for key in dict.fromkeys(hashes) if key not in missing]
+            vectors.update(zip(known, self.store.get(model, known)))
+
+        pending: Dict[str, str] = {}
+        for key, text in zip(hashes, texts):
+            if key in missing:
+                pending.setdefault(key, text)
+        keys = list(pending)
+        for start in range(0, len(keys), self.batch_size):
+            batch = keys[start : start + self.batch_size]
+            response = self.client.embed_sync([pending[key] for key in batch], model)
+            vectors.update(zip(batch, normalize(response.embeddings)))
+        return normalize([vectors[key] for key in hashes])
+
+    def search(
+        self,
+        query: str,
+        model: Optional[str] = None,
+        k: int = 5,
+        candidates: Optional[Sequence[str]] = None,
+        min_score: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Find the texts most similar to a query.
+
+        Args:
+            query: Query text
+            model: Embedding model (default: ``OLLAMA_EMBED_MODEL``)
+            k: Number of matches
+            candidates: Texts to choose from (default: every text stored for the model)
+            min_score: Leave out matches with a lower cosine similarity
+
+        Returns:
+            Model and matches, most similar first. Each match has the content hash
+            and the cosine similarity, and with candidates the index of the text.
+        """
+        model = model or settings.ollama_embed_model
+        texts = [query] + list(candidates or [])
+        hashes = self.embed(texts, model)["hashes"]
+        query_vector = self.store.get(model, hashes[:1])[0]
+
+        if candidates is None:
+            results = self.store.search(model, query_vector, k=k, min_score=min_score)
+            matches = [{"hash": key, "score": score} for key, score in results]
+        else:
+            # Equal candidates share a vector, so search the distinct ones and
+            # report the first position of each
+            positions: Dict[str, int] = {}
+            for index, key in enumerate(hashes[1:]):
+                positions.setdefault(key, index)
+            results = self.store.search(
+                model, query_vector, k=k, keys=list(positions), min_score=min_score
+            )
+            matches = [
+                {"index": positions[key], "hash": key, "score": score}
+                for key, score in results
+            ]
+        return {"model": model, "matches": matches}
+
+    def vectors(self, model: str, hashes: Sequence[str]) -> List[List[float]]:
+        """Get stored vectors as lists.
+
+        Args:
+            model: Embedding model
+            hashes: Content hashes
+
+        Returns:
+            Unit-length vector of each hash
+        """
+        return self.store.get(model, hashes).tolist()
+
+
+@lru_cache()
+def get_embedding_service() -> EmbeddingService:
+    """Get the shared embedding service.
+
+    Returns:
+        Embedding service
+    """
+    return EmbeddingService()
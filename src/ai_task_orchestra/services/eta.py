@@ -0,0 +1,193 @@
+"""Completion time estimates for AI Task Orchestra.
+
+The estimate of a task is its queue wait plus its execution time:
+
+- Queue wait: the number of tasks ahead of it, times the mean execution time,
+  divided by the pool size of the workers that are up. Tasks ahead are the
+  messages in higher priority steps plus the messages of its own step
+  published before it (from the per-step publish and dequeue sequence
+  numbers); a task held by the API also waits for what is already published
+  and for the held tasks ahead of it in the dispatch order.
+- Execution time: the median of the task's template and model from the
+  rolling stats, which the stats service keeps in memory between reads.
+
+For a running task, the elapsed time is taken off its execution time.
+"""
+
+import logging
+import time
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.metrics import (
+    get_dispatch_progress,
+    get_worker_concurrency,
+    priority_step,
+)
+from ai_task_orchestra.services.stats_service import StatsService, get_stats_service
+from ai_task_orchestra.services.task_state import TERMINAL_STATUSES
+
+logger = logging.getLogger(__name__)
+
+# Bounds of the suggested polling interval in seconds
+MIN_POLL_INTERVAL = 1.0
+MAX_POLL_INTERVAL = 60.0
+
+
+def _epoch(value: str) -> float:
+    """Convert a task record timestamp to a Unix timestamp."""
+    return (
+        datetime.fromisoformat(value.rstrip("Z")) - datetime(1970, 1, 1)
+    ).total_seconds()
+
+
+def _isoformat(timestamp: float) -> str:
+    """Format a Unix timestamp like the task records do."""
+    return datetime.utcfromtimestamp(timestamp).isoformat() + "Z"
+
+
+def _poll_after(remaining: Optional[float]) -> float:
+    """Suggest when to check on a task again: halfway to its estimated completion."""
+    if remaining is None:
+        return MAX_POLL_INTERVAL
+    return round(min(max(remaining / 2, MIN_POLL_INTERVAL), MAX_POLL_INTERVAL), 1)
+
+
+class EtaEstimator:
+    """Estimate when tasks will start and finish."""
+
+    def __init__(self, stats_service: StatsService = None):
+        """Initialize the estimator.
+
+        Args:
+            stats_service: Source of the execution time estimates
+        """
+        self.stats_service = stats_service or get_stats_service()
+
+    def _position(
+        self, task: Dict[str, Any], task_service: Any, progress: Dict[int, Any]
+    ) -> int:
+        """Count the tasks that will start before a task that has not started."""
+        step = priority_step(task["priority"])
+        higher = sum(length for other, (length, _) in progress.items() if other < step)
+        own_length, dequeued = progress[step]
+
+        if task["id"] in task_service.deferred:
+            held = sum(
+                1 for entry in task_service.pending if entry[3] in task_service._held
+            )
+            return (
+                sum(length for length, _ in progress.values())
+                + held
+                + list(task_service.deferred).index(task["id"])
+            )
+        if task["id"] in task_service._held:
+            mine = next(
+                entry
+                for entry in sorted(task_service.pending)
+                if entry[3] == task["id"]
+            )
+            ahead = sum(
+                1
+                for entry in task_service.pending
+                if entry < mine and entry[3] in task_service._held
+            )
+            return higher + own_length + ahead
+        if task.get("dispatch_seq") is not None:
+            return higher + min(max(task["dispatch_seq"] - dequeued - 1, 0), own_length)
+        return higher + own_length
+
+    def estimate(self, task: Dict[str, Any], task_service: Any) -> Dict[str, Any]:
+        """Estimate when a task will finish.
+
+        Args:
+            task: Task record, refreshed with the state reported by workers
+            task_service: Task service holding the task
+
+        Returns:
+            ``position`` (tasks ahead), ``workers`` (pool size), ``queue_wait``,
+            ``duration`` and ``remaining`` in seconds, ``completes_at`` and
+            ``poll_after`` (seconds until it is worth checking again). Estimates
+            are None when they cannot be made, e.g. while no worker is up or
+            for tasks waiting on dependencies.
+        """
+        status = task["status"]
+        if status in TERMINAL_STATUSES:
+            return {
+                "position": 0,
+                "workers": None,
+                "queue_wait": 0.0,
+                "duration": task.get("telemetry", {}).get("execution_time"),
+                "remaining": 0.0,
+                "completes_at": task.get("completed_at"),
+                "poll_after": None,
+            }
+
+        now = time.time()
+        duration = self.stats_service.execution_estimate(
+            task["template"], task.get("model"), quantile="p50"
+        )
+        mean_duration = self.stats_service.mean_execution_time()
+        if duration is None:
+            duration = (
+                mean_duration
+                if mean_duration is not None
+                else settings.deadline_default_task_seconds
+            )
+        workers = get_worker_concurrency()
+
+        if status == "running" and task.get("worker"):
+            remaining = max(duration - (now - _epoch(task["started_at"])), 0.0)
+            return {
+                "position": 0,
+                "workers": workers,
+                "queue_wait": 0.0,
+                "duration": duration,
+                "remaining": remaining,
+                "completes_at": _isoformat(now + remaining),
+                "poll_after": _poll_after(remaining),
+            }
+
+        if status == "queued" and task["id"] in task_service.waiting:
+            return {
+                "position": None,
+                "workers": workers,
+                "queue_wait": None,
+                "duration": duration,
+                "remaining": None,
+                "completes_at": None,
+                "poll_after": _poll_after(None),
+            }
+
+        position = self._position(task, task_service, get_dispatch_progress())
+        queue_wait = None
+        if workers:
+            queue_wait = (
+                position
+                * (mean_duration if mean_duration is not None else duration)
+                / workers
+            )
+        remaining = queue_wait + duration if queue_wait is not None else None
+        return {
+            "position": position,
+            "workers": workers,
+            "queue_wait": queue_wait,
+            "duration": duration,
+            "remaining": remaining,
+            "completes_at": (
+                _isoformat(now + remaining) if remaining is not None else None
+            ),
+            "poll_after": _poll_after(remaining),
+        }
+
+
+@lru_cache()
+def get_eta_estimator() -> EtaEstimator:
+    """Get the shared ETA estimator.
+
+    Returns:
+        ETA estimator
+    """
+    return EtaEstimator()
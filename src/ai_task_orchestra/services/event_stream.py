@@ -0,0 +1,337 @@
+"""Task lifecycle events for AI Task Orchestra.
+
+The API and the workers append an event to a Redis stream whenever a task is
+queued, starts running, completes a step, completes, fails or is cancelled. The
+stream keeps the latest ``EVENT_STREAM_MAX_LENGTH`` events, and the ID Redis
+assigns each event is the offset clients resume from.
+
+Each API process reads the stream once, in :class:`EventHub`, and hands every
+event to the queues of its own subscribers, so any number of API replicas can
+serve the feed without one blocking read per client.
+"""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from typing import (
+    Any,
+    AsyncIterator,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+STEP = "step"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+EVENT_TYPES = (QUEUED, RUNNING, STEP, COMPLETED, FAILED, CANCELLED)
+
+# Stream entry IDs: milliseconds, optionally followed by a sequence number
+EVENT_ID_PATTERN = re.compile(r"^\d+(-\d+)?$")
+
+# Seconds a stream read blocks waiting for new events
+READ_BLOCK_SECONDS = 2.0
+# Events read from the stream at once
+READ_BATCH_SIZE = 500
+
+
+def _stream_key() -> str:
+    """Redis stream holding the task lifecycle events."""
+    return redis_key("events")
+
+
+def _id_key(event_id: str) -> Tuple[int, int]:
+    """Make a stream entry ID comparable."""
+    milliseconds, _, sequence = event_id.partition("-")
+    return int(milliseconds), int(sequence or 0)
+
+
+def publish_event(
+    event_type: str,
+    task_id: str,
+    template: str,
+    tags: Optional[Iterable[str]] = None,
+    **data: Any,
+) -> Optional[str]:
+    """Append a task lifecycle event to the stream.
+
+    Publishing never fails the caller; events that cannot be written are logged.
+
+    Args:
+        event_type: One of ``EVENT_TYPES``
+        task_id: ID of the task
+        template: Template of the task
+        tags: Tags of the task
+        data: Further fields of the event, e.g. ``error`` or the step details
+
+    Returns:
+        ID of the event, or None if it could not be written
+    """
+    event = {
+        "type": event_type,
+        "task_id": task_id,
+        "template": template,
+        "tags": list(tags or []),
+        "timestamp": time.time(),
+        **data,
+    }
+    try:
+        return get_redis().xadd(
+            _stream_key(),
+            {"event": json.dumps(event, separators=(",", ":"))},
+            maxlen=settings.event_stream_max_length,
+            approximate=True,
+        )
+    except Exception as e:
+        logger.warning(f"Could not publish {event_type} event of task {task_id}: {e}")
+        return None
+
+
+def publish_task_event(
+    event_type: str, task: Dict[str, Any], **data: Any
+) -> Optional[str]:
+    """Append a lifecycle event of a task record to the stream.
+
+    Args:
+        event_type: One of ``EVENT_TYPES``
+        task: Task record
+        data: Further fields of the event
+
+    Returns:
+        ID of the event, or None if it could not be written
+    """
+    return publish_event(
+        event_type, task["id"], task["template"], task.get("tags"), **data
+    )
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Selects the events a subscriber receives; unset criteria match everything."""
+
+    task_ids: FrozenSet[str] = frozenset()
+    template: Optional[str] = None
+    tag: Optional[str] = None
+    types: FrozenSet[str] = frozenset()
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        """Check whether an event passes the filter."""
+        if self.task_ids and event.get("task_id") not in self.task_ids:
+            return False
+        if self.template and event.get("template") != self.template:
+            return False
+        if self.tag and self.tag not in event.get("tags", ()):
+            return False
+        if self.types and event.get("type") not in self.types:
+            return False
+        return True
+
+
+@dataclass(eq=False)
+class Subscription:
+    """Events waiting to be sent to one client."""
+
+    filter: EventFilter
+    queue: "asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]" = field(
+        default_factory=asyncio.Queue
+    )
+    overflowed: bool = False
+
+
+def _decode(
+    entries: List[Tuple[str, Dict[str, str]]],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """Decode stream entries into event IDs and events."""
+    events = []
+    for event_id, fields in entries:
+        try:
+            events.append((event_id, json.loads(fields["event"])))
+        except (KeyError, ValueError):
+            logger.warning(f"Skipping malformed event {event_id}")
+    return events
+
+
+class EventHub:
+    """Fan the event stream out to the subscribers of this process."""
+
+    def __init__(self, queue_size: int = None, keepalive: float = None):
+        """Initialize the hub.
+
+        Args:
+            queue_size: Events buffered per subscriber; a subscriber that falls
+                further behind is disconnected and resumes from its last event
+            keepalive: Seconds without events after which subscribers are
+                given a keepalive
+        """
+        self.queue_size = queue_size or settings.event_subscriber_queue_size
+        self.keepalive = keepalive or settings.event_stream_keepalive
+        self._subscribers: Set[Subscription] = set()
+        self._reader: Optional[asyncio.Task] = None
+        self._reading: Optional[asyncio.Event] = None
+
+    async def _read(self, reading: asyncio.Event) -> None:
+        """Read new events and queue them for the subscribers, while there are any.
+
+        Args:
+            reading: Set once the reader knows where the stream ends, so events
+                appended from then on reach the subscribers
+        """
+        client = get_redis()
+        key = _stream_key()
+        loop = asyncio.get_running_loop()
+        try:
+            latest = await loop.run_in_executor(
+                None, partial(client.xrevrange, key, count=1)
+            )
+            last_id = latest[0][0] if latest else "0-0"
+        except Exception as e:
+            logger.warning(f"Could not read the event stream: {e}")
+            last_id = "$"
+        reading.set()
+
+        while self._subscribers:
+            try:
+                response = await loop.run_in_executor(
+                    None,
+                    partial(
+                        client.xread,
+                        {key: last_id},
+                        count=READ_BATCH_SIZE,
+                        block=int(READ_BLOCK_SECONDS * 1000),
+                    ),
+                )
+            except Exception as e:
+                logger.warning(f"Could not read the event stream: {e}")
+                await asyncio.sleep(1.0)
+                continue
+            for _, entries in response or []:
+                if entries:
+                    last_id = entries[-1][0]
+                for event_id, event in _decode(entries):
+                    self._deliver(event_id, event)
+
+    def _deliver(self, event_id: str, event: Dict[str, Any]) -> None:
+        """Queue an event for the subscribers it matches."""
+        for subscription in list(self._subscribers):
+            if subscription.overflowed or not subscription.filter.matches(event):
+                continue
+            if subscription.queue.qsize() >= self.queue_size:
+                logger.warning("Event subscriber fell behind, disconnecting it")
+                subscription.overflowed = True
+                subscription.queue.put_nowait(None)
+                continue
+            subscription.queue.put_nowait((event_id, event))
+
+    def subscribe(self, event_filter: EventFilter) -> Subscription:
+        """Register a subscriber, starting the stream reader if needed.
+
+        Args:
+            event_filter: Events the subscriber receives
+
+        Returns:
+            Subscription whose queue receives the matching events
+        """
+        subscription = Subscription(event_filter)
+        self._subscribers.add(subscription)
+        if self._reader is None or self._reader.done():
+            self._reading = asyncio.Event()
+            self._reader = asyncio.create_task(self._read(self._reading))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscriber; the reader stops after the last one."""
+        self._subscribers.discard(subscription)
+
+    async def _history(
+        self, after: str, event_filter: EventFilter
+    ) -> AsyncIterator[Tuple[str, Optional[Dict[str, Any]]]]:
+        """Read the stored events after an offset.
+
+        Yields:
+            Event ID and the event, or None for events the filter rejects (so
+            the caller knows how far the history was read)
+        """
+        client = get_redis()
+        loop = asyncio.get_running_loop()
+        start = f"({after}"
+        while True:
+            entries = await loop.run_in_executor(
+                None,
+                partial(client.xrange, _stream_key(), min=start, count=READ_BATCH_SIZE),
+            )
+            for event_id, event in _decode(entries):
+                yield event_id, event if event_filter.matches(event) else None
+            if len(entries) < READ_BATCH_SIZE:
+                return
+            start = f"({entries[-1][0]}"
+
+    async def events(
+        self, event_filter: EventFilter, after: Optional[str] = None
+    ) -> AsyncIterator[Optional[Tuple[str, Dict[str, Any]]]]:
+        """Follow the matching events.
+
+        Args:
+            event_filter: Events to follow
+            after: Event ID to resume after (``0`` for all stored events); by
+                default only new events are followed
+
+        Yields:
+            Event ID and event, or None as a keepalive after ``EVENT_STREAM_KEEPALIVE``
+            seconds without events. The iteration ends when the subscriber falls
+            too far behind; it can resume from the last event it received.
+        """
+        subscription = self.subscribe(event_filter)
+        reading = self._reading
+        try:
+            # Subscribe first, so no event falls between the history and the live feed
+            await reading.wait()
+            last: Optional[Tuple[int, int]] = None
+            if after is not None:
+                async for event_id, event in self._history(after, event_filter):
+                    last = _id_key(event_id)
+                    if event is not None:
+                        yield event_id, event
+
+            while True:
+                try:
+                    item = await asyncio.wait_for(
+                        subscription.queue.get(), timeout=self.keepalive
+                    )
+                except asyncio.TimeoutError:
+                    yield None
+                    continue
+                if item is None:
+                    return
+                event_id, event = item
+                if last is not None and _id_key(event_id) <= last:
+                    continue
+                yield event_id, event
+        finally:
+            self.unsubscribe(subscription)
+
+
+@lru_cache()
+def get_event_hub() -> EventHub:
+    """Get the event hub of this process.
+
+    Returns:
+        Event hub
+    """
+    return EventHub()
@@ -0,0 +1,463 @@
+"""Recurring task schedules for AI Task Orchestra.
+
+A schedule submits a task from a template on a cron expression (evaluated in
+UTC) or at a fixed interval. Schedules are stored in Redis:
+
+- ``ato:schedules``: definition of each schedule (JSON)
+- ``ato:schedules:runs``: run state of each schedule (JSON)
+- ``ato:schedules:due``: sorted set of schedule IDs by next run time
+
+The sorted set is the scheduler's priority queue: each tick reads only the
+schedules that are due, and the scheduler sleeps until the earliest next run,
+so the cost of a tick does not grow with the number of schedules. A due
+schedule is claimed by moving it to its next run time in one script, so API
+processes sharing the store fire each run once. Changes made through the API
+take effect on the next tick.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+from ai_task_orchestra.services.task_service import IN_FLIGHT_STATUSES
+from ai_task_orchestra.services.template_service import (
+    TemplateService,
+    get_template_service,
+)
+
+if TYPE_CHECKING:
+    from celery.schedules import crontab
+
+logger = logging.getLogger(__name__)
+
+# Fields of a schedule that can be changed after it is created
+UPDATABLE_FIELDS = (
+    "parameters",
+    "priority",
+    "cron",
+    "interval",
+    "enabled",
+    "allow_overlap",
+)
+
+# Move a schedule to its next run time, unless it was claimed or rescheduled
+# since it was read as due
+CLAIM_SCRIPT = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if score and tonumber(score) == tonumber(ARGV[2]) then
+    redis.call('ZADD', KEYS[1], ARGV[3], ARGV[1])
+    return 1
+end
+return 0
+"""
+
+
+def _definitions_key() -> str:
+    return redis_key("schedules")
+
+
+def _runs_key() -> str:
+    return redis_key("schedules", "runs")
+
+
+def _due_key() -> str:
+    return redis_key("schedules", "due")
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    """Format a Unix timestamp like the task records do."""
+    if timestamp is None:
+        return None
+    return datetime.utcfromtimestamp(timestamp).isoformat() + "Z"
+
+
+def parse_cron(expression: str) -> "crontab":
+    """Parse a five-field cron expression.
+
+    Args:
+        expression: Cron expression (minute hour day-of-month month day-of-week)
+
+    Returns:
+        Celery crontab
+
+    Raises:
+        ValueError: If the expression is invalid
+    """
+    if len(expression.split()) != 5:
+        raise ValueError(
+            "Cron expressions have five fields: minute hour day-of-month month day-of-week"
+        )
+    # Import here so the API does not load Celery at startup
+    from celery.schedules import crontab
+
+    return crontab.from_string(expression)
+
+
+def next_run_time(schedule: Dict[str, Any], after: float) -> float:
+    """Get the first run time of a schedule after a point in time.
+
+    Args:
+        schedule: Schedule definition
+        after: Unix timestamp
+
+    Returns:
+        Unix timestamp
+    """
+    if schedule.get("interval"):
+        return after + schedule["interval"]
+    base = datetime.fromtimestamp(int(after), timezone.utc)
+    cron = parse_cron(schedule["cron"])
+    cron.nowfun = lambda: base
+    return (base + cron.remaining_estimate(base)).timestamp()
+
+
+class ScheduleService:
+    """Service for managing and firing recurring task schedules."""
+
+    def __init__(self, template_service: TemplateService = None):
+        """Initialize the schedule service.
+
+        Args:
+            template_service: Template service (default: the shared, refreshed one)
+        """
+        self.template_service = template_service
+        self._claim: Optional[Any] = None
+
+    def _validate(self, schedule: Dict[str, Any]) -> None:
+        """Check the template, parameters and timing of a schedule definition.
+
+        Raises:
+            HTTPException: If the schedule is invalid
+        """
+        if bool(schedule.get("cron")) == bool(schedule.get("interval")):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="A schedule needs either a cron expression or an interval",
+            )
+        if schedule.get("cron"):
+            try:
+                parse_cron(schedule["cron"])
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid cron expression: {e}",
+                )
+        elif schedule["interval"] < settings.schedule_min_interval:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Interval must be at least {settings.schedule_min_interval} seconds",
+            )
+
+        template_service = self.template_service or get_template_service()
+        validation_result = template_service.validate_parameters(
+            schedule["template"], schedule["parameters"]
+        )
+        if not validation_result["valid"]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail={
+                    "message": "Invalid parameters",
+                    "missing_parameters": validation_result["missing_parameters"],
+                    "invalid_parameters": validation_result["invalid_parameters"],
+                },
+            )
+
+    def _load(self, schedule_id: str) -> Optional[Dict[str, Any]]:
+        """Read a schedule definition."""
+        data = get_redis().hget(_definitions_key(), schedule_id)
+        return json.loads(data) if data is not None else None
+
+    def _with_state(self, schedules: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Add run state and next run time to schedule definitions."""
+        if not schedules:
+            return []
+        pipe = get_redis().pipeline(transaction=False)
+        for schedule in schedules:
+            pipe.hget(_runs_key(), schedule["id"])
+            pipe.zscore(_due_key(), schedule["id"])
+        results = pipe.execute()
+        for index, schedule in enumerate(schedules):
+            runs, next_run = results[2 * index : 2 * index + 2]
+            schedule.update(json.loads(runs) if runs else {"runs": 0})
+            schedule["next_run_at"] = _isoformat(next_run)
+        return schedules
+
+    async def create_schedule(
+        self,
+        template_name: str,
+        parameters: Dict[str, Any],
+        priority: int = 5,
+        cron: Optional[str] = None,
+        interval: Optional[float] = None,
+        enabled: bool = True,
+        allow_overlap: bool = False,
+    ) -> Dict[str, Any]:
+        """Create a schedule.
+
+        Args:
+            template_name: Name of the template to submit
+            parameters: Parameters for the template
+            priority: Priority of the submitted tasks (1-10, default: 5)
+            cron: Cron expression, in UTC
+            interval: Seconds between runs
+            enabled: Whether the schedule submits tasks
+            allow_overlap: Submit a task even if the previous one is still queued or
+                running
+
+        Returns:
+            Created schedule
+
+        Raises:
+            HTTPException: If the template is not found or the schedule is invalid
+        """
+        schedule = {
+            "id": str(uuid.uuid4()),
+            "template": template_name,
+            "parameters": parameters,
+            "priority": priority,
+            "cron": cron,
+            "interval": interval,
+            "enabled": enabled,
+            "allow_overlap": allow_overlap,
+            "created_at": datetime.utcnow().isoformat() + "Z",
+        }
+        self._validate(schedule)
+
+        pipe = get_redis().pipeline()
+        pipe.hset(_definitions_key(), schedule["id"], json.dumps(schedule))
+        if enabled:
+            pipe.zadd(
+                _due_key(), {schedule["id"]: next_run_time(schedule, time.time())}
+            )
+        pipe.execute()
+        logger.info(f"Created schedule {schedule['id']} for template {template_name}")
+        return self._with_state([schedule])[0]
+
+    async def get_schedule(self, schedule_id: str) -> Dict[str, Any]:
+        """Get a schedule by ID.
+
+        Args:
+            schedule_id: ID of the schedule
+
+        Returns:
+            Schedule
+
+        Raises:
+            HTTPException: If the schedule is not found
+        """
+        schedule = self._load(schedule_id)
+        if schedule is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Schedule '{schedule_id}' not found",
+            )
+        return self._with_state([schedule])[0]
+
+    async def list_schedules(
+        self, template: Optional[str] = None, limit: int = 100, offset: int = 0
+    ) -> List[Dict[str, Any]]:
+        """List schedules, oldest first.
+
+        Args:
+            template: Filter by template name
+            limit: Maximum number of schedules to return
+            offset: Pagination offset
+
+        Returns:
+            List of schedules
+        """
+        schedules = [json.loads(data) for data in get_redis().hvals(_definitions_key())]
+        if template:
+            schedules = [
+                schedule for schedule in schedules if schedule["template"] == template
+            ]
+        schedules.sort(key=lambda schedule: schedule["created_at"])
+        return self._with_state(schedules[offset : offset + limit])
+
+    async def update_schedule(
+        self, schedule_id: str, changes: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Change a schedule; a new cron expression or interval restarts its timing.
+
+        Args:
+            schedule_id: ID of the schedule
+            changes: New values of fields in ``UPDATABLE_FIELDS``
+
+        Returns:
+            Updated schedule
+
+        Raises:
+            HTTPException: If the schedule is not found or the result is invalid
+        """
+        schedule = await self.get_schedule(schedule_id)
+        definition = self._load(schedule_id)
+        definition.update(
+            {name: value for name, value in changes.items() if name in UPDATABLE_FIELDS}
+        )
+        if "cron" in changes and changes["cron"]:
+            definition["interval"] = None
+        if "interval" in changes and changes["interval"]:
+            definition["cron"] = None
+        self._validate(definition)
+
+        pipe = get_redis().pipeline()
+        pipe.hset(_definitions_key(), schedule_id, json.dumps(definition))
+        if not definition["enabled"]:
+            pipe.zrem(_due_key(), schedule_id)
+        elif not schedule["next_run_at"] or {"cron", "interval", "enabled"} & set(
+            changes
+        ):
+            pipe.zadd(_due_key(), {schedule_id: next_run_time(definition, time.time())})
+        pipe.execute()
+        logger.info(f"Updated schedule {schedule_id}: {sorted(changes)}")
+        return await self.get_schedule(schedule_id)
+
+    async def delete_schedule(self, schedule_id: str) -> None:
+        """Delete a schedule.
+
+        Args:
+            schedule_id: ID of the schedule
+
+        Raises:
+            HTTPException: If the schedule is not found
+        """
+        pipe = get_redis().pipeline()
+        pipe.hdel(_definitions_key(), schedule_id)
+        pipe.hdel(_runs_key(), schedule_id)
+        pipe.zrem(_due_key(), schedule_id)
+        deleted, _, _ = pipe.execute()
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Schedule '{schedule_id}' not found",
+            )
+        logger.info(f"Deleted schedule {schedule_id}")
+
+    def _claim_run(self, schedule_id: str, due_at: float, next_at: float) -> bool:
+        """Move a due schedule to its next run time, if no one else did."""
+        if self._claim is None:
+            self._claim = get_redis().register_script(CLAIM_SCRIPT)
+        return bool(
+            self._claim(
+                keys=[_due_key()], args=[schedule_id, repr(due_at), repr(next_at)]
+            )
+        )
+
+    async def _in_flight(self, task_service: Any, task_id: Optional[str]) -> bool:
+        """Check whether a task is queued or running."""
+        if not task_id:
+            return False
+        try:
+            task = await task_service.get_task(task_id)
+        except HTTPException:
+            return False
+        return task["status"] in IN_FLIGHT_STATUSES
+
+    async def _fire(
+        self, task_service: Any, schedule: Dict[str, Any], due_at: float
+    ) -> None:
+        """Submit the task of a due schedule and record the run."""
+        state_data = get_redis().hget(_runs_key(), schedule["id"])
+        state = json.loads(state_data) if state_data else {"runs": 0}
+
+        if not schedule["allow_overlap"] and await self._in_flight(
+            task_service, state.get("last_task_id")
+        ):
+            logger.info(
+                f"Skipping run of schedule {schedule['id']}: task {state['last_task_id']} is still active"
+            )
+            state["skipped"] = state.get("skipped", 0) + 1
+        else:
+            try:
+                task = await task_service.create_task(
+                    template_name=schedule["template"],
+                    parameters=schedule["parameters"],
+                    priority=schedule["priority"],
+                )
+                state.update(
+                    runs=state["runs"] + 1, last_task_id=task["id"], last_error=None
+                )
+                logger.info(f"Schedule {schedule['id']} submitted task {task['id']}")
+            except HTTPException as e:
+                logger.warning(
+                    f"Schedule {schedule['id']} could not submit its task: {e.detail}"
+                )
+                state["last_error"] = e.detail
+            state["last_run_at"] = _isoformat(due_at)
+        get_redis().hset(_runs_key(), schedule["id"], json.dumps(state))
+
+    async def fire_due(self, task_service: Any) -> float:
+        """Submit the tasks of all due schedules.
+
+        Args:
+            task_service: Task service to submit the tasks to
+
+        Returns:
+            Seconds until the next schedule is due
+        """
+        now = time.time()
+        client = get_redis()
+        due = client.zrangebyscore(
+            _due_key(),
+            "-inf",
+            now,
+            start=0,
+            num=settings.schedule_batch_size,
+            withscores=True,
+        )
+        for schedule_id, due_at in due:
+            schedule = self._load(schedule_id)
+            if schedule is None or not schedule["enabled"]:
+                client.zrem(_due_key(), schedule_id)
+                continue
+            # Runs missed while no scheduler was running are skipped, not caught up
+            if not self._claim_run(
+                schedule_id, due_at, next_run_time(schedule, max(due_at, now))
+            ):
+                continue
+            await self._fire(task_service, schedule, due_at)
+
+        if len(due) == settings.schedule_batch_size:
+            return 0.0
+        head = client.zrange(_due_key(), 0, 0, withscores=True)
+        return (
+            max(head[0][1] - time.time(), 0.0)
+            if head
+            else settings.schedule_tick_interval
+        )
+
+    async def run(self, task_service: Any, interval: float = None) -> None:
+        """Fire due schedules until cancelled.
+
+        Args:
+            task_service: Task service to submit the tasks to
+            interval: Longest time between checks for due schedules, which bounds
+                how late a schedule created elsewhere can fire
+        """
+        interval = interval or settings.schedule_tick_interval
+        while True:
+            try:
+                delay = await self.fire_due(task_service)
+            except Exception as e:
+                logger.warning(f"Could not fire due schedules: {e}")
+                delay = interval
+            await asyncio.sleep(min(delay, interval))
+
+
+@lru_cache()
+def get_schedule_service() -> ScheduleService:
+    """Get schedule service dependency.
+
+    Returns:
+        Schedule service
+    """
+    return ScheduleService()
@@ -0,0 +1,216 @@
+"""Semantic prompt cache for AI Task Orchestra.
+
+Templates that enable ``semantic_cache`` answer a prompt from the cache when a
+recent prompt of the template to the same model, with the same system prompt
+and options, is similar enough: the prompt is embedded, compared with the
+embeddings of the recent prompts in one vectorized search, and the response of
+the closest prompt is returned if its cosine similarity reaches the threshold.
+
+Responses, prompt embeddings and the recency index live in Redis, so all
+workers share the cache. Each scope keeps at most ``max_entries`` prompts, none
+older than ``ttl`` seconds; prompt embeddings are not added to the vector store,
+which only grows. Each process keeps the embeddings of the scopes it looked up
+last, so a lookup only reads the embeddings of prompts added since.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+from ai_task_orchestra.services.embedding_service import (
+    EmbeddingService,
+    get_embedding_service,
+)
+from ai_task_orchestra.services.template_service import SemanticCacheConfig
+from ai_task_orchestra.services.vector_store import VECTOR_DTYPE, content_hash
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Scopes whose prompt embeddings each process keeps in memory
+MEMORY_SCOPES = 32
+
+
+def cache_scope(
+    template: str, model: str, system: Optional[str], options: Optional[Dict[str, Any]]
+) -> str:
+    """Identify the requests whose responses are interchangeable apart from the prompt.
+
+    Each template has its own cache, since templates opt in with their own threshold.
+
+    Args:
+        template: Template name
+        model: Generation model
+        system: System prompt
+        options: Model options
+
+    Returns:
+        Scope ID
+    """
+    identity = json.dumps(
+        [template, model, system, options], sort_keys=True, separators=(",", ":")
+    )
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()[:32]
+
+
+class SemanticCache:
+    """Near-duplicate prompt cache for generations."""
+
+    def __init__(self, embedding_service: EmbeddingService = None):
+        """Initialize the semantic cache.
+
+        Args:
+            embedding_service: Embeds prompts and searches their vectors
+        """
+        self.embedding_service = embedding_service or get_embedding_service()
+        self._vectors: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _settings(self, config: SemanticCacheConfig) -> Dict[str, Any]:
+        """Fill in the global defaults for unset template settings."""
+        return {
+            "threshold": (
+                config.threshold
+                if config.threshold is not None
+                else settings.semantic_cache_threshold
+            ),
+            "ttl": config.ttl or settings.semantic_cache_ttl,
+            "max_entries": config.max_entries or settings.semantic_cache_max_entries,
+            "embed_model": config.embed_model or settings.ollama_embed_model,
+        }
+
+    def _recent_vectors(self, scope: str, recent: List[str]) -> Dict[str, Any]:
+        """Get the embeddings of a scope's recent prompts, reading new ones only."""
+        with self._lock:
+            known = self._vectors.pop(scope, {})
+        # Evicted prompts are dropped along with the memory of idle scopes
+        vectors = {key: known[key] for key in recent if key in known}
+        missing = [key for key in recent if key not in vectors]
+        if missing:
+            values = get_redis().hmget(redis_key("semcache", scope, "vectors"), missing)
+            for key, value in zip(missing, values):
+                if value is not None:
+                    vectors[key] = np.frombuffer(
+                        base64.b64decode(value), dtype=VECTOR_DTYPE
+                    )
+        with self._lock:
+            self._vectors[scope] = vectors
+            while len(self._vectors) > MEMORY_SCOPES:
+                self._vectors.popitem(last=False)
+        return vectors
+
+    def lookup(
+        self, scope: str, prompt: str, config: SemanticCacheConfig
+    ) -> Dict[str, Any]:
+        """Find the cached response of a similar prompt.
+
+        Args:
+            scope: Scope from :func:`cache_scope`
+            prompt: Prompt
+            config: Cache settings of the template
+
+        Returns:
+            The prompt's content ``hash`` and ``vector``; on a hit also the cached
+            ``response``, the ``matched`` prompt hash and its similarity ``score``
+        """
+        options = self._settings(config)
+        prompt_hash = content_hash(prompt)
+        client = get_redis()
+        recent = client.zrangebyscore(
+            redis_key("semcache", scope, "recent"), time.time() - options["ttl"], "+inf"
+        )
+        vectors = self._recent_vectors(scope, recent) if recent else {}
+
+        # A repeated prompt needs no embedding
+        query = vectors.get(prompt_hash)
+        if query is None:
+            query = self.embedding_service.embed_unstored(
+                [prompt], options["embed_model"]
+            )[0]
+        result = {"hash": prompt_hash, "vector": query}
+        if not vectors:
+            return result
+
+        keys = list(vectors)
+        scores = np.stack([vectors[key] for key in keys]) @ query
+        best = int(np.argmax(scores))
+        if scores[best] < options["threshold"]:
+            return result
+
+        matched = keys[best]
+        response = client.hget(redis_key("semcache", scope, "responses"), matched)
+        if response is None:
+            return result
+        return {
+            **result,
+            "matched": matched,
+            "score": float(scores[best]),
+            "response": json.loads(response),
+        }
+
+    def store(
+        self,
+        scope: str,
+        prompt_hash: str,
+        vector: Any,
+        response: Dict[str, Any],
+        config: SemanticCacheConfig,
+    ) -> None:
+        """Cache the response to a prompt, evicting the oldest and expired entries.
+
+        Args:
+            scope: Scope from :func:`cache_scope`
+            prompt_hash: Content hash returned by :meth:`lookup`
+            vector: Prompt embedding returned by :meth:`lookup`
+            response: Response fields to return on a hit
+            config: Cache settings of the template
+        """
+        options = self._settings(config)
+        now = time.time()
+        recent_key = redis_key("semcache", scope, "recent")
+        responses_key = redis_key("semcache", scope, "responses")
+        vectors_key = redis_key("semcache", scope, "vectors")
+        encoded = base64.b64encode(
+            np.asarray(vector, dtype=VECTOR_DTYPE).tobytes()
+        ).decode("ascii")
+        client = get_redis()
+
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(responses_key, prompt_hash, json.dumps(response))
+        pipe.hset(vectors_key, prompt_hash, encoded)
+        pipe.zadd(recent_key, {prompt_hash: now})
+        pipe.zrangebyscore(recent_key, "-inf", now - options["ttl"])
+        pipe.zrange(recent_key, 0, -options["max_entries"] - 1)
+        for key in (recent_key, responses_key, vectors_key):
+            pipe.expire(key, options["ttl"])
+        _, _, _, expired, overflow, *_ = pipe.execute()
+
+        evicted = set(expired) | set(overflow)
+        if evicted:
+            pipe = client.pipeline(transaction=False)
+            pipe.zrem(recent_key, *evicted)
+            pipe.hdel(responses_key, *evicted)
+            pipe.hdel(vectors_key, *evicted)
+            pipe.execute()
+
+
+@lru_cache()
+def get_semantic_cache() -> SemanticCache:
+    """Get the shared semantic cache.
+
+    Returns:
+        Semantic cache
+    """
+    return SemanticCache()
@@ -0,0 +1,288 @@
+"""Rolling performance statistics for AI Task Orchestra.
+
+Task telemetry is aggregated per model and template into quantile sketches as
+tasks finish, so statistics never require scanning tasks. The sketches use
+logarithmic buckets (as in DDSketch): every quantile is accurate to a fixed
+relative error, and sketches merge by adding bucket counts. That makes them easy
+to update atomically in Redis from many workers, and lets the rolling window be
+built from fixed time slices that simply expire.
+"""
+
+import math
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+
+# Telemetry values aggregated per model and template
+STAT_METRICS = (
+    "latency",
+    "execution_time",
+    "queue_wait",
+    "load_duration",
+    "tokens_per_second",
+)
+
+# Bucket holding zero (and negative) values, which have no logarithm
+ZERO_BUCKET = "z"
+
+# Seconds execution time estimates are reused before the stats are read again
+ESTIMATE_CACHE_SECONDS = 30
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with logarithmic buckets."""
+
+    def __init__(self, relative_accuracy: float = None):
+        """Initialize the sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of the quantiles
+        """
+        accuracy = relative_accuracy or settings.stats_relative_accuracy
+        self.gamma = (1 + accuracy) / (1 - accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[str, int] = {}
+        self.count = 0
+
+    def bucket(self, value: float) -> str:
+        """Get the bucket a value falls into.
+
+        Args:
+            value: Value
+
+        Returns:
+            Bucket key
+        """
+        if value <= 0:
+            return ZERO_BUCKET
+        return str(math.ceil(math.log(value) / self._log_gamma))
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value.
+
+        Args:
+            value: Value to add
+            count: Number of occurrences
+        """
+        key = self.bucket(value)
+        self.buckets[key] = self.buckets.get(key, 0) + count
+        self.count += count
+
+    def merge(self, buckets: Dict[str, Any]) -> None:
+        """Merge bucket counts into the sketch.
+
+        Args:
+            buckets: Bucket counts, e.g. from another sketch
+        """
+        for key, count in buckets.items():
+            count = int(count)
+            self.buckets[key] = self.buckets.get(key, 0) + count
+            self.count += count
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.buckets.get(ZERO_BUCKET, 0)
+        if rank < seen:
+            return 0.0
+        for index in sorted(int(key) for key in self.buckets if key != ZERO_BUCKET):
+            seen += self.buckets[str(index)]
+            if rank < seen:
+                # Midpoint of the bucket in relative terms
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return 2 * self.gamma**index / (self.gamma + 1)
+
+
+class StatsService:
+    """Rolling per-model and per-template statistics backed by Redis.
+
+    Each window slice of ``STATS_WINDOW_SECONDS`` has its own set of sketches;
+    queries merge the slices inside the requested window, and slices older than
+    ``STATS_WINDOWS`` slices expire on their own.
+    """
+
+    def __init__(self, window_seconds: int = None, windows: int = None):
+        """Initialize the stats service.
+
+        Args:
+            window_seconds: Length of one window slice in seconds
+            windows: Number of slices kept
+        """
+        self.window_seconds = window_seconds or settings.stats_window_seconds
+        self.windows = windows or settings.stats_windows
+        self._estimates: Optional[Dict[Any, Dict[str, float]]] = None
+        self._estimates_at = 0.0
+
+    def _slice(self, timestamp: float) -> int:
+        """Get the start of the slice containing a timestamp."""
+        return int(timestamp // self.window_seconds) * self.window_seconds
+
+    def record(
+        self,
+        model: str,
+        template: str,
+        values: Dict[str, Optional[float]],
+        timestamp: float = None,
+    ) -> None:
+        """Record the telemetry of a finished task.
+
+        Args:
+            model: Model the task used
+            template: Template of the task
+            values: Telemetry values by metric name; None values are skipped
+            timestamp: Completion time (default: now)
+        """
+        window = self._slice(timestamp or time.time())
+        series = f"{model}|{template}"
+        ttl = self.window_seconds * (self.windows + 1)
+        sketch = QuantileSketch()
+
+        pipe = get_redis().pipeline(transaction=False)
+        series_key = redis_key("stats", window, "series")
+        pipe.sadd(series_key, series)
+        pipe.expire(series_key, ttl)
+        for metric in STAT_METRICS:
+            value = values.get(metric)
+            if value is None:
+                continue
+            key = redis_key("stats", window, metric, series)
+            pipe.hincrby(key, sketch.bucket(value), 1)
+            pipe.expire(key, ttl)
+        pipe.execute()
+
+    def get_model_stats(self, window: int = None) -> List[Dict[str, Any]]:
+        """Get rolling statistics per model and template.
+
+        Args:
+            window: Window in seconds (default and maximum: all kept slices)
+
+        Returns:
+            Count and p50/p95 of each metric per model and template
+        """
+        now = time.time()
+        window = min(
+            window or self.window_seconds * self.windows,
+            self.window_seconds * self.windows,
+        )
+        slices = range(
+            self._slice(now - window + self.window_seconds),
+            self._slice(now) + 1,
+            self.window_seconds,
+        )
+        client = get_redis()
+
+        pipe = client.pipeline(transaction=False)
+        for start in slices:
+            pipe.smembers(redis_key("stats", start, "series"))
+        series_by_slice = dict(zip(slices, pipe.execute()))
+
+        keys = [
+            (series, metric, redis_key("stats", start, metric, series))
+            for start, members in series_by_slice.items()
+            for series in members
+            for metric in STAT_METRICS
+        ]
+        pipe = client.pipeline(transaction=False)
+        for _, _, key in keys:
+            pipe.hgetall(key)
+
+        sketches: Dict[str, Dict[str, QuantileSketch]] = {}
+        for (series, metric, _), buckets in zip(keys, pipe.execute()):
+            sketch = sketches.setdefault(series, {}).setdefault(
+                metric, QuantileSketch()
+            )
+            sketch.merge(buckets)
+
+        stats = []
+        for series, metrics in sorted(sketches.items()):
+            model, _, template = series.partition("|")
+            entry: Dict[str, Any] = {
+                "model": model,
+                "template": template,
+                "window_seconds": window,
+            }
+            entry["count"] = metrics["latency"].count if "latency" in metrics else 0
+            for metric, sketch in metrics.items():
+                if sketch.count:
+                    entry[metric] = {
+                        "p50": sketch.quantile(0.5),
+                        "p95": sketch.quantile(0.95),
+                        "count": sketch.count,
+                    }
+            stats.append(entry)
+        return stats
+
+    def execution_estimate(
+        self, template: str, model: Optional[str] = None, quantile: str = "p95"
+    ) -> Optional[float]:
+        """Estimate how long a task will run from the rolling stats.
+
+        Args:
+            template: Template of the task
+            model: Model of the task; without stats for it, the slowest model
+                that ran the template is used
+            quantile: ``p50`` or ``p95`` of the execution time
+
+        Returns:
+            Execution time in seconds, or None if the template has no stats
+        """
+        estimates = self._execution_times()
+        estimate = estimates.get((model or "none", template))
+        if estimate is not None:
+            return estimate[quantile]
+        matches = [
+            value[quantile]
+            for (_, name), value in estimates.items()
+            if name == template
+        ]
+        return max(matches) if matches else None
+
+    def mean_execution_time(self) -> Optional[float]:
+        """Estimate the execution time of a task of unknown template.
+
+        Returns:
+            Median execution time averaged over all templates and models,
+            weighted by their number of runs, or None without stats
+        """
+        estimates = self._execution_times().values()
+        count = sum(value["count"] for value in estimates)
+        if not count:
+            return None
+        return sum(value["p50"] * value["count"] for value in estimates) / count
+
+    def _execution_times(self) -> Dict[Any, Dict[str, float]]:
+        """Get the execution time stats by model and template.
+
+        They are read at most every ``ESTIMATE_CACHE_SECONDS``.
+        """
+        now = time.monotonic()
+        if self._estimates is None or now - self._estimates_at > ESTIMATE_CACHE_SECONDS:
+            self._estimates = {
+                (entry["model"], entry["template"]): entry["execution_time"]
+                for entry in self.get_model_stats()
+                if entry.get("execution_time")
+            }
+            self._estimates_at = now
+        return self._estimates
+
+
+@lru_cache()
+def get_stats_service() -> StatsService:
+    """Get stats service dependency.
+
+    Returns:
+        Stats service
+    """
+    return StatsService()
@@ -0,0 +1,212 @@
+"""Archive of finished tasks for AI Task Orchestra.
+
+Finished tasks older than ``TASK_RETENTION_AGE`` are moved out of the API's
+working set into compressed JSON Lines files, one per day of completion::
+
+    archive/2026/10/tasks-2026-10-19.jsonl.zst
+
+Each retention run appends one zstd frame (a gzip member without zstandard) per
+day, so a day file is a valid compressed stream that ``zstdcat`` or any
+analytics tool can read, and a single task can be read back by decompressing
+only its frame. The frame of each archived task is recorded in a Redis hash, so
+all API processes can serve archived tasks.
+"""
+
+import asyncio
+import fcntl
+import gzip
+import json
+import logging
+import os
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - gzip is used instead
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+def _index_key() -> str:
+    """Redis hash mapping task IDs to their archive frame."""
+    return redis_key("archive", "index")
+
+
+def finished_at(task: Dict[str, Any]) -> datetime:
+    """Get the time a task finished (its creation time if it never ran).
+
+    Args:
+        task: Task record
+
+    Returns:
+        Naive UTC timestamp
+    """
+    value = task.get("completed_at") or task["created_at"]
+    return datetime.fromisoformat(value.rstrip("Z"))
+
+
+class TaskArchive:
+    """Day-partitioned, compressed archive of task records."""
+
+    def __init__(self, root: str = None, compression_level: int = None):
+        """Initialize the task archive.
+
+        Args:
+            root: Directory to store the archive files in
+            compression_level: zstd (or gzip) compression level
+        """
+        self.root = root or settings.task_archive_dir
+        self.compression_level = (
+            compression_level
+            if compression_level is not None
+            else settings.task_archive_compression_level
+        )
+        self.extension = ".jsonl.zst" if zstandard is not None else ".jsonl.gz"
+        os.makedirs(self.root, exist_ok=True)
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress one frame."""
+        if zstandard is not None:
+            return zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        return gzip.compress(data, compresslevel=min(max(self.compression_level, 1), 9))
+
+    @staticmethod
+    def _decompress(path: str, data: bytes) -> bytes:
+        """Decompress one frame of an archive file."""
+        if path.endswith(".zst"):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read this archive file")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def _path(self, day: str) -> str:
+        """Archive file of a day, relative to the root."""
+        return os.path.join(day[:4], day[5:7], f"tasks-{day}{self.extension}")
+
+    def append(self, tasks: Iterable[Dict[str, Any]]) -> int:
+        """Archive task records.
+
+        Args:
+            tasks: Finished task records
+
+        Returns:
+            Number of tasks archived
+        """
+        days: Dict[str, List[Dict[str, Any]]] = {}
+        for task in tasks:
+            days.setdefault(finished_at(task).strftime("%Y-%m-%d"), []).append(task)
+
+        archived = 0
+        for day, records in sorted(days.items()):
+            data = b"".join(
+                json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+                for record in records
+            )
+            frame = self._compress(data)
+            relative = self._path(day)
+            path = os.path.join(self.root, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            with open(path, "ab") as f:
+                # Frames of concurrent writers must not interleave
+                fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    offset = f.seek(0, os.SEEK_END)
+                    f.write(frame)
+                    f.flush()
+                    os.fsync(f.fileno())
+                finally:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+            location = json.dumps([relative, offset, len(frame)])
+            get_redis().hset(
+                _index_key(), mapping={record["id"]: location for record in records}
+            )
+            archived += len(records)
+            logger.info(
+                f"Archived {len(records)} tasks to {relative} ({len(frame)} bytes)"
+            )
+        return archived
+
+    def get(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Read an archived task.
+
+        Args:
+            task_id: ID of the task
+
+        Returns:
+            Task record, or None if the task is not archived
+        """
+        return self.get_many([task_id]).get(task_id)
+
+    def get_many(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Read archived tasks, with one index lookup and one read per frame.
+
+        Args:
+            task_ids: IDs of the tasks
+
+        Returns:
+            Task records by ID; tasks that are not archived are left out
+        """
+        if not task_ids:
+            return {}
+        frames: Dict[Tuple[str, int, int], List[str]] = {}
+        for task_id, location in zip(
+            task_ids, get_redis().hmget(_index_key(), task_ids)
+        ):
+            if location is not None:
+                relative, offset, length = json.loads(location)
+                frames.setdefault((relative, offset, length), []).append(task_id)
+
+        found: Dict[str, Dict[str, Any]] = {}
+        for (relative, offset, length), ids in frames.items():
+            path = os.path.join(self.root, relative)
+            try:
+                with open(path, "rb") as f:
+                    f.seek(offset)
+                    data = self._decompress(path, f.read(length))
+            except FileNotFoundError:
+                logger.warning(f"Archive file {relative} of tasks {ids} is missing")
+                continue
+            wanted = set(ids)
+            for line in data.splitlines():
+                record = json.loads(line)
+                if record["id"] in wanted:
+                    found[record["id"]] = record
+        return found
+
+
+async def run_retention(
+    task_service: Any, max_age: float = None, interval: float = None
+) -> None:
+    """Archive finished tasks periodically, until cancelled.
+
+    Args:
+        task_service: Task service holding the task records
+        max_age: Seconds a finished task stays in the working set
+        interval: Seconds between retention runs
+    """
+    max_age = max_age or settings.task_retention_age
+    interval = interval or settings.task_retention_interval
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await task_service.archive_finished(max_age)
+        except Exception as e:
+            logger.warning(f"Task retention run failed: {e}")
+
+
+@lru_cache()
+def get_task_archive() -> TaskArchive:
+    """Get the shared task archive.
+
+    Returns:
+        Task archive
+    """
+    return TaskArchive()
@@ -1,34 +1,150 @@
 """Task service for AI Task Orchestra."""
 
+import asyncio
+import hashlib
+import heapq
+import itertools
+import json
 import logging
+import time
 import traceback
 import uuid
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
 
 from fastapi import Depends, HTTPException, status
 
-from ai_task_orchestra.services.template_service import TemplateService, get_template_service
-from ai_task_orchestra.worker import celery_app
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.dispatch import EXECUTE_TASK, TaskDispatcher, get_dispatcher
+from ai_task_orchestra.metrics import (
+    DISPATCH_LATENCY,
+    TASKS_SHED,
+    TASKS_SUBMITTED,
+    get_queue_length,
+    next_dispatch_sequence,
+    priority_step,
+    track_enqueued,
+)
+from ai_task_orchestra.services.blob_store import is_blob_ref, offload_large_values
+from ai_task_orchestra.services.deadlines import (
+    predicted_duration,
+    shed_message,
+    shed_reason,
+)
+from ai_task_orchestra.services.event_stream import (
+    CANCELLED,
+    COMPLETED,
+    FAILED,
+    QUEUED,
+    EventFilter,
+    get_event_hub,
+    publish_task_event,
+)
+from ai_task_orchestra.services.task_archive import (
+    TaskArchive,
+    finished_at,
+    get_task_archive,
+)
+from ai_task_orchestra.services.task_state import (
+    TERMINAL_STATUSES,
+    delete_task_states,
+    get_task_states,
+    merge_task_state,
+    update_task_state,
+)
+from ai_task_orchestra.services.template_service import (
+    TemplateService,
+    get_template_service,
+)
+from ai_task_orchestra.tracing import SpanKind, inject_context, tracer
 
 logger = logging.getLogger(__name__)
 
+IN_FLIGHT_STATUSES = ("queued", "running")
+
+# Seconds between status checks of tasks waited for, in case an event is missed
+WAIT_RECHECK_SECONDS = 5.0
+# Seconds between checks of dependencies, in case a completion event is missed
+DEPENDENCY_RECHECK_SECONDS = 5.0
+
+
+def _epoch(value: Optional[str]) -> Optional[float]:
+    """Convert a task record timestamp to a Unix timestamp."""
+    if value is None:
+        return None
+    return (
+        datetime.fromisoformat(value.rstrip("Z"))
+        .replace(tzinfo=timezone.utc)
+        .timestamp()
+    )
+
+
+def task_fingerprint(template_name: str, parameters: Dict[str, Any]) -> str:
+    """Hash the work a task does, independent of parameter order.
+
+    Args:
+        template_name: Name of the template
+        parameters: Parameters for the template
+
+    Returns:
+        Hex digest
+    """
+    canonical = json.dumps(
+        [template_name, parameters], sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
 
 class TaskService:
     """Service for managing tasks."""
 
-    def __init__(self, template_service: TemplateService = Depends(get_template_service)):
+    def __init__(
+        self,
+        template_service: TemplateService = Depends(get_template_service),
+        dispatcher: TaskDispatcher = None,
+        archive: TaskArchive = None,
+    ):
         """Initialize the task service.
 
         Args:
             template_service: Template service
+            dispatcher: Publishes tasks to the workers (default: the shared dispatcher)
+            archive: Archive of finished tasks (default: the shared archive)
         """
         self.template_service = template_service
+        self.dispatcher = dispatcher or get_dispatcher()
+        self.archive = archive
         # In a real implementation, this would be stored in a database
         self.tasks: Dict[str, Dict[str, Any]] = {}
+        # IDs of tasks admitted while the queue was full, published in order once it
+        # drains
+        self.deferred: Deque[str] = deque()
+        # Task IDs by idempotency key, and of deduplicated tasks by fingerprint
+        self.idempotency_keys: Dict[str, str] = {}
+        self.in_flight: Dict[str, str] = {}
+        # Tasks held back from the broker while DISPATCH_WINDOW messages are
+        # waiting, by priority step, then earliest deadline, then submission
+        self.pending: List[Tuple[int, float, int, str]] = []
+        self._held: Set[str] = set()
+        self._sequence = itertools.count()
+        # IDs of tasks waiting for their dependencies to complete
+        self.waiting: Set[str] = set()
 
     async def create_task(
-        self, template_name: str, parameters: Dict[str, Any], priority: int = 5, depends_on: List[str] = None
+        self,
+        template_name: str,
+        parameters: Dict[str, Any],
+        priority: int = 5,
+        depends_on: List[str] = None,
+        session_id: Optional[str] = None,
+        reuse_context: bool = False,
+        deferred: bool = False,
+        idempotency_key: Optional[str] = None,
+        deduplicate: bool = False,
+        deadline: Optional[datetime] = None,
+        max_queue_wait: Optional[float] = None,
+        tags: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
         """Create a new task.
 
@@ -37,28 +153,45 @@ class TaskService:
             parameters: Parameters for the template
             priority: Task priority (1-10, default: 5)
             depends_on: List of task IDs this task depends on
+            session_id: Session whose generation context the task continues and updates
+            reuse_context: Continue from the generation context of the dependencies
+                and keep the task's own (implied by ``session_id``)
+            deferred: Hold the task in the defer lane instead of publishing it
+            idempotency_key: Key under which later submissions find this task
+            deduplicate: Let identical submissions attach to this task while it
+                is queued or running; ignored for tasks with dependencies or a
+                session, whose results depend on other tasks
+            deadline: Time the task must be finished by (naive times are UTC)
+            max_queue_wait: Seconds the task may wait to start
+            tags: Labels to find the task's events by
 
         Returns:
             Created task
 
         Raises:
-            HTTPException: If the template is not found or parameters are invalid
+            HTTPException: If the template is not found, parameters are invalid
+                or the deadline cannot be met
         """
         logger.info(f"Creating task with template: {template_name}")
-        logger.info(f"Parameters: {parameters}")
+        logger.info(f"Parameters: {list(parameters)}")
         logger.info(f"Priority: {priority}")
         logger.info(f"Dependencies: {depends_on}")
-        
+
         try:
             # Validate template and parameters
-            logger.info("Getting template")
-            template = self.template_service.get_template(template_name)
-            logger.info(f"Template found: {template}")
-            
-            logger.info("Validating parameters")
-            validation_result = self.template_service.validate_parameters(template_name, parameters)
-            logger.info(f"Validation result: {validation_result}")
-            
+            with tracer.start_as_current_span(
+                "validate_parameters", attributes={"ato.template": template_name}
+            ):
+                logger.info("Getting template")
+                template = self.template_service.get_template(template_name)
+                logger.info(f"Template found: {template}")
+
+                logger.info("Validating parameters")
+                validation_result = self.template_service.validate_parameters(
+                    template_name, parameters
+                )
+                logger.info(f"Validation result: {validation_result}")
+
             if not validation_result["valid"]:
                 logger.error(f"Invalid parameters: {validation_result}")
                 raise HTTPException(
@@ -69,11 +202,45 @@ class TaskService:
                         "invalid_parameters": validation_result["invalid_parameters"],
                     },
                 )
-            
+
+            fingerprint = task_fingerprint(template_name, parameters)
+
+            # Fail fast if the task would not finish in time even if it started now
+            if deadline is not None:
+                if deadline.tzinfo is None:
+                    deadline = deadline.replace(tzinfo=timezone.utc)
+                deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+                expected = predicted_duration(
+                    template_name,
+                    self.template_service.get_task_model(template_name, parameters),
+                )
+                remaining = (deadline - datetime.utcnow()).total_seconds()
+                if remaining < expected:
+                    raise HTTPException(
+                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                        detail=f"Deadline cannot be met: the task is expected to take {expected:.1f}s "
+                        f"and the deadline is {remaining:.1f}s away",
+                    )
+
+            # Large values are stored once in the blob store; the task record and
+            # the broker message only carry references the worker resolves lazily
+            with tracer.start_as_current_span("offload_parameters"):
+                submitted = parameters
+                parameters = offload_large_values(
+                    parameters, limit=settings.parameter_inline_limit
+                )
+            # Only these references are resolved by the worker: a reference in the
+            # submitted parameters could name any blob, including other tasks' results
+            offloaded = sorted(
+                name
+                for name, value in parameters.items()
+                if is_blob_ref(value) and not is_blob_ref(submitted[name])
+            )
+
             # Create task
             task_id = str(uuid.uuid4())
             created_at = datetime.utcnow().isoformat() + "Z"
-            
+
             logger.info(f"Creating task with ID: {task_id}")
             task = {
                 "id": task_id,
@@ -82,18 +249,39 @@ class TaskService:
                 "created_at": created_at,
                 "template": template_name,
                 "parameters": parameters,
+                "offloaded_parameters": offloaded,
                 "depends_on": depends_on or [],
+                "session_id": session_id,
+                "reuse_context": reuse_context or bool(session_id),
+                "fingerprint": fingerprint,
+                "deadline": deadline.isoformat() + "Z" if deadline else None,
+                "max_queue_wait": max_queue_wait,
+                "tags": tags or [],
             }
-            
+
             # Store task
             logger.info(f"Storing task: {task}")
             self.tasks[task_id] = task
-            
+            if idempotency_key:
+                self.idempotency_keys[idempotency_key] = task_id
+            if deduplicate and not depends_on and not session_id:
+                self.in_flight[fingerprint] = task_id
+            TASKS_SUBMITTED.labels(template=template_name).inc()
+            publish_task_event(QUEUED, task, priority=priority)
+
             # Enqueue task if it has no dependencies
-            if not depends_on:
+            if deferred and not depends_on:
+                logger.info(f"Deferring task: {task_id}")
+                task["deferred"] = True
+                self.deferred.append(task_id)
+            elif not depends_on:
                 logger.info(f"Enqueueing task: {task_id}")
-                await self.enqueue_task(task_id)
-            
+                await self._dispatch(task_id)
+            else:
+                # The dependencies may have finished already
+                self.waiting.add(task_id)
+                await self.release_dependents([task_id])
+
             logger.info(f"Task created successfully: {task}")
             return task
         except HTTPException:
@@ -107,8 +295,59 @@ class TaskService:
                 detail=f"Error creating task: {str(e)}",
             )
 
+    async def find_duplicate(
+        self,
+        template_name: str,
+        parameters: Dict[str, Any],
+        idempotency_key: Optional[str] = None,
+        deduplicate: bool = False,
+    ) -> Optional[Dict[str, Any]]:
+        """Find the task an identical submission should attach to.
+
+        Args:
+            template_name: Name of the template
+            parameters: Parameters for the template
+            idempotency_key: Idempotency key of the submission
+            deduplicate: Also match queued or running tasks with the same fingerprint
+
+        Returns:
+            Existing task, or None if the submission creates a new task
+
+        Raises:
+            HTTPException: If the idempotency key was used for a different submission
+        """
+        fingerprint = task_fingerprint(template_name, parameters)
+        if idempotency_key:
+            task_id = self.idempotency_keys.get(idempotency_key)
+            if task_id:
+                task = await self.get_task(task_id)
+                if task["fingerprint"] != fingerprint:
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Idempotency key was already used for a different task",
+                    )
+                return task
+
+        if deduplicate:
+            task_id = self.in_flight.get(fingerprint)
+            task = self.tasks.get(task_id) if task_id else None
+            if task:
+                self._refresh([task])
+                if task["status"] in IN_FLIGHT_STATUSES:
+                    logger.info(f"Attaching duplicate submission to task {task_id}")
+                    return task
+            if task_id:
+                del self.in_flight[fingerprint]
+        return None
+
+    def _archive(self) -> TaskArchive:
+        """Get the task archive, created on first use."""
+        if self.archive is None:
+            self.archive = get_task_archive()
+        return self.archive
+
     async def get_task(self, task_id: str) -> Dict[str, Any]:
-        """Get a task by ID.
+        """Get a task by ID, from the archive if it was moved there.
 
         Args:
             task_id: ID of the task
@@ -121,14 +360,145 @@ class TaskService:
         """
         task = self.tasks.get(task_id)
         if not task:
+            try:
+                task = await asyncio.get_running_loop().run_in_executor(
+                    None, self._archive().get, task_id
+                )
+            except Exception as e:
+                logger.warning(f"Could not read task {task_id} from the archive: {e}")
+            if task:
+                return dict(task, archived=True)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Task '{task_id}' not found",
             )
+        self._refresh([task])
         return task
 
+    async def get_tasks(self, task_ids: List[str]) -> List[Dict[str, Any]]:
+        """Get several tasks by ID at once.
+
+        Tasks in the working set are refreshed with one Redis round trip; the
+        others are read from the archive at once.
+
+        Args:
+            task_ids: IDs of the tasks
+
+        Returns:
+            Tasks in the order of ``task_ids``; unknown IDs are left out
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        live = [self.tasks[task_id] for task_id in task_ids if task_id in self.tasks]
+        self._refresh(live)
+        found = {task["id"]: task for task in live}
+
+        missing = [task_id for task_id in task_ids if task_id not in found]
+        if missing:
+            try:
+                archived = await asyncio.get_running_loop().run_in_executor(
+                    None, self._archive().get_many, missing
+                )
+            except Exception as e:
+                logger.warning(f"Could not read tasks from the archive: {e}")
+                archived = {}
+            for task_id, task in archived.items():
+                found[task_id] = dict(task, archived=True)
+        return [found[task_id] for task_id in task_ids if task_id in found]
+
+    async def wait_for_tasks(
+        self, task_ids: List[str], timeout: float, wait_for_all: bool = True
+    ) -> Dict[str, Any]:
+        """Wait until tasks have finished.
+
+        Waiting follows the completion events of the tasks, and checks their
+        status every ``WAIT_RECHECK_SECONDS`` in case an event is missed.
+
+        Args:
+            task_ids: IDs of the tasks
+            timeout: Seconds to wait at most
+            wait_for_all: Wait for all tasks to finish, rather than for any
+
+        Returns:
+            ``done`` (whether the condition was met), the ``finished`` and
+            ``pending`` task IDs, and the ``tasks``
+
+        Raises:
+            HTTPException: If any of the tasks is not found
+        """
+        task_ids = list(dict.fromkeys(task_ids))
+        hub = get_event_hub()
+        # Subscribe before the first check, so no completion falls in between
+        subscription = hub.subscribe(
+            EventFilter(
+                task_ids=frozenset(task_ids),
+                types=frozenset((COMPLETED, FAILED, CANCELLED)),
+            )
+        )
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            while True:
+                tasks = await self.get_tasks(task_ids)
+                if len(tasks) < len(task_ids):
+                    missing = sorted(
+                        set(task_ids).difference(task["id"] for task in tasks)
+                    )
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Tasks not found: {', '.join(missing)}",
+                    )
+                finished = [
+                    task["id"] for task in tasks if task["status"] in TERMINAL_STATUSES
+                ]
+                done = len(finished) == len(tasks) if wait_for_all else bool(finished)
+                remaining = deadline - loop.time()
+                if done or remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(
+                        subscription.queue.get(),
+                        timeout=min(remaining, WAIT_RECHECK_SECONDS),
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                # Events that arrived meanwhile are covered by the next check
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+        finally:
+            hub.unsubscribe(subscription)
+
+        return {
+            "done": done,
+            "finished": finished,
+            "pending": [
+                task["id"] for task in tasks if task["status"] not in TERMINAL_STATUSES
+            ],
+            "tasks": tasks,
+        }
+
+    def _refresh(self, tasks: List[Dict[str, Any]]) -> None:
+        """Apply the state reported by workers to dispatched, unfinished tasks.
+
+        Args:
+            tasks: Tasks to refresh, updated in place
+        """
+        in_flight = [task for task in tasks if task["status"] == "running"]
+        if not in_flight:
+            return
+        try:
+            states = get_task_states(task["id"] for task in in_flight)
+        except Exception as e:
+            logger.warning(f"Could not read task state from Redis: {e}")
+            return
+        for task, state in zip(in_flight, states):
+            merge_task_state(task, state)
+
     async def list_tasks(
-        self, status: Optional[str] = None, template: Optional[str] = None, limit: int = 100, offset: int = 0
+        self,
+        status: Optional[str] = None,
+        template: Optional[str] = None,
+        limit: int = 100,
+        offset: int = 0,
     ) -> List[Dict[str, Any]]:
         """List tasks with optional filtering.
 
@@ -142,22 +512,68 @@ class TaskService:
             List of tasks
         """
         tasks = list(self.tasks.values())
-        
+        self._refresh(tasks)
+
         # Apply filters
         if status:
             tasks = [task for task in tasks if task["status"] == status]
-        
+
         if template:
             tasks = [task for task in tasks if task["template"] == template]
-        
+
         # Sort by created_at (newest first)
         tasks.sort(key=lambda task: task["created_at"], reverse=True)
-        
+
         # Apply pagination
-        tasks = tasks[offset:offset + limit]
-        
+        tasks = tasks[offset : offset + limit]
+
         return tasks
 
+    async def archive_finished(self, max_age: float) -> int:
+        """Move finished tasks out of the working set into the archive.
+
+        Args:
+            max_age: Seconds since a task finished before it is archived
+
+        Returns:
+            Number of tasks archived
+        """
+        self._refresh(list(self.tasks.values()))
+        cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+        expired = [
+            task
+            for task in self.tasks.values()
+            if task["status"] in TERMINAL_STATUSES and finished_at(task) < cutoff
+        ]
+        if not expired:
+            return 0
+
+        archived = await asyncio.get_running_loop().run_in_executor(
+            None, self._archive().append, expired
+        )
+        for task in expired:
+            self.tasks.pop(task["id"], None)
+        # Archived tasks can no longer be attached to
+        self.idempotency_keys = {
+            key: task_id
+            for key, task_id in self.idempotency_keys.items()
+            if task_id in self.tasks
+        }
+        self.in_flight = {
+            key: task_id
+            for key, task_id in self.in_flight.items()
+            if task_id in self.tasks
+        }
+        try:
+            delete_task_states(task["id"] for task in expired)
+        except Exception as e:
+            # The states expire on their own
+            logger.warning(f"Could not delete the state of archived tasks: {e}")
+        logger.info(
+            f"Archived {archived} finished tasks, {len(self.tasks)} tasks remain"
+        )
+        return archived
+
     async def update_task_priority(self, task_id: str, priority: int) -> Dict[str, Any]:
         """Update task priority.
 
@@ -172,17 +588,19 @@ class TaskService:
             HTTPException: If the task is not found
         """
         task = await self.get_task(task_id)
-        
+
         # Only allow updating priority for queued tasks
         if task["status"] != "queued":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot update priority for task with status '{task['status']}'",
             )
-        
-        # Update priority
+
+        # Update priority; a held task moves to its new place in the dispatch order
         task["priority"] = priority
-        
+        if task_id in self._held:
+            self._hold(task)
+
         return task
 
     async def cancel_task(self, task_id: str) -> None:
@@ -195,18 +613,275 @@ class TaskService:
             HTTPException: If the task is not found
         """
         task = await self.get_task(task_id)
-        
+
         # Only allow cancelling queued or running tasks
         if task["status"] not in ["queued", "running"]:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Cannot cancel task with status '{task['status']}'",
             )
-        
+
+        # Stop the Celery task; a running script receives SIGTERM and its whole
+        # process tree is torn down by the script runner
+        if task["status"] == "running":
+            self.dispatcher.revoke(task_id, terminate=True, signal="SIGTERM")
+
         # Update status
         task["status"] = "cancelled"
-        
-        # TODO: Cancel Celery task if running
+        task["completed_at"] = datetime.utcnow().isoformat() + "Z"
+        try:
+            update_task_state(task_id, status="cancelled")
+        except Exception as e:
+            logger.warning(f"Could not report cancellation of task {task_id}: {e}")
+        publish_task_event(CANCELLED, task)
+
+    async def release_deferred(self, limit: int) -> int:
+        """Publish deferred tasks, oldest first.
+
+        Tasks cancelled while deferred are dropped from the lane.
+
+        Args:
+            limit: Maximum number of tasks to publish
+
+        Returns:
+            Number of tasks published
+        """
+        released = 0
+        while self.deferred and released < limit:
+            task_id = self.deferred[0]
+            task = self.tasks.get(task_id)
+            if task is None or task["status"] != "queued":
+                self.deferred.popleft()
+                continue
+            try:
+                await self._dispatch(task_id)
+            except HTTPException as e:
+                # Keep the task deferred and try again later
+                logger.warning(f"Could not release deferred task {task_id}: {e.detail}")
+                break
+            self.deferred.popleft()
+            task["deferred"] = False
+            released += 1
+        return released
+
+    def _fail_dependent(self, task: Dict[str, Any], unmet: List[str]) -> None:
+        """Fail a task whose dependencies did not complete."""
+        logger.warning(
+            f"Task {task['id']} cannot run: dependencies {unmet} did not complete"
+        )
+        task["status"] = "failed"
+        task["error"] = f"Dependencies did not complete: {', '.join(unmet)}"
+        task["completed_at"] = datetime.utcnow().isoformat() + "Z"
+        try:
+            update_task_state(task["id"], status="failed", error=task["error"])
+        except Exception as e:
+            logger.warning(f"Could not report failure of task {task['id']}: {e}")
+        # Its own dependents fail in turn
+        publish_task_event(FAILED, task, error=task["error"])
+
+    async def release_dependents(self, task_ids: Optional[List[str]] = None) -> int:
+        """Publish waiting tasks whose dependencies have all completed.
+
+        Tasks with a dependency that failed, was cancelled or does not exist
+        fail without running.
+
+        Args:
+            task_ids: Waiting tasks to check (default: all of them)
+
+        Returns:
+            Number of tasks published
+        """
+        waiting = []
+        for task_id in list(self.waiting if task_ids is None else task_ids):
+            task = self.tasks.get(task_id)
+            if task is None or task["status"] != "queued":
+                self.waiting.discard(task_id)
+            else:
+                waiting.append(task)
+        if not waiting:
+            return 0
+
+        dependencies = list(
+            dict.fromkeys(
+                dependency for task in waiting for dependency in task["depends_on"]
+            )
+        )
+        statuses = {
+            task["id"]: task["status"] for task in await self.get_tasks(dependencies)
+        }
+        released = 0
+        for task in waiting:
+            unmet = [
+                dependency
+                for dependency in task["depends_on"]
+                if statuses.get(dependency) in (None, "failed", "cancelled")
+            ]
+            if unmet:
+                self.waiting.discard(task["id"])
+                self._fail_dependent(task, unmet)
+                continue
+            if any(
+                statuses[dependency] != "completed" for dependency in task["depends_on"]
+            ):
+                continue
+            self.waiting.discard(task["id"])
+            try:
+                await self._dispatch(task["id"])
+            except HTTPException as e:
+                # Try again on the next check
+                logger.warning(
+                    f"Could not release dependent task {task['id']}: {e.detail}"
+                )
+                self.waiting.add(task["id"])
+                continue
+            released += 1
+        return released
+
+    async def run_dependency_release(self) -> None:
+        """Publish dependent tasks as their dependencies finish, until cancelled.
+
+        Follows the completion events, and checks every
+        ``DEPENDENCY_RECHECK_SECONDS`` in case an event is missed.
+        """
+        hub = get_event_hub()
+        event_filter = EventFilter(types=frozenset((COMPLETED, FAILED, CANCELLED)))
+        subscription = hub.subscribe(event_filter)
+        try:
+            while True:
+                if self.waiting:
+                    try:
+                        released = await self.release_dependents()
+                        if released:
+                            logger.info(f"Released {released} dependent tasks")
+                    except Exception as e:
+                        logger.warning(f"Could not release dependent tasks: {e}")
+                try:
+                    await asyncio.wait_for(
+                        subscription.queue.get(), timeout=DEPENDENCY_RECHECK_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                # Events that arrived meanwhile are covered by the next check
+                while not subscription.queue.empty():
+                    subscription.queue.get_nowait()
+                if subscription.overflowed:
+                    hub.unsubscribe(subscription)
+                    subscription = hub.subscribe(event_filter)
+        finally:
+            hub.unsubscribe(subscription)
+
+    def _hold(self, task: Dict[str, Any]) -> None:
+        """Add a task to the dispatch order."""
+        deadline = _epoch(task.get("deadline"))
+        entry = (
+            priority_step(task["priority"]),
+            deadline if deadline is not None else float("inf"),
+            next(self._sequence),
+            task["id"],
+        )
+        heapq.heappush(self.pending, entry)
+        self._held.add(task["id"])
+
+    async def _dispatch(self, task_id: str) -> None:
+        """Publish a task, or hold it back while the dispatch window is full.
+
+        Args:
+            task_id: ID of the task
+        """
+        if settings.dispatch_window <= 0:
+            await self.enqueue_task(task_id)
+            return
+        self._hold(self.tasks[task_id])
+        await self.dispatch_pending()
+
+    def _shed(self, task: Dict[str, Any], reason: str) -> None:
+        """Fail a task that can no longer meet its deadline or max_queue_wait."""
+        logger.warning(f"Shedding task {task['id']}: {reason}")
+        task["status"] = "failed"
+        task["error"] = shed_message(reason)
+        task["shed"] = reason
+        task["completed_at"] = datetime.utcnow().isoformat() + "Z"
+        TASKS_SHED.labels(template=task["template"], reason=reason).inc()
+        try:
+            update_task_state(
+                task["id"], status="failed", error=task["error"], shed=reason
+            )
+        except Exception as e:
+            logger.warning(f"Could not report shedding of task {task['id']}: {e}")
+        publish_task_event(FAILED, task, error=task["error"], shed=reason)
+
+    async def dispatch_pending(self) -> int:
+        """Publish held tasks while the broker queue is below the dispatch window.
+
+        Tasks go out by priority step, then earliest deadline first, then in
+        submission order. Tasks that can no longer meet their deadline or
+        max_queue_wait are shed instead.
+
+        Returns:
+            Number of tasks published
+        """
+        if not self.pending:
+            return 0
+        try:
+            room = settings.dispatch_window - get_queue_length()
+        except Exception as e:
+            logger.warning(
+                f"Could not read the queue length, dispatching held tasks: {e}"
+            )
+            room = len(self.pending)
+
+        dispatched = 0
+        now = time.time()
+        while self.pending and dispatched < room:
+            step, deadline, sequence, task_id = heapq.heappop(self.pending)
+            task = self.tasks.get(task_id)
+            # Entries of published, cancelled or re-prioritized tasks are stale
+            if (
+                task is None
+                or task_id not in self._held
+                or step != priority_step(task["priority"])
+            ):
+                continue
+            if task["status"] != "queued":
+                self._held.discard(task_id)
+                continue
+            reason = shed_reason(
+                task["template"],
+                self.template_service.get_task_model(
+                    task["template"], task["parameters"]
+                ),
+                deadline if deadline != float("inf") else None,
+                _epoch(task["created_at"]),
+                task.get("max_queue_wait"),
+                now=now,
+            )
+            if reason:
+                self._held.discard(task_id)
+                self._shed(task, reason)
+                continue
+            try:
+                await self.enqueue_task(task_id)
+            except HTTPException as e:
+                logger.warning(f"Could not dispatch held task {task_id}: {e.detail}")
+                heapq.heappush(self.pending, (step, deadline, sequence, task_id))
+                break
+            self._held.discard(task_id)
+            dispatched += 1
+        return dispatched
+
+    async def run_dispatcher(self, interval: float = None) -> None:
+        """Dispatch held tasks as the broker queue drains, until cancelled.
+
+        Args:
+            interval: Seconds between checks of the queue length
+        """
+        interval = interval or settings.dispatch_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.dispatch_pending()
+            except Exception as e:
+                logger.warning(f"Could not dispatch held tasks: {e}")
 
     async def enqueue_task(self, task_id: str) -> None:
         """Enqueue a task for execution.
@@ -218,11 +893,11 @@ class TaskService:
             HTTPException: If the task is not found
         """
         logger.info(f"Enqueueing task: {task_id}")
-        
+
         try:
             task = await self.get_task(task_id)
             logger.info(f"Task found: {task}")
-            
+
             # Only allow enqueueing queued tasks
             if task["status"] != "queued":
                 logger.error(f"Cannot enqueue task with status: {task['status']}")
@@ -230,22 +905,68 @@ class TaskService:
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Cannot enqueue task with status '{task['status']}'",
                 )
-            
+
             # Update status
             logger.info("Updating task status to running")
             task["status"] = "running"
             task["started_at"] = datetime.utcnow().isoformat() + "Z"
-            
+
             # Enqueue task
             logger.info(f"Sending task to Celery: {task_id}")
             try:
-                result = celery_app.send_task(
-                    "ai_task_orchestra.execute_task",
-                    args=[task_id, task["template"], task["parameters"]],
-                    kwargs={},
-                    priority=task["priority"],
+                model = self.template_service.get_task_model(
+                    task["template"], task["parameters"]
+                )
+                task["model"] = model
+                # Read by the worker for queue wait and queue depth metrics;
+                # the trace context continues the request's trace on the worker
+                headers = {
+                    "ato_enqueued_at": time.time(),
+                    "ato_priority": task["priority"],
+                    "ato_model": model,
+                }
+                # Read by the worker to shed tasks that would finish too late
+                if task.get("deadline") or task.get("max_queue_wait"):
+                    headers["ato_created_at"] = _epoch(task["created_at"])
+                    headers["ato_deadline"] = _epoch(task.get("deadline"))
+                    headers["ato_max_queue_wait"] = task.get("max_queue_wait")
+                # Lets queue wait estimates tell how many messages are ahead
+                task["dispatch_seq"] = next_dispatch_sequence(task["priority"])
+                if task["dispatch_seq"] is not None:
+                    headers["ato_dispatch_seq"] = task["dispatch_seq"]
+                if task.get("tags"):
+                    headers["ato_tags"] = task["tags"]
+                if task.get("offloaded_parameters"):
+                    headers["ato_offloaded"] = task["offloaded_parameters"]
+                if task.get("reuse_context"):
+                    headers["ato_conversation"] = {
+                        "session_id": task.get("session_id"),
+                        "depends_on": task["depends_on"],
+                    }
+                dispatch_started = time.monotonic()
+                with tracer.start_as_current_span(
+                    "publish execute_task",
+                    kind=SpanKind.PRODUCER,
+                    attributes={
+                        "ato.task_id": task_id,
+                        "ato.template": task["template"],
+                        "ato.model": model,
+                    },
+                ):
+                    self.dispatcher.send_task(
+                        EXECUTE_TASK,
+                        args=[task_id, task["template"], task["parameters"]],
+                        task_id=task_id,
+                        priority=task["priority"],
+                        headers=inject_context(headers),
+                    )
+                dispatch_time = time.monotonic() - dispatch_started
+                DISPATCH_LATENCY.labels(template=task["template"]).observe(
+                    dispatch_time
                 )
-                logger.info(f"Task sent to Celery: {result}")
+                task.setdefault("telemetry", {})["dispatch_time"] = dispatch_time
+                track_enqueued(task["priority"], model)
+                logger.info(f"Task sent to Celery: {task_id}")
             except Exception as e:
                 logger.error(f"Error sending task to Celery: {str(e)}")
                 logger.error(traceback.format_exc())
@@ -254,7 +975,7 @@ class TaskService:
                 if "started_at" in task:
                     del task["started_at"]
                 raise
-                
+
             logger.info(f"Task enqueued successfully: {task_id}")
         except HTTPException:
             # Re-raise HTTP exceptions
@@ -268,15 +989,23 @@ class TaskService:
             )
 
 
+_task_service: Optional[TaskService] = None
+
+
 def get_task_service(
     template_service: TemplateService = Depends(get_template_service),
 ) -> TaskService:
     """Get task service dependency.
 
+    Tasks are kept in memory, so all requests share one service instance.
+
     Args:
         template_service: Template service
 
     Returns:
         Task service
     """
-    return TaskService(template_service=template_service)
+    global _task_service
+    if _task_service is None:
+        _task_service = TaskService(template_service=template_service)
+    return _task_service
@@ -0,0 +1,103 @@
+"""Shared task state for AI Task Orchestra.
+
+Workers report progress (status, timestamps, telemetry, result references) into
+a small Redis hash per task. The API overlays it onto its task records when they
+are read, so status changes made on a worker become visible without the worker
+having to reach the API.
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, List
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_redis, redis_key
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed", "cancelled")
+
+
+def _state_key(task_id: str) -> str:
+    """Redis hash holding the shared state of a task."""
+    return redis_key("task", task_id)
+
+
+def update_task_state(task_id: str, **fields: Any) -> None:
+    """Update the shared state of a task.
+
+    Args:
+        task_id: ID of the task
+        fields: Fields to set; values are stored as JSON
+    """
+    key = _state_key(task_id)
+    pipe = get_redis().pipeline()
+    pipe.hset(key, mapping={name: json.dumps(value) for name, value in fields.items()})
+    pipe.expire(key, settings.task_state_ttl)
+    pipe.execute()
+
+
+def _decode(state: Dict[str, str]) -> Dict[str, Any]:
+    """Decode the JSON values of a state hash."""
+    return {name: json.loads(value) for name, value in state.items()}
+
+
+def get_task_state(task_id: str) -> Dict[str, Any]:
+    """Get the shared state of a task.
+
+    Args:
+        task_id: ID of the task
+
+    Returns:
+        State fields reported so far (empty if none)
+    """
+    return _decode(get_redis().hgetall(_state_key(task_id)))
+
+
+def get_task_states(task_ids: Iterable[str]) -> List[Dict[str, Any]]:
+    """Get the shared state of several tasks in one round trip.
+
+    Args:
+        task_ids: IDs of the tasks
+
+    Returns:
+        State of each task, in the same order
+    """
+    pipe = get_redis().pipeline()
+    for task_id in task_ids:
+        pipe.hgetall(_state_key(task_id))
+    return [_decode(state) for state in pipe.execute()]
+
+
+def delete_task_states(task_ids: Iterable[str]) -> None:
+    """Delete the shared state of several tasks.
+
+    Args:
+        task_ids: IDs of the tasks
+    """
+    keys = [_state_key(task_id) for task_id in task_ids]
+    if keys:
+        get_redis().delete(*keys)
+
+
+def merge_task_state(task: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Any]:
+    """Apply reported state to a task record.
+
+    A task the API already considers finished (e.g. cancelled) keeps its status.
+
+    Args:
+        task: Task record, updated in place
+        state: Reported state
+
+    Returns:
+        The updated task record
+    """
+    if not state:
+        return task
+    if task.get("status") in TERMINAL_STATUSES:
+        state = {name: value for name, value in state.items() if name != "status"}
+    telemetry = state.pop("telemetry", None)
+    task.update(state)
+    if telemetry:
+        task.setdefault("telemetry", {}).update(telemetry)
+    return task
@@ -1,9 +1,13 @@
 """Template service for AI Task Orchestra."""
 
 import glob
+import hashlib
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import re
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from fastapi import Depends, HTTPException, status
@@ -13,6 +17,12 @@ from ai_task_orchestra.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Steps that use an embedding model, which default to OLLAMA_EMBED_MODEL
+EMBEDDING_STEP_TYPES = ("ollama_embed", "similarity_search")
+
+# A step value that is exactly one parameter, e.g. "{{model}}"
+_PARAMETER_REFERENCE = re.compile(r"^\{\{\s*(\w+)\s*\}\}$")
+
 
 class TemplateParameter(BaseModel):
     """Template parameter model."""
@@ -30,6 +40,16 @@ class TemplateStep(BaseModel):
     # Additional fields will be dynamically validated
 
 
+class SemanticCacheConfig(BaseModel):
+    """Semantic cache settings of a template; unset values use the global settings."""
+
+    enabled: bool = True
+    threshold: Optional[float] = Field(None, ge=-1, le=1)
+    ttl: Optional[int] = Field(None, ge=1)
+    max_entries: Optional[int] = Field(None, ge=1)
+    embed_model: Optional[str] = None
+
+
 class Template(BaseModel):
     """Template model."""
 
@@ -37,6 +57,7 @@ class Template(BaseModel):
     description: Optional[str] = None
     parameters: List[TemplateParameter]
     steps: List[Dict[str, Any]]
+    semantic_cache: Optional[SemanticCacheConfig] = None
 
 
 class TemplateService:
@@ -50,31 +71,77 @@ class TemplateService:
         """
         self.templates_dir = templates_dir or settings.templates_dir
         self.templates: Dict[str, Template] = {}
+        # Identifies the loaded set of template files; changes whenever they do
+        self.version = ""
+        self._signature: Tuple[Tuple[str, int, int], ...] = ()
+        self._checked_at = 0.0
         self.load_templates()
 
+    def _template_files(self) -> List[str]:
+        """Find all YAML files in the templates directory."""
+        template_files = glob.glob(os.path.join(self.templates_dir, "*.yaml"))
+        template_files.extend(glob.glob(os.path.join(self.templates_dir, "*.yml")))
+        return sorted(template_files)
+
+    def _scan(self, template_files: List[str]) -> Tuple[Tuple[str, int, int], ...]:
+        """Build a signature of the template files from their metadata."""
+        signature = []
+        for template_file in template_files:
+            try:
+                stat = os.stat(template_file)
+            except FileNotFoundError:
+                continue
+            signature.append((template_file, stat.st_mtime_ns, stat.st_size))
+        return tuple(signature)
+
     def load_templates(self) -> None:
         """Load templates from YAML files."""
         logger.info(f"Loading templates from {self.templates_dir}")
-        
+
         # Create templates directory if it doesn't exist
         os.makedirs(self.templates_dir, exist_ok=True)
-        
-        # Find all YAML files in the templates directory
-        template_files = glob.glob(os.path.join(self.templates_dir, "*.yaml"))
-        template_files.extend(glob.glob(os.path.join(self.templates_dir, "*.yml")))
-        
+
+        template_files = self._template_files()
+        signature = self._scan(template_files)
+
         # Load each template
+        templates: Dict[str, Template] = {}
         for template_file in template_files:
             try:
                 with open(template_file, "r") as f:
                     template_data = yaml.safe_load(f)
-                
+
                 template = Template(**template_data)
-                self.templates[template.name] = template
+                templates[template.name] = template
                 logger.info(f"Loaded template: {template.name}")
             except (ValidationError, yaml.YAMLError) as e:
                 logger.error(f"Error loading template {template_file}: {e}")
 
+        # Swap in the new registry at once so readers never see a partial one
+        self.templates = templates
+        self._signature = signature
+        self._checked_at = time.monotonic()
+        self.version = hashlib.sha1(repr(signature).encode("utf-8")).hexdigest()[:16]
+
+    def refresh(self) -> bool:
+        """Reload the templates if the template files changed.
+
+        The files are checked at most once per ``TEMPLATES_RELOAD_INTERVAL`` seconds,
+        and only their metadata is read unless something changed.
+
+        Returns:
+            True if the templates were reloaded
+        """
+        now = time.monotonic()
+        if now - self._checked_at < settings.templates_reload_interval:
+            return False
+        self._checked_at = now
+
+        if self._scan(self._template_files()) == self._signature:
+            return False
+        self.load_templates()
+        return True
+
     def get_templates(self) -> List[Template]:
         """Get all templates.
 
@@ -103,7 +170,39 @@ class TemplateService:
             )
         return template
 
-    def validate_parameters(self, template_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+    def get_task_model(self, template_name: str, parameters: Dict[str, Any]) -> str:
+        """Get the model the first AI step of a task will use.
+
+        Args:
+            template_name: Name of the template
+            parameters: Parameters of the task
+
+        Returns:
+            Model name, or "none" if the template has no AI step
+        """
+        template = self.get_template(template_name)
+        for step in template.steps:
+            embedding = step.get("type") in EMBEDDING_STEP_TYPES
+            if "model" not in step and not embedding:
+                continue
+            model = step.get("model")
+            match = (
+                _PARAMETER_REFERENCE.match(model) if isinstance(model, str) else None
+            )
+            if match:
+                model = parameters.get(match.group(1))
+            if isinstance(model, str) and model:
+                return model
+            return (
+                settings.ollama_embed_model
+                if embedding
+                else settings.ollama_default_model
+            )
+        return "none"
+
+    def validate_parameters(
+        self, template_name: str, parameters: Dict[str, Any]
+    ) -> Dict[str, Any]:
         """Validate parameters for a template.
 
         Args:
@@ -117,37 +216,41 @@ class TemplateService:
             HTTPException: If the template is not found
         """
         logger.info(f"Validating parameters for template: {template_name}")
-        logger.info(f"Parameters: {parameters}")
-        
+        logger.info(f"Parameters: {list(parameters)}")
+
         try:
             template = self.get_template(template_name)
             logger.info(f"Template found: {template}")
-            
+
             # Check for missing required parameters
             missing_parameters = []
             for param in template.parameters:
-                logger.info(f"Checking parameter: {param.name}, required: {param.required}")
+                logger.info(
+                    f"Checking parameter: {param.name}, required: {param.required}"
+                )
                 if param.required and param.name not in parameters:
                     logger.warning(f"Missing required parameter: {param.name}")
                     missing_parameters.append(param.name)
-            
+
             # Check for invalid parameters
             invalid_parameters = []
-            for param_name, param_value in parameters.items():
-                logger.info(f"Validating parameter: {param_name} = {param_value}")
-                
+            for param_name in parameters:
+                logger.info(f"Validating parameter: {param_name}")
+
                 # Find the parameter definition
-                param_def = next((p for p in template.parameters if p.name == param_name), None)
-                
+                param_def = next(
+                    (p for p in template.parameters if p.name == param_name), None
+                )
+
                 # If the parameter is not defined in the template, it's invalid
                 if not param_def:
                     logger.warning(f"Invalid parameter: {param_name}")
                     invalid_parameters.append(param_name)
                     continue
-                
+
                 # TODO: Add type validation based on param_def.type
                 logger.info(f"Parameter {param_name} is valid")
-            
+
             # Return validation result
             result = {
                 "valid": len(missing_parameters) == 0 and len(invalid_parameters) == 0,
@@ -162,10 +265,18 @@ class TemplateService:
             raise
 
 
+@lru_cache()
+def _shared_template_service() -> TemplateService:
+    """Get the template service shared by all requests of this process."""
+    return TemplateService()
+
+
 def get_template_service() -> TemplateService:
     """Get template service dependency.
 
     Returns:
         Template service
     """
-    return TemplateService()
+    template_service = _shared_template_service()
+    template_service.refresh()
+    return template_service
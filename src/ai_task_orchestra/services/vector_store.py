@@ -0,0 +1,275 @@
+"""Embedding vector store for AI Task Orchestra.
+
+Vectors are cached on the local filesystem, one collection per embedding model,
+keyed by the hash of the embedded text, so a text is only embedded once per
+model. A collection is two append-only files:
+
+- ``vectors.f32``: unit-length float32 rows, memory-mapped for reading
+- ``keys.bin``: the 16-byte content hash of each row, in row order
+
+Appends take an exclusive lock, so workers and the API can share a directory.
+Readers pick up rows appended by other processes on their next access.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ai_task_orchestra.config import settings
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+logger = logging.getLogger(__name__)
+
+KEY_SIZE = 16
+VECTOR_DTYPE = "<f4"
+
+
+def content_hash(text: str) -> str:
+    """Hash a text the way the vector store keys it.
+
+    Args:
+        text: Text
+
+    Returns:
+        Hex digest (32 characters)
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[: KEY_SIZE * 2]
+
+
+def _require_numpy() -> None:
+    """Fail clearly when the vector store is used without NumPy."""
+    if np is None:
+        raise RuntimeError(
+            'The vector store requires NumPy; install it with pip install -e ".[vectors]"'
+        )
+
+
+def normalize(vectors: Sequence[Sequence[float]]) -> Any:
+    """Scale vectors to unit length, so dot products are cosine similarities.
+
+    Args:
+        vectors: Vectors
+
+    Returns:
+        Float32 array with one unit-length row per vector (zero vectors stay zero)
+    """
+    matrix = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+class _Collection:
+    """Vectors of one embedding model."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.keys_path = os.path.join(directory, "keys.bin")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.lock_path = os.path.join(directory, "lock")
+        self.dimensions: Optional[int] = None
+        self.rows: Dict[str, int] = {}
+        self.keys: List[str] = []
+        self.vectors: Any = None
+        self._keys_size = 0
+
+    def refresh(self) -> None:
+        """Pick up rows appended since the last access."""
+        try:
+            size = os.path.getsize(self.keys_path)
+        except FileNotFoundError:
+            return
+        size -= size % KEY_SIZE
+        if size == self._keys_size:
+            return
+        if self.dimensions is None:
+            with open(self.meta_path) as f:
+                self.dimensions = json.load(f)["dimensions"]
+        with open(self.keys_path, "rb") as f:
+            f.seek(self._keys_size)
+            data = f.read(size - self._keys_size)
+        for offset in range(0, len(data), KEY_SIZE):
+            key = data[offset : offset + KEY_SIZE].hex()
+            self.rows.setdefault(key, len(self.keys))
+            self.keys.append(key)
+        self._keys_size = size
+        self.vectors = np.memmap(
+            self.vectors_path,
+            dtype=VECTOR_DTYPE,
+            mode="r",
+            shape=(len(self.keys), self.dimensions),
+        )
+
+    def append(self, keys: Sequence[str], vectors: Any) -> None:
+        """Append rows for keys that are not stored yet."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.lock_path, "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                self.refresh()
+                if self.dimensions is None:
+                    self.dimensions = int(vectors.shape[1])
+                    with open(self.meta_path, "w") as f:
+                        json.dump({"dimensions": self.dimensions}, f)
+                elif vectors.shape[1] != self.dimensions:
+                    raise ValueError(
+                        f"Expected {self.dimensions}-dimensional vectors, got {vectors.shape[1]}"
+                    )
+
+                # First row of each key that is not stored yet
+                new: Dict[str, int] = {}
+                for index, key in enumerate(keys):
+                    if key not in self.rows and key not in new:
+                        new[key] = index
+                if not new:
+                    return
+                with open(self.vectors_path, "ab") as f:
+                    # Rows of an append interrupted before its keys were written are
+                    # dropped
+                    f.truncate(len(self.keys) * self.dimensions * 4)
+                    f.write(
+                        np.ascontiguousarray(
+                            vectors[list(new.values())], dtype=VECTOR_DTYPE
+                        ).tobytes()
+                    )
+                with open(self.keys_path, "ab") as f:
+                    f.write(b"".join(bytes.fromhex(key) for key in new))
+                self.refresh()
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+class VectorStore:
+    """Content-addressed store of unit-length embedding vectors."""
+
+    def __init__(self, root: str = None):
+        """Initialize the vector store.
+
+        Args:
+            root: Directory to store the collections in
+        """
+        _require_numpy()
+        self.root = root or settings.vector_store_dir
+        self._collections: Dict[str, _Collection] = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def _collection(self, model: str) -> _Collection:
+        """Get the collection of a model, with rows appended elsewhere picked up."""
+        with self._lock:
+            collection = self._collections.get(model)
+            if collection is None:
+                name = re.sub(r"[^A-Za-z0-9._-]", "_", model)
+                collection = self._collections[model] = _Collection(
+                    os.path.join(self.root, name)
+                )
+            collection.refresh()
+            return collection
+
+    def missing(self, model: str, keys: Sequence[str]) -> List[str]:
+        """Find the keys that have no stored vector.
+
+        Args:
+            model: Embedding model
+            keys: Content hashes
+
+        Returns:
+            Distinct missing keys, in order of first appearance
+        """
+        rows = self._collection(model).rows
+        return list(dict.fromkeys(key for key in keys if key not in rows))
+
+    def add(
+        self, model: str, keys: Sequence[str], vectors: Sequence[Sequence[float]]
+    ) -> None:
+        """Store vectors; keys that are already stored keep their vector.
+
+        Args:
+            model: Embedding model
+            keys: Content hashes
+            vectors: One vector per key
+        """
+        matrix = normalize(vectors)
+        collection = self._collection(model)
+        with self._lock:
+            collection.append(keys, matrix)
+
+    def get(self, model: str, keys: Sequence[str]) -> Any:
+        """Get stored vectors.
+
+        Args:
+            model: Embedding model
+            keys: Content hashes
+
+        Returns:
+            Array with one unit-length row per key
+
+        Raises:
+            KeyError: If a key has no stored vector
+        """
+        collection = self._collection(model)
+        return np.asarray(collection.vectors[[collection.rows[key] for key in keys]])
+
+    def search(
+        self,
+        model: str,
+        query: Any,
+        k: int = 5,
+        keys: Sequence[str] = None,
+        min_score: float = None,
+    ) -> List[Tuple[str, float]]:
+        """Find the stored vectors most similar to a query vector.
+
+        Args:
+            model: Embedding model
+            query: Query vector
+            k: Number of results
+            keys: Only consider these content hashes (default: the whole collection)
+            min_score: Leave out results with a lower cosine similarity
+
+        Returns:
+            Content hashes and cosine similarities, most similar first
+        """
+        collection = self._collection(model)
+        if collection.vectors is None or k <= 0:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        if keys is None:
+            candidates = collection.keys
+            scores = collection.vectors @ query
+        else:
+            candidates = list(keys)
+            scores = self.get(model, candidates) @ query
+
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            (candidates[index], float(scores[index]))
+            for index in top
+            if min_score is None or scores[index] >= min_score
+        ]
+
+
+@lru_cache()
+def get_vector_store() -> VectorStore:
+    """Get the shared vector store.
+
+    Returns:
+        Vector store
+    """
+    return VectorStore()
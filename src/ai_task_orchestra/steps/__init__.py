@@ -0,0 +1 @@
+"""Step execution package for AI Task Orchestra."""
@@ -0,0 +1,62 @@
+"""Embedding and similarity search steps for AI Task Orchestra."""
+
+import logging
+from typing import Any, Dict, List
+
+from ai_task_orchestra.services.embedding_service import get_embedding_service
+
+logger = logging.getLogger(__name__)
+
+
+def _texts(value: Any) -> List[str]:
+    """Accept a single text or a list of texts."""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    return [str(item) for item in value]
+
+
+def ollama_embed(step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the ``ollama_embed`` step.
+
+    Texts whose vector is already stored are not sent to Ollama again.
+
+    Args:
+        step: Rendered step definition with ``input`` (a text or a list of texts)
+            and optional ``model``, ``batch_size`` and ``return_vectors``
+        context: Execution context
+
+    Returns:
+        Step result with the content hash of each input, which identifies its
+        vector in the vector store, and the vectors if requested
+    """
+    service = get_embedding_service()
+    result = service.embed(
+        _texts(step.get("input")), step.get("model"), step.get("batch_size")
+    )
+    if step.get("return_vectors"):
+        result["embeddings"] = service.vectors(result["model"], result["hashes"])
+    return result
+
+
+def similarity_search(step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the ``similarity_search`` step.
+
+    Args:
+        step: Rendered step definition with ``query`` and optional ``model``,
+            ``k`` (default: 5), ``candidates`` (texts to choose from; default:
+            everything embedded with the model) and ``min_score``
+        context: Execution context
+
+    Returns:
+        Step result with the matches, most similar first
+    """
+    candidates = step.get("candidates")
+    return get_embedding_service().search(
+        step["query"],
+        model=step.get("model"),
+        k=int(step.get("k") or 5),
+        candidates=_texts(candidates) if candidates is not None else None,
+        min_score=step.get("min_score"),
+    )
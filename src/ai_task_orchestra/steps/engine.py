@@ -0,0 +1,285 @@
+"""Step execution engine for AI Task Orchestra."""
+
+import logging
+import os
+import time
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from jinja2 import meta
+from jinja2.nativetypes import NativeEnvironment
+
+from ai_task_orchestra.metrics import STEP_DURATION
+from ai_task_orchestra.services.blob_store import load_blob_value, offload_large_values
+from ai_task_orchestra.services.template_service import Template
+from ai_task_orchestra.steps.embeddings import ollama_embed, similarity_search
+from ai_task_orchestra.steps.ollama import ollama_generate
+from ai_task_orchestra.steps.script import execute_script
+from ai_task_orchestra.steps.store_result import store_result
+from ai_task_orchestra.tracing import tracer
+
+logger = logging.getLogger(__name__)
+
+# A step handler receives the rendered step definition and the shared execution
+# context, and returns the step result.
+StepHandler = Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+
+STEP_HANDLERS: Dict[str, StepHandler] = {
+    "execute_script": execute_script,
+    "ollama_embed": ollama_embed,
+    "ollama_generate": ollama_generate,
+    "similarity_search": similarity_search,
+    "store_result": store_result,
+}
+
+# Native rendering keeps "{{input_files}}" a list instead of its string repr
+_jinja_env = NativeEnvironment()
+
+
+class LazyVariables:
+    """Template variables whose blob-referenced values are loaded on first use.
+
+    Large parameters arrive as blob references; they are only fetched when a step
+    that is actually executed refers to them, and at most once per task. Only the
+    references the API created are loaded: others were submitted by the client
+    and are passed on as they are.
+    """
+
+    def __init__(self, values: Dict[str, Any], offloaded: Iterable[str] = ()):
+        """Initialize the variables.
+
+        Args:
+            values: Variable values, possibly blob references
+            offloaded: Names of the variables the API replaced with blob references
+        """
+        self._values = values
+        self._offloaded = frozenset(offloaded)
+        self._loaded: Dict[str, Any] = {}
+
+    def get(self, name: str) -> Any:
+        """Get the value of a variable, loading it if necessary.
+
+        Args:
+            name: Name of the variable
+
+        Returns:
+            Variable value, or None if it is not defined
+        """
+        if name not in self._offloaded:
+            return self._values.get(name)
+        if name not in self._loaded:
+            self._loaded[name] = load_blob_value(self._values.get(name))
+        return self._loaded[name]
+
+
+@lru_cache(maxsize=1024)
+def _compile(source: str) -> Tuple[Any, FrozenSet[str]]:
+    """Compile a template string once per process.
+
+    Args:
+        source: Template source
+
+    Returns:
+        Compiled Jinja template and the names of the variables it uses
+    """
+    names = frozenset(meta.find_undeclared_variables(_jinja_env.parse(source)))
+    return _jinja_env.from_string(source), names
+
+
+def _expressions(value: Any) -> Iterator[str]:
+    """Find the template expressions in a step value."""
+    if isinstance(value, str):
+        if "{{" in value or "{%" in value:
+            yield value
+    elif isinstance(value, list):
+        for item in value:
+            yield from _expressions(item)
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _expressions(item)
+
+
+def precompile(templates: Iterable[Template]) -> int:
+    """Compile the template expressions of the given templates' steps ahead of use.
+
+    Workers call this before they fork their pool, so pool processes share the
+    compiled templates instead of compiling them on first use.
+
+    Args:
+        templates: Templates to compile
+
+    Returns:
+        Number of expressions compiled
+    """
+    compiled = 0
+    for template in templates:
+        for source in _expressions(template.steps):
+            try:
+                _compile(source)
+                compiled += 1
+            except Exception as e:
+                logger.warning(
+                    f"Template {template.name}: could not compile {source!r}: {e}"
+                )
+    return compiled
+
+
+def render_value(value: Any, variables: Any) -> Any:
+    """Render template expressions in a step value.
+
+    Args:
+        value: Value from the step definition
+        variables: Variables available to the template (anything with ``get``)
+
+    Returns:
+        Rendered value
+    """
+    if isinstance(value, str):
+        if "{{" not in value and "{%" not in value:
+            return value
+        template, names = _compile(value)
+        return template.render({name: variables.get(name) for name in names})
+    if isinstance(value, list):
+        return [render_value(item, variables) for item in value]
+    if isinstance(value, dict):
+        return {key: render_value(item, variables) for key, item in value.items()}
+    return value
+
+
+def run_steps(
+    task_id: str,
+    template: Template,
+    parameters: Dict[str, Any],
+    conversation: Optional[Dict[str, Any]] = None,
+    on_step: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    offloaded: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """Execute the steps of a template.
+
+    Args:
+        task_id: ID of the task
+        template: Template to execute
+        parameters: Parameters for the template
+        conversation: For tasks that reuse generation context, the ``session_id``
+            and ``depends_on`` task IDs whose stored context the task continues
+        on_step: Called with the index and result of each completed step
+        offloaded: Names of the parameters the API replaced with blob references
+
+    Returns:
+        Result of the execution with one entry per step
+    """
+    # Optional parameters that were not supplied render as None
+    variables = LazyVariables(parameters, offloaded or ())
+
+    context: Dict[str, Any] = {
+        "task_id": task_id,
+        "template": template.name,
+        "parameters": parameters,
+        "steps": [],
+        "cleanup": [],
+        # Spool files of script output by step index, removed after the run
+        "spool": {},
+        "conversation": conversation,
+        "semantic_cache": template.semantic_cache,
+    }
+    step_results: List[Dict[str, Any]] = context["steps"]
+
+    # A task missing a step would report results it did not produce
+    missing = [
+        step.get("type")
+        for step in template.steps
+        if step.get("type") not in STEP_HANDLERS
+    ]
+    if missing:
+        raise ValueError(
+            f"Template {template.name} uses step types that are not implemented: "
+            f"{', '.join(map(str, missing))}"
+        )
+
+    try:
+        for index, step in enumerate(template.steps):
+            step_type = step.get("type")
+            handler = STEP_HANDLERS[step_type]
+
+            logger.info(f"Task {task_id}: running step {index} ({step_type})")
+            with tracer.start_as_current_span(
+                f"step {step_type}",
+                attributes={"ato.step_index": index, "ato.step_type": step_type},
+            ):
+                rendered = render_value(step, variables)
+                started = time.monotonic()
+                result = handler(rendered, context)
+                duration = time.monotonic() - started
+            STEP_DURATION.labels(template=template.name, step_type=step_type).observe(
+                duration
+            )
+            # Large outputs travel as blob references, not through the result backend
+            result = offload_large_values(result)
+            step_results.append(
+                {
+                    "type": step_type,
+                    "status": "completed",
+                    "duration": duration,
+                    **result,
+                }
+            )
+            if on_step is not None:
+                on_step(index, step_results[-1])
+
+        output = step_results[-1] if step_results else {}
+        return {"steps": step_results, "output": output}
+    finally:
+        for path in context["cleanup"]:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+
+def collect_telemetry(step_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Summarize the telemetry of the executed steps.
+
+    Args:
+        step_results: Step results from :func:`run_steps`
+
+    Returns:
+        Per-step durations and the model timings summed over all generations
+    """
+    telemetry: Dict[str, Any] = {
+        "steps": [
+            {"type": result["type"], "duration": result["duration"]}
+            for result in step_results
+            if "duration" in result
+        ]
+    }
+    generations = [
+        result["telemetry"] for result in step_results if result.get("telemetry")
+    ]
+    if not generations:
+        return telemetry
+
+    for name in (
+        "total_duration",
+        "load_duration",
+        "prompt_eval_duration",
+        "eval_duration",
+    ):
+        telemetry[name] = sum(generation[name] or 0.0 for generation in generations)
+    for name in ("prompt_eval_count", "eval_count"):
+        telemetry[name] = sum(generation[name] or 0 for generation in generations)
+    telemetry["tokens_per_second"] = (
+        telemetry["eval_count"] / telemetry["eval_duration"]
+        if telemetry["eval_duration"]
+        else None
+    )
+    return telemetry
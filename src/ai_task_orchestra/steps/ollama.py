@@ -0,0 +1,181 @@
+"""Ollama generation step for AI Task Orchestra."""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.integrations.ollama import get_ollama_client
+from ai_task_orchestra.metrics import SEMANTIC_CACHE_REQUESTS
+from ai_task_orchestra.services.context_store import (
+    get_context_store,
+    session_context_key,
+    task_context_key,
+)
+from ai_task_orchestra.services.semantic_cache import cache_scope, get_semantic_cache
+
+logger = logging.getLogger(__name__)
+
+
+def _context_sources(context: Dict[str, Any]) -> List[str]:
+    """Get the stored contexts a task may continue from, in order of preference.
+
+    The session's latest context comes first, then the contexts of the task's
+    dependencies, the last listed first.
+    """
+    conversation = context["conversation"]
+    sources = []
+    if conversation.get("session_id"):
+        sources.append(session_context_key(conversation["session_id"]))
+    sources.extend(
+        task_context_key(task_id)
+        for task_id in reversed(conversation.get("depends_on") or [])
+    )
+    return sources
+
+
+def _initial_context(model: str, context: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Find the context a generation of a model continues from.
+
+    Within a task, a generation continues from the previous one of the same
+    model; the first one continues from a stored context.
+    """
+    previous = context.get("generation_context")
+    if previous and previous["model"] == model:
+        return {"name": "previous_step", "context": previous["context"]}
+    try:
+        return get_context_store().get(_context_sources(context), model)
+    except Exception as e:
+        logger.warning(f"Could not read stored contexts: {e}")
+        return None
+
+
+def _store_context(model: str, tokens: List[int], context: Dict[str, Any]) -> None:
+    """Keep the context of a generation for later steps and tasks."""
+    context["generation_context"] = {"model": model, "context": tokens}
+    names = [task_context_key(context["task_id"])]
+    session_id = context["conversation"].get("session_id")
+    if session_id:
+        names.append(session_context_key(session_id))
+    try:
+        get_context_store().put(names, model, tokens)
+    except Exception as e:
+        logger.warning(f"Could not store context of task {context['task_id']}: {e}")
+
+
+def _cache_lookup(
+    request: Dict[str, Any], context: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Look up the semantic cache of the template, counting the outcome.
+
+    Errors are logged and count as a miss that is not cached afterwards.
+    """
+    labels = {"template": context.get("template"), "model": request["model"]}
+    try:
+        cached = get_semantic_cache().lookup(
+            cache_scope(
+                context["template"],
+                request["model"],
+                request["system"],
+                request["options"],
+            ),
+            request["prompt"],
+            context["semantic_cache"],
+        )
+    except Exception as e:
+        logger.warning(f"Semantic cache lookup failed: {e}")
+        SEMANTIC_CACHE_REQUESTS.labels(result="error", **labels).inc()
+        return None
+    SEMANTIC_CACHE_REQUESTS.labels(
+        result="hit" if "response" in cached else "miss", **labels
+    ).inc()
+    return cached
+
+
+def _cache_store(
+    request: Dict[str, Any],
+    cached: Dict[str, Any],
+    response: Any,
+    context: Dict[str, Any],
+) -> None:
+    """Add a generated response to the semantic cache of the template."""
+    try:
+        get_semantic_cache().store(
+            cache_scope(
+                context["template"],
+                request["model"],
+                request["system"],
+                request["options"],
+            ),
+            cached["hash"],
+            cached["vector"],
+            {"model": response.model, "response": response.response},
+            context["semantic_cache"],
+        )
+    except Exception as e:
+        logger.warning(f"Could not add response to the semantic cache: {e}")
+
+
+def ollama_generate(step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the ``ollama_generate`` step.
+
+    For tasks that reuse context (see ``conversation`` in :func:`run_steps`) the
+    generation continues from the context of an earlier generation, and its own
+    context is stored for the steps and tasks after it.
+
+    Other tasks of templates with ``semantic_cache`` enabled return the cached
+    response of a sufficiently similar earlier prompt instead of generating.
+
+    Args:
+        step: Rendered step definition with ``model``, ``prompt`` and optional
+            ``system`` and ``options``
+        context: Execution context
+
+    Returns:
+        Step result with the generated response
+    """
+    model = step.get("model") or settings.ollama_default_model
+    request = {
+        "model": model,
+        "prompt": step["prompt"],
+        "system": step.get("system"),
+        "options": step.get("options"),
+    }
+    initial = _initial_context(model, context) if context.get("conversation") else None
+    if initial:
+        logger.info(
+            f"Continuing from context {initial['name']} ({len(initial['context'])} tokens)"
+        )
+        request["context"] = initial["context"]
+
+    # A cached response has no generation context to continue from, so
+    # conversations always generate
+    cache = context.get("semantic_cache")
+    cached = None
+    if cache is not None and cache.enabled and not context.get("conversation"):
+        cached = _cache_lookup(request, context)
+        if cached and "response" in cached:
+            logger.info(f"Semantic cache hit (similarity {cached['score']:.3f})")
+            return {
+                "model": cached["response"]["model"],
+                "response": cached["response"]["response"],
+                "cache": {
+                    "hit": True,
+                    "score": cached["score"],
+                    "matched": cached["matched"],
+                },
+            }
+
+    response = get_ollama_client().generate_sync(request)
+    result = {
+        "model": response.model,
+        "response": response.response,
+        "telemetry": response.telemetry(),
+    }
+    if cached:
+        result["cache"] = {"hit": False}
+        _cache_store(request, cached, response, context)
+    if initial:
+        result["context_tokens"] = len(initial["context"])
+    if context.get("conversation") and response.context:
+        _store_context(model, response.context, context)
+    return result
@@ -0,0 +1,385 @@
+"""Sandboxed script execution step for AI Task Orchestra."""
+
+import ctypes
+import logging
+import os
+import resource
+import shlex
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from ai_task_orchestra.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Environment variables passed through to scripts; everything else (including
+# API keys) is withheld from the child process.
+SAFE_ENV_VARS = ("PATH", "HOME", "LANG", "LC_ALL", "TMPDIR", "TZ")
+
+# Number of trailing output bytes kept inline in the step result
+TAIL_BYTES = 4096
+
+# Seconds between SIGTERM and SIGKILL when tearing down a process tree
+KILL_GRACE_PERIOD = 5.0
+
+POLL_INTERVAL = 0.1
+
+PR_SET_PDEATHSIG = 1
+
+try:
+    _libc = (
+        ctypes.CDLL(None, use_errno=True) if sys.platform.startswith("linux") else None
+    )
+except OSError:
+    _libc = None
+
+
+class ScriptCancelled(Exception):
+    """Raised when a running script is cancelled."""
+
+
+class ScriptLimits(BaseModel):
+    """Resource limits applied to a script."""
+
+    timeout: float = settings.script_timeout
+    cpu_seconds: int = settings.script_cpu_limit
+    memory_mb: int = settings.script_memory_limit_mb
+    output_mb: int = settings.script_output_limit_mb
+    max_processes: int = settings.script_max_processes
+
+
+class ScriptRunner:
+    """Run scripts in their own session with resource limits.
+
+    Output is streamed straight from the child's file descriptors into spool files,
+    so the worker never holds it in memory. CPU, memory and output size are capped
+    with rlimits; when a cgroup v2 root is configured the limits are additionally
+    enforced for the whole process tree.
+    """
+
+    def __init__(
+        self,
+        limits: ScriptLimits = None,
+        spool_dir: str = None,
+        cgroup_root: str = None,
+    ):
+        """Initialize the script runner.
+
+        Args:
+            limits: Resource limits
+            spool_dir: Directory for captured output
+            cgroup_root: Delegated cgroup v2 directory to create per-run cgroups in
+        """
+        self.limits = limits or ScriptLimits()
+        self.spool_dir = spool_dir or settings.script_spool_dir or tempfile.gettempdir()
+        self.cgroup_root = (
+            cgroup_root if cgroup_root is not None else settings.script_cgroup_root
+        )
+        os.makedirs(self.spool_dir, exist_ok=True)
+
+    def run(
+        self,
+        command: List[str],
+        cwd: str,
+        env: Optional[Dict[str, str]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        name: str = "script",
+    ) -> Dict[str, Any]:
+        """Run a command to completion, timeout or cancellation.
+
+        Args:
+            command: Command and arguments
+            cwd: Working directory
+            env: Additional environment variables
+            cancel_event: Event that cancels the run when set
+            name: Prefix for the spool files
+
+        Returns:
+            Run result with exit code, status and spooled output locations
+
+        Raises:
+            ScriptCancelled: If the run was cancelled
+        """
+        cancel_event = cancel_event or threading.Event()
+        stdout_path = self._spool_path(name, "stdout")
+        stderr_path = self._spool_path(name, "stderr")
+        cgroup = self._create_cgroup()
+
+        child_env = {key: os.environ[key] for key in SAFE_ENV_VARS if key in os.environ}
+        child_env.update(env or {})
+
+        logger.info(f"Running script: {shlex.join(command)} (cwd={cwd})")
+        started = time.monotonic()
+        status = None
+
+        try:
+            with open(stdout_path, "wb") as stdout, open(stderr_path, "wb") as stderr:
+                process = subprocess.Popen(
+                    command,
+                    cwd=cwd,
+                    env=child_env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=stdout,
+                    stderr=stderr,
+                    start_new_session=True,
+                    preexec_fn=lambda: self._setup_child(cgroup),
+                )
+        except OSError:
+            self._remove_cgroup(cgroup)
+            raise
+
+        try:
+            with _cancel_on_signal(cancel_event):
+                while process.poll() is None:
+                    if cancel_event.is_set():
+                        status = "cancelled"
+                        break
+                    if time.monotonic() - started > self.limits.timeout:
+                        status = "timeout"
+                        break
+                    if (
+                        cgroup
+                        and self._cgroup_cpu_seconds(cgroup) > self.limits.cpu_seconds
+                    ):
+                        status = "cpu_limit_exceeded"
+                        break
+                    try:
+                        process.wait(timeout=POLL_INTERVAL)
+                    except subprocess.TimeoutExpired:
+                        pass
+        finally:
+            # Whatever happened above, no part of the tree may outlive the run
+            self._kill_tree(process, cgroup)
+            self._remove_cgroup(cgroup)
+
+        duration = time.monotonic() - started
+        returncode = process.returncode
+        stdout_bytes = os.path.getsize(stdout_path)
+        stderr_bytes = os.path.getsize(stderr_path)
+        if status is None:
+            status = self._status_from_returncode(returncode)
+        if (
+            status == "failed"
+            and max(stdout_bytes, stderr_bytes) >= self.limits.output_mb * 1024 * 1024
+        ):
+            # Interpreters that ignore SIGXFSZ fail with EFBIG instead
+            status = "output_limit_exceeded"
+
+        result = {
+            "status": status,
+            "exit_code": returncode,
+            "duration": duration,
+            "stdout_path": stdout_path,
+            "stderr_path": stderr_path,
+            "stdout_bytes": stdout_bytes,
+            "stderr_bytes": stderr_bytes,
+            "stdout_tail": _read_tail(stdout_path),
+            "stderr_tail": _read_tail(stderr_path),
+        }
+        logger.info(
+            f"Script finished with status {status} (exit code {returncode}) in {duration:.2f}s"
+        )
+
+        if status == "cancelled":
+            raise ScriptCancelled(f"Script cancelled after {duration:.2f}s")
+        return result
+
+    def _spool_path(self, name: str, stream: str) -> str:
+        """Build a unique spool file path."""
+        return os.path.join(self.spool_dir, f"{name}-{uuid.uuid4().hex}.{stream}")
+
+    def _setup_child(self, cgroup: Optional[str]) -> None:
+        """Apply limits in the child between fork and exec."""
+        memory = self.limits.memory_mb * 1024 * 1024
+        output = self.limits.output_mb * 1024 * 1024
+        resource.setrlimit(
+            resource.RLIMIT_CPU, (self.limits.cpu_seconds, self.limits.cpu_seconds + 5)
+        )
+        resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        # Caps the spool files: writes past the limit raise SIGXFSZ in the child
+        resource.setrlimit(resource.RLIMIT_FSIZE, (output, output))
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if _libc is not None:
+            # Kill the script if the worker child dies hard (e.g. task_time_limit)
+            _libc.prctl(PR_SET_PDEATHSIG, signal.SIGKILL)
+        if cgroup:
+            with open(os.path.join(cgroup, "cgroup.procs"), "w") as f:
+                f.write("0")
+
+    def _status_from_returncode(self, returncode: int) -> str:
+        """Map an exit code to a run status."""
+        if returncode == 0:
+            return "completed"
+        if returncode == -signal.SIGXFSZ:
+            return "output_limit_exceeded"
+        if returncode == -signal.SIGXCPU:
+            return "cpu_limit_exceeded"
+        return "failed"
+
+    def _create_cgroup(self) -> Optional[str]:
+        """Create a per-run cgroup if a delegated cgroup v2 root is configured."""
+        if not self.cgroup_root:
+            return None
+        path = os.path.join(self.cgroup_root, f"ato-{uuid.uuid4().hex}")
+        try:
+            os.mkdir(path)
+            _write_cgroup(path, "memory.max", str(self.limits.memory_mb * 1024 * 1024))
+            _write_cgroup(path, "memory.swap.max", "0")
+            _write_cgroup(path, "pids.max", str(self.limits.max_processes))
+            return path
+        except OSError as e:
+            logger.warning(
+                f"Could not set up cgroup under {self.cgroup_root}, using rlimits only: {e}"
+            )
+            self._remove_cgroup(path)
+            return None
+
+    def _cgroup_cpu_seconds(self, cgroup: str) -> float:
+        """Read the CPU time consumed by the whole tree."""
+        try:
+            with open(os.path.join(cgroup, "cpu.stat")) as f:
+                for line in f:
+                    key, _, value = line.partition(" ")
+                    if key == "usage_usec":
+                        return int(value) / 1_000_000
+        except OSError:
+            pass
+        return 0.0
+
+    def _kill_tree(self, process: subprocess.Popen, cgroup: Optional[str]) -> None:
+        """Terminate every process started by the script."""
+        if cgroup:
+            # cgroup.kill also reaches descendants that left the process group
+            if _write_cgroup(cgroup, "cgroup.kill", "1"):
+                process.wait()
+                return
+
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            process.wait()
+            return
+        try:
+            process.wait(timeout=KILL_GRACE_PERIOD)
+        except subprocess.TimeoutExpired:
+            pass
+        # Stragglers left in the group after the leader exited get no second chance
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        process.wait()
+
+    def _remove_cgroup(self, cgroup: Optional[str]) -> None:
+        """Remove a per-run cgroup once it is empty."""
+        if not cgroup:
+            return
+        for _ in range(50):
+            try:
+                os.rmdir(cgroup)
+                return
+            except FileNotFoundError:
+                return
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+        logger.warning(f"Could not remove cgroup {cgroup}")
+
+
+def _write_cgroup(cgroup: str, name: str, value: str) -> bool:
+    """Write a cgroup control file, returning False if it is unsupported."""
+    try:
+        with open(os.path.join(cgroup, name), "w") as f:
+            f.write(value)
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _read_tail(path: str, size: int = TAIL_BYTES) -> str:
+    """Read the last bytes of a file as text."""
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - size))
+        return f.read().decode("utf-8", errors="replace")
+
+
+@contextmanager
+def _cancel_on_signal(cancel_event: threading.Event) -> Iterator[None]:
+    """Turn SIGTERM (e.g. a revoke with terminate=True) into a cancellation."""
+    if threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    previous = signal.signal(signal.SIGTERM, lambda signum, frame: cancel_event.set())
+    try:
+        yield
+    finally:
+        signal.signal(signal.SIGTERM, previous)
+
+
+def _build_command(script_path: str, args: Optional[str]) -> List[str]:
+    """Build the command line for a script."""
+    arguments = shlex.split(args) if args else []
+    if script_path.endswith(".py"):
+        return [sys.executable, script_path] + arguments
+    if script_path.endswith(".sh") or not os.access(script_path, os.X_OK):
+        return ["/bin/sh", script_path] + arguments
+    return [script_path] + arguments
+
+
+def execute_script(step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the ``execute_script`` step.
+
+    Args:
+        step: Rendered step definition with ``script`` and optional ``args``,
+            ``timeout``, ``env`` and ``allow_failure``
+        context: Execution context
+
+    Returns:
+        Step result
+
+    Raises:
+        ValueError: If the script path escapes the working directory
+        RuntimeError: If the script does not complete successfully
+    """
+    workdir = os.path.realpath(context.get("workdir") or settings.script_workdir)
+    script_path = os.path.realpath(os.path.join(workdir, step["script"]))
+    if os.path.commonpath([workdir, script_path]) != workdir:
+        raise ValueError(f"Script '{step['script']}' is outside the working directory")
+    if not os.path.isfile(script_path):
+        raise ValueError(f"Script '{step['script']}' not found")
+
+    limits = ScriptLimits()
+    if step.get("timeout"):
+        # Templates may tighten the wall-clock limit, never extend it
+        limits.timeout = min(float(step["timeout"]), limits.timeout)
+
+    runner = ScriptRunner(limits=limits)
+    result = runner.run(
+        _build_command(script_path, step.get("args")),
+        cwd=workdir,
+        env=step.get("env"),
+        cancel_event=context.get("cancel_event"),
+        name=context["task_id"],
+    )
+    # The spool files are removed after the run, so their paths stay out of the
+    # stored result; a following store_result step uploads them
+    spool = {"stdout": result.pop("stdout_path"), "stderr": result.pop("stderr_path")}
+    context["spool"][len(context["steps"])] = spool
+    context["cleanup"].extend(spool.values())
+
+    if result["status"] != "completed" and not step.get("allow_failure"):
+        raise RuntimeError(
+            f"Script {step['script']} {result['status']} (exit code {result['exit_code']}): "
+            f"{result['stderr_tail'][-500:]}"
+        )
+    return result
@@ -0,0 +1,50 @@
+"""Result storage step for AI Task Orchestra."""
+
+import json
+import logging
+import os
+from typing import Any, Dict
+
+from ai_task_orchestra.services.blob_store import get_blob_store, is_blob_ref
+
+logger = logging.getLogger(__name__)
+
+
+def store_result(step: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    """Execute the ``store_result`` step.
+
+    Stores the output of the previous step in the blob store. Spooled script
+    output is streamed from disk; other results are stored as JSON. Only the
+    blob references end up in the task result.
+
+    Args:
+        step: Rendered step definition with an optional ``path`` naming the result
+        context: Execution context
+
+    Returns:
+        Step result with the references of the stored outputs
+    """
+    store = get_blob_store()
+    if not context["steps"]:
+        raise ValueError("store_result requires a preceding step with output")
+    index = len(context["steps"]) - 1
+    previous = context["steps"][index]
+    spool = context["spool"].get(index, {})
+
+    stored: Dict[str, Any] = {}
+    for stream in ("stdout", "stderr"):
+        spool_path = spool.get(stream)
+        if spool_path and os.path.exists(spool_path):
+            stored[stream] = store.put_file(spool_path, "text/plain; charset=utf-8")
+
+    if not stored:
+        if is_blob_ref(previous.get("output")):
+            stored["output"] = previous["output"]
+        else:
+            data = json.dumps(previous).encode("utf-8")
+            stored["output"] = store.put(data, "application/json")
+
+    logger.info(
+        f"Task {context['task_id']}: stored result {step.get('path') or ''}".rstrip()
+    )
+    return {"path": step.get("path"), "stored": stored}
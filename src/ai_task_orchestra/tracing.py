@@ -0,0 +1,260 @@
+"""Distributed tracing for AI Task Orchestra.
+
+Spans follow a task from the API request that creates it, through the broker
+(the trace context travels in the Celery message headers) into the worker, its
+steps and the Ollama calls they make. Tracing uses OpenTelemetry: without the
+SDK (the ``tracing`` extra) or with ``TRACING_EXPORTER=none`` every span is a
+no-op.
+"""
+
+import importlib.util
+import logging
+import os
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Mapping,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from opentelemetry import propagate, trace
+from opentelemetry.context import Context
+from opentelemetry.trace import SpanKind, Status, StatusCode
+
+from ai_task_orchestra.config import settings
+
+try:
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        SpanExporter,
+        SpanExportResult,
+    )
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+except ImportError:  # pragma: no cover - optional dependency
+    TracerProvider = None
+    ReadableSpan = Any
+    SpanExporter = object
+
+logger = logging.getLogger(__name__)
+
+# Spans are created through the proxy tracer, which stays a no-op until
+# setup_tracing() installs a provider
+tracer = trace.get_tracer("ai_task_orchestra")
+
+# Recent FastAPI releases create request spans themselves once a tracer
+# provider is installed; older ones need tracing_middleware
+FASTAPI_TRACES_REQUESTS = importlib.util.find_spec("fastapi.telemetry") is not None
+
+_provider: Optional[Any] = None
+
+
+class FileSpanExporter(SpanExporter):
+    """Append finished spans to a file as JSON lines for offline analysis.
+
+    Each batch is written with a single append, so the API and several worker
+    processes can share one file.
+    """
+
+    def __init__(self, path: str):
+        """Initialize the exporter.
+
+        Args:
+            path: File to append spans to
+        """
+        self.path = path
+
+    def export(self, spans: Sequence[ReadableSpan]) -> Any:
+        """Write a batch of spans.
+
+        Args:
+            spans: Finished spans
+
+        Returns:
+            Export result
+        """
+        data = "".join(span.to_json(indent=None) + "\n" for span in spans).encode(
+            "utf-8"
+        )
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        except OSError as e:
+            logger.warning(f"Could not write spans to {self.path}: {e}")
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        """Shut down the exporter."""
+
+
+def setup_tracing(service_name: str) -> bool:
+    """Install the tracer provider of this process.
+
+    Call this once per process; in the worker, after the pool forks, since the
+    span processor runs a background thread.
+
+    Args:
+        service_name: Service name recorded on the spans
+
+    Returns:
+        True if tracing is enabled
+
+    Raises:
+        ValueError: If the configured exporter is unknown
+    """
+    global _provider
+    exporter_name = settings.tracing_exporter.lower()
+    if exporter_name == "none" or _provider is not None:
+        return _provider is not None
+    if TracerProvider is None:
+        logger.warning(
+            "TRACING_EXPORTER is set but opentelemetry-sdk is not installed; tracing is disabled"
+        )
+        return False
+
+    if exporter_name == "otlp":
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import (
+                OTLPSpanExporter,
+            )
+        except ImportError:
+            logger.warning(
+                "opentelemetry-exporter-otlp-proto-http is not installed; tracing is disabled"
+            )
+            return False
+        exporter = OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint)
+    elif exporter_name == "file":
+        exporter = FileSpanExporter(settings.tracing_file_path)
+    else:
+        raise ValueError(f"Unknown tracing exporter: {settings.tracing_exporter}")
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": service_name}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(BatchSpanProcessor(exporter))
+    trace.set_tracer_provider(provider)
+    _provider = provider
+    logger.info(f"Tracing enabled for {service_name} ({exporter_name} exporter)")
+    return True
+
+
+def shutdown_tracing() -> None:
+    """Export pending spans and stop the tracer provider of this process."""
+    global _provider
+    if _provider is not None:
+        _provider.shutdown()
+        _provider = None
+
+
+def inject_context(headers: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the current trace context to outgoing message headers.
+
+    Args:
+        headers: Headers, updated in place
+
+    Returns:
+        The headers
+    """
+    propagate.inject(headers)
+    return headers
+
+
+def extract_context(carrier: Mapping[str, Any]) -> Context:
+    """Get the trace context sent along with a request or message.
+
+    Args:
+        carrier: Headers carrying the context
+
+    Returns:
+        Trace context (empty if none was sent)
+    """
+    return propagate.extract(
+        {name: value for name, value in carrier.items() if value is not None}
+    )
+
+
+def propagation_fields() -> Set[str]:
+    """Get the names of the headers that carry the trace context.
+
+    Returns:
+        Header names
+    """
+    return set(propagate.get_global_textmap().fields)
+
+
+def record_error(span: Any, error: BaseException) -> None:
+    """Mark a span as failed.
+
+    Args:
+        span: Span
+        error: Exception that failed the operation
+    """
+    span.record_exception(error)
+    span.set_status(Status(StatusCode.ERROR, str(error)))
+
+
+def record_phases(
+    parent: Any, phases: Sequence[Tuple[str, Optional[float]]], end_time: int = None
+) -> None:
+    """Add child spans for consecutive phases timed by another service.
+
+    The phases are laid out back to back so that the last one ends at
+    ``end_time``; e.g. the model load, prompt evaluation and generation that
+    Ollama reports for a request.
+
+    Args:
+        parent: Span the phases belong to
+        phases: Phase names and durations in seconds, in order; None durations are
+            skipped
+        end_time: End of the last phase in nanoseconds since the epoch (default: now)
+    """
+    end = end_time or time.time_ns()
+    context = trace.set_span_in_context(parent)
+    for name, duration in reversed(phases):
+        if duration is None:
+            continue
+        start = end - int(duration * 1e9)
+        tracer.start_span(name, context=context, start_time=start).end(end_time=end)
+        end = start
+
+
+async def tracing_middleware(
+    request: Any, call_next: Callable[[Any], Awaitable[Any]]
+) -> Any:
+    """Trace each API request as a server span.
+
+    Args:
+        request: Incoming request
+        call_next: Next handler
+
+    Returns:
+        Response
+    """
+    method = request.method
+    with tracer.start_as_current_span(
+        f"{method} {request.url.path}",
+        context=extract_context(request.headers),
+        kind=SpanKind.SERVER,
+        attributes={"http.request.method": method, "url.path": request.url.path},
+    ) as span:
+        response = await call_next(request)
+        route = request.scope.get("route")
+        if route is not None:
+            span.update_name(f"{method} {route.path}")
+            span.set_attribute("http.route", route.path)
+        span.set_attribute("http.response.status_code", response.status_code)
+        if response.status_code >= 500:
+            span.set_status(Status(StatusCode.ERROR))
+        return response
@@ -1,11 +1,55 @@
 """Celery worker for AI Task Orchestra."""
 
+import gc
 import logging
+import os
+import time
+from datetime import datetime
 from typing import Any, Dict
 
 from celery import Celery
+from celery.signals import (
+    task_revoked,
+    worker_before_create_process,
+    worker_init,
+    worker_process_init,
+    worker_process_shutdown,
+    worker_ready,
+    worker_shutdown,
+)
 
 from ai_task_orchestra.config import settings
+from ai_task_orchestra.integrations.ollama import get_ollama_client
+from ai_task_orchestra.metrics import (
+    QUEUE_WAIT,
+    TASK_DURATION,
+    TASKS_SHED,
+    mark_process_dead,
+    remove_worker,
+    start_worker_exporter,
+    start_worker_heartbeat,
+    track_dequeued,
+    track_finished,
+    track_started,
+)
+from ai_task_orchestra.serialization import register_serializers
+from ai_task_orchestra.services.event_stream import (
+    COMPLETED,
+    FAILED,
+    RUNNING,
+    STEP,
+    publish_event,
+)
+from ai_task_orchestra.services.task_state import update_task_state
+from ai_task_orchestra.tracing import (
+    SpanKind,
+    extract_context,
+    propagation_fields,
+    record_error,
+    setup_tracing,
+    shutdown_tracing,
+    tracer,
+)
 
 # Configure logging
 logging.basicConfig(
@@ -14,15 +58,43 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Register compact serializers before the app resolves its configuration
+register_serializers()
+
 # Create Celery app
-celery_app = Celery("ai_task_orchestra", broker=settings.redis_url, backend=settings.redis_url)
+celery_app = Celery(
+    "ai_task_orchestra", broker=settings.redis_url, backend=settings.redis_url
+)
 
 # Configure Celery
 celery_app.conf.update(**settings.dict_for_celery())
 
 
-@celery_app.task(name="ai_task_orchestra.execute_task")
-def execute_task(task_id: str, template_name: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
+def _timestamp(value: float) -> str:
+    """Format a Unix timestamp like the task records do."""
+    return datetime.utcfromtimestamp(value).isoformat() + "Z"
+
+
+def _report_state(task_id: str, **fields: Any) -> None:
+    """Report task state to the API without failing the task if Redis is down."""
+    try:
+        update_task_state(task_id, **fields)
+    except Exception as e:
+        logger.warning(f"Could not report state of task {task_id}: {e}")
+
+
+def _header(request: Any, name: str) -> Any:
+    """Read a custom message header from a task request."""
+    value = getattr(request, name, None)
+    if value is None:
+        value = (getattr(request, "headers", None) or {}).get(name)
+    return value
+
+
+@celery_app.task(name="ai_task_orchestra.execute_task", bind=True)
+def execute_task(
+    self: Any, task_id: str, template_name: str, parameters: Dict[str, Any]
+) -> Dict[str, Any]:
     """Execute a task.
 
     Args:
@@ -34,29 +106,189 @@ def execute_task(task_id: str, template_name: str, parameters: Dict[str, Any]) -
         Task result
     """
     logger.info(f"Executing task {task_id} with template {template_name}")
-    
-    try:
-        # TODO: Implement task execution logic
-        # 1. Load template
-        # 2. Validate parameters
-        # 3. Execute steps
-        # 4. Return result
-        
-        # Placeholder implementation
-        return {
-            "task_id": task_id,
-            "status": "completed",
-            "result": {
-                "output": f"Executed task with template {template_name}",
-            },
-        }
-    except Exception as e:
-        logger.error(f"Error executing task {task_id}: {e}")
-        return {
-            "task_id": task_id,
-            "status": "failed",
-            "error": str(e),
-        }
+    started_at = time.time()
+    started = time.monotonic()
+
+    model = _header(self.request, "ato_model")
+    tags = _header(self.request, "ato_tags")
+    track_dequeued(
+        _header(self.request, "ato_priority"),
+        model,
+        _header(self.request, "ato_dispatch_seq"),
+    )
+    model = model or "none"
+    track_started(model, task_id)
+
+    telemetry: Dict[str, Any] = {}
+    enqueued_at = _header(self.request, "ato_enqueued_at")
+    if enqueued_at:
+        telemetry["queue_wait"] = max(started_at - enqueued_at, 0.0)
+        QUEUE_WAIT.labels(template=template_name, model=model).observe(
+            telemetry["queue_wait"]
+        )
+
+    deadline = _header(self.request, "ato_deadline")
+    max_queue_wait = _header(self.request, "ato_max_queue_wait")
+    if deadline or max_queue_wait:
+        from ai_task_orchestra.services.deadlines import shed_message, shed_reason
+
+        queued_at = _header(self.request, "ato_created_at") or enqueued_at or started_at
+        reason = shed_reason(
+            template_name, model, deadline, queued_at, max_queue_wait, now=started_at
+        )
+        if reason:
+            logger.warning(f"Shedding task {task_id}: {reason}")
+            track_finished(model, task_id)
+            TASKS_SHED.labels(template=template_name, reason=reason).inc()
+            outcome = {
+                "task_id": task_id,
+                "status": "failed",
+                "error": shed_message(reason),
+                "telemetry": telemetry,
+            }
+            _report_state(
+                task_id,
+                status="failed",
+                completed_at=_timestamp(started_at),
+                error=outcome["error"],
+                shed=reason,
+                telemetry=telemetry,
+            )
+            publish_event(
+                FAILED,
+                task_id,
+                template_name,
+                tags,
+                error=outcome["error"],
+                shed=reason,
+            )
+            return outcome
+
+    _report_state(
+        task_id,
+        status="running",
+        started_at=_timestamp(started_at),
+        worker=self.request.hostname,
+        telemetry=telemetry,
+    )
+    publish_event(
+        RUNNING, task_id, template_name, tags, worker=self.request.hostname, model=model
+    )
+
+    # Import here so the API process, which imports this module to publish
+    # tasks, does not load the step engine
+    from ai_task_orchestra.services.stats_service import get_stats_service
+    from ai_task_orchestra.services.template_service import get_template_service
+    from ai_task_orchestra.steps.engine import collect_telemetry, run_steps
+    from ai_task_orchestra.steps.script import ScriptCancelled
+
+    parent = extract_context(
+        {name: _header(self.request, name) for name in propagation_fields()}
+    )
+    if enqueued_at:
+        # Time spent in the broker, as its own span of the task's trace
+        tracer.start_span(
+            "queue_wait",
+            context=parent,
+            kind=SpanKind.CONSUMER,
+            start_time=int(enqueued_at * 1e9),
+        ).end(end_time=int(started_at * 1e9))
+
+    with tracer.start_as_current_span(
+        "execute_task",
+        context=parent,
+        kind=SpanKind.CONSUMER,
+        attributes={
+            "ato.task_id": task_id,
+            "ato.template": template_name,
+            "ato.model": model,
+        },
+    ) as span:
+        try:
+            template = get_template_service().get_template(template_name)
+            conversation = _header(self.request, "ato_conversation")
+
+            def on_step(index: int, step_result: Dict[str, Any]) -> None:
+                publish_event(
+                    STEP,
+                    task_id,
+                    template_name,
+                    tags,
+                    step=index,
+                    steps=len(template.steps),
+                    step_type=step_result["type"],
+                    duration=step_result["duration"],
+                )
+
+            result = run_steps(
+                task_id,
+                template,
+                parameters,
+                conversation=conversation,
+                on_step=on_step,
+                offloaded=_header(self.request, "ato_offloaded"),
+            )
+
+            outcome = {
+                "task_id": task_id,
+                "status": "completed",
+                "result": result,
+            }
+            telemetry.update(collect_telemetry(result["steps"]))
+        except ScriptCancelled as e:
+            logger.warning(f"Task {task_id} cancelled: {e}")
+            outcome = {
+                "task_id": task_id,
+                "status": "cancelled",
+                "error": str(e),
+            }
+        except Exception as e:
+            logger.error(f"Error executing task {task_id}: {e}")
+            record_error(span, e)
+            outcome = {
+                "task_id": task_id,
+                "status": "failed",
+                "error": str(e),
+            }
+
+        span.set_attribute("ato.status", outcome["status"])
+
+    track_finished(model, task_id)
+    finished_at = time.time()
+    telemetry["execution_time"] = time.monotonic() - started
+    if enqueued_at:
+        telemetry["latency"] = max(finished_at - enqueued_at, 0.0)
+    outcome["telemetry"] = telemetry
+
+    TASK_DURATION.labels(template=template_name, status=outcome["status"]).observe(
+        telemetry["execution_time"]
+    )
+    _report_state(
+        task_id,
+        status=outcome["status"],
+        completed_at=_timestamp(finished_at),
+        result=outcome.get("result"),
+        error=outcome.get("error"),
+        telemetry=telemetry,
+    )
+    if outcome["status"] == "completed":
+        publish_event(
+            COMPLETED,
+            task_id,
+            template_name,
+            tags,
+            execution_time=telemetry["execution_time"],
+        )
+        try:
+            get_stats_service().record(
+                model, template_name, telemetry, timestamp=finished_at
+            )
+        except Exception as e:
+            logger.warning(f"Could not record stats for task {task_id}: {e}")
+    elif outcome["status"] == "failed":
+        publish_event(FAILED, task_id, template_name, tags, error=outcome["error"])
+    # Cancellations are announced by the API when it revokes the task
+    return outcome
 
 
 @celery_app.task(name="ai_task_orchestra.ollama_generate")
@@ -72,33 +304,17 @@ def ollama_generate(model: str, prompt: str, system: str = None) -> Dict[str, An
         Generation result
     """
     logger.info(f"Generating text with model {model}")
-    
+
     try:
-        # Import here to avoid circular imports
-        import httpx
-        
-        # Create request payload
-        payload = {
-            "model": model,
-            "prompt": prompt,
-        }
-        
-        if system:
-            payload["system"] = system
-        
-        # Send request to Ollama API
-        with httpx.Client(timeout=60.0) as client:
-            response = client.post(
-                f"{settings.ollama_api_base_url}/api/generate",
-                json=payload,
-            )
-            response.raise_for_status()
-            result = response.json()
-        
+        response = get_ollama_client().generate_sync(
+            {"model": model, "prompt": prompt, "system": system or None}
+        )
+
         return {
             "model": model,
-            "response": result.get("response", ""),
+            "response": response.response,
             "status": "completed",
+            "telemetry": response.telemetry(),
         }
     except Exception as e:
         logger.error(f"Error generating text with model {model}: {e}")
@@ -109,5 +325,100 @@ def ollama_generate(model: str, prompt: str, system: str = None) -> Dict[str, An
         }
 
 
+@worker_init.connect
+def _start_metrics_exporter(**kwargs: Any) -> None:
+    """Serve worker metrics from the main worker process."""
+    start_worker_exporter()
+
+
+@worker_init.connect
+def _preload(**kwargs: Any) -> None:
+    """Build read-only worker state in the main process, before the pool is forked.
+
+    Pool processes share it copy-on-write instead of each building it again,
+    including the ones that replace recycled processes. Nothing holding sockets
+    or threads (HTTP and Redis clients) is built here.
+    """
+    if not settings.worker_preload:
+        return
+    started = time.monotonic()
+    from ai_task_orchestra.services.template_service import get_template_service
+    from ai_task_orchestra.steps.engine import precompile
+
+    templates = get_template_service().get_templates()
+    compiled = precompile(templates)
+    logger.info(
+        f"Preloaded {len(templates)} templates and {compiled} template expressions "
+        f"in {time.monotonic() - started:.3f}s"
+    )
+
+
+@worker_before_create_process.connect
+def _freeze_shared_state(**kwargs: Any) -> None:
+    """Keep the garbage collector of pool processes off the preloaded objects.
+
+    A collection writes to every object it tracks, which would copy the shared
+    pages into each process.
+    """
+    if settings.worker_preload:
+        gc.freeze()
+
+
+@worker_ready.connect
+def _start_heartbeat(sender: Any = None, **kwargs: Any) -> None:
+    """Announce the worker and its pool size, for queue wait estimates."""
+    if sender is not None:
+        # The pool size changes under --autoscale
+        pool = sender.controller.pool
+        start_worker_heartbeat(sender.hostname, lambda: pool.num_processes)
+
+
+@worker_shutdown.connect
+def _remove_worker(sender: Any = None, **kwargs: Any) -> None:
+    """Withdraw the worker's pool from the queue wait estimates."""
+    if sender is None:
+        return
+    try:
+        remove_worker(sender.hostname)
+    except Exception as e:
+        logger.warning(f"Could not remove worker registration: {e}")
+
+
+@worker_process_init.connect
+def _start_tracing(**kwargs: Any) -> None:
+    """Install the tracer provider in each pool process after the fork."""
+    setup_tracing("ai-task-orchestra-worker")
+
+
+@worker_process_shutdown.connect
+def _mark_metrics_process_dead(pid: int = None, **kwargs: Any) -> None:
+    """Drop the metrics of an exiting pool process and flush its spans."""
+    mark_process_dead(pid or os.getpid())
+    shutdown_tracing()
+
+
+@task_revoked.connect
+def _record_revoked(
+    request: Any = None, terminated: bool = False, **kwargs: Any
+) -> None:
+    """Keep the queue depth and running task counts accurate for revoked tasks.
+
+    Tasks revoked before they started leave the queue; running tasks that were
+    terminated may not reach the end of ``execute_task`` (script steps turn the
+    signal into a cancellation and do, so a task is only counted finished once).
+    """
+    if request is None:
+        return
+    headers = getattr(request, "request_dict", None) or {}
+    if terminated:
+        track_finished(headers.get("ato_model") or "none", request.id)
+    else:
+        track_dequeued(
+            headers.get("ato_priority"),
+            headers.get("ato_model"),
+            headers.get("ato_dispatch_seq"),
+        )
+
+
 if __name__ == "__main__":
     celery_app.start()
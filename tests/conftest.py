@@ -0,0 +1,77 @@
+"""Shared fixtures for the AI Task Orchestra tests."""
+
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from ai_task_orchestra import redis_client
+from ai_task_orchestra.services import blob_store as blob_store_module
+from ai_task_orchestra.services.blob_store import BlobStore
+from ai_task_orchestra.services.task_archive import TaskArchive
+from ai_task_orchestra.services.task_service import TaskService
+from ai_task_orchestra.services.template_service import TemplateService
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+
+
+class RecordingDispatcher:
+    """Task dispatcher that records messages instead of publishing them."""
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+        self.revoked: List[str] = []
+
+    def send_task(self, name, args=(), kwargs=None, task_id=None, **options):
+        self.sent.append({"name": name, "args": list(args), "id": task_id, **options})
+        return task_id
+
+    def revoke(self, task_id, terminate=False, signal="SIGTERM"):
+        self.revoked.append(task_id)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """Point every Redis client of the package at one in-memory fakeredis server."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+
+    def from_url(url, **kwargs):
+        return fakeredis.FakeRedis(server=server, **kwargs)
+
+    monkeypatch.setattr(redis_client.redis.Redis, "from_url", from_url)
+    redis_client.get_redis.cache_clear()
+    redis_client.get_broker_redis.cache_clear()
+    yield redis_client.get_redis()
+    redis_client.get_redis.cache_clear()
+    redis_client.get_broker_redis.cache_clear()
+
+
+@pytest.fixture
+def blob_store(tmp_path, monkeypatch):
+    """Shared blob store in a temporary directory."""
+    store = BlobStore(root=str(tmp_path / "results"))
+    monkeypatch.setattr(blob_store_module, "get_blob_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def template_service():
+    """Template service with the bundled templates."""
+    return TemplateService(templates_dir=TEMPLATES_DIR)
+
+
+@pytest.fixture
+def dispatcher():
+    """Dispatcher recording the published messages."""
+    return RecordingDispatcher()
+
+
+@pytest.fixture
+def task_service(fake_redis, blob_store, template_service, dispatcher, tmp_path):
+    """Task service publishing every task straight away."""
+    return TaskService(
+        template_service=template_service,
+        dispatcher=dispatcher,
+        archive=TaskArchive(root=str(tmp_path / "archive")),
+    )
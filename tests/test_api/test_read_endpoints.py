@@ -0,0 +1,103 @@
+"""Tests for the cached template and task read endpoints."""
+
+import asyncio
+import os
+import shutil
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.api.v1.endpoints import tasks, templates
+from ai_task_orchestra.services.task_service import get_task_service
+from ai_task_orchestra.services.template_service import (
+    TemplateService,
+    get_template_service,
+)
+
+TEMPLATES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "templates"
+)
+
+
+@pytest.fixture
+def template_dir(tmp_path):
+    """Copy of the bundled templates."""
+    directory = tmp_path / "templates"
+    shutil.copytree(TEMPLATES_DIR, directory)
+    return directory
+
+
+@pytest.fixture
+def client(template_dir, task_service):
+    """Client of an app serving the template and task endpoints."""
+    service = TemplateService(templates_dir=str(template_dir))
+    app = FastAPI()
+    app.include_router(templates.router, prefix="/templates")
+    app.include_router(tasks.router, prefix="/tasks")
+    app.dependency_overrides[get_template_service] = lambda: service
+    app.dependency_overrides[get_task_service] = lambda: task_service
+    client = TestClient(app)
+    client.template_service = service
+    return client
+
+
+def test_template_list_etag(client):
+    """Test that an unchanged template list is answered with 304."""
+    response = client.get("/templates/")
+    assert response.status_code == 200
+    assert "ollama-inference" in {template["name"] for template in response.json()}
+    etag = response.headers["ETag"]
+
+    response = client.get("/templates/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    response = client.get("/templates/", headers={"If-None-Match": f'"x", W/{etag}'})
+    assert response.status_code == 304
+    response = client.get("/templates/", headers={"If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+def test_template_etag_changes_with_files(client, template_dir, monkeypatch):
+    """Test that editing a template file invalidates the cached body."""
+    response = client.get("/templates/ollama-inference")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    path = template_dir / "ollama-inference.yaml"
+    path.write_text(path.read_text().replace("Run inference", "Run an inference"))
+    monkeypatch.setattr(
+        "ai_task_orchestra.services.template_service.settings."
+        "templates_reload_interval",
+        0,
+    )
+    assert client.template_service.refresh()
+
+    response = client.get(
+        "/templates/ollama-inference", headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert response.json()["description"].startswith("Run an inference")
+
+
+def test_unknown_template(client):
+    """Test that an unknown template is not found."""
+    assert client.get("/templates/missing").status_code == 404
+
+
+def test_task_reads(client, task_service):
+    """Test that task reads return the stored records."""
+    task = asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": "Hello"}
+        )
+    )
+    response = client.get(f"/tasks/{task['id']}")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["parameters"] == {"model": "llama3", "prompt": "Hello"}
+
+    response = client.get("/tasks/", params={"template": "ollama-inference"})
+    assert [item["id"] for item in response.json()] == [task["id"]]
+    assert client.get("/tasks/missing").status_code == 404
@@ -0,0 +1,106 @@
+"""Tests for the queue-driven worker autoscaler."""
+
+import json
+import time
+
+import pytest
+
+from ai_task_orchestra import metrics
+from ai_task_orchestra.redis_client import get_broker_redis
+
+autoscale = pytest.importorskip("ai_task_orchestra.autoscale")
+
+
+class FakePool:
+    """Worker pool that only counts its processes."""
+
+    def __init__(self, processes):
+        self.num_processes = processes
+
+    def grow(self, n):
+        self.num_processes += n
+
+    def shrink(self, n):
+        self.num_processes -= n
+
+    def maintain_pool(self):
+        pass
+
+
+@pytest.fixture
+def scaler(fake_redis):
+    """Autoscaler of a pool of one to eight processes, without cooldowns."""
+    scaler = autoscale.QueueAutoscaler(FakePool(1), 8, 1, interval=1)
+    scaler.target_wait = 5.0
+    scaler.scale_up_cooldown = scaler.scale_down_cooldown = 0.0
+    scaler.model_limits = {}
+    scaler.gpu_slots = 0
+    return scaler
+
+
+def queue(model, count, waited):
+    """Queue tasks of a model, the oldest published some seconds ago."""
+    for _ in range(count):
+        metrics.track_enqueued(5, model)
+    message = {"headers": {"ato_enqueued_at": time.time() - waited}}
+    get_broker_redis().rpush(metrics.priority_list(3), json.dumps(message))
+
+
+def test_runnable_tasks(scaler):
+    """Test that model limits and GPU slots cap the tasks that could start."""
+    queued = {"llama3": 5, "mistral": 3, autoscale.NO_MODEL: 2}
+    assert scaler.runnable_tasks(queued, {}) == 10
+
+    scaler.model_limits = {"llama3": 2}
+    assert scaler.runnable_tasks(queued, {"llama3": 1}) == 1 + 3 + 2
+    assert scaler.runnable_tasks(queued, {"llama3": 4}) == 0 + 3 + 2
+
+    scaler.gpu_slots = 3
+    assert scaler.runnable_tasks(queued, {"mistral": 1}) == 2 + 2
+    assert scaler.runnable_tasks(queued, {"mistral": 5}) == 0 + 2
+
+
+def test_oldest_wait(scaler):
+    """Test that the wait is read from the tail message of each band."""
+    assert scaler.oldest_wait() == 0.0
+    queue("llama3", 1, waited=30)
+    get_broker_redis().rpush(metrics.priority_list(0), "not json")
+    assert scaler.oldest_wait() == pytest.approx(30, abs=1)
+
+
+def test_grows_only_when_tasks_wait_too_long(scaler):
+    """Test that the pool grows by the runnable tasks once the wait is too long."""
+    queue("llama3", 3, waited=1)
+    scaler.maybe_scale()
+    assert scaler.pool.num_processes == 1
+
+    get_broker_redis().delete(metrics.priority_list(3))
+    queue("mistral", 20, waited=30)
+    scaler._target = None
+    scaler.maybe_scale()
+    assert scaler.pool.num_processes == 8
+
+
+def test_shrinks_when_nothing_is_runnable(scaler):
+    """Test that an idle pool shrinks to its minimum after the cooldown."""
+    scaler.pool.num_processes = 6
+    scaler.maybe_scale()
+    assert scaler.pool.num_processes == 1
+
+
+def test_cooldowns(scaler):
+    """Test that the pool neither grows nor shrinks right after growing."""
+    scaler.scale_up_cooldown = scaler.scale_down_cooldown = 60.0
+    queue("llama3", 2, waited=30)
+    scaler.maybe_scale()
+    assert scaler.pool.num_processes == 2
+
+    queue("llama3", 4, waited=30)
+    scaler._target = None
+    scaler.maybe_scale()
+    assert scaler.pool.num_processes == 2
+
+    scaler.model_limits = {"llama3": 0}
+    scaler._target = None
+    scaler.maybe_scale()
+    assert scaler.pool.num_processes == 2
@@ -0,0 +1,75 @@
+"""Tests for publishing tasks without the worker's Celery app."""
+
+import subprocess
+import sys
+
+import pytest
+from kombu import Connection
+
+from ai_task_orchestra.dispatch import DEFAULT_QUEUE, EXECUTE_TASK, TaskDispatcher
+
+
+@pytest.fixture
+def dispatcher():
+    """Dispatcher publishing to the in-memory broker."""
+    dispatcher = TaskDispatcher(broker_url="memory://", pool_limit=2)
+    yield dispatcher
+    dispatcher.close()
+
+
+def receive(queue=DEFAULT_QUEUE):
+    """Get the next message of a queue of the in-memory broker."""
+    with Connection("memory://") as connection:
+        simple = connection.SimpleQueue(queue)
+        try:
+            message = simple.get(timeout=1)
+            message.ack()
+            return message
+        finally:
+            simple.close()
+
+
+def test_send_task_publishes_protocol_2_message(dispatcher):
+    """Test that the message has the headers and body Celery sends."""
+    task_id = dispatcher.send_task(
+        EXECUTE_TASK,
+        args=["task-1", "ollama-inference", {"model": "llama3"}],
+        task_id="task-1",
+        priority=6,
+        headers={"ato_model": "llama3"},
+    )
+    assert task_id == "task-1"
+
+    message = receive()
+    assert message.headers["task"] == EXECUTE_TASK
+    assert message.headers["id"] == message.headers["root_id"] == "task-1"
+    assert message.headers["ato_model"] == "llama3"
+    assert message.properties["priority"] == 6
+    assert message.properties["correlation_id"] == "task-1"
+    args, kwargs, embed = message.decode()
+    assert args == ["task-1", "ollama-inference", {"model": "llama3"}]
+    assert kwargs == {}
+    assert embed["chain"] is None
+
+
+def test_headers_match_celery(dispatcher):
+    """Test that no header Celery sets is missing."""
+    celery = pytest.importorskip("celery")
+    expected = celery.Celery(broker="memory://").amqp.as_task_v2(
+        "task-2", EXECUTE_TASK, args=[], kwargs={}
+    )
+    dispatcher.send_task(EXECUTE_TASK, task_id="task-2")
+    assert set(expected.headers) <= set(receive().headers)
+
+
+def test_api_does_not_import_the_worker():
+    """Test that importing the API loads neither Celery nor the worker."""
+    modules = ("celery", "kombu", "ai_task_orchestra.worker")
+    code = (
+        "import sys, ai_task_orchestra.main\n"
+        f"print([name for name in {modules!r} if name in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,113 @@
+"""Tests for the stub Ollama server and the load test helpers."""
+
+import os
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.integrations.ollama import OllamaClient
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "benchmarks")
+)
+
+from fake_ollama import FakeOllamaConfig, create_app  # noqa: E402
+from load_test import compare, percentile, summarize  # noqa: E402
+
+CONFIG = FakeOllamaConfig(
+    models=["llama3", "mistral"],
+    latency=0,
+    prompt_token_latency=0,
+    token_latency=0,
+    tokens=8,
+    swap_delay=0.05,
+    pull_delay=0,
+    dimensions=16,
+)
+
+
+@pytest.fixture
+def app():
+    """Stub server."""
+    return create_app(CONFIG)
+
+
+@pytest.fixture
+def ollama(app):
+    """Ollama client talking to the stub server."""
+    client = OllamaClient(base_url="http://testserver")
+    with TestClient(app) as sync_client:
+        client.sync_client = sync_client
+        yield client
+
+
+def test_generate_reports_model_swaps(app, ollama):
+    """Test that loading another model is reported as load duration."""
+    first = ollama.generate_sync({"model": "llama3", "prompt": "Hello there"})
+    assert first.response == "token " * 8
+    assert first.eval_count == 8
+    assert first.prompt_eval_count == 2
+    assert first.telemetry()["load_duration"] >= 0.05
+
+    again = ollama.generate_sync({"model": "llama3", "prompt": "Hello"})
+    assert again.telemetry()["load_duration"] < 0.05
+    ollama.generate_sync({"model": "mistral", "prompt": "Hello"})
+    assert app.state.stats == {"generations": 3, "embeddings": 0, "loads": 2}
+
+    running = ollama.sync_client.get("/api/ps").json()["models"]
+    assert [model["name"] for model in running] == ["mistral"]
+
+
+def test_streaming_generate(ollama):
+    """Test that streamed generations end with the summary chunk."""
+    response = ollama.sync_client.post(
+        "/api/generate", json={"model": "llama3", "prompt": "Hello"}
+    )
+    lines = response.text.splitlines()
+    assert len(lines) == 9
+    assert '"done": true' in lines[-1]
+
+
+def test_unknown_model_and_pull(ollama):
+    """Test that unknown models are not found until pulled."""
+    body = {"model": "phi3", "prompt": "Hello", "stream": False}
+    response = ollama.sync_client.post("/api/generate", json=body)
+    assert response.status_code == 404
+    response = ollama.sync_client.post(
+        "/api/pull", json={"name": "phi3", "stream": False}
+    )
+    assert response.json() == {"status": "success"}
+    assert ollama.sync_client.post("/api/generate", json=body).status_code == 200
+
+
+def test_embeddings_are_deterministic_unit_vectors(ollama):
+    """Test that the same text always gets the same normalized vector."""
+    result = ollama.embed_sync(["a", "b", "a"], model_name="llama3")
+    first, second, third = result.embeddings
+    assert first == third
+    assert first != second
+    assert len(first) == 16
+    assert sum(value * value for value in first) == pytest.approx(1.0)
+
+
+def test_percentile_and_summary():
+    """Test the nearest-rank percentiles of the latency summary."""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 99) == 99.0
+    assert percentile(values, 0) == 1.0
+    assert percentile([], 50) is None
+    assert summarize([1.0, 3.0])["mean"] == 2.0
+    assert summarize([])["max"] is None
+
+
+def test_compare_flags_regressions(capsys):
+    """Test that changes for the worse beyond the tolerance are flagged."""
+    baseline = {"throughput": 100.0, "latency": {"p50": 1.0, "p99": 2.0}}
+    result = {"throughput": 98.0, "latency": {"p50": 1.2, "p99": None}}
+    compare(result, baseline)
+    lines = {line.split()[0]: line for line in capsys.readouterr().out.splitlines()[1:]}
+    assert "REGRESSION" not in lines["throughput"]
+    assert "REGRESSION" in lines["latency.p50"]
+    assert "latency.p99" not in lines
@@ -0,0 +1,99 @@
+"""Tests for the Prometheus metrics."""
+
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+
+from ai_task_orchestra import metrics
+from ai_task_orchestra.integrations.ollama import OllamaClient
+
+
+def generated_tokens(model):
+    """Read the generated token counter of a model."""
+    value = REGISTRY.get_sample_value(
+        "ato_ollama_generated_tokens_total", {"model": model}
+    )
+    return value or 0.0
+
+
+@pytest.mark.parametrize(
+    "priority, step", [(1, 0), (2, 0), (3, 3), (5, 3), (6, 6), (8, 6), (9, 9), (10, 9)]
+)
+def test_priority_step(priority, step):
+    """Test that priorities map to Celery's Redis priority steps."""
+    assert metrics.priority_step(priority) == step
+
+
+def test_queue_length_reads_every_priority_list(fake_redis):
+    """Test that the queue length adds up the priority lists."""
+    fake_redis.rpush(metrics.priority_list(0), "a", "b")
+    fake_redis.rpush(metrics.priority_list(6), "c")
+    assert metrics.priority_list(0) == "celery"
+    assert metrics.get_queue_length() == 3
+
+
+def test_queue_depth_collector(fake_redis):
+    """Test that the collector reports the lists and the tracked counts."""
+    fake_redis.rpush(metrics.priority_list(3), "a")
+    metrics.track_enqueued(5, "llama3")
+    metrics.track_enqueued(5, "llama3")
+    metrics.track_dequeued(5, "llama3", sequence=1)
+    metrics.track_started("llama3", "task-1")
+
+    samples = {
+        (metric.name, tuple(sorted(sample.labels.items()))): sample.value
+        for metric in metrics.QueueDepthCollector().collect()
+        for sample in metric.samples
+    }
+    assert samples[("ato_queue_length", (("priority_band", "3"), ("queue", "celery")))]
+    assert samples[("ato_queued_tasks", (("model", "llama3"), ("priority", "5")))] == 1
+    assert samples[("ato_running_tasks", (("model", "llama3"),))] == 1
+
+
+def test_finished_task_counted_once(fake_redis):
+    """Test that a task reported finished twice is only counted once."""
+    metrics.track_started("llama3", "task-1")
+    metrics.track_started("llama3", "task-2")
+    metrics.track_finished("llama3", "task-1")
+    metrics.track_finished("llama3", "task-1")
+    assert metrics.get_running_models() == {"llama3": 1}
+
+
+def test_dispatch_progress(fake_redis):
+    """Test that the sequence numbers track published and dequeued messages."""
+    first = metrics.next_dispatch_sequence(5)
+    second = metrics.next_dispatch_sequence(5)
+    assert (first, second) == (1, 2)
+    fake_redis.rpush(metrics.priority_list(3), "second")
+    metrics.track_dequeued(5, "llama3", sequence=first)
+    assert metrics.get_dispatch_progress()[3] == (1, 1)
+
+
+def test_generation_uses_its_own_read_timeout():
+    """Test that generations are not cut off by the general request timeout."""
+    seen = {}
+
+    def handler(request):
+        seen.update(request.extensions["timeout"])
+        return httpx.Response(
+            200,
+            json={
+                "model": "llama3",
+                "created_at": "2026-01-01T00:00:00Z",
+                "response": "Hi",
+                "done": True,
+                "eval_count": 10,
+                "eval_duration": 500_000_000,
+            },
+        )
+
+    client = OllamaClient(base_url="http://ollama", timeout=5, generate_timeout=300)
+    client.sync_client = httpx.Client(
+        base_url="http://ollama", transport=httpx.MockTransport(handler), timeout=5
+    )
+    before = generated_tokens("llama3")
+    result = client.generate_sync({"model": "llama3", "prompt": "Hello"})
+    assert result.response == "Hi"
+    assert seen["read"] == 300
+    assert seen["connect"] == 5
+    assert generated_tokens("llama3") - before == 10
@@ -0,0 +1,89 @@
+"""Tests for the model prewarmer."""
+
+import asyncio
+import json
+
+import pytest
+
+from ai_task_orchestra import metrics
+from ai_task_orchestra.prewarm import ModelPrewarmer
+from ai_task_orchestra.redis_client import get_broker_redis
+from ai_task_orchestra.services.stats_service import get_stats_service
+
+
+class RecordingOllamaClient:
+    """Ollama client recording model loads and unloads."""
+
+    def __init__(self, resident):
+        self.resident = list(resident)
+        self.loads = []
+        self.unloads = []
+
+    async def list_running_models(self):
+        return list(self.resident)
+
+    async def unload_model(self, model_name):
+        self.unloads.append(model_name)
+        self.resident.remove(model_name)
+
+    async def ensure_model_loaded(self, model_name=None, keep_alive=None):
+        self.loads.append((model_name, keep_alive))
+        if model_name not in self.resident:
+            self.resident.append(model_name)
+        return True
+
+
+def queue_message(step, model):
+    """Append a task message for a model to a priority list."""
+    message = {"body": "", "headers": {"ato_model": model}}
+    get_broker_redis().rpush(metrics.priority_list(step), json.dumps(message))
+
+
+@pytest.fixture
+def prewarmer(fake_redis):
+    """Prewarmer of up to two models over a client with two resident models."""
+    get_stats_service.cache_clear()
+    client = RecordingOllamaClient(resident=["llama3", "gemma"])
+    yield ModelPrewarmer(client=client, lookahead=10, max_models=2, min_keep_alive=60)
+    get_stats_service.cache_clear()
+
+
+def test_upcoming_models_in_consumption_order(prewarmer):
+    """Test that the lowest priority step is read first, from the tail."""
+    queue_message(3, "phi3")
+    queue_message(0, "qwen")
+    queue_message(0, "mistral")
+    queue_message(0, "mistral")
+    assert prewarmer.upcoming_models() == ["mistral", "qwen", "phi3"]
+
+    prewarmer.lookahead = 2
+    assert prewarmer.upcoming_models() == ["mistral"]
+
+
+def test_keep_alive_bounds(prewarmer):
+    """Test that keep_alive covers the known work within the bounds."""
+    assert prewarmer.keep_alive(0, 30.0) == 60
+    assert prewarmer.keep_alive(10, 30.0) == 300
+    assert prewarmer.keep_alive(1000, 30.0) == prewarmer.max_keep_alive
+
+
+def test_tick_loads_upcoming_and_unloads_unneeded(prewarmer):
+    """Test that running models stay, the next model loads and idle ones go."""
+    metrics.track_started("llama3", "task-1")
+    queue_message(0, "mistral")
+    queue_message(0, "phi3")
+    metrics.track_enqueued(5, "mistral")
+
+    summary = asyncio.run(prewarmer.tick())
+    assert summary == {
+        "targets": ["llama3", "phi3"],
+        "loaded": ["phi3"],
+        "unloaded": ["gemma"],
+    }
+    assert prewarmer.client.loads == [("llama3", 60), ("phi3", 60)]
+
+    # keep_alive was just set, so the next tick leaves the models alone
+    prewarmer.client.loads.clear()
+    summary = asyncio.run(prewarmer.tick())
+    assert summary["loaded"] == summary["unloaded"] == []
+    assert prewarmer.client.loads == []
@@ -0,0 +1,71 @@
+"""Tests for the compact Celery serializers."""
+
+import pytest
+from kombu.serialization import dumps, loads
+
+from ai_task_orchestra.serialization import (
+    SERIALIZER_MSGPACK,
+    SERIALIZER_ORJSON,
+    compress_frame,
+    decompress_frame,
+    register_serializers,
+)
+
+MESSAGE = (
+    ["task-id", "ollama-inference", {"model": "llama3", "prompt": "Hello"}],
+    {},
+    {"callbacks": None, "errbacks": None, "chain": None, "chord": None},
+)
+
+
+@pytest.fixture(params=[SERIALIZER_ORJSON, SERIALIZER_MSGPACK])
+def serializer(request):
+    """Name of a registered compact serializer."""
+    if request.param not in register_serializers():
+        pytest.skip(f"{request.param} is not installed")
+    return request.param
+
+
+def round_trip(serializer, value):
+    """Encode and decode a value through kombu."""
+    content_type, encoding, data = dumps(value, serializer=serializer)
+    return loads(data, content_type, encoding, accept=[content_type])
+
+
+def test_round_trip(serializer):
+    """Test that a task message decodes to what was encoded."""
+    args, kwargs, embed = round_trip(serializer, MESSAGE)
+    assert [args, kwargs, embed] == list(MESSAGE)
+
+
+def test_round_trip_compressed(serializer):
+    """Test that payloads above the threshold are compressed and decode."""
+    value = {"output": "x" * 100000}
+    content_type, encoding, data = dumps(value, serializer=serializer)
+    assert len(data) < 10000
+    assert loads(data, content_type, encoding, accept=[content_type]) == value
+
+
+def test_bytes_are_lossless(serializer):
+    """Test that binary values survive, nested or not."""
+    value = {
+        "data": bytes(range(256)),
+        "nested": [{"chunk": b"\xff\xfe"}, "text"],
+        "lookalike": {"__type__": "bytes", "note": "not encoded bytes"},
+    }
+    assert round_trip(serializer, value) == value
+
+
+def test_sets_become_lists(serializer):
+    """Test that sets are encoded as lists."""
+    assert sorted(round_trip(serializer, {"tags": {"a", "b"}})["tags"]) == ["a", "b"]
+
+
+def test_frames():
+    """Test the frame marker of raw and compressed payloads."""
+    assert compress_frame(b"small", threshold=100) == b"\x00small"
+    framed = compress_frame(b"a" * 1000, threshold=100)
+    assert framed[:1] in (b"\x01", b"\x02")
+    assert decompress_frame(framed) == b"a" * 1000
+    with pytest.raises(ValueError):
+        decompress_frame(b"\x09payload")
@@ -0,0 +1,88 @@
+"""Tests for the service microbenchmarks."""
+
+import os
+import sys
+
+import pytest
+
+from ai_task_orchestra import redis_client
+from ai_task_orchestra.services import task_service as task_service_module
+from ai_task_orchestra.services.template_service import TemplateService
+
+REPOSITORY = os.path.dirname(os.path.dirname(__file__))
+sys.path.insert(0, os.path.join(REPOSITORY, "benchmarks"))
+
+import service_benchmark  # noqa: E402
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    """Fail every attempt to connect to Redis."""
+
+    def from_url(url, **kwargs):
+        raise AssertionError(f"Redis was reached at {url}")
+
+    monkeypatch.setattr(redis_client.redis.Redis, "from_url", from_url)
+    redis_client.get_redis.cache_clear()
+    yield
+    redis_client.get_redis.cache_clear()
+
+
+def test_measure_repeats_for_min_rounds():
+    """Test that the function is warmed up and called for the minimum rounds."""
+    calls = []
+    stats = service_benchmark.measure(lambda: calls.append(1), 0, 5)
+    assert stats["rounds"] == 5
+    assert len(calls) == 6
+    assert stats["min"] <= stats["median"]
+
+
+def test_written_templates_load(tmp_path):
+    """Test that the generated templates are valid templates."""
+    service_benchmark.write_templates(str(tmp_path), 3, parameters=4)
+    service = TemplateService(templates_dir=str(tmp_path))
+    assert sorted(service.templates) == [
+        "benchmark-00000",
+        "benchmark-00001",
+        "benchmark-00002",
+    ]
+    assert service.validate_parameters(
+        "benchmark-00001", {"param_0": "llama3", "param_2": "x"}
+    )
+
+
+def test_run_benchmarks_does_not_reach_redis(no_redis, monkeypatch, capsys):
+    """Test that every case runs without Redis, as the docstring claims."""
+    monkeypatch.setattr(
+        task_service_module,
+        "publish_task_event",
+        task_service_module.publish_task_event,
+    )
+    monkeypatch.setattr(
+        "ai_task_orchestra.services.template_service.settings.templates_dir",
+        os.path.join(REPOSITORY, "templates"),
+    )
+    # Loading 1,000 templates takes seconds and is not what is tested here
+    write_templates = service_benchmark.write_templates
+    monkeypatch.setattr(
+        service_benchmark,
+        "write_templates",
+        lambda directory, count, parameters=5: write_templates(
+            directory, min(count, 10), parameters
+        ),
+    )
+    results = service_benchmark.run_benchmarks([20], min_time=0, min_rounds=1)
+    assert {"create_task[0k]", "list_tasks[0k]", "get_tasks_status[0k]"} <= set(results)
+    assert "case" in capsys.readouterr().out
+
+
+def test_check_regressions():
+    """Test that only medians slower than the tolerance are reported."""
+    baseline = {"fast": {"median": 1.0}, "slow": {"median": 1.0}}
+    results = {
+        "fast": {"median": 1.1},
+        "slow": {"median": 1.5},
+        "new": {"median": 9.0},
+    }
+    (regression,) = service_benchmark.check_regressions(results, baseline, 20)
+    assert regression.startswith("slow: 1000.000 ms -> 1500.000 ms")
@@ -0,0 +1,166 @@
+"""Tests for admission control of task submissions."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra import metrics
+from ai_task_orchestra.api.v1.endpoints import tasks
+from ai_task_orchestra.redis_client import get_broker_redis
+from ai_task_orchestra.services import admission as admission_module
+from ai_task_orchestra.services.admission import (
+    ACCEPTED,
+    OVERLOADED,
+    RATE_LIMITED,
+    AdmissionController,
+    get_admission_controller,
+)
+from ai_task_orchestra.services.task_service import get_task_service
+
+API_KEY = "configured-key"
+
+
+class Clock:
+    """Replacement for the clock of the admission module."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Clock the token buckets refill by."""
+    clock = Clock()
+    monkeypatch.setattr(admission_module.time, "time", clock.time)
+    return clock
+
+
+@pytest.fixture
+def admission(fake_redis, clock):
+    """Admission control of one submission per second, bursts of two."""
+    return AdmissionController(
+        rate=1.0, burst=2, high_water=3, low_water=1, retry_after=7, api_key=API_KEY
+    )
+
+
+def fill_queue(count):
+    """Put messages in the broker queue."""
+    get_broker_redis().rpush(metrics.priority_list(0), *["message"] * count)
+
+
+def decisions(admission, count, **kwargs):
+    """Decide several submissions."""
+    return [admission.check(**kwargs)["decision"] for _ in range(count)]
+
+
+def test_token_bucket_refills(admission, clock):
+    """Test that a burst is admitted and tokens come back at the rate."""
+    assert decisions(admission, 2, client="10.0.0.1") == [ACCEPTED, ACCEPTED]
+    refused = admission.check(client="10.0.0.1")
+    assert refused == {"decision": RATE_LIMITED, "retry_after": 1}
+
+    clock.now += 1.5
+    assert decisions(admission, 2, client="10.0.0.1") == [ACCEPTED, RATE_LIMITED]
+    clock.now += 60
+    assert decisions(admission, 3, client="10.0.0.1") == [
+        ACCEPTED,
+        ACCEPTED,
+        RATE_LIMITED,
+    ]
+
+
+def test_unknown_api_keys_do_not_get_their_own_bucket(admission):
+    """Test that made-up keys are limited by the client address."""
+    assert admission.check(api_key="a", client="10.0.0.1")["decision"] == ACCEPTED
+    assert admission.check(api_key="b", client="10.0.0.1")["decision"] == ACCEPTED
+    assert admission.check(api_key="c", client="10.0.0.1")["decision"] == RATE_LIMITED
+
+    assert decisions(admission, 2, api_key=API_KEY, client="10.0.0.1") == [
+        ACCEPTED,
+        ACCEPTED,
+    ]
+    assert admission.check(client="10.0.0.2")["decision"] == ACCEPTED
+
+
+def test_full_queue(admission):
+    """Test that a full queue refuses without a token, but the defer lane pays."""
+    fill_queue(3)
+    overloaded = admission.check(client="10.0.0.1")
+    assert overloaded == {"decision": OVERLOADED, "retry_after": 7, "queue_length": 3}
+    assert decisions(admission, 5, client="10.0.0.1") == [OVERLOADED] * 5
+
+    deferrable = decisions(admission, 3, client="10.0.0.1", allow_defer=True)
+    assert deferrable == [OVERLOADED, OVERLOADED, RATE_LIMITED]
+
+
+def test_redis_errors_admit(clock, monkeypatch):
+    """Test that submissions are admitted when Redis cannot be reached."""
+
+    def unavailable():
+        raise ConnectionError("Redis is down")
+
+    monkeypatch.setattr(admission_module, "get_queue_length", unavailable)
+    admission = AdmissionController(rate=1.0, burst=1, high_water=3)
+    assert admission.check(client="10.0.0.1") == {"decision": ACCEPTED}
+
+
+def test_release_deferred_when_drained(admission, task_service, dispatcher):
+    """Test that deferred tasks are published once the queue is below low water."""
+
+    async def release_for(seconds):
+        releaser = asyncio.ensure_future(
+            admission.release_deferred(task_service, interval=0.01)
+        )
+        await asyncio.sleep(seconds)
+        releaser.cancel()
+
+    async def run():
+        for _ in range(3):
+            await task_service.create_task(
+                "ollama-inference",
+                {"model": "llama3", "prompt": "Hello"},
+                deferred=True,
+            )
+        fill_queue(1)
+        await release_for(0.05)
+        assert dispatcher.sent == []
+
+        get_broker_redis().delete(metrics.priority_list(0))
+        await release_for(0.05)
+
+    asyncio.run(run())
+    assert len(dispatcher.sent) == 3
+    assert not task_service.deferred
+
+
+def test_endpoint_refusals(admission, task_service):
+    """Test the status codes and Retry-After of refused and deferred submissions."""
+    app = FastAPI()
+    app.include_router(tasks.router, prefix="/tasks")
+    app.dependency_overrides[get_task_service] = lambda: task_service
+    app.dependency_overrides[get_admission_controller] = lambda: admission
+    client = TestClient(app)
+
+    def submit(**extra):
+        parameters = {"model": "llama3", "prompt": str(len(task_service.tasks))}
+        body = {"template": "ollama-inference", "parameters": parameters}
+        return client.post("/tasks/", json={**body, **extra})
+
+    assert submit().status_code == 201
+    fill_queue(3)
+    response = submit()
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "7"
+
+    response = submit(allow_defer=True)
+    assert response.status_code == 202
+    assert response.json()["deferred"] is True
+
+    response = submit(allow_defer=True)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
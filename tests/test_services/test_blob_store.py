@@ -0,0 +1,112 @@
+"""Tests for the content-addressed blob store."""
+
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.api.v1.endpoints import results
+from ai_task_orchestra.services.blob_store import (
+    BLOB_REF_KEY,
+    BlobNotFoundError,
+    BlobStore,
+    get_blob_store,
+    load_blob_value,
+    offload_large_values,
+)
+
+# Not a multiple of the chunk size, so the last chunk is partial
+DATA = bytes(range(256)) * 40 + b"tail"
+
+
+@pytest.fixture(params=["zstd", "zlib", "none"])
+def store(request, tmp_path):
+    """Blob store with small chunks, for each codec."""
+    return BlobStore(root=str(tmp_path), compression=request.param, chunk_size=1000)
+
+
+def test_put_get_round_trip(store):
+    """Test that stored content reads back unchanged."""
+    ref = store.put(DATA, "application/octet-stream")
+    assert ref[BLOB_REF_KEY].startswith("sha256:")
+    assert ref["size"] == len(DATA)
+    assert store.size(ref[BLOB_REF_KEY]) == len(DATA)
+    assert store.get(ref[BLOB_REF_KEY]) == DATA
+
+
+def test_put_deduplicates(store, tmp_path):
+    """Test that the same content is stored once."""
+    first = store.put(DATA)
+    second = store.put(DATA)
+    assert first == second
+    files = [name for _, _, names in os.walk(tmp_path) for name in names]
+    assert len(files) == 1
+
+
+@pytest.mark.parametrize(
+    "start, stop",
+    [(0, 1), (999, 1001), (1500, 2500), (3000, None), (0, None), (10000, 20000)],
+)
+def test_read_range(store, start, stop):
+    """Test that range reads match slices of the content, across chunks."""
+    key = store.put(DATA)[BLOB_REF_KEY]
+    assert b"".join(store.read_range(key, start, stop)) == DATA[start:stop]
+
+
+def test_read_range_past_end(store):
+    """Test that a range starting after the end is empty."""
+    key = store.put(DATA)[BLOB_REF_KEY]
+    assert b"".join(store.read_range(key, len(DATA) + 10)) == b""
+
+
+def test_unknown_and_invalid_keys(store):
+    """Test that missing blobs and malformed keys are not found."""
+    with pytest.raises(BlobNotFoundError):
+        store.get("sha256:" + "0" * 64)
+    with pytest.raises(BlobNotFoundError):
+        store.get("sha256:../../etc/passwd")
+
+
+def test_offload_and_load_values(tmp_path):
+    """Test that large values become references and load back as they were."""
+    store = BlobStore(root=str(tmp_path), compression="zlib")
+    values = {
+        "small": "inline",
+        "text": "é" * 100,
+        "data": b"\x00" * 300,
+        "items": list(range(100)),
+    }
+    offloaded = offload_large_values(values, store=store, limit=150)
+    assert offloaded["small"] == "inline"
+    assert offloaded["text"]["content_type"] == "text/plain; charset=utf-8"
+    assert offloaded["items"]["content_type"] == "application/json"
+    assert {
+        name: load_blob_value(value, store=store) for name, value in offloaded.items()
+    } == values
+
+
+def test_results_endpoint_ranges(tmp_path):
+    """Test that the results endpoint serves whole blobs and single ranges."""
+    store = BlobStore(root=str(tmp_path), compression="zstd", chunk_size=1000)
+    key = store.put(DATA)[BLOB_REF_KEY]
+    app = FastAPI()
+    app.include_router(results.router, prefix="/results")
+    app.dependency_overrides[get_blob_store] = lambda: store
+    client = TestClient(app)
+
+    response = client.get(f"/results/{key}")
+    assert response.status_code == 200
+    assert response.content == DATA
+
+    response = client.get(f"/results/{key}", headers={"Range": "bytes=990-1009"})
+    assert response.status_code == 206
+    assert response.headers["Content-Range"] == f"bytes 990-1009/{len(DATA)}"
+    assert response.content == DATA[990:1010]
+
+    response = client.get(f"/results/{key}", headers={"Range": "bytes=-4"})
+    assert response.content == b"tail"
+
+    response = client.get(f"/results/{key}", headers={"Range": "bytes=99999-"})
+    assert response.status_code == 416
+    assert client.get("/results/sha256:" + "0" * 64).status_code == 404
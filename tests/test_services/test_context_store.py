@@ -0,0 +1,131 @@
+"""Tests for reusing generation context across tasks."""
+
+import asyncio
+
+import pytest
+
+from ai_task_orchestra.integrations.ollama import OllamaGenerateResponse
+from ai_task_orchestra.services.context_store import (
+    ContextStore,
+    session_context_key,
+    task_context_key,
+)
+from ai_task_orchestra.steps import ollama as ollama_step
+
+
+class RecordingOllamaClient:
+    """Ollama client answering with a context one token longer than the request's."""
+
+    def __init__(self):
+        self.requests = []
+
+    def generate_sync(self, request):
+        self.requests.append(request)
+        context = list(request.get("context") or []) + [len(self.requests)]
+        return OllamaGenerateResponse(
+            model=request["model"],
+            created_at="2026-01-01T00:00:00Z",
+            response="Hi",
+            done=True,
+            context=context,
+        )
+
+
+@pytest.fixture
+def store(fake_redis, monkeypatch):
+    """Context store shared with the generation step."""
+    store = ContextStore(ttl=60, max_entries=3, max_tokens=10)
+    monkeypatch.setattr(ollama_step, "get_context_store", lambda: store)
+    return store
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Ollama client used by the generation step."""
+    client = RecordingOllamaClient()
+    monkeypatch.setattr(ollama_step, "get_ollama_client", lambda: client)
+    return client
+
+
+def test_get_prefers_earlier_names_of_the_model(store):
+    """Test that the first entry of the requested model is returned."""
+    store.put(["a"], "llama3", [1])
+    store.put(["b"], "mistral", [2])
+    store.put(["c"], "llama3", [3])
+    assert store.get(["b", "c", "a"], "llama3") == {"name": "c", "context": [3]}
+    assert store.get(["missing"], "llama3") is None
+    assert store.get([], "llama3") is None
+
+
+def test_long_context_replaces_nothing(store):
+    """Test that a context over the limit removes the entry it would replace."""
+    store.put(["a"], "llama3", [1, 2])
+    store.put(["a"], "llama3", list(range(11)))
+    assert store.get(["a"], "llama3") is None
+
+
+def test_least_recently_used_entries_are_evicted(store, fake_redis):
+    """Test that reads count as uses when evicting beyond the entry limit."""
+    for name in ("a", "b", "c"):
+        store.put([name], "llama3", [1])
+    assert store.get(["a"], "llama3")
+    store.put(["d"], "llama3", [1])
+    assert store.get(["b"], "llama3") is None
+    assert [store.get([name], "llama3") is not None for name in "acd"] == [True] * 3
+    assert fake_redis.zcard(store.index_key) == 3
+
+
+def test_generations_chain_within_and_across_tasks(store, client):
+    """Test that steps and tasks of a session continue from the last context."""
+    conversation = {"session_id": "s1", "depends_on": []}
+    first = {"task_id": "t1", "conversation": conversation}
+    step = {"model": "llama3", "prompt": "Hello"}
+    ollama_step.ollama_generate(step, first)
+    result = ollama_step.ollama_generate(step, first)
+    assert client.requests[1]["context"] == [1]
+    assert result["context_tokens"] == 1
+
+    second = {"task_id": "t2", "conversation": conversation}
+    ollama_step.ollama_generate(step, second)
+    assert client.requests[2]["context"] == [1, 2]
+    assert store.get([session_context_key("s1")], "llama3")["context"] == [1, 2, 3]
+
+    dependent = {
+        "task_id": "t3",
+        "conversation": {"session_id": None, "depends_on": ["t1"]},
+    }
+    ollama_step.ollama_generate(step, dependent)
+    assert client.requests[3]["context"] == [1, 2]
+    assert store.get([task_context_key("t3")], "llama3")["context"] == [1, 2, 4]
+
+
+def test_tasks_without_conversation_send_no_context(store, client):
+    """Test that tasks that do not opt in neither read nor store contexts."""
+    store.put([task_context_key("t1")], "llama3", [1])
+    ollama_step.ollama_generate(
+        {"model": "llama3", "prompt": "Hello"}, {"task_id": "t2"}
+    )
+    assert "context" not in client.requests[0]
+    assert store.get([task_context_key("t2")], "llama3") is None
+
+
+def test_session_tasks_carry_the_conversation_header(task_service, dispatcher):
+    """Test that the opt-in travels to the worker with the message."""
+    asyncio.run(
+        task_service.create_task(
+            "ollama-inference",
+            {"model": "llama3", "prompt": "Hello"},
+            session_id="s1",
+        )
+    )
+    asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": "Hello"}
+        )
+    )
+    first, second = dispatcher.sent
+    assert first["headers"]["ato_conversation"] == {
+        "session_id": "s1",
+        "depends_on": [],
+    }
+    assert "ato_conversation" not in second["headers"]
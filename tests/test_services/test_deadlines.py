@@ -0,0 +1,131 @@
+"""Tests for deadline-ordered dispatch and shedding."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from ai_task_orchestra import metrics
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_broker_redis
+from ai_task_orchestra.services import deadlines
+from ai_task_orchestra.services.deadlines import (
+    DEADLINE_MISSED,
+    QUEUE_WAIT_EXCEEDED,
+    shed_reason,
+)
+
+
+class FixedEstimates:
+    """Stats service predicting the same execution time for every task."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def execution_estimate(self, template, model=None, quantile="p95"):
+        return self.seconds
+
+
+@pytest.fixture
+def estimates(monkeypatch):
+    """Execution time predicted for every task, 60 seconds to start with."""
+    estimates = FixedEstimates(60.0)
+    monkeypatch.setattr(deadlines, "get_stats_service", lambda: estimates)
+    return estimates
+
+
+@pytest.fixture
+def window(task_service, monkeypatch):
+    """Dispatch window of two messages, full to start with."""
+    monkeypatch.setattr(settings, "dispatch_window", 2)
+    get_broker_redis().rpush(metrics.priority_list(0), "a", "b")
+
+
+def drain():
+    """Empty the broker queue."""
+    get_broker_redis().delete(metrics.priority_list(0))
+
+
+def in_hours(hours):
+    """Time a number of hours from now."""
+    return datetime.now(timezone.utc) + timedelta(hours=hours)
+
+
+def create(task_service, prompt, **options):
+    """Create an inference task."""
+    return asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": prompt}, **options
+        )
+    )
+
+
+def sent_prompts(dispatcher):
+    """Prompts of the published tasks, in order."""
+    return [message["args"][2]["prompt"] for message in dispatcher.sent]
+
+
+def test_shed_reason(estimates):
+    """Test the queue wait and predicted completion checks."""
+    now = 1_000_000.0
+    assert shed_reason("t", None, None, now - 10, 5, now=now) == QUEUE_WAIT_EXCEEDED
+    assert shed_reason("t", None, now + 30, now, None, now=now) == DEADLINE_MISSED
+    assert shed_reason("t", None, now + 90, now - 10, 60, now=now) is None
+    assert shed_reason("t", None, None, now, None, now=now) is None
+
+
+def test_unreachable_deadline_is_refused(task_service, estimates):
+    """Test that a submission that cannot finish in time is refused."""
+    with pytest.raises(HTTPException) as error:
+        create(task_service, "late", deadline=datetime.utcnow() + timedelta(seconds=30))
+    assert error.value.status_code == 422
+    assert task_service.tasks == {}
+
+
+def test_held_tasks_dispatch_by_band_then_deadline(
+    task_service, dispatcher, estimates, window
+):
+    """Test that held tasks go out by priority band, then earliest deadline."""
+    create(task_service, "no deadline")
+    create(task_service, "later", deadline=in_hours(2))
+    create(task_service, "sooner", deadline=in_hours(1))
+    create(task_service, "urgent band", priority=1)
+    create(task_service, "also no deadline")
+    assert dispatcher.sent == []
+    assert len(task_service.pending) == 5
+
+    drain()
+    assert asyncio.run(task_service.dispatch_pending()) == 2
+    assert sent_prompts(dispatcher) == ["urgent band", "sooner"]
+    assert asyncio.run(task_service.dispatch_pending()) == 2
+    assert asyncio.run(task_service.dispatch_pending()) == 1
+    assert sent_prompts(dispatcher)[2:] == ["later", "no deadline", "also no deadline"]
+
+
+def test_reprioritized_task_moves_band(task_service, dispatcher, estimates, window):
+    """Test that a held task whose priority changed is dispatched in its new band."""
+    create(task_service, "first")
+    second = create(task_service, "second")
+    asyncio.run(task_service.update_task_priority(second["id"], 1))
+    drain()
+    asyncio.run(task_service.dispatch_pending())
+    assert sent_prompts(dispatcher) == ["second", "first"]
+
+
+def test_held_tasks_are_shed(task_service, dispatcher, estimates, window):
+    """Test that tasks that can no longer make it are failed instead of published."""
+    waited = create(task_service, "waited", max_queue_wait=5)
+    task_service.tasks[waited["id"]]["created_at"] = (
+        datetime.utcnow() - timedelta(seconds=10)
+    ).isoformat() + "Z"
+    doomed = create(task_service, "doomed", deadline=in_hours(1))
+    create(task_service, "fine")
+
+    estimates.seconds = 7200.0
+    drain()
+    assert asyncio.run(task_service.dispatch_pending()) == 1
+    assert sent_prompts(dispatcher) == ["fine"]
+    assert task_service.tasks[waited["id"]]["shed"] == QUEUE_WAIT_EXCEEDED
+    assert task_service.tasks[doomed["id"]]["status"] == "failed"
+    assert task_service.tasks[doomed["id"]]["shed"] == DEADLINE_MISSED
@@ -0,0 +1,100 @@
+"""Tests for idempotent and deduplicated task submissions."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.api.v1.endpoints import tasks
+from ai_task_orchestra.services.admission import (
+    AdmissionController,
+    get_admission_controller,
+)
+from ai_task_orchestra.services.task_service import get_task_service, task_fingerprint
+from ai_task_orchestra.services.task_state import update_task_state
+
+PARAMETERS = {"model": "llama3", "prompt": "Hello"}
+
+
+def submit(task_service, parameters=PARAMETERS, key=None, deduplicate=False):
+    """Find the task a submission attaches to, or create one."""
+
+    async def run():
+        existing = await task_service.find_duplicate(
+            "ollama-inference", parameters, key, deduplicate
+        )
+        if existing:
+            return existing
+        return await task_service.create_task(
+            "ollama-inference",
+            parameters,
+            idempotency_key=key,
+            deduplicate=deduplicate,
+        )
+
+    return asyncio.run(run())
+
+
+def test_fingerprint_ignores_parameter_order():
+    """Test that the same work hashes the same."""
+    first = task_fingerprint("t", {"a": 1, "b": [1, 2]})
+    assert first == task_fingerprint("t", {"b": [1, 2], "a": 1})
+    assert first != task_fingerprint("t", {"a": 1, "b": [2, 1]})
+    assert first != task_fingerprint("u", {"a": 1, "b": [1, 2]})
+
+
+def test_idempotency_key(task_service, dispatcher):
+    """Test that a retried submission returns the task it created."""
+    first = submit(task_service, key="k1")
+    assert submit(task_service, key="k1")["id"] == first["id"]
+    assert len(dispatcher.sent) == 1
+
+    with pytest.raises(HTTPException) as error:
+        submit(task_service, {**PARAMETERS, "prompt": "Other"}, key="k1")
+    assert error.value.status_code == 409
+
+
+def test_duplicates_attach_while_in_flight(task_service, dispatcher):
+    """Test that identical submissions share a task until it finishes."""
+    first = submit(task_service, deduplicate=True)
+    assert first["status"] == "running"
+    assert submit(task_service, deduplicate=True)["id"] == first["id"]
+    assert submit(task_service)["id"] != first["id"]
+
+    update_task_state(first["id"], status="completed")
+    third = submit(task_service, deduplicate=True)
+    assert third["id"] != first["id"]
+    assert len(dispatcher.sent) == 3
+
+
+def test_endpoint_scopes_keys_by_api_key(task_service):
+    """Test that the same idempotency key of two API keys makes two tasks."""
+    app = FastAPI()
+    app.include_router(tasks.router, prefix="/tasks")
+    app.dependency_overrides[get_task_service] = lambda: task_service
+    app.dependency_overrides[get_admission_controller] = lambda: AdmissionController(
+        rate=0, high_water=0
+    )
+    client = TestClient(app)
+    body = {"template": "ollama-inference", "parameters": PARAMETERS}
+
+    def post(api_key):
+        return client.post(
+            "/tasks/",
+            json=body,
+            headers={"Idempotency-Key": "k1", "X-API-Key": api_key},
+        )
+
+    first = post("alice")
+    assert first.status_code == 201
+    retried = post("alice")
+    assert retried.status_code == 200
+    assert retried.json()["id"] == first.json()["id"]
+    assert post("bob").json()["id"] != first.json()["id"]
+
+    response = client.post("/tasks/", json={**body, "deduplicate": True})
+    duplicate = client.post("/tasks/", json={**body, "deduplicate": True})
+    assert response.status_code == 201
+    assert duplicate.status_code == 200
+    assert duplicate.json()["id"] == response.json()["id"]
@@ -0,0 +1,126 @@
+"""Tests for the vector store and the cached, batched embeddings."""
+
+import os
+
+import pytest
+
+from ai_task_orchestra.integrations.ollama import OllamaEmbedResponse
+
+np = pytest.importorskip("numpy")
+
+from ai_task_orchestra.services.embedding_service import (  # noqa: E402
+    EmbeddingService,
+)
+from ai_task_orchestra.services.vector_store import (  # noqa: E402
+    VectorStore,
+    content_hash,
+)
+
+VECTORS = {
+    "cat": [1.0, 0.0, 0.0],
+    "kitten": [0.9, 0.1, 0.0],
+    "car": [0.0, 1.0, 0.0],
+    "truck": [0.0, 0.8, 0.6],
+    "void": [0.0, 0.0, 0.0],
+}
+
+
+class RecordingOllamaClient:
+    """Ollama client embedding the known texts, recording each batch."""
+
+    def __init__(self):
+        self.batches = []
+
+    def embed_sync(self, inputs, model_name=None):
+        self.batches.append(list(inputs))
+        return OllamaEmbedResponse(
+            model=model_name, embeddings=[VECTORS[text] for text in inputs]
+        )
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Vector store in a temporary directory."""
+    return VectorStore(root=str(tmp_path / "vectors"))
+
+
+@pytest.fixture
+def client():
+    """Recording Ollama client."""
+    return RecordingOllamaClient()
+
+
+@pytest.fixture
+def service(store, client):
+    """Embedding service sending two texts per request."""
+    return EmbeddingService(store=store, client=client, batch_size=2)
+
+
+def test_store_round_trip_and_sharing(store, tmp_path):
+    """Test that vectors are normalized, kept once and seen by other stores."""
+    keys = [content_hash(text) for text in ("cat", "car", "cat")]
+    store.add("nomic/embed:v1", keys, [[2.0, 0, 0], [0, 3.0, 0], [0, 0, 5.0]])
+    assert np.allclose(store.get("nomic/embed:v1", keys[:2]), [[1, 0, 0], [0, 1, 0]])
+    assert store.missing("nomic/embed:v1", keys + ["f" * 32]) == ["f" * 32]
+    assert os.listdir(tmp_path / "vectors") == ["nomic_embed_v1"]
+
+    other = VectorStore(root=str(tmp_path / "vectors"))
+    assert np.allclose(other.get("nomic/embed:v1", keys[2:]), [[1, 0, 0]])
+    other.add("nomic/embed:v1", [content_hash("truck")], [[0, 0.8, 0.6]])
+    assert store.missing("nomic/embed:v1", [content_hash("truck")]) == []
+    with pytest.raises(ValueError):
+        store.add("nomic/embed:v1", [content_hash("x")], [[1.0, 0.0]])
+    with pytest.raises(KeyError):
+        store.get("nomic/embed:v1", ["0" * 32])
+
+
+def test_store_search(store):
+    """Test that search ranks by cosine similarity and honours its filters."""
+    keys = {text: content_hash(text) for text in VECTORS}
+    store.add("m", list(keys.values()), list(VECTORS.values()))
+    results = store.search("m", [1.0, 0.0, 0.0], k=2)
+    assert [key for key, _ in results] == [keys["cat"], keys["kitten"]]
+    assert results[0][1] == pytest.approx(1.0)
+
+    results = store.search(
+        "m", [0.0, 1.0, 0.0], k=5, keys=[keys["cat"], keys["truck"]], min_score=0.5
+    )
+    assert results == [(keys["truck"], pytest.approx(0.8))]
+    assert store.search("empty", [1.0, 0.0, 0.0]) == []
+
+
+def test_embed_skips_stored_texts_and_batches(service, client):
+    """Test that each distinct text is embedded once, in batches."""
+    result = service.embed(["cat", "car", "cat", "truck"], model="m")
+    assert (result["embedded"], result["cached"], result["batches"]) == (3, 0, 2)
+    assert client.batches == [["cat", "car"], ["truck"]]
+    assert result["hashes"][0] == result["hashes"][2] == content_hash("cat")
+
+    result = service.embed(["truck", "kitten"], model="m")
+    assert (result["embedded"], result["cached"], result["batches"]) == (1, 1, 1)
+    assert client.batches[-1] == ["kitten"]
+
+
+def test_embed_unstored_reuses_but_does_not_add(service, store, client):
+    """Test that prompt vectors are not kept, while stored ones are reused."""
+    service.embed(["cat"], model="m")
+    vectors = service.embed_unstored(["cat", "car"], model="m")
+    assert np.allclose(vectors, [[1, 0, 0], [0, 1, 0]])
+    assert client.batches[-1] == ["car"]
+    assert store.missing("m", [content_hash("car")]) == [content_hash("car")]
+
+
+def test_search_candidates(service):
+    """Test that candidate matches report the first index of each text."""
+    result = service.search(
+        "cat",
+        model="m",
+        k=2,
+        candidates=["car", "kitten", "kitten", "void"],
+        min_score=0.5,
+    )
+    assert [match["index"] for match in result["matches"]] == [1]
+    assert result["matches"][0]["score"] == pytest.approx(0.9 / np.hypot(0.9, 0.1))
+
+    result = service.search("car", model="m", k=1)
+    assert result["matches"][0]["hash"] == content_hash("car")
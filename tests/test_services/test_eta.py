@@ -0,0 +1,115 @@
+"""Tests for task completion estimates."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from ai_task_orchestra import metrics
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.redis_client import get_broker_redis
+from ai_task_orchestra.services.eta import EtaEstimator
+
+
+class FixedStats:
+    """Stats service with one median for every template and a mean."""
+
+    def __init__(self, median, mean):
+        self.median = median
+        self.mean = mean
+
+    def execution_estimate(self, template, model=None, quantile="p95"):
+        return self.median
+
+    def mean_execution_time(self):
+        return self.mean
+
+
+@pytest.fixture
+def estimator(fake_redis):
+    """Estimator of 10s tasks with a 20s mean, and two worker processes."""
+    metrics.heartbeat_worker("worker-1", 2)
+    return EtaEstimator(stats_service=FixedStats(10.0, 20.0))
+
+
+def create(task_service, prompt, **options):
+    """Create an inference task whose message is in the broker queue."""
+    task = asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": prompt}, **options
+        )
+    )
+    if task["status"] == "running":
+        step = metrics.priority_step(task["priority"])
+        get_broker_redis().lpush(metrics.priority_list(step), task["id"])
+    return task
+
+
+def take(priority, sequence):
+    """Have a worker take the oldest message of a priority band."""
+    get_broker_redis().rpop(metrics.priority_list(metrics.priority_step(priority)))
+    metrics.track_dequeued(priority, "llama3", sequence=sequence)
+
+
+def test_queued_position_and_wait(task_service, estimator):
+    """Test that tasks ahead are counted from the higher bands and the sequence."""
+    first, second, third = (create(task_service, str(index)) for index in range(3))
+    urgent = create(task_service, "urgent", priority=1)
+    take(5, first["dispatch_seq"])
+
+    estimate = estimator.estimate(third, task_service)
+    assert (estimate["position"], estimate["workers"]) == (2, 2)
+    assert estimate["queue_wait"] == 2 * 20.0 / 2
+    assert estimate["remaining"] == 30.0
+    assert estimate["poll_after"] == 15.0
+    assert estimator.estimate(second, task_service)["position"] == 1
+    assert estimator.estimate(urgent, task_service)["position"] == 0
+
+
+def test_held_and_deferred_tasks_wait_for_published_ones(
+    task_service, estimator, monkeypatch
+):
+    """Test that held tasks count the queue and the held tasks ahead of them."""
+    monkeypatch.setattr(settings, "dispatch_window", 1)
+    create(task_service, "published")
+    held = create(task_service, "held")
+    held_urgent = create(task_service, "held urgent", priority=1)
+    deferred = create(task_service, "deferred", deferred=True)
+
+    assert estimator.estimate(held_urgent, task_service)["position"] == 0
+    assert estimator.estimate(held, task_service)["position"] == 2
+    assert estimator.estimate(deferred, task_service)["position"] == 3
+
+
+def test_running_finished_and_waiting_tasks(task_service, estimator):
+    """Test the estimates of tasks that are not in the queue."""
+    running = create(task_service, "running")
+    running.update(
+        worker="worker-1",
+        started_at=(datetime.utcnow() - timedelta(seconds=4)).isoformat() + "Z",
+    )
+    estimate = estimator.estimate(running, task_service)
+    assert estimate["position"] == 0
+    assert estimate["remaining"] == pytest.approx(6.0, abs=0.5)
+
+    waiting = create(task_service, "waiting", depends_on=[running["id"]])
+    estimate = estimator.estimate(waiting, task_service)
+    assert estimate["position"] is None
+    assert estimate["poll_after"] == 60.0
+
+    running.update(status="completed", completed_at="2026-10-19T10:00:00Z")
+    estimate = estimator.estimate(running, task_service)
+    assert (estimate["remaining"], estimate["completes_at"]) == (
+        0.0,
+        "2026-10-19T10:00:00Z",
+    )
+
+
+def test_no_workers(task_service, fake_redis):
+    """Test that queue waits are unknown while no worker is up."""
+    estimator = EtaEstimator(stats_service=FixedStats(None, None))
+    task = create(task_service, "alone")
+    estimate = estimator.estimate(task, task_service)
+    assert estimate["workers"] == 0
+    assert estimate["queue_wait"] is None
+    assert estimate["duration"] == settings.deadline_default_task_seconds
@@ -0,0 +1,144 @@
+"""Tests for the task lifecycle event feed."""
+
+import asyncio
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.api.v1.endpoints import events as events_endpoint
+from ai_task_orchestra.redis_client import get_redis
+from ai_task_orchestra.services import event_stream
+from ai_task_orchestra.services.event_stream import (
+    COMPLETED,
+    FAILED,
+    QUEUED,
+    EventFilter,
+    EventHub,
+    publish_event,
+)
+
+
+@pytest.fixture(autouse=True)
+def short_reads(monkeypatch):
+    """Keep the stream reader's blocking reads short."""
+    monkeypatch.setattr(event_stream, "READ_BLOCK_SECONDS", 0.05)
+
+
+async def next_event(stream, timeout=5.0):
+    """Take the next event from an event iterator, skipping keepalives."""
+    while True:
+        item = await asyncio.wait_for(stream.__anext__(), timeout)
+        if item is not None:
+            return item
+
+
+def test_filter():
+    """Test that each set criterion must match and unset ones match everything."""
+    event = {"type": FAILED, "task_id": "t1", "template": "x", "tags": ["nightly"]}
+    assert EventFilter().matches(event)
+    assert EventFilter(task_ids=frozenset({"t1", "t2"}), tag="nightly").matches(event)
+    assert not EventFilter(task_ids=frozenset({"t2"})).matches(event)
+    assert not EventFilter(template="y").matches(event)
+    assert not EventFilter(tag="hourly").matches(event)
+    assert EventFilter(types=frozenset({COMPLETED, FAILED})).matches(event)
+    assert not EventFilter(types=frozenset({QUEUED}), template="x").matches(event)
+
+
+def test_publish_never_fails(fake_redis, monkeypatch):
+    """Test that events are appended in order and a Redis error is swallowed."""
+    first = publish_event(QUEUED, "t1", "x", tags=["a"], priority=5)
+    second = publish_event(COMPLETED, "t1", "x")
+    assert event_stream._id_key(first) < event_stream._id_key(second)
+
+    class Broken:
+        def xadd(self, *args, **kwargs):
+            raise ConnectionError("down")
+
+    monkeypatch.setattr(event_stream, "get_redis", Broken)
+    assert publish_event(QUEUED, "t2", "x") is None
+
+
+def test_created_tasks_publish_queued_events(task_service):
+    """Test that submitting a task appends its queued event with its tags."""
+    task = asyncio.run(
+        task_service.create_task(
+            "ollama-inference",
+            {"model": "llama3", "prompt": "Hello"},
+            tags=["nightly"],
+        )
+    )
+    entries = event_stream._decode(get_redis().xrange(event_stream._stream_key()))
+    assert [event["type"] for _, event in entries] == [QUEUED]
+    assert entries[0][1]["task_id"] == task["id"]
+    assert entries[0][1]["tags"] == ["nightly"]
+
+
+def test_history_then_live_events(fake_redis):
+    """Test that a resumed subscriber gets stored events, then new ones, once each."""
+    hub = EventHub(keepalive=0.05)
+    first = publish_event(QUEUED, "t1", "x")
+    publish_event(QUEUED, "t2", "x")
+    publish_event(COMPLETED, "t1", "x")
+
+    async def run():
+        stream = hub.events(EventFilter(task_ids=frozenset({"t1"})), after="0")
+        history = [await next_event(stream), await next_event(stream)]
+        publish_event(FAILED, "t2", "x")
+        publish_event(FAILED, "t1", "x")
+        live = await next_event(stream)
+        await stream.aclose()
+        return history, live
+
+    history, live = asyncio.run(run())
+    assert history[0][0] == first
+    assert [event["type"] for _, event in history] == [QUEUED, COMPLETED]
+    assert (live[1]["task_id"], live[1]["type"]) == ("t1", FAILED)
+    assert hub._subscribers == set()
+
+
+def test_keepalive_and_new_events_only(fake_redis):
+    """Test that without an offset only new events are followed."""
+    hub = EventHub(keepalive=0.05)
+    publish_event(QUEUED, "old", "x")
+
+    async def run():
+        stream = hub.events(EventFilter())
+        assert await stream.__anext__() is None
+        publish_event(QUEUED, "new", "x")
+        item = await next_event(stream)
+        await stream.aclose()
+        return item
+
+    assert asyncio.run(run())[1]["task_id"] == "new"
+
+
+def test_slow_subscriber_is_disconnected(fake_redis):
+    """Test that a subscriber whose queue is full is ended instead of blocking."""
+    hub = EventHub(queue_size=2)
+
+    async def run():
+        subscription = hub.subscribe(EventFilter(types=frozenset({QUEUED})))
+        for index in range(4):
+            hub._deliver(f"{index}-0", {"type": QUEUED, "task_id": str(index)})
+        hub._deliver("5-0", {"type": COMPLETED})
+        hub.unsubscribe(subscription)
+        items = []
+        while not subscription.queue.empty():
+            items.append(subscription.queue.get_nowait())
+        return subscription, items
+
+    subscription, items = asyncio.run(run())
+    assert subscription.overflowed
+    assert [item[0] for item in items[:2]] == ["0-0", "1-0"]
+    assert items[2:] == [None]
+
+
+@pytest.mark.parametrize("query", ["types=queued,done", "after=latest"])
+def test_endpoint_rejects_bad_queries(query):
+    """Test that unknown event types and malformed offsets are refused."""
+    app = FastAPI()
+    app.include_router(events_endpoint.router, prefix="/events")
+    app.dependency_overrides[event_stream.get_event_hub] = EventHub
+    response = TestClient(app).get(f"/events/?{query}")
+    assert response.status_code == 400
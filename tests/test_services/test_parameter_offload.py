@@ -0,0 +1,57 @@
+"""Tests for passing large task parameters by reference."""
+
+import asyncio
+
+from ai_task_orchestra.services.blob_store import BLOB_REF_KEY, is_blob_ref
+from ai_task_orchestra.steps.engine import LazyVariables
+
+LONG_PROMPT = "Summarize: " + "lorem ipsum " * 2000
+
+
+def test_create_task_offloads_large_parameters(task_service, dispatcher, blob_store):
+    """Test that large values are stored once and named on the task and message."""
+    task = asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": LONG_PROMPT}
+        )
+    )
+    assert task["parameters"]["model"] == "llama3"
+    assert is_blob_ref(task["parameters"]["prompt"])
+    assert task["offloaded_parameters"] == ["prompt"]
+
+    (message,) = dispatcher.sent
+    assert message["args"][2] == task["parameters"]
+    assert message["headers"]["ato_offloaded"] == ["prompt"]
+    key = task["parameters"]["prompt"][BLOB_REF_KEY]
+    assert blob_store.get(key).decode("utf-8") == LONG_PROMPT
+
+
+def test_create_task_does_not_mark_submitted_references(
+    task_service, dispatcher, blob_store
+):
+    """Test that references sent by the client are not marked as offloaded."""
+    foreign = blob_store.put(b"another tenant's result")
+    task = asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": foreign}
+        )
+    )
+    assert task["parameters"]["prompt"] == foreign
+    assert task["offloaded_parameters"] == []
+    assert "ato_offloaded" not in dispatcher.sent[0]["headers"]
+
+
+def test_lazy_variables_load_only_offloaded_references(blob_store):
+    """Test that only the named references are loaded, once."""
+    offloaded = blob_store.put(LONG_PROMPT.encode("utf-8"), "text/plain; charset=utf-8")
+    foreign = blob_store.put(b"secret", "text/plain; charset=utf-8")
+    variables = LazyVariables(
+        {"prompt": offloaded, "other": foreign, "model": "llama3"}, ["prompt"]
+    )
+    assert variables.get("prompt") == LONG_PROMPT
+    assert variables.get("other") == foreign
+    assert variables.get("model") == "llama3"
+    assert variables.get("missing") is None
+
+    blob_store.delete(offloaded[BLOB_REF_KEY])
+    assert variables.get("prompt") == LONG_PROMPT
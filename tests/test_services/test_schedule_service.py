@@ -0,0 +1,120 @@
+"""Tests for recurring task schedules."""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from ai_task_orchestra.redis_client import get_redis
+from ai_task_orchestra.services.schedule_service import (
+    ScheduleService,
+    _due_key,
+    next_run_time,
+)
+
+PARAMETERS = {"model": "llama3", "prompt": "Daily report"}
+
+
+def timestamp(value):
+    """Unix timestamp of an ISO 8601 UTC time."""
+    return datetime.fromisoformat(value).replace(tzinfo=timezone.utc).timestamp()
+
+
+@pytest.fixture
+def schedules(task_service, template_service):
+    """Schedule service sharing the task service's templates and Redis."""
+    return ScheduleService(template_service=template_service)
+
+
+def create(schedules, **options):
+    """Create a schedule of the inference template."""
+    return asyncio.run(
+        schedules.create_schedule("ollama-inference", PARAMETERS, **options)
+    )
+
+
+def make_due(schedule_id, seconds_ago=1.0):
+    """Move a schedule's next run into the past."""
+    get_redis().zadd(_due_key(), {schedule_id: time.time() - seconds_ago})
+
+
+def test_next_run_time():
+    """Test cron expressions in UTC and fixed intervals."""
+    after = timestamp("2026-10-19T10:07:30")
+    quarter = next_run_time({"cron": "*/15 * * * *"}, after)
+    assert quarter == timestamp("2026-10-19T10:15:00")
+    monday = next_run_time({"cron": "0 9 * * 1"}, after)
+    assert monday == timestamp("2026-10-26T09:00:00")
+    assert next_run_time({"interval": 30}, after) == after + 30
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"cron": "* * * * *", "interval": 60}, {"cron": "* * *"}, {"interval": 0.1}],
+)
+def test_invalid_timing(schedules, options):
+    """Test that a schedule needs exactly one valid cron expression or interval."""
+    with pytest.raises(HTTPException) as error:
+        create(schedules, **options)
+    assert error.value.status_code == 400
+
+
+def test_create_and_disable(schedules):
+    """Test that only enabled schedules are queued by their next run time."""
+    schedule = create(schedules, interval=60)
+    assert schedule["runs"] == 0
+    assert schedule["next_run_at"] is not None
+
+    updated = asyncio.run(schedules.update_schedule(schedule["id"], {"enabled": False}))
+    assert updated["next_run_at"] is None
+    assert get_redis().zcard(_due_key()) == 0
+
+
+def test_due_run_is_claimed_once(schedules, task_service, template_service):
+    """Test that schedulers sharing the store fire each run once."""
+    schedule = create(schedules, interval=60)
+    make_due(schedule["id"], seconds_ago=3600)
+    other = ScheduleService(template_service=template_service)
+
+    assert asyncio.run(schedules.fire_due(task_service)) > 0
+    assert asyncio.run(other.fire_due(task_service)) > 0
+    assert len(task_service.tasks) == 1
+
+    # Runs missed while no scheduler ran are skipped
+    next_run = get_redis().zscore(_due_key(), schedule["id"])
+    assert next_run > time.time()
+
+    due_at = next_run
+    assert schedules._claim_run(schedule["id"], due_at, due_at + 60)
+    assert not other._claim_run(schedule["id"], due_at, due_at + 60)
+
+
+def test_overlapping_runs_are_skipped(schedules, task_service):
+    """Test that a run is skipped while the previous task is still active."""
+    schedule = create(schedules, interval=60)
+    make_due(schedule["id"])
+    asyncio.run(schedules.fire_due(task_service))
+    make_due(schedule["id"])
+    asyncio.run(schedules.fire_due(task_service))
+    state = asyncio.run(schedules.get_schedule(schedule["id"]))
+    assert (state["runs"], state["skipped"]) == (1, 1)
+
+    task_service.tasks[state["last_task_id"]]["status"] = "completed"
+    make_due(schedule["id"])
+    asyncio.run(schedules.fire_due(task_service))
+    state = asyncio.run(schedules.get_schedule(schedule["id"]))
+    assert state["runs"] == 2
+    assert len(task_service.tasks) == 2
+
+
+def test_deleted_schedules_do_not_fire(schedules, task_service):
+    """Test that a deleted schedule leaves the due queue."""
+    schedule = create(schedules, cron="0 * * * *")
+    make_due(schedule["id"])
+    asyncio.run(schedules.delete_schedule(schedule["id"]))
+    asyncio.run(schedules.fire_due(task_service))
+    assert task_service.tasks == {}
+    with pytest.raises(HTTPException):
+        asyncio.run(schedules.delete_schedule(schedule["id"]))
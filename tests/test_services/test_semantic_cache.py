@@ -0,0 +1,136 @@
+"""Tests for the semantic prompt cache."""
+
+import pytest
+
+from ai_task_orchestra.integrations.ollama import (
+    OllamaEmbedResponse,
+    OllamaGenerateResponse,
+)
+from ai_task_orchestra.redis_client import redis_key
+from ai_task_orchestra.services.template_service import SemanticCacheConfig
+from ai_task_orchestra.steps import ollama as ollama_step
+
+np = pytest.importorskip("numpy")
+
+from ai_task_orchestra.services.embedding_service import (  # noqa: E402
+    EmbeddingService,
+)
+from ai_task_orchestra.services.semantic_cache import (  # noqa: E402
+    SemanticCache,
+    cache_scope,
+)
+from ai_task_orchestra.services.vector_store import VectorStore  # noqa: E402
+
+VECTORS = {
+    "What is the capital of France?": [1.0, 0.0, 0.0],
+    "What's the capital of France?": [0.99, 0.05, 0.0],
+    "Name a large French city.": [0.8, 0.6, 0.0],
+    "Write a haiku.": [0.0, 0.0, 1.0],
+}
+CONFIG = SemanticCacheConfig(threshold=0.95, embed_model="embed")
+SCOPE = cache_scope("qa", "llama3", None, None)
+
+
+class RecordingOllamaClient:
+    """Ollama client embedding the known prompts and generating fixed answers."""
+
+    def __init__(self):
+        self.embedded = []
+        self.generated = []
+
+    def embed_sync(self, inputs, model_name=None):
+        self.embedded.extend(inputs)
+        return OllamaEmbedResponse(
+            model=model_name, embeddings=[VECTORS[text] for text in inputs]
+        )
+
+    def generate_sync(self, request):
+        self.generated.append(request["prompt"])
+        return OllamaGenerateResponse(
+            model=request["model"],
+            created_at="2026-01-01T00:00:00Z",
+            response=f"Answer {len(self.generated)}",
+            done=True,
+        )
+
+
+@pytest.fixture
+def client():
+    """Recording Ollama client."""
+    return RecordingOllamaClient()
+
+
+@pytest.fixture
+def cache(fake_redis, client, tmp_path):
+    """Semantic cache embedding prompts with the recording client."""
+    store = VectorStore(root=str(tmp_path / "vectors"))
+    return SemanticCache(EmbeddingService(store=store, client=client))
+
+
+def remember(cache, prompt, answer, config=CONFIG, scope=SCOPE):
+    """Look up a prompt and cache an answer to it."""
+    result = cache.lookup(scope, prompt, config)
+    cache.store(scope, result["hash"], result["vector"], {"response": answer}, config)
+    return result
+
+
+def test_similar_prompt_hits(cache, client):
+    """Test that a near-duplicate prompt gets the cached response."""
+    miss = remember(cache, "What is the capital of France?", "Paris")
+    assert "response" not in miss
+
+    hit = cache.lookup(SCOPE, "What's the capital of France?", CONFIG)
+    assert hit["response"] == {"response": "Paris"}
+    assert hit["matched"] == miss["hash"]
+    assert hit["score"] == pytest.approx(0.99 / np.hypot(0.99, 0.05), abs=1e-6)
+
+    assert "response" not in cache.lookup(SCOPE, "Name a large French city.", CONFIG)
+    other = cache_scope("qa", "mistral", None, None)
+    assert "response" not in cache.lookup(
+        other, "What is the capital of France?", CONFIG
+    )
+
+
+def test_repeated_prompt_is_not_embedded_again(cache, client):
+    """Test that a cached prompt's vector is reused."""
+    remember(cache, "What is the capital of France?", "Paris")
+    client.embedded.clear()
+    cache._vectors.clear()
+    hit = cache.lookup(SCOPE, "What is the capital of France?", CONFIG)
+    assert hit["score"] == pytest.approx(1.0)
+    assert client.embedded == []
+
+
+def test_oldest_entries_are_evicted(cache, fake_redis):
+    """Test that a scope keeps at most max_entries prompts."""
+    config = SemanticCacheConfig(threshold=0.95, embed_model="embed", max_entries=1)
+    remember(cache, "What is the capital of France?", "Paris", config)
+    remember(cache, "Write a haiku.", "Autumn moonlight", config)
+    assert "response" not in cache.lookup(
+        SCOPE, "What's the capital of France?", config
+    )
+    assert fake_redis.hlen(redis_key("semcache", SCOPE, "responses")) == 1
+
+
+def test_generation_step_answers_from_cache(cache, client, monkeypatch):
+    """Test that the step only generates on misses and caches what it generates."""
+    monkeypatch.setattr(ollama_step, "get_semantic_cache", lambda: cache)
+    monkeypatch.setattr(ollama_step, "get_ollama_client", lambda: client)
+    context = {"template": "qa", "semantic_cache": CONFIG}
+
+    first = ollama_step.ollama_generate(
+        {"model": "llama3", "prompt": "What is the capital of France?"}, context
+    )
+    assert first["cache"] == {"hit": False}
+    second = ollama_step.ollama_generate(
+        {"model": "llama3", "prompt": "What's the capital of France?"}, context
+    )
+    assert second["cache"]["hit"] is True
+    assert second["response"] == first["response"] == "Answer 1"
+    assert client.generated == ["What is the capital of France?"]
+
+    ollama_step.ollama_generate(
+        {"model": "llama3", "prompt": "What's the capital of France?"},
+        {**context, "conversation": {"session_id": "s1"}, "task_id": "t1"},
+    )
+    assert len(client.generated) == 2
@@ -0,0 +1,117 @@
+"""Tests for the rolling per-model statistics."""
+
+import random
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.api.v1.endpoints import stats
+from ai_task_orchestra.services.stats_service import (
+    QuantileSketch,
+    StatsService,
+    get_stats_service,
+)
+
+ACCURACY = 0.01
+
+
+def exact_quantile(values, q):
+    """Quantile of a sorted list by rank, as the sketch defines it."""
+    return values[int(q * (len(values) - 1))]
+
+
+def test_sketch_quantiles_within_relative_accuracy():
+    """Test that quantiles are within the relative accuracy of the exact ones."""
+    generator = random.Random(42)
+    values = sorted(generator.lognormvariate(0, 2) for _ in range(10000))
+    sketch = QuantileSketch(relative_accuracy=ACCURACY)
+    for value in values:
+        sketch.add(value)
+    for q in (0.0, 0.1, 0.5, 0.9, 0.95, 0.99, 1.0):
+        expected = exact_quantile(values, q)
+        assert sketch.quantile(q) == pytest.approx(expected, rel=ACCURACY)
+
+
+def test_sketch_merge_equals_sketch_of_union():
+    """Test that merging bucket counts gives the sketch of all values."""
+    generator = random.Random(7)
+    first, second, union = (QuantileSketch(relative_accuracy=ACCURACY) for _ in "abc")
+    for index in range(2000):
+        value = generator.expovariate(0.1)
+        (first if index % 3 else second).add(value)
+        union.add(value)
+    first.merge(second.buckets)
+    assert first.count == union.count
+    assert first.buckets == union.buckets
+    assert first.quantile(0.95) == union.quantile(0.95)
+
+
+def test_sketch_zero_values_and_empty():
+    """Test that zeros have their own bucket and empty sketches have no quantiles."""
+    sketch = QuantileSketch(relative_accuracy=ACCURACY)
+    assert sketch.quantile(0.5) is None
+    sketch.add(0.0, count=3)
+    sketch.add(10.0)
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == pytest.approx(10.0, rel=ACCURACY)
+
+
+def test_record_and_query_rolling_window(fake_redis):
+    """Test that stats merge the slices inside the window only."""
+    service = StatsService(window_seconds=60, windows=10)
+    now = time.time()
+    for seconds in (1.0, 2.0, 3.0):
+        service.record(
+            "llama3",
+            "ollama-inference",
+            {"latency": seconds + 1, "execution_time": seconds, "queue_wait": None},
+            timestamp=now - 130,
+        )
+    service.record(
+        "llama3", "ollama-inference", {"latency": 11.0, "execution_time": 10.0}
+    )
+    service.record("mistral", "ollama-inference", {"latency": 1.0})
+
+    llama, mistral = service.get_model_stats()
+    assert (llama["model"], llama["count"]) == ("llama3", 4)
+    assert llama["execution_time"]["p50"] == pytest.approx(2.0, rel=0.02)
+    assert llama["execution_time"]["p95"] == pytest.approx(3.0, rel=0.02)
+    assert llama["execution_time"]["count"] == 4
+    assert "queue_wait" not in llama
+    assert mistral["count"] == 1
+
+    recent, _ = service.get_model_stats(window=60)
+    assert recent["count"] == 1
+    assert recent["execution_time"]["p50"] == pytest.approx(10.0, rel=0.02)
+
+
+def test_execution_estimate(fake_redis):
+    """Test that estimates fall back to the slowest model of the template."""
+    service = StatsService(window_seconds=60, windows=10)
+    service.record("llama3", "summarize", {"latency": 5.0, "execution_time": 4.0})
+    service.record("mistral", "summarize", {"latency": 9.0, "execution_time": 8.0})
+    assert service.execution_estimate("summarize", "llama3") == pytest.approx(
+        4.0, rel=0.02
+    )
+    assert service.execution_estimate("summarize", "phi3") == pytest.approx(
+        8.0, rel=0.02
+    )
+    assert service.execution_estimate("translate") is None
+
+
+def test_stats_endpoint(fake_redis):
+    """Test that the endpoint returns the stats of the window."""
+    service = StatsService(window_seconds=60, windows=10)
+    service.record("llama3", "summarize", {"latency": 5.0})
+    app = FastAPI()
+    app.include_router(stats.router, prefix="/stats")
+    app.dependency_overrides[get_stats_service] = lambda: service
+    client = TestClient(app)
+
+    response = client.get("/stats/models", params={"window": 300})
+    assert response.status_code == 200
+    (entry,) = response.json()["stats"]
+    assert (entry["model"], entry["window_seconds"]) == ("llama3", 300)
+    assert client.get("/stats/models", params={"window": 0}).status_code == 422
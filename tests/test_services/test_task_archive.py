@@ -0,0 +1,108 @@
+"""Tests for the archive of finished tasks."""
+
+import asyncio
+import gzip
+import io
+import os
+
+import pytest
+
+from ai_task_orchestra.services.task_archive import TaskArchive, zstandard
+
+
+def record(task_id, day, status="completed"):
+    """Finished task record."""
+    return {
+        "id": task_id,
+        "status": status,
+        "created_at": f"{day}T08:00:00Z",
+        "completed_at": f"{day}T09:00:00Z",
+        "template": "ollama-inference",
+        "parameters": {"prompt": f"Prompt of {task_id}"},
+    }
+
+
+def read_stream(path):
+    """Decompress a whole archive file as a tool reading it would."""
+    with open(path, "rb") as f:
+        if path.endswith(".zst"):
+            reader = zstandard.ZstdDecompressor().stream_reader(
+                f, read_across_frames=True
+            )
+            return io.BufferedReader(reader).read()
+        return gzip.decompress(f.read())
+
+
+@pytest.fixture
+def archive(fake_redis, tmp_path):
+    """Archive in a temporary directory."""
+    return TaskArchive(root=str(tmp_path / "archive"), compression_level=3)
+
+
+def test_round_trip_across_days_and_runs(archive):
+    """Test that tasks are read back from the frames of several runs."""
+    assert archive.append([record("a", "2026-10-18"), record("b", "2026-10-19")]) == 2
+    assert archive.append([record("c", "2026-10-19")]) == 1
+
+    assert archive.get("b") == record("b", "2026-10-19")
+    assert archive.get("missing") is None
+    found = archive.get_many(["a", "b", "c", "missing"])
+    assert found == {
+        task_id: record(task_id, day)
+        for task_id, day in (
+            ("a", "2026-10-18"),
+            ("b", "2026-10-19"),
+            ("c", "2026-10-19"),
+        )
+    }
+    assert archive.get_many([]) == {}
+
+    path = os.path.join(
+        archive.root, "2026", "10", f"tasks-2026-10-19{archive.extension}"
+    )
+    lines = read_stream(path).splitlines()
+    assert [line[:8] for line in lines] == [b'{"id":"b', b'{"id":"c']
+
+
+def test_get_many_reads_each_frame_once(archive, monkeypatch):
+    """Test that tasks sharing a frame are decompressed together."""
+    archive.append([record(str(index), "2026-10-19") for index in range(5)])
+    decompressed = []
+    decompress = archive._decompress
+    monkeypatch.setattr(
+        archive,
+        "_decompress",
+        lambda path, data: decompressed.append(path) or decompress(path, data),
+    )
+    assert sorted(archive.get_many(["0", "3", "4"])) == ["0", "3", "4"]
+    assert len(decompressed) == 1
+
+
+def test_missing_file_is_skipped(archive):
+    """Test that tasks of a deleted archive file are not found."""
+    archive.append([record("a", "2026-10-18"), record("b", "2026-10-19")])
+    os.remove(os.path.join(archive.root, archive._path("2026-10-18")))
+    assert list(archive.get_many(["a", "b"])) == ["b"]
+
+
+def test_archive_finished_moves_old_tasks(task_service):
+    """Test that old finished tasks leave the working set but can still be read."""
+
+    async def run():
+        old = await task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": "old"}
+        )
+        queued = await task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": "queued"}
+        )
+        task_service.tasks[old["id"]].update(
+            status="completed", completed_at="2020-01-01T00:00:00Z"
+        )
+        assert await task_service.archive_finished(max_age=3600) == 1
+        assert await task_service.archive_finished(max_age=3600) == 0
+        return old, queued, await task_service.get_task(old["id"])
+
+    old, queued, archived = asyncio.run(run())
+    assert list(task_service.tasks) == [queued["id"]]
+    assert archived["status"] == "completed"
+    assert archived["parameters"]["prompt"] == "old"
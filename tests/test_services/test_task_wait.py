@@ -0,0 +1,150 @@
+"""Tests for getting and waiting for several tasks at once."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from ai_task_orchestra.api.v1.endpoints import tasks as tasks_endpoint
+from ai_task_orchestra.services import event_stream
+from ai_task_orchestra.services import task_service as task_service_module
+from ai_task_orchestra.services.event_stream import COMPLETED, publish_task_event
+from ai_task_orchestra.services.task_service import get_task_service
+from ai_task_orchestra.services.task_state import update_task_state
+
+
+@pytest.fixture(autouse=True)
+def event_hub(fake_redis, monkeypatch):
+    """Fresh event hub with short stream reads and no status rechecks."""
+    monkeypatch.setattr(event_stream, "READ_BLOCK_SECONDS", 0.05)
+    monkeypatch.setattr(task_service_module, "WAIT_RECHECK_SECONDS", 60.0)
+    event_stream.get_event_hub.cache_clear()
+    yield
+    event_stream.get_event_hub.cache_clear()
+
+
+def create(task_service, prompt):
+    """Create an inference task."""
+    return asyncio.run(
+        task_service.create_task(
+            "ollama-inference", {"model": "llama3", "prompt": prompt}
+        )
+    )
+
+
+def archive(task_service, task):
+    """Finish a task and move it to the archive."""
+    task_service.tasks[task["id"]].update(
+        status="completed", completed_at="2020-01-01T00:00:00Z"
+    )
+    asyncio.run(task_service.archive_finished(max_age=3600))
+
+
+def complete(task_service, task, delay):
+    """Have a worker complete a task after a delay."""
+
+    async def run():
+        await asyncio.sleep(delay)
+        update_task_state(task["id"], status="completed")
+        publish_task_event(COMPLETED, task_service.tasks[task["id"]])
+
+    return asyncio.ensure_future(run())
+
+
+def test_get_tasks_mixes_live_and_archived(task_service):
+    """Test that tasks come back in the given order, once each, unknown ones left out."""
+    old = create(task_service, "old")
+    archive(task_service, old)
+    live = create(task_service, "live")
+    update_task_state(live["id"], status="completed")
+
+    found = asyncio.run(
+        task_service.get_tasks([live["id"], "unknown", old["id"], live["id"]])
+    )
+    assert [task["id"] for task in found] == [live["id"], old["id"]]
+    assert found[0]["status"] == "completed"
+    assert "archived" not in found[0]
+    assert found[1]["archived"] is True
+
+
+def test_wait_for_all_wakes_on_completion_events(task_service):
+    """Test that waiting returns once the last task's completion event arrives."""
+    first = create(task_service, "first")
+    second = create(task_service, "second")
+    archived = create(task_service, "archived")
+    archive(task_service, archived)
+    ids = [first["id"], second["id"], archived["id"]]
+
+    async def run():
+        finishing = [
+            complete(task_service, first, 0.1),
+            complete(task_service, second, 0.3),
+        ]
+        started = time.monotonic()
+        result = await task_service.wait_for_tasks(ids, timeout=10)
+        await asyncio.gather(*finishing)
+        return result, time.monotonic() - started
+
+    result, waited = asyncio.run(run())
+    assert result["done"]
+    assert sorted(result["finished"]) == sorted(ids)
+    assert result["pending"] == []
+    assert 0.3 <= waited < 5
+
+
+def test_wait_for_any_and_timeout(task_service):
+    """Test returning on the first finished task, or with the pending ones on timeout."""
+    first = create(task_service, "first")
+    second = create(task_service, "second")
+    ids = [first["id"], second["id"]]
+
+    result = asyncio.run(task_service.wait_for_tasks(ids, timeout=0.1))
+    assert not result["done"]
+    assert result["pending"] == ids
+
+    async def run():
+        finishing = complete(task_service, second, 0.1)
+        result = await task_service.wait_for_tasks(ids, 10, wait_for_all=False)
+        await finishing
+        return result
+
+    result = asyncio.run(run())
+    assert result["done"]
+    assert (result["finished"], result["pending"]) == ([second["id"]], [first["id"]])
+
+
+def test_wait_for_unknown_task(task_service):
+    """Test that waiting for a task that does not exist is refused."""
+    task = create(task_service, "known")
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(task_service.wait_for_tasks([task["id"], "unknown"], timeout=1))
+    assert error.value.status_code == 404
+    assert "unknown" in error.value.detail
+    assert event_stream.get_event_hub()._subscribers == set()
+
+
+def test_endpoints(task_service):
+    """Test the multi-get filters and the limits of a wait request."""
+    app = FastAPI()
+    app.include_router(tasks_endpoint.router, prefix="/tasks")
+    app.dependency_overrides[get_task_service] = lambda: task_service
+    client = TestClient(app)
+    first = create(task_service, "first")
+    second = create(task_service, "second")
+    update_task_state(second["id"], status="completed")
+
+    response = client.get(f"/tasks/?ids={second['id']},{first['id']},unknown")
+    assert [task["id"] for task in response.json()] == [second["id"], first["id"]]
+    response = client.get(f"/tasks/?ids={second['id']},{first['id']}&status=running")
+    assert [task["id"] for task in response.json()] == [first["id"]]
+
+    response = client.post(
+        "/tasks/wait", json={"ids": [second["id"]], "return_when": "any"}
+    )
+    assert response.status_code == 200
+    assert response.json()["done"]
+    assert client.post("/tasks/wait", json={"ids": []}).status_code == 422
+    too_long = {"ids": [first["id"]], "timeout": 10**6}
+    assert client.post("/tasks/wait", json=too_long).status_code == 422
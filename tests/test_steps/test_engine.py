@@ -0,0 +1,75 @@
+"""Tests for the step execution engine."""
+
+import pytest
+
+from ai_task_orchestra.services.template_service import Template
+from ai_task_orchestra.steps import engine
+
+
+def make_template(*steps):
+    """Create a template with the given steps."""
+    return Template(name="test", parameters=[], steps=list(steps))
+
+
+@pytest.fixture
+def echo(monkeypatch):
+    """Register an ``echo`` step returning its rendered ``text``."""
+    calls = []
+
+    def handler(step, context):
+        calls.append(step)
+        return {"output": step["text"]}
+
+    monkeypatch.setitem(engine.STEP_HANDLERS, "echo", handler)
+    return calls
+
+
+def test_run_steps_renders_parameters(echo):
+    """Test that steps are rendered with the parameters and run in order."""
+    template = make_template(
+        {"type": "echo", "text": "Hello {{name}}"},
+        {"type": "echo", "text": "{{missing}}"},
+    )
+    result = engine.run_steps("task", template, {"name": "world"})
+    assert [step["output"] for step in result["steps"]] == ["Hello world", None]
+    assert result["output"]["output"] is None
+    assert all(step["status"] == "completed" for step in result["steps"])
+
+
+def test_run_steps_fails_on_unimplemented_step_type(echo):
+    """Test that no step runs if the template uses an unknown step type."""
+    template = make_template(
+        {"type": "echo", "text": "first"}, {"type": "git_clone", "repo": "x"}
+    )
+    with pytest.raises(ValueError, match="git_clone"):
+        engine.run_steps("task", template, {})
+    assert echo == []
+
+
+def test_run_steps_removes_cleanup_files(tmp_path, monkeypatch):
+    """Test that files registered for cleanup are removed, even on failure."""
+    spool = tmp_path / "out.stdout"
+
+    def handler(step, context):
+        spool.write_text("output")
+        context["cleanup"].append(str(spool))
+        raise RuntimeError("step failed")
+
+    monkeypatch.setitem(engine.STEP_HANDLERS, "spooling", handler)
+    with pytest.raises(RuntimeError):
+        engine.run_steps("task", make_template({"type": "spooling"}), {})
+    assert not spool.exists()
+
+
+def test_precompile_fills_the_expression_cache():
+    """Test that precompiled step expressions are not compiled again on render."""
+    engine._compile.cache_clear()
+    template = make_template(
+        {"type": "echo", "text": "Hello {{name}}", "options": {"n": "{{ n }}"}},
+        {"type": "echo", "text": ["plain", "{% if x %}x{% endif %}"]},
+        {"type": "echo", "text": "{{ broken"},
+    )
+    assert engine.precompile([template]) == 3
+    hits = engine._compile.cache_info().hits
+    assert engine.render_value("Hello {{name}}", {"name": "world"}) == "Hello world"
+    assert engine._compile.cache_info().hits == hits + 1
@@ -0,0 +1,163 @@
+"""Tests for the sandboxed script runner."""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+from ai_task_orchestra.steps.script import (
+    ScriptCancelled,
+    ScriptLimits,
+    ScriptRunner,
+    execute_script,
+)
+
+
+def make_runner(tmp_path, **limits):
+    """Create a runner spooling to a temporary directory."""
+    return ScriptRunner(
+        limits=ScriptLimits(**limits), spool_dir=str(tmp_path / "spool"), cgroup_root=""
+    )
+
+
+def python(code):
+    """Command running Python code."""
+    return [sys.executable, "-c", code]
+
+
+def process_ended(pid, wait=5.0):
+    """Wait until a process is gone or a zombie waiting to be reaped."""
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        try:
+            with open(f"/proc/{pid}/stat") as f:
+                if f.read().rsplit(")", 1)[1].split()[0] == "Z":
+                    return True
+        except FileNotFoundError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_run_spools_output(tmp_path):
+    """Test that output goes to spool files, with the tail inline."""
+    runner = make_runner(tmp_path)
+    result = runner.run(
+        python("import sys; print('x' * 10000); sys.stderr.write('oops')"),
+        cwd=str(tmp_path),
+    )
+    assert result["status"] == "completed"
+    assert result["exit_code"] == 0
+    assert result["stdout_bytes"] == 10001
+    assert len(result["stdout_tail"]) == 4096
+    assert result["stderr_tail"] == "oops"
+    with open(result["stdout_path"]) as f:
+        assert f.read() == "x" * 10000 + "\n"
+
+
+def test_run_withholds_environment(tmp_path, monkeypatch):
+    """Test that only safe variables and the step's own reach the script."""
+    monkeypatch.setenv("API_KEY", "secret")
+    runner = make_runner(tmp_path)
+    result = runner.run(
+        python("import os; print(os.environ.get('API_KEY'), os.environ['GREETING'])"),
+        cwd=str(tmp_path),
+        env={"GREETING": "hello"},
+    )
+    assert result["stdout_tail"] == "None hello\n"
+
+
+def test_run_failure(tmp_path):
+    """Test that a non-zero exit code fails the run."""
+    result = make_runner(tmp_path).run(python("raise SystemExit(3)"), cwd=str(tmp_path))
+    assert result["status"] == "failed"
+    assert result["exit_code"] == 3
+
+
+def test_run_output_limit(tmp_path):
+    """Test that output beyond the limit stops the script."""
+    result = make_runner(tmp_path, output_mb=1).run(
+        python("import sys\nwhile True: sys.stdout.write('x' * 65536)"),
+        cwd=str(tmp_path),
+    )
+    assert result["status"] == "output_limit_exceeded"
+    assert result["stdout_bytes"] <= 1024 * 1024
+
+
+def test_run_timeout_kills_process_group(tmp_path):
+    """Test that a timeout kills the script and the processes it started."""
+    marker = tmp_path / "grandchild.pid"
+    code = (
+        "import subprocess, sys, time\n"
+        "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        f"open({str(marker)!r}, 'w').write(str(child.pid))\n"
+        "time.sleep(60)\n"
+    )
+    started = time.monotonic()
+    result = make_runner(tmp_path, timeout=1).run(python(code), cwd=str(tmp_path))
+    assert result["status"] == "timeout"
+    assert time.monotonic() - started < 10
+
+    assert process_ended(int(marker.read_text()))
+
+
+def test_run_cancel(tmp_path):
+    """Test that setting the cancel event stops the script."""
+    cancel = threading.Event()
+    threading.Timer(0.3, cancel.set).start()
+    with pytest.raises(ScriptCancelled):
+        make_runner(tmp_path).run(
+            python("import time; time.sleep(60)"),
+            cwd=str(tmp_path),
+            cancel_event=cancel,
+        )
+
+
+def test_execute_script_keeps_spool_paths_out_of_result(tmp_path, monkeypatch):
+    """Test that the spool files are recorded in the context, not the result."""
+    monkeypatch.setattr(
+        "ai_task_orchestra.steps.script.settings.script_spool_dir",
+        str(tmp_path / "spool"),
+    )
+    (tmp_path / "hello.py").write_text("print('hello')\n")
+    context = {
+        "task_id": "task",
+        "workdir": str(tmp_path),
+        "steps": [],
+        "spool": {},
+        "cleanup": [],
+    }
+    result = execute_script({"script": "hello.py"}, context)
+    assert result["stdout_tail"] == "hello\n"
+    assert "stdout_path" not in result
+    assert os.path.exists(context["spool"][0]["stdout"])
+    assert context["cleanup"] == list(context["spool"][0].values())
+
+
+def test_execute_script_rejects_paths_outside_workdir(tmp_path):
+    """Test that scripts must be inside the working directory."""
+    context = {"task_id": "task", "workdir": str(tmp_path), "steps": []}
+    with pytest.raises(ValueError):
+        execute_script({"script": "../outside.py"}, context)
+
+
+def test_execute_script_raises_on_failure(tmp_path, monkeypatch):
+    """Test that a failed script fails the step unless failure is allowed."""
+    monkeypatch.setattr(
+        "ai_task_orchestra.steps.script.settings.script_spool_dir",
+        str(tmp_path / "spool"),
+    )
+    (tmp_path / "fail.sh").write_text("echo broken >&2\nexit 1\n")
+    context = {
+        "task_id": "task",
+        "workdir": str(tmp_path),
+        "steps": [],
+        "spool": {},
+        "cleanup": [],
+    }
+    with pytest.raises(RuntimeError, match="broken"):
+        execute_script({"script": "fail.sh"}, context)
+    result = execute_script({"script": "fail.sh", "allow_failure": True}, context)
+    assert result["status"] == "failed"
@@ -0,0 +1,72 @@
+"""Tests for the trace context propagation."""
+
+import asyncio
+
+from opentelemetry import context, trace
+from opentelemetry.trace import NonRecordingSpan, SpanContext, TraceFlags
+
+from ai_task_orchestra import tracing
+
+TRACE_ID = 0x0AF7651916CD43DD8448EB211C80319C
+SPAN_ID = 0xB7AD6B7169203331
+
+
+def attach_remote_parent():
+    """Make a sampled remote span the current span.
+
+    Returns:
+        Token to detach the context with
+    """
+    parent = SpanContext(
+        trace_id=TRACE_ID,
+        span_id=SPAN_ID,
+        is_remote=True,
+        trace_flags=TraceFlags(TraceFlags.SAMPLED),
+    )
+    return context.attach(trace.set_span_in_context(NonRecordingSpan(parent)))
+
+
+def test_tracing_disabled_by_default():
+    """Test that no provider is installed without an exporter."""
+    assert tracing.setup_tracing("tests") is False
+    tracing.shutdown_tracing()
+
+
+def test_inject_extract_round_trip():
+    """Test that the context injected into headers is extracted again."""
+    assert tracing.inject_context({}) == {}
+
+    token = attach_remote_parent()
+    try:
+        headers = tracing.inject_context({"ato_tags": ["a"]})
+    finally:
+        context.detach(token)
+    assert headers["ato_tags"] == ["a"]
+    assert headers["traceparent"] == f"00-{TRACE_ID:032x}-{SPAN_ID:016x}-01"
+    assert "traceparent" in tracing.propagation_fields()
+
+    carrier = {name: headers.get(name) for name in tracing.propagation_fields()}
+    extracted = trace.get_current_span(tracing.extract_context(carrier))
+    assert extracted.get_span_context().trace_id == TRACE_ID
+    assert extracted.get_span_context().span_id == SPAN_ID
+
+
+def test_extract_without_headers():
+    """Test that missing headers give an empty context."""
+    extracted = tracing.extract_context({"traceparent": None})
+    assert not trace.get_current_span(extracted).get_span_context().is_valid
+
+
+def test_task_message_carries_trace_context(task_service, dispatcher):
+    """Test that the trace of the creating request travels with the message."""
+    token = attach_remote_parent()
+    try:
+        asyncio.run(
+            task_service.create_task(
+                "ollama-inference", {"model": "llama3", "prompt": "Hello"}
+            )
+        )
+    finally:
+        context.detach(token)
+    (message,) = dispatcher.sent
+    assert message["headers"]["traceparent"].split("-")[1] == f"{TRACE_ID:032x}"
@@ -0,0 +1,51 @@
+"""Tests for the worker's preloading and recycling settings."""
+
+import pytest
+
+from ai_task_orchestra import worker
+from ai_task_orchestra.config import settings
+from ai_task_orchestra.services.template_service import _shared_template_service
+from ai_task_orchestra.steps import engine
+
+
+@pytest.fixture
+def bundled_templates(template_service, monkeypatch):
+    """Shared template service reading the bundled templates."""
+    monkeypatch.setattr(settings, "templates_dir", template_service.templates_dir)
+    _shared_template_service.cache_clear()
+    yield
+    _shared_template_service.cache_clear()
+
+
+def test_preload_builds_shared_state(bundled_templates, monkeypatch):
+    """Test that worker_init loads the templates and compiles their expressions."""
+    engine._compile.cache_clear()
+    monkeypatch.setattr(settings, "worker_preload", True)
+    worker._preload()
+    assert _shared_template_service.cache_info().currsize == 1
+    assert engine._compile.cache_info().currsize > 0
+
+    engine._compile.cache_clear()
+    monkeypatch.setattr(settings, "worker_preload", False)
+    worker._preload()
+    assert engine._compile.cache_info().currsize == 0
+
+
+def test_gc_freeze_before_fork(monkeypatch):
+    """Test that the collector is frozen before each pool process is created."""
+    frozen = []
+    monkeypatch.setattr(worker.gc, "freeze", lambda: frozen.append(True))
+    monkeypatch.setattr(settings, "worker_preload", True)
+    worker._freeze_shared_state()
+    monkeypatch.setattr(settings, "worker_preload", False)
+    worker._freeze_shared_state()
+    assert frozen == [True]
+
+
+def test_recycling_limits(monkeypatch):
+    """Test that a zero task or memory limit disables it in the Celery config."""
+    monkeypatch.setattr(settings, "worker_max_tasks_per_child", 0)
+    monkeypatch.setattr(settings, "worker_max_memory_per_child", 512000)
+    config = settings.dict_for_celery()
+    assert config["worker_max_tasks_per_child"] is None
+    assert config["worker_max_memory_per_child"] == 512000